@@ -8,6 +8,7 @@ from starlette.staticfiles import StaticFiles
 
 import mgraph_ai_service_llms
 from mgraph_ai_service_llms.config                                               import FAST_API__TITLE
+from mgraph_ai_service_llms.fast_api.middlewares.Middleware__Perf__Server_Timing import Middleware__Perf__Server_Timing
 from mgraph_ai_service_llms.fast_api.routes.Routes__Cache                        import Routes__Cache
 from mgraph_ai_service_llms.fast_api.routes.Routes__Info                         import Routes__Info
 from mgraph_ai_service_llms.fast_api.routes.Routes__LLMs                         import Routes__LLMs
@@ -54,6 +55,11 @@ class Service__Fast_API(Serverless__Fast_API):
                              StaticFiles(directory=path_static_folder, html=True),
                              name=path_name                                      )
 
+    def setup_middlewares(self):
+        super().setup_middlewares()
+        self.app().add_middleware(Middleware__Perf__Server_Timing)  # per request span breakdown (Server-Timing header), also for the mounted platform apps
+        return self
+
     def setup_routes(self):
         self.add_routes    (Routes__Info         )
         self.add_routes    (Routes__Config       )
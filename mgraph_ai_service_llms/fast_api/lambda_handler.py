@@ -17,7 +17,9 @@ if os.getenv('AWS_REGION'):  # only execute if we are not running inside an AWS
 
     clear_osbot_modules()
 
-from mgraph_ai_service_llms.fast_api.Service__Fast_API import Service__Fast_API
+from mgraph_ai_service_llms.fast_api.Service__Fast_API                     import Service__Fast_API
+from mgraph_ai_service_llms.platforms.open_router.cache.Open_Router__Cache__GC import Open_Router__Cache__GC
+from mgraph_ai_service_llms.service.cache.LLM__Cache__Stats                import llm_cache__stats
 
 with Service__Fast_API() as _:
     _.setup()
@@ -25,4 +27,9 @@ with Service__Fast_API() as _:
     app     = _.app()
 
 def run(event, context=None):
-    return handler(event, context)
\ No newline at end of file
+    if event.get('source') == 'aws.events':                  # scheduled (EventBridge) invocation: collect the expired chat cache entries
+        return Open_Router__Cache__GC().setup().run()
+    try:
+        return handler(event, context)
+    finally:
+        llm_cache__stats.flush(wait=True)                   # the function is frozen after the response (so the background flush may never run)
\ No newline at end of file
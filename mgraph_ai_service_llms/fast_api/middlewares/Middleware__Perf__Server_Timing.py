@@ -0,0 +1,24 @@
+from typing                                                                         import TYPE_CHECKING
+from mgraph_ai_service_llms.service.perf.Perf__Span                                import perf__trace
+if TYPE_CHECKING:
+    from starlette.types import ASGIApp, Receive, Scope, Send
+
+HEADER__SERVER_TIMING = b'server-timing'
+
+
+class Middleware__Perf__Server_Timing:                                              # Collects the spans of each request and returns them in a Server-Timing header
+    def __init__(self, app: 'ASGIApp'):
+        self.app = app
+
+    async def __call__(self, scope: 'Scope', receive: 'Receive', send: 'Send'):
+        if scope.get('type') != 'http':
+            await self.app(scope, receive, send)
+            return
+        with perf__trace() as trace:
+            async def send_with_server_timing(message):
+                if message['type'] == 'http.response.start':                       # (sync routes have finished by now; streams only report the spans done before the first byte)
+                    server_timing = trace.server_timing()
+                    if server_timing:
+                        message['headers'] = list(message.get('headers', [])) + [(HEADER__SERVER_TIMING, server_timing.encode('latin-1'))]
+                await send(message)
+            await self.app(scope, receive, send_with_server_timing)
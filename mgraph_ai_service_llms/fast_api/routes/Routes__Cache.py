@@ -1,11 +1,17 @@
-from osbot_fast_api.api.routes.Fast_API__Routes          import Fast_API__Routes
-from mgraph_ai_service_llms.service.cache.Service__Cache import Service__Cache
+from typing                                                    import Optional
+from fastapi.responses                                         import StreamingResponse
+from osbot_fast_api.api.routes.Fast_API__Routes                import Fast_API__Routes
+from mgraph_ai_service_llms.service.cache.Service__Cache       import Service__Cache, CACHE_INDEX__PAGE_LIMIT__DEFAULT
+from mgraph_ai_service_llms.service.schemas.Schema__Cache__Ids import Schema__Cache__Ids
 
 TAG__ROUTES_CACHE = 'cache'
 ROUTES_PATHS__CACHE = [ f'/{TAG__ROUTES_CACHE}/index'                  ,
+                        f'/{TAG__ROUTES_CACHE}/export'                  ,
                         f'/{TAG__ROUTES_CACHE}/entry-by-id/{{cache_id}}',
+                        f'/{TAG__ROUTES_CACHE}/entries-by-ids'          ,
                         f'/{TAG__ROUTES_CACHE}/entry-by-hash'           ,
-                        f'/{TAG__ROUTES_CACHE}/stats'                   ]
+                        f'/{TAG__ROUTES_CACHE}/stats'                   ,
+                        f'/{TAG__ROUTES_CACHE}/stats-daily'             ]
 
 class Routes__Cache(Fast_API__Routes):
     tag           : str            = 'cache'
@@ -15,23 +21,51 @@ class Routes__Cache(Fast_API__Routes):
         super().__init__(**kwargs)
         self.service_cache = Service__Cache()
 
-    def index(self):                                                        # GET /cache/index
-        """Get the complete cache index"""
-        return self.service_cache.cache_index()
+    def index(self, limit     : int           = CACHE_INDEX__PAGE_LIMIT__DEFAULT,     # GET /cache/index?limit=100&cursor=xxx
+                    cursor    : Optional[str] = None ,
+                    model     : Optional[str] = None ,
+                    date_from : Optional[str] = None ,                                  # YYYY-MM-DD
+                    date_to   : Optional[str] = None
+               ):
+        """Get one page of the cache index (use next_cursor to get the next page)"""
+        return self.service_cache.cache_index(limit=limit, cursor=cursor, model=model, date_from=date_from, date_to=date_to)
+
+    def export(self, model     : Optional[str] = None ,                                 # GET /cache/export
+                     date_from : Optional[str] = None ,
+                     date_to   : Optional[str] = None
+                ):
+        """Stream the full cache index as NDJSON (one entry per line)"""
+        lines = self.service_cache.cache_index__export(model=model, date_from=date_from, date_to=date_to)
+        return StreamingResponse(lines, media_type='application/x-ndjson')
 
     def entry_by_id__cache_id(self, cache_id: str):                         # GET /cache/entry_by_id/{cache_id}
         return self.service_cache.get_cache_entry_by_id(cache_id)           # Get a cache entry by its cache ID"""
 
+    def entries_by_ids(self, cache_ids: Schema__Cache__Ids):                # POST /cache/entries-by-ids  {"cache_ids": [...]}
+        """Get several cache entries in one call (map of cache_id -> entry, each with its own status)"""
+        return self.service_cache.get_cache_entries_by_ids(cache_ids.cache_ids)
+
     def entry_by_hash(self, request_hash: str):                             # GET /cache/entry_by_hash?request_hash=xxx
         """Get a cache entry by its request hash"""
         return self.service_cache.get_cache_entry_by_hash(request_hash)
 
-    def stats(self):                                                        # GET /cache/stats
-        """Get cache statistics"""
-        return self.service_cache.cache_stats()
+    def stats(self, date_from : Optional[str] = None ,                      # GET /cache/stats?date_from=YYYY-MM-DD&date_to=YYYY-MM-DD
+                    date_to   : Optional[str] = None
+               ):
+        """Get cache statistics (from the daily rollups)"""
+        return self.service_cache.cache_stats(date_from=date_from, date_to=date_to)
+
+    def stats_daily(self, date_from : Optional[str] = None ,                # GET /cache/stats-daily?date_from=YYYY-MM-DD&date_to=YYYY-MM-DD
+                          date_to   : Optional[str] = None
+                     ):
+        """Get the cache statistics per day (entries, models, providers, bytes, hits, misses, cost saved)"""
+        return self.service_cache.cache_stats__daily(date_from=date_from, date_to=date_to)
 
     def setup_routes(self):
-        self.add_route_get(self.index                  )
-        self.add_route_get(self.entry_by_id__cache_id  )
-        self.add_route_get(self.entry_by_hash          )
-        self.add_route_get(self.stats                  )
\ No newline at end of file
+        self.add_route_get (self.index                  )
+        self.add_route_get (self.export                 )
+        self.add_route_get (self.entry_by_id__cache_id  )
+        self.add_route_post(self.entries_by_ids         )
+        self.add_route_get (self.entry_by_hash          )
+        self.add_route_get (self.stats                  )
+        self.add_route_get (self.stats_daily            )
@@ -1,11 +1,17 @@
-from osbot_fast_api.api.routes.Fast_API__Routes        import Fast_API__Routes
-from mgraph_ai_service_llms.service.info.Service_Info  import Service_Info
+from fastapi.responses                                       import PlainTextResponse
+from osbot_fast_api.api.routes.Fast_API__Routes              import Fast_API__Routes
+from mgraph_ai_service_llms.service.info.Service_Info        import Service_Info
+from mgraph_ai_service_llms.service.metrics.LLM__Metrics     import METRICS__CONTENT_TYPE
 
 TAG__ROUTES_INFO                  = 'info'
-ROUTES_PATHS__INFO                = [ f'/{TAG__ROUTES_INFO}/health'  ,
-                                      f'/{TAG__ROUTES_INFO}/server'  ,
-                                      f'/{TAG__ROUTES_INFO}/status'  ,
-                                      f'/{TAG__ROUTES_INFO}/versions']
+ROUTES_PATHS__INFO                = [ f'/{TAG__ROUTES_INFO}/circuit-breakers',
+                                      f'/{TAG__ROUTES_INFO}/health'          ,
+                                      f'/{TAG__ROUTES_INFO}/metrics'         ,
+                                      f'/{TAG__ROUTES_INFO}/perf'            ,
+                                      f'/{TAG__ROUTES_INFO}/server'          ,
+                                      f'/{TAG__ROUTES_INFO}/status'          ,
+                                      f'/{TAG__ROUTES_INFO}/transport'       ,
+                                      f'/{TAG__ROUTES_INFO}/versions'        ]
 ROUTES_INFO__HEALTH__RETURN_VALUE = {'status': 'ok'}
 
 class Routes__Info(Fast_API__Routes):
@@ -24,9 +30,24 @@ class Routes__Info(Fast_API__Routes):
     def versions(self):                                             # Get service versions
         return self.service_info.versions()
 
+    def circuit_breakers(self):                                     # Get the upstream circuit breakers state
+        return self.service_info.circuit_breakers()
+
+    def transport(self):                                            # Get the upstream connection pool and request counters
+        return self.service_info.transport()
+
+    def perf(self):                                                 # Get the latency breakdown per request stage (cache, S3, upstream, cost, ...)
+        return self.service_info.perf()
+
+    def metrics(self):                                              # Prometheus scrape endpoint (latency histograms, cache hits, tokens and cost per model and provider)
+        return PlainTextResponse(self.service_info.metrics(), media_type=METRICS__CONTENT_TYPE)
 
     def setup_routes(self):
         self.add_route_get(self.health  )
         self.add_route_get(self.server  )
         self.add_route_get(self.status  )
-        self.add_route_get(self.versions)
\ No newline at end of file
+        self.add_route_get(self.versions)
+        self.add_route_get(self.circuit_breakers)
+        self.add_route_get(self.transport       )
+        self.add_route_get(self.perf            )
+        self.add_route_get(self.metrics         )
\ No newline at end of file
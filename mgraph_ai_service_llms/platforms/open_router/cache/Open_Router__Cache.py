@@ -85,52 +85,6 @@ class Open_Router__Cache(Type_Safe):
     #                   ) -> bool:
     #     file_fs = self.file_for_latest(Safe_Id(file_id))
     #     return file_fs.delete()
-    #
-    # def list_temporal_entries(self, file_id_prefix : str                      ,         # List temporal entries by prefix
-    #                                 days_back      : int = 7
-    #                           ) -> list[str]:
-    #     entries = []
-    #     now     = datetime.now()
-    #
-    #     for day_offset in range(days_back):
-    #         date = datetime(now.year, now.month, now.day)
-    #         date = datetime.fromordinal(date.toordinal() - day_offset)
-    #
-    #         # Build temporal path
-    #         temporal_path = f"cache/{date.year}/{date.month:02d}/{date.day:02d}"
-    #
-    #         # List files in temporal path
-    #         folder_files = self.storage_fs.folder__files(temporal_path, return_full_path=True)
-    #
-    #         for file_path in folder_files:
-    #             if file_id_prefix in str(file_path):
-    #                 entries.append(str(file_path))
-    #
-    #     return sorted(entries)
-    
-    def clear_all(self) -> bool:                                                        # Clear all cache entries
+
+    def clear_all(self) -> bool:                                                        # Clear all cache entries (see Open_Router__Cache__GC for removing only the expired ones)
         return self.s3__storage.clear()
-    
-    # def clear_old_temporal(self, days_to_keep: int = 30                                 # Clear old temporal entries
-    #                        ) -> int:
-    #     deleted_count = 0
-    #     now           = datetime.now()
-    #     cutoff_date   = datetime.fromordinal(now.toordinal() - days_to_keep)
-    #
-    #     # Iterate through year/month/day structure
-    #     for year in range(2024, now.year + 1):
-    #         for month in range(1, 13):
-    #             for day in range(1, 32):
-    #                 try:
-    #                     check_date = datetime(year, month, day)
-    #                     if check_date < cutoff_date:
-    #                         path = f"cache/{year}/{month:02d}/{day:02d}"
-    #                         # Delete all files in this day's folders
-    #                         files = self.storage_fs.folder__files(path, return_full_path=True)
-    #                         for file_path in files:
-    #                             if self.storage_fs.file__delete(file_path):
-    #                                 deleted_count += 1
-    #                 except ValueError:
-    #                     continue  # Invalid date, skip
-    #
-    #     return deleted_count
\ No newline at end of file
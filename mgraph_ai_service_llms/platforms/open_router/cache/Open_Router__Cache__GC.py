@@ -0,0 +1,126 @@
+import json
+import re
+from concurrent.futures                                                             import ThreadPoolExecutor
+from datetime                                                                       import datetime, timedelta, timezone
+from typing                                                                         import Dict, Any, List, Optional
+from osbot_utils.helpers.duration.decorators.capture_duration                       import capture_duration
+from osbot_utils.type_safe.Type_Safe                                                import Type_Safe
+from mgraph_ai_service_llms.platforms.open_router.cache.Open_Router__Cache          import Open_Router__Cache
+from mgraph_ai_service_llms.platforms.open_router.cache.Open_Router__Chat__Cache    import Open_Router__Chat__Cache
+
+CACHE_GC__MAX_WORKERS   = 8
+CACHE_GC__BATCH_SIZE    = 1000                                                      # max number of keys per S3 multi-object delete
+CACHE_GC__FOLDER_LATEST = 'latest'
+REGEX__TEMPORAL_PATH    = re.compile(r'^(\d{4})/(\d{2})/(\d{2})/(\d{2})/')            # YYYY/MM/DD/HH/ (from Path__Handler__Temporal)
+
+
+class Open_Router__Cache__GC(Type_Safe):                                            # Deletes the expired entries from a (latest + temporal) Open_Router__Cache
+    cache       : Open_Router__Cache = None
+    ttl_hours   : int                = 24
+    max_workers : int                = CACHE_GC__MAX_WORKERS
+    batch_size  : int                = CACHE_GC__BATCH_SIZE
+
+    def setup(self) -> 'Open_Router__Cache__GC':                                    # by default collect the chat cache (using its TTL)
+        if self.cache is None:
+            chat_cache     = Open_Router__Chat__Cache().setup()
+            self.cache     = chat_cache.cache
+            self.ttl_hours = chat_cache.cache_ttl_hours
+        return self
+
+    def s3(self):
+        return self.cache.s3__storage.s3
+
+    def s3_bucket(self) -> str:
+        return self.cache.s3__storage.s3_bucket
+
+    def s3_prefix(self) -> str:
+        prefix = self.cache.s3__storage.s3_prefix
+        return f'{prefix}/' if prefix and not prefix.endswith('/') else (prefix or '')
+
+    def folder_list(self, parent_folder: str) -> List[str]:
+        return sorted(self.s3().folder_list(s3_bucket=self.s3_bucket(), parent_folder=parent_folder))
+
+    def day_folders(self, cutoff: datetime) -> List[str]:                           # walk YYYY/MM/DD skipping the months and days that can't have expired entries
+        prefix      = self.s3_prefix()
+        day_folders = []
+        for year in self.folder_list(prefix):
+            if not (year.isdigit() and len(year) == 4) or int(year) > cutoff.year:
+                continue
+            for month in self.folder_list(f'{prefix}{year}/'):
+                if not month.isdigit() or (int(year), int(month)) > (cutoff.year, cutoff.month):
+                    continue
+                for day in self.folder_list(f'{prefix}{year}/{month}/'):
+                    if day.isdigit() and (int(year), int(month), int(day)) <= (cutoff.year, cutoff.month, cutoff.day):
+                        day_folders.append(f'{prefix}{year}/{month}/{day}/')
+        return day_folders
+
+    def expired__temporal(self, day_folder: str, cutoff: datetime) -> List[dict]:   # objects in the day folder whose hour folder ended before the cutoff
+        expired = []
+        prefix  = self.s3_prefix()
+        for s3_object in self.s3().files_raw(bucket=self.s3_bucket(), prefix=day_folder):
+            match = REGEX__TEMPORAL_PATH.match(s3_object['Key'][len(prefix):])
+            if match:
+                hour_end = datetime(*(int(value) for value in match.groups())) + timedelta(hours=1)
+                if hour_end <= cutoff:
+                    expired.append(s3_object)
+        return expired
+
+    def expired__latest(self, cutoff: datetime) -> Dict[str, List[dict]]:          # latest entries (all their files) last written before the cutoff
+        latest_folder = f'{self.s3_prefix()}{CACHE_GC__FOLDER_LATEST}/'
+        cutoff_utc    = cutoff.astimezone(timezone.utc)
+        entries       = {}
+        for s3_object in self.s3().files_raw(bucket=self.s3_bucket(), prefix=latest_folder):
+            file_id = s3_object['Key'][len(latest_folder):].split('.')[0]           # {file_id}.json, {file_id}.json.config and {file_id}.json.metadata
+            entries.setdefault(file_id, []).append(s3_object)
+        return { file_id: s3_objects for file_id, s3_objects in entries.items()
+                 if max(s3_object['LastModified'] for s3_object in s3_objects) <= cutoff_utc }   # only if all files are old (i.e. the entry was not re-cached)
+
+    def delete(self, s3_objects: List[dict]) -> int:                                # multi-object delete in batches
+        keys = [s3_object['Key'] for s3_object in s3_objects]
+        for index in range(0, len(keys), self.batch_size):
+            self.s3().files_delete(bucket=self.s3_bucket(), keys=keys[index:index + self.batch_size])
+        return len(keys)
+
+    def run(self, dry_run: bool = False, now: Optional[datetime] = None) -> Dict[str, Any]:
+        now    = now or datetime.now()                                              # temporal paths use local time (see Path__Handler__Temporal.path_now)
+        cutoff = now - timedelta(hours=self.ttl_hours)
+        with capture_duration() as duration:
+            day_folders = self.day_folders(cutoff)
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:     # days are listed (and deleted) in parallel
+                expired_per_day = list(executor.map(lambda day_folder: self.expired__temporal(day_folder, cutoff), day_folders))
+                expired_latest  = self.expired__latest(cutoff)                      # latest copies go together with the temporal ones, so reads see a clean miss
+                latest_objects  = [s3_object for s3_objects in expired_latest.values() for s3_object in s3_objects]
+                if not dry_run:
+                    list(executor.map(self.delete, expired_per_day + [latest_objects]))
+        temporal_objects = [s3_object for s3_objects in expired_per_day for s3_object in s3_objects]
+        all_objects      = temporal_objects + latest_objects
+        return { 'status'           : 'success'                                                  ,
+                 'dry_run'          : dry_run                                                    ,
+                 's3_bucket'        : self.s3_bucket()                                           ,
+                 's3_prefix'        : self.s3_prefix()                                           ,
+                 'ttl_hours'        : self.ttl_hours                                             ,
+                 'cutoff'           : cutoff.isoformat()                                         ,
+                 'days_scanned'     : len(day_folders)                                           ,
+                 'files_deleted'    : len(all_objects)                                           ,
+                 'latest_deleted'   : len(expired_latest)                                        ,
+                 'bytes_reclaimed'  : sum(s3_object.get('Size', 0) for s3_object in all_objects) ,
+                 'duration'         : duration.seconds                                           }
+
+
+def main(args: List[str] = None) -> Dict[str, Any]:                                 # CLI: python -m mgraph_ai_service_llms.platforms.open_router.cache.Open_Router__Cache__GC --dry-run
+    import argparse
+    parser = argparse.ArgumentParser(description='Delete the expired entries from the OpenRouter chat cache')
+    parser.add_argument('--dry-run'  , action='store_true', help='only report what would be deleted')
+    parser.add_argument('--ttl-hours', type=int           , help='override the chat cache TTL'     )
+    parsed = parser.parse_args(args)
+
+    cache_gc = Open_Router__Cache__GC().setup()
+    if parsed.ttl_hours is not None:
+        cache_gc.ttl_hours = parsed.ttl_hours
+    report = cache_gc.run(dry_run=parsed.dry_run)
+    print(json.dumps(report, indent=4))
+    return report
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+from bisect                                                                         import bisect_right
+from typing                                                                         import Any, Dict, List, Optional, Union
+from osbot_utils.type_safe.Type_Safe                                                import Type_Safe
+
+CATALOGUE_INDEX__LIST_FIELDS = ['id', 'name', 'context_length', 'is_free', 'pricing']   # what /chat/models returns (when no fields are asked for)
+CATALOGUE_INDEX__MAX_LIMIT   = 1000
+
+
+class Open_Router__Catalogue__Index(Type_Safe):                                     # The catalogue as plain records plus lookup indexes (built once per catalogue version), so that listings are filtered, projected and paged without touching the Type_Safe models
+    records         : list                                                          # model.json() + is_free (catalogue order)
+    positions       : dict                                                          # model id -> position
+    by_modality     : dict                                                          # modality            -> set of positions
+    by_tokenizer    : dict                                                          # tokenizer           -> set of positions
+    by_parameter    : dict                                                          # supported parameter -> set of positions
+    context_lengths : list
+    max_prices      : list                                                          # max(prompt, completion) price (None when not priced, or priced at -1 like 'openrouter/auto')
+    field_names     : list                                                          # the fields that can be projected
+
+    def load_models(self, models: list) -> 'Open_Router__Catalogue__Index':
+        for position, model in enumerate(models):
+            record  = dict(model.json())                                            # (records share their json with the snapshot)
+            pricing = model.pricing
+            prompt     = float(pricing.prompt     or 0) if pricing else 0.0
+            completion = float(pricing.completion or 0) if pricing else 0.0
+            record['is_free'] = prompt == 0 and completion == 0
+            self.records        .append(record)
+            self.positions      [str(model.id)] = position
+            self.context_lengths.append(int(model.context_length or 0))
+            self.max_prices     .append(max(prompt, completion) if pricing and prompt >= 0 and completion >= 0 else None)
+            self.by_modality .setdefault(str(model.architecture.modality ), set()).add(position)
+            self.by_tokenizer.setdefault(str(model.architecture.tokenizer), set()).add(position)
+            for parameter in model.supported_parameters:
+                self.by_parameter.setdefault(str(parameter), set()).add(position)
+        if self.records:
+            self.field_names = list(self.records[0])
+        return self
+
+    def size(self) -> int:
+        return len(self.records)
+
+    def parse_fields(self, fields: Union[str, List[str], None]) -> Optional[List[str]]:    # 'id,name,pricing' or ['id', 'name', 'pricing']
+        if not fields:
+            return None
+        if isinstance(fields, str):
+            fields = [field.strip() for field in fields.split(',') if field.strip()]
+        unknown = [field for field in fields if field not in self.field_names]
+        if unknown and self.records:
+            raise ValueError(f"Unknown fields: {unknown}. Valid options: {self.field_names}")
+        return list(fields)
+
+    def matching(self, modality            : Optional[str  ] = None ,               # positions of the models that pass all the filters (in catalogue order)
+                       tokenizer           : Optional[str  ] = None ,
+                       supported_parameter : Optional[str  ] = None ,
+                       min_context_length  : int             = 0    ,
+                       max_price           : Optional[float] = None ,
+                       include_free        : bool            = True ,
+                       include_paid        : bool            = True
+                 ) -> List[int]:
+        indexed = [index.get(value, set()) for index, value in ((self.by_modality , modality           ),
+                                                                (self.by_tokenizer, tokenizer          ),
+                                                                (self.by_parameter, supported_parameter))
+                                           if value]
+        if indexed:
+            indexed.sort(key=len)
+            candidates = sorted(set.intersection(*indexed))
+        else:
+            candidates = range(self.size())
+        records = self.records
+        return [position for position in candidates
+                         if self.context_lengths[position] >= min_context_length                                                         and
+                            (max_price is None or (self.max_prices[position] is not None and self.max_prices[position] <= max_price)) and
+                            (include_free if records[position]['is_free'] else include_paid)                                            ]
+
+    def query(self, fields              : Union[str, List[str], None] = None ,       # one page of (projected) models
+                    limit               : Optional[int  ]             = None ,
+                    cursor              : Optional[str  ]             = None ,       # the last model id of the previous page
+                    **filters
+              ) -> Dict[str, Any]:
+        fields    = self.parse_fields(fields)
+        positions = self.matching(**filters)
+        total     = len(positions)
+        if cursor:
+            if cursor not in self.positions:
+                raise ValueError(f"Unknown cursor: {cursor} (the catalogue may have been refreshed)")
+            positions = positions[bisect_right(positions, self.positions[cursor]):]
+        if limit is not None:
+            limit = min(max(limit, 0), CATALOGUE_INDEX__MAX_LIMIT)
+        page        = positions[:limit] if limit is not None else positions
+        next_cursor = self.records[page[-1]]['id'] if page and len(page) < len(positions) else None
+        if fields:
+            models = [{ field: self.records[position].get(field) for field in fields } for position in page]
+        else:
+            models = [self.records[position] for position in page]
+        return { "models"      : models      ,
+                 "total"       : total       ,                                      # (all the pages)
+                 "next_cursor" : next_cursor }
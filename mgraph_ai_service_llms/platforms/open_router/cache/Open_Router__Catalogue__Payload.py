@@ -0,0 +1,32 @@
+import hashlib
+import json
+from typing                                                                         import Any, Optional
+from osbot_utils.type_safe.Type_Safe                                                import Type_Safe
+
+CATALOGUE__CACHE_CONTROL        = 'public, max-age=300, stale-while-revalidate=60'  # the catalogue changes a few times a day, and a revalidation (304) is cheap
+CATALOGUE__CACHE_CONTROL__FIXED = 'public, max-age=3600'                            # payloads that only change with a deploy
+CATALOGUE__CONTENT_TYPE         = 'application/json'
+
+
+class Open_Router__Catalogue__Payload(Type_Safe):                                   # A response serialised once (per catalogue version), with a strong ETag of its bytes
+    body          : bytes
+    etag          : str
+    cache_control : str = CATALOGUE__CACHE_CONTROL
+
+    @classmethod
+    def from_json(cls, data: Any, cache_control: str = CATALOGUE__CACHE_CONTROL) -> 'Open_Router__Catalogue__Payload':
+        body = json.dumps(data, separators=(',', ':')).encode()
+        etag = f'"{hashlib.sha256(body).hexdigest()[:32]}"'                         # from the bytes (not the version counter), so that all workers agree
+        return cls(body=body, etag=etag, cache_control=cache_control)
+
+    def not_modified(self, if_none_match: Optional[str]) -> bool:                   # If-None-Match matches (weak comparison, as RFC 9110 asks for GETs)
+        if not if_none_match:
+            return False
+        for etag in if_none_match.split(','):
+            etag = etag.strip()
+            if etag == '*' or etag.removeprefix('W/') == self.etag:
+                return True
+        return False
+
+    def headers(self) -> dict:
+        return { 'ETag': self.etag, 'Cache-Control': self.cache_control }
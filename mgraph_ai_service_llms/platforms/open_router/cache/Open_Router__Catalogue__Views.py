@@ -0,0 +1,57 @@
+import threading
+from functools                                                                      import wraps
+from typing                                                                         import Any, Callable, Dict
+from osbot_utils.type_safe.Type_Safe                                                import Type_Safe
+
+CATALOGUE_VIEWS__MAX_VIEWS = 1024                                                   # (views keyed by client arguments, like cursors, must not grow without limit)
+
+
+class Open_Router__Catalogue__Views(Type_Safe):                                     # Values derived from the models catalogue (free models, summaries, filters, ...), computed once per catalogue version and arguments
+    catalogue : object = None                                                       # the models list the views were computed from
+    version   : int                                                                 # incremented every time the catalogue changes
+    views     : dict                                                                # (view name, args, kwargs) -> value
+    hits      : int
+    misses    : int
+    max_views : int    = CATALOGUE_VIEWS__MAX_VIEWS
+    lock      : object = None
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.lock = threading.RLock()
+
+    def for_catalogue(self, models: list) -> 'Open_Router__Catalogue__Views':       # drops all the views when the catalogue is not the one they were computed from
+        if self.catalogue is not models:
+            with self.lock:
+                if self.catalogue is not models:
+                    self.views     = {}
+                    self.catalogue = models
+                    self.version  += 1
+        return self
+
+    def get(self, name: str, args: tuple, kwargs: Dict[str, Any], builder: Callable[[], Any]) -> Any:
+        key   = (name, args, tuple(sorted(kwargs.items())))
+        views = self.views                                                          # (a refresh swaps the dict, so a value built for the previous catalogue is never stored in the new one)
+        if key in views:
+            self.hits += 1
+            return views[key]
+        self.misses += 1
+        value = builder()
+        if len(views) < self.max_views:
+            views[key] = value
+        return value
+
+    def status(self) -> Dict[str, Any]:
+        return dict(version = self.version                                          ,
+                    models  = len(self.catalogue) if self.catalogue is not None else 0,
+                    views   = len(self.views)                                       ,
+                    hits    = self.hits                                             ,
+                    misses  = self.misses                                           )
+
+
+def cache_on_catalogue(function: Callable) -> Callable:                             # like @cache_on_self, but keyed by the arguments and dropped when the catalogue refreshes (the class provides catalogue_views())
+    name = function.__qualname__
+
+    @wraps(function)
+    def wrapper(self, *args, **kwargs):
+        return self.catalogue_views().get(name, args, kwargs, lambda: function(self, *args, **kwargs))
+    return wrapper
@@ -5,6 +5,7 @@ from osbot_utils.type_safe.primitives.safe_str.identifiers.Safe_Id
 from osbot_utils.utils.Json                                                         import json_to_str
 from osbot_utils.utils.Misc                                                         import bytes_sha256
 from mgraph_ai_service_llms.platforms.open_router.cache.Open_Router__Cache          import Open_Router__Cache
+from mgraph_ai_service_llms.service.perf.Perf__Span                                 import span
 
 class Open_Router__Chat__Cache(Type_Safe):
     cache: Open_Router__Cache = None
@@ -46,22 +47,24 @@ class Open_Router__Chat__Cache(Type_Safe):
                         'cached_at' : Timestamp_Now()      ,
                         'ttl_hours' : self.cache_ttl_hours }
         file_id = Safe_Id(cache_id)                                                         # we need to convert Safe_Str__Hash into Safe_ID
-        with self.cache.fs__latest_temporal.file__json(file_id) as _:
-            _.create(cache_entry)
-            return True
+        with span('cache.put'):
+            with self.cache.fs__latest_temporal.file__json(file_id) as _:
+                _.create(cache_entry)
+                return True
 
     def get_cached_response(self, request_data: dict) -> dict:          # Retrieve cached response if available and valid
         cache_id = self.generate_cache_id(request_data)
         file_id  = Safe_Id(cache_id)
-        with self.cache.fs__latest_temporal.file__json(file_id) as _:
-            if _.exists():
-                cache_entry = _.content()
+        with span('cache.get'):
+            with self.cache.fs__latest_temporal.file__json(file_id) as _:
+                if _.exists():
+                    cache_entry = _.content()
 
-                cached_at = cache_entry.get('cached_at', 0)                 # Check TTL
-                current_time = Timestamp_Now()
-                age_hours    = (current_time - cached_at) / 3_600_000
+                    cached_at = cache_entry.get('cached_at', 0)                 # Check TTL
+                    current_time = Timestamp_Now()
+                    age_hours    = (current_time - cached_at) / 3_600_000
 
-                if age_hours < self.cache_ttl_hours:
-                    return cache_entry.get('response')
+                    if age_hours < self.cache_ttl_hours:
+                        return cache_entry.get('response')
 
         return None
\ No newline at end of file
@@ -3,8 +3,10 @@ from osbot_utils.type_safe.Type_Safe
 from osbot_utils.type_safe.primitives.safe_int.Timestamp_Now                                             import Timestamp_Now
 from mgraph_ai_service_llms.platforms.open_router.cache.Open_Router__Cache                               import Open_Router__Cache
 from mgraph_ai_service_llms.platforms.open_router.schemas.models.Schema__Open_Router__Models__Response   import Schema__Open_Router__Models__Response
+from mgraph_ai_service_llms.service.metrics.LLM__Metrics                                                 import llm__metrics
 
-FILE_ID__OPEN_ROUTER__MODELS = "openrouter-models"
+FILE_ID__OPEN_ROUTER__MODELS           = "openrouter-models"
+FILE_ID__OPEN_ROUTER__MODELS__SNAPSHOT = "openrouter-models--snapshot"                  # the same catalogue in the trusted (fast to load) form, see Open_Router__Models__Snapshot
 
 class Open_Router__Models__Cache(Type_Safe):
     cache           : Open_Router__Cache     = None                                     # Cache backend
@@ -31,4 +33,17 @@ class Open_Router__Models__Cache(Type_Safe):
     def get_cached_models(self) -> Schema__Open_Router__Models__Response:                            # Retrieve cached models data
         with self.cache.fs__latest_temporal.file__json(FILE_ID__OPEN_ROUTER__MODELS) as _:
             json_data = _.content()
-            return Schema__Open_Router__Models__Response.from_json(json_data)
\ No newline at end of file
+            llm__metrics.cache_lookup('models', hit=bool(json_data))
+            return Schema__Open_Router__Models__Response.from_json(json_data)
+
+    def cache_models_snapshot(self, snapshot_json: dict) -> File_FS:                        # (written by this service from validated models)
+        with self.cache.fs__latest_temporal.file__json(FILE_ID__OPEN_ROUTER__MODELS__SNAPSHOT) as _:
+            _.create          (snapshot_json                         )
+            _.metadata__update(dict(cache_timestamp = Timestamp_Now()))
+            return _
+
+    def get_cached_models_snapshot(self) -> dict:
+        with self.cache.fs__latest_temporal.file__json(FILE_ID__OPEN_ROUTER__MODELS__SNAPSHOT) as _:
+            json_data = _.content()
+            llm__metrics.cache_lookup('models_snapshot', hit=bool(json_data))
+            return json_data
@@ -0,0 +1,40 @@
+import threading
+from typing                                                                           import Any, Callable, Dict
+from osbot_utils.type_safe.Type_Safe                                                  import Type_Safe
+from mgraph_ai_service_llms.platforms.open_router.cache.Open_Router__Models__Snapshot import Open_Router__Models__Snapshot
+
+
+class Open_Router__Models__Catalogue(Type_Safe):                                    # The (read-only) models catalogue shared by all the models services of this process, so each worker holds one copy
+    snapshot : Open_Router__Models__Snapshot = None
+    loads    : int                                                                  # times the catalogue was loaded or replaced
+    lock     : object                        = None
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.lock = threading.RLock()
+
+    def get(self, loader: Callable[[], Open_Router__Models__Snapshot]) -> Open_Router__Models__Snapshot:   # loader: only called by the first service that needs the catalogue
+        snapshot = self.snapshot
+        if snapshot is None:
+            with self.lock:
+                if self.snapshot is None:
+                    self.replace(loader())
+                snapshot = self.snapshot
+        return snapshot
+
+    def replace(self, snapshot: Open_Router__Models__Snapshot) -> Open_Router__Models__Snapshot:           # (after a refresh, every service sees the new catalogue and recomputes its views)
+        with self.lock:
+            self.snapshot = snapshot
+            self.loads   += 1
+        return snapshot
+
+    def clear(self) -> None:
+        with self.lock:
+            self.snapshot = None
+
+    def status(self) -> Dict[str, Any]:
+        snapshot = self.snapshot
+        return dict(loaded = snapshot is not None                                  ,
+                    models = len(snapshot.records) if snapshot is not None else 0  ,
+                    built  = len(snapshot.models ) if snapshot is not None and snapshot.models is not None else 0,
+                    loads  = self.loads                                            )
@@ -0,0 +1,130 @@
+import hashlib
+import sys
+from functools                                                                                         import lru_cache
+from typing                                                                                            import Any, Dict, List, Optional
+from osbot_utils.type_safe.Type_Safe                                                                   import Type_Safe
+from mgraph_ai_service_llms.platforms.open_router.schemas.models.Schema__Open_Router__Model            import Schema__Open_Router__Model
+from mgraph_ai_service_llms.platforms.open_router.schemas.models.Schema__Open_Router__Models__Response import Schema__Open_Router__Models__Response
+
+MODELS_SNAPSHOT__FORMAT        = 1                                                  # bump when the snapshot layout (not the schema) changes
+MODELS_SNAPSHOT__PRICE_FIELDS  = ['prompt', 'completion', 'request', 'image', 'audio', 'web_search', 'internal_reasoning', 'input_cache_read', 'input_cache_write']
+MODELS_SNAPSHOT__NOT_INTERNED  = ['description']                                    # (unique per model, nothing to share)
+
+
+@lru_cache
+def models_snapshot__schema_checksum(schema: type = Schema__Open_Router__Model) -> str:     # changes when any (nested) Schema__Open_Router__Model field or type changes, so old snapshots are not trusted
+    lines = [f'format:{MODELS_SNAPSHOT__FORMAT}']
+    seen  = set()
+    def walk(cls):
+        if cls in seen:
+            return
+        seen.add(cls)
+        for base in reversed(cls.__mro__):
+            for name, annotation in getattr(base, '__annotations__', {}).items():
+                lines.append(f'{cls.__name__}.{name}:{getattr(annotation, "__name__", repr(annotation))}')
+                for nested in [annotation, *getattr(annotation, '__args__', ())]:
+                    if isinstance(nested, type) and issubclass(nested, Type_Safe):
+                        walk(nested)
+    walk(schema)
+    return hashlib.sha256('\n'.join(lines).encode()).hexdigest()[:16]
+
+
+def models_snapshot__intern(data: Any, key: str = None) -> Any:                     # interns (in place) the strings of a model's json, so that ids, modalities, tokenizers, parameters and prices are stored once per process
+    if isinstance(data, dict):
+        for name, value in data.items():
+            data[name] = models_snapshot__intern(value, name)
+    elif isinstance(data, list):
+        data[:] = [models_snapshot__intern(value, key) for value in data]
+    elif isinstance(data, str) and key not in MODELS_SNAPSHOT__NOT_INTERNED:
+        return sys.intern(data)
+    return data
+
+
+class Open_Router__Model__Record__Pricing:                                          # prices as plain floats (None when not priced), same attribute names as Schema__Open_Router__Model__Pricing
+    __slots__ = MODELS_SNAPSHOT__PRICE_FIELDS
+
+    def __init__(self, pricing: Dict[str, str]):
+        for field in MODELS_SNAPSHOT__PRICE_FIELDS:
+            value = pricing.get(field)
+            setattr(self, field, float(value) if value is not None else None)
+
+
+class Open_Router__Model__Record__Architecture:
+    __slots__ = ('modality', 'tokenizer')
+
+    def __init__(self, architecture: Dict[str, Any]):
+        self.modality  = architecture.get('modality' ) or ''
+        self.tokenizer = architecture.get('tokenizer') or ''
+
+
+class Open_Router__Model__Record:                                                   # One catalogue entry loaded without Type_Safe validation (from a snapshot this service wrote), with the attributes the cost table, cost engine and index read
+    __slots__ = ('id', 'name', 'context_length', 'architecture', 'pricing', 'supported_parameters', 'data', 'model')
+
+    def __init__(self, data: Dict[str, Any], shared: Dict[tuple, Any] = None):     # shared: the pricing and architecture records already built (identical ones are stored once)
+        shared                    = {} if shared is None else shared
+        pricing                   = data.get('pricing'     ) or {}
+        architecture              = data.get('architecture') or {}
+        pricing_key               = ('pricing'     , *[pricing.get(field) for field in MODELS_SNAPSHOT__PRICE_FIELDS])
+        architecture_key          = ('architecture', architecture.get('modality'), architecture.get('tokenizer'))
+        self.data                 = models_snapshot__intern(data)                   # model.json() (as it was when validated)
+        self.id                   = data.get('id'  ) or ''
+        self.name                 = data.get('name') or ''
+        self.context_length       = data.get('context_length') or 0
+        self.architecture         = shared.get(architecture_key) or shared.setdefault(architecture_key, Open_Router__Model__Record__Architecture(architecture))
+        self.pricing              = shared.get(pricing_key     ) or shared.setdefault(pricing_key     , Open_Router__Model__Record__Pricing     (pricing     ))
+        self.supported_parameters = data.get('supported_parameters') or []
+        self.model                = None                                            # the Type_Safe model (built on first use)
+
+    def json(self) -> Dict[str, Any]:
+        return self.data
+
+    def api_model(self) -> Schema__Open_Router__Model:                             # (only this model is validated, not the whole catalogue)
+        if self.model is None:
+            self.model = Schema__Open_Router__Model.from_json(self.data)
+        return self.model
+
+
+class Open_Router__Models__Snapshot(Type_Safe):                                     # The catalogue as records (fast to load), with the Type_Safe models only built when something asks for them
+    schema  : str                                                                   # models_snapshot__schema_checksum() when it was written
+    records : list                                                                  # Open_Router__Model__Record (catalogue order)
+    models  : list = None                                                           # the Type_Safe models (built on first use)
+
+    @classmethod
+    def from_models(cls, models: list) -> 'Open_Router__Models__Snapshot':          # from validated models (so the snapshot can be trusted later)
+        snapshot         = cls(schema=models_snapshot__schema_checksum())
+        shared           = {}
+        snapshot.records = [Open_Router__Model__Record(model.json(), shared) for model in models]
+        snapshot.models  = models
+        for record, model in zip(snapshot.records, models):
+            record.model = model
+        return snapshot
+
+    @classmethod
+    def from_json(cls, json_data: Optional[Dict[str, Any]]) -> Optional['Open_Router__Models__Snapshot']:     # trusted load (no per field validation), None if it was written for another schema
+        if not json_data or json_data.get('schema') != models_snapshot__schema_checksum():
+            return None
+        snapshot         = cls(schema=json_data['schema'])
+        shared           = {}
+        snapshot.records = [Open_Router__Model__Record(data, shared) for data in json_data.get('data') or []]
+        return snapshot
+
+    def json(self) -> Dict[str, Any]:
+        return dict(schema = self.schema                                  ,
+                    data   = [record.data for record in self.records]     )
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def api_models(self) -> List[Schema__Open_Router__Model]:                      # (the validated path, once per snapshot)
+        if self.models is None:
+            models = Schema__Open_Router__Models__Response.from_json(dict(data=[record.data for record in self.records])).data
+            for position, record in enumerate(self.records):
+                if record.model is None:
+                    record.model = models[position]
+                else:
+                    models[position] = record.model                                 # (same object as the one get_model_by_id returned)
+            self.models = models
+        return self.models
+
+    def records_by_id(self) -> Dict[str, Open_Router__Model__Record]:
+        return { record.id: record for record in self.records }
@@ -3,6 +3,7 @@ from memory_fs.file_fs.File_FS
 from osbot_utils.type_safe.Type_Safe                                             import Type_Safe
 from osbot_utils.type_safe.primitives.safe_int.Timestamp_Now                     import Timestamp_Now
 from mgraph_ai_service_llms.platforms.open_router.cache.Open_Router__Cache       import Open_Router__Cache
+from mgraph_ai_service_llms.service.metrics.LLM__Metrics                         import llm__metrics
 
 FILE_ID__OPEN_ROUTER__PROVIDERS = "openrouter-providers"
 
@@ -31,7 +32,9 @@ class Open_Router__Providers__Cache(Type_Safe):
     def get_cached_providers(self) -> dict:                                      # Retrieve cached providers data
         with self.cache.fs__latest_temporal.file__json(FILE_ID__OPEN_ROUTER__PROVIDERS) as _:
             if _.exists():
+                llm__metrics.cache_lookup('providers', hit=True)
                 return _.content()
+            llm__metrics.cache_lookup('providers', hit=False)
             return None
 
     def is_cache_valid(self) -> bool:                                            # Check if cache is valid based on TTL
@@ -0,0 +1,102 @@
+from decimal                                                                                         import Decimal, ROUND_HALF_EVEN
+from typing                                                                                          import Dict, Any, Optional
+from osbot_utils.type_safe.Type_Safe                                                                 import Type_Safe
+from osbot_utils.type_safe.primitives.safe_float.Safe_Float                                          import Safe_Float
+from mgraph_ai_service_llms.platforms.open_router.schemas.Safe_Str__Open_Router__Model_ID            import Safe_Str__Open_Router__Model_ID
+from mgraph_ai_service_llms.platforms.open_router.schemas.cost.Schema__Open_Router__Cost_Breakdown   import Schema__Open_Router__Cost_Breakdown
+from mgraph_ai_service_llms.platforms.open_router.schemas.models.Schema__Open_Router__Model__Pricing import Schema__Open_Router__Model__Pricing
+
+COST_ENGINE__PRICE_SCALE = 10 ** 12                                                 # prices are stored as integer pico-dollars (catalogue prices go down to ~1e-11)
+COST_ENGINE__PER_TOKEN   = 1_000_000                                                # token prices are divided by this (same as Service__Open_Router__Cost._calculate_token_cost)
+COST_ENGINE__COST_SCALE  = COST_ENGINE__PRICE_SCALE * COST_ENGINE__PER_TOKEN        # token costs are integer multiples of 1e-18 USD (exact, no rounding until the response)
+
+COST_ENGINE__PRICE_FIELDS = ['prompt', 'completion', 'request', 'image', 'audio', 'web_search', 'internal_reasoning', 'input_cache_read', 'input_cache_write']
+COST_ENGINE__TOKEN_COSTS  = { 'cache_read_cost' : ('prompt_cache_hit_tokens'  , 'input_cache_read'  ),  # breakdown field -> (usage key, price field), only set when used
+                              'cache_write_cost': ('prompt_cache_write_tokens', 'input_cache_write' ),
+                              'reasoning_cost'  : ('reasoning_tokens'         , 'internal_reasoning')}
+COST_ENGINE__CACHE_TOKENS = ['prompt_cache_hit_tokens', 'prompt_cache_write_tokens']                      # prompt tokens read from / written to the provider's prompt cache (not in prompt_tokens)
+COST_ENGINE__LEGACY_WRITE = 'prompt_cache_miss_tokens'                                                    # the usage key the cache writes were priced from before prompt_cache_write_tokens
+COST_ENGINE__UNIT_COSTS   = { 'image_cost'      : ('images'                  , 'image'             ),   # priced per unit (not per token)
+                              'audio_cost'      : ('audio_seconds'           , 'audio'             ),
+                              'web_search_cost' : ('web_searches'            , 'web_search'        )}
+
+
+class Open_Router__Cost__Engine(Type_Safe):                                         # Prices parsed once per catalogue into integers, so that each response is costed with integer maths
+    prices : dict                                                                   # model id -> dict(price field -> integer pico-dollars)
+
+    def load_models(self, models: list) -> 'Open_Router__Cost__Engine':
+        prices = {}
+        for model in models:
+            if model.pricing:
+                prices[str(model.id)] = self.pricing_units(model.pricing)
+        self.prices = prices                                                        # swapped in one go (requests in flight keep the previous prices)
+        return self
+
+    def pricing_units(self, pricing: Schema__Open_Router__Model__Pricing) -> Dict[str, int]:
+        return { field: self.price_units(getattr(pricing, field)) for field in COST_ENGINE__PRICE_FIELDS }
+
+    def price_units(self, price: Any) -> int:                                       # (the only place where Decimal is used)
+        if not price:
+            return 0
+        return int((Decimal(str(price)) * COST_ENGINE__PRICE_SCALE).to_integral_value(rounding=ROUND_HALF_EVEN))
+
+    def model_prices(self, model_id: str) -> Optional[Dict[str, int]]:
+        return self.prices.get(str(model_id))
+
+    def cost_usage(self, usage: Dict[str, Any]) -> Dict[str, Any]:                 # OpenRouter usage (cached tokens are part of prompt_tokens, see prompt_tokens_details) -> the usage costed here (cache reads and writes apart from prompt_tokens)
+        if COST_ENGINE__LEGACY_WRITE in usage and 'prompt_cache_write_tokens' not in usage:
+            usage = dict(usage, prompt_cache_write_tokens=usage[COST_ENGINE__LEGACY_WRITE])
+        details = usage.get('prompt_tokens_details') or {}
+        cached  = int(details.get('cached_tokens'     ) or 0)
+        written = int(details.get('cache_write_tokens') or 0)
+        if not (cached or written) or any(key in usage for key in COST_ENGINE__CACHE_TOKENS):
+            return usage
+        return dict(usage, prompt_tokens             = max(usage.get('prompt_tokens', 0) - cached - written, 0),
+                           prompt_cache_hit_tokens   = cached                                                  ,
+                           prompt_cache_write_tokens = written                                                 )
+
+    def cost_units(self, prices: Dict[str, int], usage: Dict[str, int]) -> Dict[str, int]:     # breakdown field -> cost (in 1e-18 USD)
+        costs = dict(prompt_cost     = usage.get('prompt_tokens'    , 0) * prices['prompt'    ],
+                     completion_cost = usage.get('completion_tokens', 0) * prices['completion'])
+        for field, (usage_key, price_field) in COST_ENGINE__TOKEN_COSTS.items():
+            count = usage.get(usage_key, 0)
+            if count > 0 and prices[price_field]:
+                costs[field] = count * prices[price_field]
+            elif count > 0 and usage_key in COST_ENGINE__CACHE_TOKENS:
+                costs['prompt_cost'] += count * prices['prompt']                    # (no cache price in the catalogue: charged as prompt tokens)
+        for field, (usage_key, price_field) in COST_ENGINE__UNIT_COSTS.items():
+            count = usage.get(usage_key, 0)
+            if count > 0 and prices[price_field]:
+                costs[field] = count * prices[price_field] * COST_ENGINE__PER_TOKEN           # (scaled to the token costs' unit)
+        if prices['request']:
+            costs['request_cost'] = prices['request'] * COST_ENGINE__PER_TOKEN
+        return costs
+
+    def to_usd(self, units: int) -> Safe_Float:
+        return Safe_Float(units / COST_ENGINE__COST_SCALE)                          # int / int is correctly rounded
+
+    def breakdown(self, prices   : Dict[str, int]                  ,
+                        usage    : Dict[str, int]                  ,
+                        model_id : Safe_Str__Open_Router__Model_ID ,
+                        provider : Optional[str] = None
+                  ) -> Schema__Open_Router__Cost_Breakdown:                         # same values as the Safe_Float maths it replaces (converted only here, at the response boundary)
+        total_tokens      = usage.get("total_tokens"     , usage.get("prompt_tokens", 0) + usage.get("completion_tokens", 0))
+        usage             = self.cost_usage(usage)
+        prompt_tokens     = usage.get("prompt_tokens"    , 0)
+        completion_tokens = usage.get("completion_tokens", 0)
+        costs             = self.cost_units(prices, usage)
+        total_units       = sum(costs.values())
+        if total_tokens > 0:
+            cost_per_1k = Safe_Float(total_units * 1000 / (total_tokens * COST_ENGINE__COST_SCALE))
+        else:
+            cost_per_1k = Safe_Float(0)
+        return Schema__Open_Router__Cost_Breakdown(prompt_tokens      = prompt_tokens                                  ,
+                                                   completion_tokens  = completion_tokens                              ,
+                                                   total_tokens       = total_tokens                                   ,
+                                                   cached_tokens      = usage.get('prompt_cache_hit_tokens' , 0)       ,
+                                                   cache_write_tokens = usage.get('prompt_cache_write_tokens', 0)      ,
+                                                   total_cost         = self.to_usd(total_units)                       ,
+                                                   cost_per_1k_tokens = cost_per_1k                                    ,
+                                                   model_id           = Safe_Str__Open_Router__Model_ID(model_id)      ,
+                                                   provider           = provider                                       ,
+                                                   **{ field: self.to_usd(units) for field, units in costs.items() }  )
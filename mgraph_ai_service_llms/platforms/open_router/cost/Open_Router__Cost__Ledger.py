@@ -0,0 +1,317 @@
+import copy
+import json
+import threading
+import time
+import uuid
+from collections                                                                                 import deque
+from datetime                                                                                    import datetime, timezone
+from typing                                                                                      import Dict, Any, Optional
+from osbot_utils.type_safe.Type_Safe                                                             import Type_Safe
+from osbot_utils.utils.Env                                                                       import get_env
+from mgraph_ai_service_llms.platforms.open_router.schemas.cost.Schema__Open_Router__Cost__Budget import Schema__Open_Router__Cost__Budget
+from mgraph_ai_service_llms.service.cache.LLM__Cache                                             import LLM__Cache
+
+ENV_NAME_OPEN_ROUTER__COST_BUDGETS         = "OPEN_ROUTER__COST_BUDGETS"            # JSON: {"global": {"daily_usd": 50}, "tenant:*": {"daily_usd": 5}, "tenant:key-1a2b3c": {"daily_usd": 20}}
+ENV_NAME_OPEN_ROUTER__COST_LEDGER__PERSIST = "OPEN_ROUTER__COST_LEDGER__PERSIST"    # set to 'false' to keep the ledger in memory only
+
+COST_BUDGET__GLOBAL          = 'global'
+COST_BUDGET__TENANT_DEFAULT  = 'tenant:*'                                           # applies to every tenant without its own budget
+COST_LEDGER__ALL_TENANTS     = '*'
+COST_LEDGER__FOLDER          = 'cost_ledger'
+COST_LEDGER__FIELDS          = ['timestamp', 'model', 'provider', 'route', 'tenant', 'prompt_tokens', 'completion_tokens', 'cost', 'cache_hit', 'cost_avoided']    # one (compact) row per priced call or cache hit
+COST_LEDGER__FLUSH_INTERVAL  = 60.0                                                 # seconds between the writes of the pending rows (and this worker's rollups)
+COST_LEDGER__HOURS_KEPT      = 48                                                   # hourly rollups kept in memory
+COST_LEDGER__RECENT_ROWS     = 1000                                                 # rows kept in memory (for the API)
+
+
+class Open_Router__Cost__Budget_Exceeded(Exception):                                # the request would go over a budget (nothing was sent upstream)
+    pass
+
+
+class Open_Router__Cost__Reservation(Type_Safe):                                    # Estimated cost held against the budgets while the request is in flight
+    ledger         : object = None
+    tenant         : str
+    estimated_cost : float
+    released       : bool
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.release()
+        return False
+
+    def release(self) -> None:                                                      # (the actual cost is added by ledger.record)
+        if not self.released:
+            self.released = True
+            self.ledger.release(self)
+
+
+class Open_Router__Cost__Ledger(Type_Safe):                                         # Append-only record of every priced call, hourly rollups (by model, provider, route and tenant) and daily budgets
+    budgets        : dict                                                           # 'global', 'tenant:*' or 'tenant:{id}' -> Schema__Open_Router__Cost__Budget
+    hourly         : dict                                                           # 'YYYY-MM-DD-HH' -> rollup (this worker)
+    spend          : dict                                                           # (day, tenant) -> cost of this worker (tenant '*' is the total)
+    spend_others   : dict                                                           # (day, tenant) -> cost of the other workers (read from the stored rollups)
+    reserved       : dict                                                           # tenant -> estimated cost of the requests in flight
+    pending        : list                                                           # rows not written yet
+    recent         : object = None                                                  # deque with the last rows
+    counters       : dict
+    persist        : bool   = True
+    llm_cache      : LLM__Cache = None                                              # where the rows and rollups are written (created on the first flush)
+    worker_id      : str    = None
+    flush_interval : float  = COST_LEDGER__FLUSH_INTERVAL
+    next_flush     : float  = 0.0
+    sequence       : int                                                            # (part of the file names of the rows)
+    lock           : object = None
+    flush_lock     : object = None
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.lock       = threading.RLock()
+        self.flush_lock = threading.RLock()
+        self.recent     = deque(maxlen=COST_LEDGER__RECENT_ROWS)
+        self.worker_id  = self.worker_id or uuid.uuid4().hex[:8]                  # (workers might share a pid, e.g. in different containers)
+        self.next_flush = time.monotonic() + self.flush_interval
+        if (get_env(ENV_NAME_OPEN_ROUTER__COST_LEDGER__PERSIST) or '').lower() == 'false':
+            self.persist = False
+        self.load_budgets_from_env()
+
+    def load_budgets_from_env(self) -> None:
+        try:
+            budgets = json.loads(get_env(ENV_NAME_OPEN_ROUTER__COST_BUDGETS) or '{}')
+        except ValueError:
+            return                                                                  # invalid config is ignored (no budgets)
+        for key, budget in budgets.items():
+            self.set_budget(key, **budget)
+
+    def set_budget(self, key: str, daily_usd: float = 0.0) -> Schema__Open_Router__Cost__Budget:   # e.g. 'global' or 'tenant:key-1a2b3c'
+        budget = Schema__Open_Router__Cost__Budget(daily_usd=float(daily_usd))
+        with self.lock:
+            self.budgets[key] = budget
+        return budget
+
+    def budget__for_tenant(self, tenant: str) -> Optional[Schema__Open_Router__Cost__Budget]:
+        return self.budgets.get(f'tenant:{tenant}') or self.budgets.get(COST_BUDGET__TENANT_DEFAULT)
+
+    def hour(self, timestamp: float) -> str:                                        # 'YYYY-MM-DD-HH' (UTC)
+        return datetime.fromtimestamp(timestamp, timezone.utc).strftime('%Y-%m-%d-%H')
+
+    def day(self, timestamp: Optional[float] = None) -> str:
+        return self.hour(time.time() if timestamp is None else timestamp)[:10]
+
+    # budgets
+
+    def spent(self, day: str, tenant: str = COST_LEDGER__ALL_TENANTS) -> float:     # all workers (the others as of their last flush)
+        return self.spend.get((day, tenant), 0.0) + self.spend_others.get((day, tenant), 0.0)
+
+    def reserve(self, tenant: str, estimated_cost: Optional[float] = None, now: Optional[float] = None) -> Open_Router__Cost__Reservation:
+        estimated_cost = float(estimated_cost or 0.0)                               # unknown pricing: only the spend so far is checked
+        day            = self.day(now)
+        checks         = [(COST_BUDGET__GLOBAL, COST_LEDGER__ALL_TENANTS, self.budgets.get(COST_BUDGET__GLOBAL)),
+                          (f'tenant:{tenant}' , tenant                  , self.budget__for_tenant(tenant)      )]
+        self.flush__if_due()
+        with self.lock:
+            for name, scope, budget in checks:
+                if budget and budget.daily_usd:
+                    committed = self.spent(day, scope) + self.reserved.get(scope, 0.0)
+                    if committed + estimated_cost > budget.daily_usd:
+                        self.counters['rejected'] = self.counters.get('rejected', 0) + 1
+                        raise Open_Router__Cost__Budget_Exceeded(f"Daily budget of ${budget.daily_usd} for '{name}' would be exceeded "
+                                                                 f"(spent or in flight: ${committed:.6f}, this request: up to ${estimated_cost:.6f})")
+            for scope in (COST_LEDGER__ALL_TENANTS, tenant):
+                self.reserved[scope] = self.reserved.get(scope, 0.0) + estimated_cost
+        return Open_Router__Cost__Reservation(ledger=self, tenant=tenant, estimated_cost=estimated_cost)
+
+    def release(self, reservation: Open_Router__Cost__Reservation) -> None:
+        with self.lock:
+            for scope in (COST_LEDGER__ALL_TENANTS, reservation.tenant):
+                self.reserved[scope] = max(0.0, self.reserved.get(scope, 0.0) - reservation.estimated_cost)
+
+    # ledger
+
+    def record(self, model             : str                     ,                  # one priced upstream call
+                     provider          : Optional[str  ] = None  ,
+                     route             : str             = ''    ,
+                     tenant            : str             = ''    ,
+                     prompt_tokens     : int             = 0     ,
+                     completion_tokens : int             = 0     ,
+                     cost              : float           = 0.0   ,
+                     cache_hit         : bool            = False ,
+                     cost_avoided      : float           = 0.0   ,                  # what the cached response cost when it was created
+                     now               : Optional[float] = None
+               ) -> list:
+        row = [round(time.time() if now is None else now, 3), model, provider or 'default', route or '', tenant or '',
+               int(prompt_tokens or 0), int(completion_tokens or 0), float(cost or 0.0), 1 if cache_hit else 0, float(cost_avoided or 0.0)]
+        with self.lock:
+            self.recent.append(row)
+            if self.persist:
+                self.pending.append(row)
+            hour   = self.hour(row[0])
+            rollup = self.hourly.get(hour)
+            if rollup is None:
+                rollup = self.hourly[hour] = self.rollup__empty(hour)
+                self.hourly__prune()
+            self.rollup__add(rollup, row)
+            for scope in (COST_LEDGER__ALL_TENANTS, row[4]):
+                self.spend[(hour[:10], scope)] = self.spend.get((hour[:10], scope), 0.0) + row[7]
+        self.flush__if_due()
+        return row
+
+    def record_cache_hit(self, model: str, provider: Optional[str] = None, route: str = '', tenant: str = '', cost_avoided: float = 0.0, now: Optional[float] = None) -> list:
+        return self.record(model=model, provider=provider, route=route, tenant=tenant, cache_hit=True, cost_avoided=cost_avoided, now=now)
+
+    def rollup__empty(self, hour: str) -> Dict[str, Any]:
+        return dict(hour              = hour ,
+                    requests          = 0    ,
+                    cache_hits        = 0    ,
+                    cost              = 0.0  ,
+                    cost_avoided      = 0.0  ,
+                    prompt_tokens     = 0    ,
+                    completion_tokens = 0    ,
+                    models            = {}   ,
+                    providers         = {}   ,
+                    routes            = {}   ,
+                    tenants           = {}   )
+
+    def rollup__add(self, rollup: Dict[str, Any], row: list) -> None:
+        _, model, provider, route, tenant, prompt_tokens, completion_tokens, cost, cache_hit, cost_avoided = row
+        for target in [rollup] + [rollup[group].setdefault(key, dict(requests=0, cache_hits=0, cost=0.0, cost_avoided=0.0))
+                                  for group, key in (('models', model), ('providers', provider), ('routes', route), ('tenants', tenant))]:
+            target['requests'    ] += 1 - cache_hit
+            target['cache_hits'  ] += cache_hit
+            target['cost'        ] += cost
+            target['cost_avoided'] += cost_avoided
+        rollup['prompt_tokens'    ] += prompt_tokens
+        rollup['completion_tokens'] += completion_tokens
+
+    def rollup__merge(self, target: Dict[str, Any], source: Dict[str, Any]) -> Dict[str, Any]:
+        for key in ('requests', 'cache_hits', 'cost', 'cost_avoided', 'prompt_tokens', 'completion_tokens'):
+            target[key] += source.get(key, 0)
+        for group in ('models', 'providers', 'routes', 'tenants'):
+            for name, values in source.get(group, {}).items():
+                item = target[group].setdefault(name, dict(requests=0, cache_hits=0, cost=0.0, cost_avoided=0.0))
+                for key, value in values.items():
+                    item[key] = item.get(key, 0) + value
+        return target
+
+    def hourly__prune(self) -> None:
+        for hour in sorted(self.hourly)[:-COST_LEDGER__HOURS_KEPT]:
+            del self.hourly[hour]
+        oldest_day = min(self.hourly)[:10]
+        for key in [key for key in self.spend if key[0] < oldest_day]:
+            del self.spend[key]
+
+    # storage (each worker appends its own row files and owns its hourly rollup files, so workers never overwrite each other)
+
+    def storage(self) -> LLM__Cache:
+        if self.llm_cache is None:
+            self.llm_cache = LLM__Cache().setup()
+        return self.llm_cache
+
+    def path_rows(self, hour: str, sequence: int) -> str:
+        return f'{COST_LEDGER__FOLDER}/rows/{hour[:10]}/{hour[11:]}/{self.worker_id}-{sequence:06d}.json'
+
+    def path_hourly(self, hour: str, worker_id: Optional[str] = None) -> str:
+        return f'{COST_LEDGER__FOLDER}/hourly/{hour[:10]}/{hour[11:]}--{worker_id or self.worker_id}.json'
+
+    def flush__if_due(self) -> None:                                                # writes happen on a background thread (never on the request path)
+        if self.persist and time.monotonic() >= self.next_flush:
+            self.next_flush = time.monotonic() + self.flush_interval
+            threading.Thread(target=self.flush, daemon=True).start()
+
+    def flush(self) -> bool:
+        if not self.persist or not self.flush_lock.acquire(blocking=False):         # another thread is already flushing
+            return False
+        try:
+            with self.lock:
+                rows, self.pending = self.pending, []
+                rollups            = { hour: copy.deepcopy(self.hourly[hour]) for hour in {self.hour(row[0]) for row in rows} if hour in self.hourly }
+            try:
+                storage = self.storage()
+                rows_by_hour = {}
+                for row in rows:
+                    rows_by_hour.setdefault(self.hour(row[0]), []).append(row)
+                for hour, hour_rows in rows_by_hour.items():
+                    self.sequence += 1
+                    storage.json__save(self.path_rows(hour, self.sequence), dict(fields=COST_LEDGER__FIELDS, rows=hour_rows))
+                for hour, rollup in rollups.items():
+                    storage.json__save(self.path_hourly(hour), rollup)
+                self.spend_others__refresh()
+                self.counters['flushes'] = self.counters.get('flushes', 0) + 1
+                return True
+            except Exception:
+                with self.lock:
+                    self.pending = rows + self.pending                             # try again on the next flush
+                    self.counters['flush_errors'] = self.counters.get('flush_errors', 0) + 1
+                return False
+        finally:
+            self.flush_lock.release()
+
+    def hourly__stored(self, day: str, exclude_worker: Optional[str] = None) -> Dict[str, Dict[str, Any]]:    # 'HH' -> rollup (all the workers, as of their last flush)
+        storage    = self.storage()
+        folder     = storage.get_s3_key(f'{COST_LEDGER__FOLDER}/hourly/{day}')
+        rollups    = {}
+        for file_name in storage.s3_db.s3_folder_files(folder=folder):
+            hour_of_day, _, worker_id = file_name[:-len('.json')].partition('--')
+            if worker_id == exclude_worker:
+                continue
+            rollup = storage.json__load(f'{COST_LEDGER__FOLDER}/hourly/{day}/{file_name}')
+            if rollup:
+                hour = f'{day}-{hour_of_day}'
+                self.rollup__merge(rollups.setdefault(hour, self.rollup__empty(hour)), rollup)
+        return rollups
+
+    def spend_others__refresh(self) -> None:                                        # today's spend of the other workers (so that the budgets apply to the whole service)
+        day          = self.day()
+        spend_others = {}
+        for rollup in self.hourly__stored(day, exclude_worker=self.worker_id).values():
+            spend_others[(day, COST_LEDGER__ALL_TENANTS)] = spend_others.get((day, COST_LEDGER__ALL_TENANTS), 0.0) + rollup.get('cost', 0.0)
+            for tenant, values in rollup.get('tenants', {}).items():
+                spend_others[(day, tenant)] = spend_others.get((day, tenant), 0.0) + values.get('cost', 0.0)
+        with self.lock:
+            self.spend_others = spend_others
+
+    # reports
+
+    def daily(self, day: Optional[str] = None) -> Dict[str, Any]:                  # hourly rollups of one day (all workers when persisted, otherwise this one)
+        day = day or self.day()
+        if self.persist:
+            self.flush()
+            rollups = self.hourly__stored(day)
+        else:
+            with self.lock:
+                rollups = { hour: copy.deepcopy(rollup) for hour, rollup in self.hourly.items() if hour.startswith(day) }
+        totals = self.rollup__empty(day)
+        for rollup in rollups.values():
+            self.rollup__merge(totals, rollup)
+        del totals['hour']
+        return dict(day    = day                                             ,
+                    totals = totals                                          ,
+                    hours  = [rollups[hour] for hour in sorted(rollups)]     )
+
+    def rows(self, limit: int = 100) -> Dict[str, Any]:                             # the last rows recorded by this worker
+        with self.lock:
+            rows = list(self.recent)[-limit:] if limit > 0 else []
+        return dict(fields=COST_LEDGER__FIELDS, rows=rows)
+
+    def status(self) -> Dict[str, Any]:
+        day = self.day()
+        with self.lock:
+            budgets = {}
+            for key, budget in sorted(self.budgets.items()):
+                if key == COST_BUDGET__TENANT_DEFAULT:
+                    budgets[key] = dict(daily_usd=budget.daily_usd)                 # (for each tenant)
+                    continue
+                scope = COST_LEDGER__ALL_TENANTS if key == COST_BUDGET__GLOBAL else key[len('tenant:'):]
+                spent = self.spent(day, scope)
+                budgets[key] = dict(daily_usd = budget.daily_usd                                   ,
+                                    spent     = round(spent, 8)                                    ,
+                                    reserved  = round(self.reserved.get(scope, 0.0), 8)           ,
+                                    remaining = round(max(0.0, budget.daily_usd - spent), 8)      )
+            return dict(day       = day                                           ,
+                        spent     = round(self.spent(day), 8)                     ,
+                        budgets   = budgets                                       ,
+                        persist   = self.persist                                  ,
+                        worker_id = self.worker_id                                ,
+                        pending   = len(self.pending)                             ,
+                        counters  = dict(self.counters)                           )
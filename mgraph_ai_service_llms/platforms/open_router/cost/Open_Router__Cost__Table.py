@@ -0,0 +1,94 @@
+import heapq
+from array                                                                                import array
+from typing                                                                               import Dict, Any, List, Optional
+from osbot_utils.type_safe.Type_Safe                                                      import Type_Safe
+
+COST_TABLE__PRICE_FIELDS = ['prompt', 'completion', 'request', 'input_cache_read', 'input_cache_write', 'internal_reasoning']
+COST_TABLE__PER_TOKEN    = 1_000_000                                                # token prices are divided by this (same as Service__Open_Router__Cost._calculate_token_cost)
+
+
+class Open_Router__Cost__Table(Type_Safe):                                          # The catalogue's prices as columns (one array per price field), so that a usage profile is priced for every model in one pass
+    model_ids       : list
+    names           : list
+    context_lengths : list
+    capabilities    : list                                                          # frozenset of the supported parameters (per model)
+    columns         : dict                                                          # price field -> array('d') (one value per model, 0.0 when not priced)
+    by_capability   : dict                                                          # capability -> list of the model indexes (built on first use)
+
+    def load_models(self, models: list) -> 'Open_Router__Cost__Table':              # models without prompt/completion prices (and 'auto' routing, priced at -1) are skipped
+        columns = { field: array('d') for field in COST_TABLE__PRICE_FIELDS }
+        for model in models:
+            pricing = model.pricing
+            if not pricing or pricing.prompt is None or pricing.completion is None:
+                continue
+            prices = { field: float(getattr(pricing, field) or 0.0) for field in COST_TABLE__PRICE_FIELDS }
+            if prices['prompt'] < 0 or prices['completion'] < 0:
+                continue
+            for field, price in prices.items():
+                columns[field].append(price)
+            self.model_ids      .append(str(model.id))
+            self.names          .append(str(model.name))
+            self.context_lengths.append(int(model.context_length or 0))
+            self.capabilities   .append(frozenset(str(parameter) for parameter in model.supported_parameters))
+        self.columns = columns
+        self.by_capability.clear()
+        return self
+
+    def size(self) -> int:
+        return len(self.model_ids)
+
+    def indexes(self, capability: Optional[str] = None) -> List[int]:
+        if not capability:
+            return list(range(self.size()))
+        indexes = self.by_capability.get(capability)
+        if indexes is None:
+            indexes = self.by_capability[capability] = [index for index, capabilities in enumerate(self.capabilities) if capability in capabilities]
+        return indexes
+
+    def is_free(self, index: int) -> bool:
+        return self.columns['prompt'][index] == 0 and self.columns['completion'][index] == 0
+
+    def totals(self, prompt_tokens     : int = 0 ,                                  # total cost (USD) of one request with this usage profile, for every model
+                     completion_tokens : int = 0 ,
+                     cached_tokens     : int = 0 ,                                  # prompt tokens read from the provider's cache
+                     cache_write_tokens: int = 0 ,
+                     reasoning_tokens  : int = 0
+               ) -> List[float]:
+        weights = [(column, tokens / COST_TABLE__PER_TOKEN) for column, tokens in ((self.columns['prompt'            ], prompt_tokens     ),
+                                                                                  (self.columns['completion'        ], completion_tokens ),
+                                                                                  (self.columns['input_cache_read'  ], cached_tokens     ),
+                                                                                  (self.columns['input_cache_write' ], cache_write_tokens),
+                                                                                  (self.columns['internal_reasoning'], reasoning_tokens  ))
+                                                                if tokens]
+        totals = list(self.columns['request'])                                      # flat price per request
+        for column, weight in weights:
+            totals = [total + price * weight for total, price in zip(totals, column)]
+        return totals
+
+    def rank(self, prompt_tokens      : int           = 1000  ,                     # the cheapest models for a usage profile
+                   completion_tokens  : int           = 500   ,
+                   cached_tokens      : int           = 0     ,
+                   cache_write_tokens : int           = 0     ,
+                   reasoning_tokens   : int           = 0     ,
+                   capability         : Optional[str] = None  ,                     # e.g. 'tools' or 'response_format'
+                   include_free       : bool          = True  ,
+                   min_context_length : int           = 0     ,
+                   limit              : int           = 10
+             ) -> List[Dict[str, Any]]:
+        totals     = self.totals(prompt_tokens, completion_tokens, cached_tokens, cache_write_tokens, reasoning_tokens)
+        candidates = [index for index in self.indexes(capability)
+                            if (include_free or not self.is_free(index)) and self.context_lengths[index] >= min_context_length]
+        cheapest   = heapq.nsmallest(max(limit, 0), candidates, key=lambda index: (totals[index], self.model_ids[index]))
+        return [dict(model_id          = self.model_ids      [index]                             ,
+                     name              = self.names          [index]                             ,
+                     total_cost        = totals              [index]                             ,
+                     prompt_price      = self.columns['prompt'    ][index]                       ,
+                     completion_price  = self.columns['completion'][index]                       ,
+                     context_length    = self.context_lengths[index]                             ,
+                     is_free           = self.is_free(index)                                     )
+                for index in cheapest]
+
+    def compare(self, model_ids: List[str], **usage) -> Dict[str, float]:           # total cost per model (models without prices are left out)
+        totals    = self.totals(**usage)
+        positions = { model_id: index for index, model_id in enumerate(self.model_ids) }
+        return { model_id: totals[positions[model_id]] for model_id in model_ids if model_id in positions }
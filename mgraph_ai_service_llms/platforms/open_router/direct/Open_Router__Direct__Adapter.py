@@ -0,0 +1,47 @@
+from typing                                                                                         import Dict, Any, Optional
+from osbot_utils.type_safe.Type_Safe                                                                import Type_Safe
+from osbot_utils.utils.Env                                                                          import get_env
+from mgraph_ai_service_llms.platforms.open_router.schemas.request.Schema__Open_Router__Chat_Request import Schema__Open_Router__Chat_Request
+
+DIRECT__OPEN_ROUTER_ONLY_FIELDS = ['provider', 'transforms', 'models', 'route',     # request fields that only OpenRouter understands
+                                   'min_p', 'top_a', 'top_k', 'repetition_penalty']
+
+
+class Open_Router__Direct__Adapter(Type_Safe):                                      # Sends a request (for a pinned provider) straight to the provider's OpenAI compatible endpoint
+    provider      : str                                                             # OpenRouter provider id (the value used in Schema__Open_Router__Providers)
+    provider_name : str                                                             # name OpenRouter returns in the 'provider' field of its responses
+    api_url       : str
+    api_key_name  : str
+    model_ids     : Dict[str, str]                                                  # OpenRouter model id -> provider model id (only these models go direct)
+
+    def api_key(self) -> Optional[str]:
+        return get_env(self.api_key_name)
+
+    def enabled(self) -> bool:
+        return bool(self.api_url and self.api_key())
+
+    def supports(self, model: str) -> bool:
+        return str(model) in self.model_ids
+
+    def headers(self) -> Dict[str, str]:
+        return { "Authorization" : f"Bearer {self.api_key()}",
+                 "Content-Type"  : "application/json"        }
+
+    def payload(self, request: Schema__Open_Router__Chat_Request) -> Dict[str, Any]:    # the OpenRouter request, in the provider's terms
+        payload          = request.to_api_dict()
+        payload['model'] = self.model_ids[str(request.model)]
+        for field in DIRECT__OPEN_ROUTER_ONLY_FIELDS:
+            payload.pop(field, None)
+        return payload
+
+    def normalise(self, response_data: Dict[str, Any], model: str) -> Dict[str, Any]:   # same shape as an OpenRouter response (so cost, stats and cache don't change)
+        response_data['model'   ] = str(model)
+        response_data['provider'] = self.provider_name
+        response_data['direct'  ] = True
+        usage = response_data.get('usage') or {}
+        response_data['usage'   ] = dict(prompt_tokens     = usage.get('prompt_tokens'    , 0),
+                                         completion_tokens = usage.get('completion_tokens', 0),
+                                         total_tokens      = usage.get('total_tokens'     , 0))
+        if usage.get('prompt_tokens_details'):
+            response_data['usage']['prompt_tokens_details'] = usage['prompt_tokens_details']    # (cached tokens, for the cost breakdown)
+        return response_data
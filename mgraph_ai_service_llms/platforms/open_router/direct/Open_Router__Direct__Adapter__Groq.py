@@ -0,0 +1,22 @@
+from mgraph_ai_service_llms.platforms.open_router.direct.Open_Router__Direct__Adapter         import Open_Router__Direct__Adapter
+from mgraph_ai_service_llms.service.llms.providers.groq.API__LLM__Groq                        import ENV_NAME_GROQ__API_KEY, GROQ__API_URL
+from mgraph_ai_service_llms.service.llms.providers.open_router.Schema__Open_Router__Providers import Schema__Open_Router__Providers
+
+GROQ__MODEL_IDS = { "openai/gpt-oss-120b"               : "openai/gpt-oss-120b"          ,   # paid OpenRouter models only (':free' ones are cheaper through OpenRouter)
+                    "openai/gpt-oss-20b"                : "openai/gpt-oss-20b"           ,
+                    "moonshotai/kimi-k2"                : "moonshotai/kimi-k2-instruct"  ,
+                    "qwen/qwen3-32b"                    : "qwen/qwen3-32b"               ,
+                    "meta-llama/llama-3.3-70b-instruct" : "llama-3.3-70b-versatile"      ,
+                    "meta-llama/llama-3.1-8b-instruct"  : "llama-3.1-8b-instant"         }
+
+
+class Open_Router__Direct__Adapter__Groq(Open_Router__Direct__Adapter):             # Groq's OpenAI compatible endpoint
+    provider      : str = Schema__Open_Router__Providers.GROQ.value
+    provider_name : str = "Groq"
+    api_url       : str = GROQ__API_URL
+    api_key_name  : str = ENV_NAME_GROQ__API_KEY
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        if not self.model_ids:
+            self.model_ids = dict(GROQ__MODEL_IDS)
@@ -0,0 +1,36 @@
+from typing                                                                                  import Dict, Any, Optional
+from osbot_utils.type_safe.Type_Safe                                                         import Type_Safe
+from osbot_utils.utils.Env                                                                   import get_env
+from mgraph_ai_service_llms.platforms.open_router.direct.Open_Router__Direct__Adapter        import Open_Router__Direct__Adapter
+from mgraph_ai_service_llms.platforms.open_router.direct.Open_Router__Direct__Adapter__Groq  import Open_Router__Direct__Adapter__Groq
+
+ENV_NAME_OPEN_ROUTER__DIRECT_PROVIDERS = "OPEN_ROUTER__DIRECT_PROVIDERS"            # comma separated providers that skip OpenRouter when pinned (e.g. "groq")
+
+
+class Open_Router__Direct__Adapters(Type_Safe):                                     # The direct (OpenRouter bypass) adapters, per provider
+    adapters : Dict[str, Open_Router__Direct__Adapter]
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        if not self.adapters:
+            for adapter in [Open_Router__Direct__Adapter__Groq()]:
+                self.adapters[adapter.provider] = adapter
+
+    def direct_providers(self):                                                     # opt in, so that pinning a provider doesn't silently change the billing account
+        return [provider.strip().lower() for provider in (get_env(ENV_NAME_OPEN_ROUTER__DIRECT_PROVIDERS) or '').split(',') if provider.strip()]
+
+    def adapter(self, model: str, provider: Optional[str]) -> Optional[Open_Router__Direct__Adapter]:  # adapter to use for this request (None means: go through OpenRouter)
+        if not provider or provider not in self.direct_providers():
+            return None
+        adapter = self.adapters.get(provider)
+        if adapter and adapter.enabled() and adapter.supports(model):
+            return adapter
+        return None
+
+    def status(self) -> Dict[str, Any]:
+        direct_providers = self.direct_providers()
+        return { provider: dict(opted_in = provider in direct_providers ,
+                                enabled  = adapter.enabled()            ,
+                                api_url  = adapter.api_url              ,
+                                models   = sorted(adapter.model_ids)    )
+                 for provider, adapter in sorted(self.adapters.items()) }
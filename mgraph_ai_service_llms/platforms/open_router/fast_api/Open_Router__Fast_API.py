@@ -1,9 +1,11 @@
-from osbot_fast_api.api.Fast_API                                                        import Fast_API
-from mgraph_ai_service_llms.platforms.open_router.fast_api.routes.Routes__API_Data      import Routes__API_Data
-from mgraph_ai_service_llms.platforms.open_router.fast_api.routes.Routes__LLM__Simple   import Routes__LLM__Simple
-from mgraph_ai_service_llms.platforms.open_router.fast_api.routes.Routes__Open_Router   import Routes__Open_Router
-from mgraph_ai_service_llms.platforms.open_router.fast_api.routes.Routes__Text_Analysis import Routes__Text_Analysis
-from mgraph_ai_service_llms.utils.Version                                               import version__mgraph_ai_service_llms
+from osbot_fast_api.api.Fast_API                                                                                import Fast_API
+from mgraph_ai_service_llms.platforms.open_router.fast_api.middlewares.Middleware__Open_Router__Request_Context import Middleware__Open_Router__Request_Context
+from mgraph_ai_service_llms.platforms.open_router.fast_api.routes.Routes__API_Data                              import Routes__API_Data
+from mgraph_ai_service_llms.platforms.open_router.fast_api.routes.Routes__Cost                                  import Routes__Cost
+from mgraph_ai_service_llms.platforms.open_router.fast_api.routes.Routes__LLM__Simple                           import Routes__LLM__Simple
+from mgraph_ai_service_llms.platforms.open_router.fast_api.routes.Routes__Open_Router                           import Routes__Open_Router
+from mgraph_ai_service_llms.platforms.open_router.fast_api.routes.Routes__Text_Analysis                         import Routes__Text_Analysis
+from mgraph_ai_service_llms.utils.Version                                                                       import version__mgraph_ai_service_llms
 
 FAST_API__TITLE__OPEN_ROUTER = 'Platform - Open Router'
 
@@ -13,8 +15,14 @@ class Open_Router__Fast_API(Fast_API):
     name           = FAST_API__TITLE__OPEN_ROUTER
     version        =  version__mgraph_ai_service_llms
 
+    def setup_middlewares(self):
+        super().setup_middlewares()
+        self.app().add_middleware(Middleware__Open_Router__Request_Context)                 # tenant and deadline used by the scheduler
+        return self
+
     def setup_routes(self):
         self.add_routes(Routes__API_Data     )
         self.add_routes(Routes__Open_Router  )
         self.add_routes(Routes__LLM__Simple  )
-        self.add_routes(Routes__Text_Analysis)
\ No newline at end of file
+        self.add_routes(Routes__Text_Analysis)
+        self.add_routes(Routes__Cost         )
\ No newline at end of file
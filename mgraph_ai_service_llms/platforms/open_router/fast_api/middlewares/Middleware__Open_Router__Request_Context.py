@@ -0,0 +1,20 @@
+from typing import TYPE_CHECKING
+from mgraph_ai_service_llms.platforms.open_router.limits.Open_Router__Request_Context import open_router__request_context, request_context__from_headers
+if TYPE_CHECKING:
+    from starlette.types import ASGIApp, Receive, Scope, Send
+
+
+class Middleware__Open_Router__Request_Context:                                     # Captures the tenant and deadline (from the headers) for the scheduler, and the route for the cost ledger
+    def __init__(self, app: 'ASGIApp'):
+        self.app = app
+
+    async def __call__(self, scope: 'Scope', receive: 'Receive', send: 'Send'):
+        if scope.get('type') != 'http':
+            await self.app(scope, receive, send)
+            return
+        headers = { name.decode('latin-1').lower(): value.decode('latin-1') for name, value in scope.get('headers', []) }
+        token   = open_router__request_context.set(request_context__from_headers(headers, route=scope.get('path', '')))    # copied into the thread pool that runs the (sync) routes
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            open_router__request_context.reset(token)
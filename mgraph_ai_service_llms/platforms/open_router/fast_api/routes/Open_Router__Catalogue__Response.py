@@ -0,0 +1,8 @@
+from fastapi                                                                            import Request, Response
+from mgraph_ai_service_llms.platforms.open_router.cache.Open_Router__Catalogue__Payload import Open_Router__Catalogue__Payload, CATALOGUE__CONTENT_TYPE
+
+
+def catalogue_response(request: Request, payload: Open_Router__Catalogue__Payload) -> Response:      # 304 when the client already has these bytes, else the pre-serialised body
+    if payload.not_modified(request.headers.get('if-none-match')):
+        return Response(status_code=304, headers=payload.headers())
+    return Response(content=payload.body, media_type=CATALOGUE__CONTENT_TYPE, headers=payload.headers())
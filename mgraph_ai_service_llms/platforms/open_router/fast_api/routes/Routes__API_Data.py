@@ -1,17 +1,42 @@
-from osbot_fast_api.api.routes.Fast_API__Routes                                         import Fast_API__Routes
-from osbot_fast_api.schemas.Safe_Str__Fast_API__Route__Tag                              import Safe_Str__Fast_API__Route__Tag
-from mgraph_ai_service_llms.platforms.open_router.service.Service__Open_Router__Models  import Service__Open_Router__Models
+from typing                                                                                        import Optional
+from fastapi                                                                                       import HTTPException, Request
+from osbot_fast_api.api.routes.Fast_API__Routes                                                    import Fast_API__Routes
+from osbot_fast_api.schemas.Safe_Str__Fast_API__Route__Tag                                         import Safe_Str__Fast_API__Route__Tag
+from mgraph_ai_service_llms.platforms.open_router.service.Service__Open_Router__Models             import Service__Open_Router__Models
+from mgraph_ai_service_llms.platforms.open_router.service.Open_Router__Services                    import open_router__services
+from mgraph_ai_service_llms.platforms.open_router.fast_api.routes.Open_Router__Catalogue__Response import catalogue_response
 
 
 class Routes__API_Data(Fast_API__Routes):
     tag        : Safe_Str__Fast_API__Route__Tag = 'api/data'
-    open_router: Service__Open_Router__Models
+    open_router: Service__Open_Router__Models    = None
 
-    def models(self):
-        return self.open_router.api__models()
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        if self.open_router is None:
+            self.open_router = open_router__services.shared(Service__Open_Router__Models)         # the same catalogue as the chat routes
 
-    def providers(self):
-        return self.open_router.api__providers()
+    def models(self, request             : Request                ,             # (ETag / If-None-Match: unchanged catalogues get a 304)
+                     fields              : Optional[str  ] = None ,                 # comma separated, e.g. 'id,pricing' (default: all fields)
+                     limit               : Optional[int  ] = None ,
+                     cursor              : Optional[str  ] = None ,                 # next_cursor of the previous page
+                     modality            : Optional[str  ] = None ,
+                     tokenizer           : Optional[str  ] = None ,
+                     min_context_length  : int             = 0    ,
+                     supported_parameter : Optional[str  ] = None ,
+                     max_price           : Optional[float] = None                   # highest prompt/completion price (catalogue units)
+               ):
+        query = dict(fields=fields, limit=limit, cursor=cursor, modality=modality, tokenizer=tokenizer,
+                     min_context_length=min_context_length, supported_parameter=supported_parameter, max_price=max_price)
+        if not any(query.values()):                                                 # the whole catalogue (as before)
+            return catalogue_response(request, self.open_router.api__models__payload())
+        try:
+            return catalogue_response(request, self.open_router.api__models__query__payload(**query))
+        except ValueError as error:
+            raise HTTPException(status_code=400, detail=str(error))
+
+    def providers(self, request: Request):
+        return catalogue_response(request, self.open_router.api__providers__payload())
 
     def setup_routes(self):
         self.add_route_get(self.providers )
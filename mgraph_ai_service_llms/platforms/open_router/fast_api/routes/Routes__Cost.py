@@ -0,0 +1,40 @@
+from typing                                                                             import Dict, Any, Optional
+from osbot_fast_api.api.routes.Fast_API__Routes                                         import Fast_API__Routes
+from osbot_fast_api.schemas.Safe_Str__Fast_API__Route__Tag                              import Safe_Str__Fast_API__Route__Tag
+from mgraph_ai_service_llms.platforms.open_router.service.Service__Open_Router__Cost    import Service__Open_Router__Cost
+from mgraph_ai_service_llms.platforms.open_router.service.Open_Router__Services         import open_router__services
+
+TAG__ROUTES_COST   = 'cost'
+ROUTES_PATHS__COST = [f'/{TAG__ROUTES_COST}/rank']
+
+
+class Routes__Cost(Fast_API__Routes):
+    tag          : Safe_Str__Fast_API__Route__Tag = TAG__ROUTES_COST
+    cost_service : Service__Open_Router__Cost     = None
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.cost_service = open_router__services.shared(Service__Open_Router__Cost)                     # (the one the chat service prices with)
+
+    def rank(self, prompt_tokens      : int           = 1000 ,                                          # Cheapest models for a token profile (optionally only the ones supporting a parameter, e.g. 'tools')
+                   completion_tokens  : int           = 500  ,
+                   cached_tokens      : int           = 0    ,
+                   cache_write_tokens : int           = 0    ,
+                   reasoning_tokens   : int           = 0    ,
+                   capability         : Optional[str] = None ,
+                   include_free       : bool          = True ,
+                   min_context_length : int           = 0    ,
+                   limit              : int           = 10
+             ) -> Dict[str, Any]:
+        return self.cost_service.rank_models(prompt_tokens      = prompt_tokens      ,
+                                             completion_tokens  = completion_tokens  ,
+                                             cached_tokens      = cached_tokens      ,
+                                             cache_write_tokens = cache_write_tokens ,
+                                             reasoning_tokens   = reasoning_tokens   ,
+                                             capability         = capability         ,
+                                             include_free       = include_free       ,
+                                             min_context_length = min_context_length ,
+                                             limit              = limit              )
+
+    def setup_routes(self):
+        self.add_route_get(self.rank)
@@ -1,18 +1,24 @@
-from typing                                                                                      import Optional, Dict, Any
-from osbot_fast_api.api.routes.Fast_API__Routes                                                  import Fast_API__Routes
-from osbot_fast_api.schemas.Safe_Str__Fast_API__Route__Tag                                       import Safe_Str__Fast_API__Route__Tag
-from osbot_utils.type_safe.Type_Safe                                                             import Type_Safe
-from mgraph_ai_service_llms.platforms.open_router.service.Service__LLM__Simple                   import Service__LLM__Simple, HIGH_THROUGHPUT_MODELS
-from mgraph_ai_service_llms.service.llms.providers.open_router.Schema__Open_Router__Providers    import Schema__Open_Router__Providers
+from typing                                                                                        import Optional, Dict, Any
+from fastapi                                                                                       import Request
+from osbot_fast_api.api.routes.Fast_API__Routes                                                    import Fast_API__Routes
+from osbot_fast_api.schemas.Safe_Str__Fast_API__Route__Tag                                         import Safe_Str__Fast_API__Route__Tag
+from osbot_utils.type_safe.Type_Safe                                                               import Type_Safe
+from mgraph_ai_service_llms.platforms.open_router.service.Service__LLM__Simple                     import Service__LLM__Simple, HIGH_THROUGHPUT_MODELS
+from mgraph_ai_service_llms.service.llms.providers.open_router.Schema__Open_Router__Providers      import Schema__Open_Router__Providers
+from mgraph_ai_service_llms.platforms.open_router.cache.Open_Router__Catalogue__Payload            import Open_Router__Catalogue__Payload, CATALOGUE__CACHE_CONTROL__FIXED
+from mgraph_ai_service_llms.platforms.open_router.fast_api.routes.Open_Router__Catalogue__Response import catalogue_response
 
 TAG__ROUTES_LLM_SIMPLE   = 'llm-simple'
 ROUTES_PATHS__LLM_SIMPLE = [f'/{TAG__ROUTES_LLM_SIMPLE}/complete']
+MODELS__PAYLOAD          = Open_Router__Catalogue__Payload.from_json({ "available_models" : HIGH_THROUGHPUT_MODELS }, cache_control=CATALOGUE__CACHE_CONTROL__FIXED)
 
 class User_Prompt_Simple(Type_Safe):                                                                # Simple LLM completion
     user_prompt   : str                            = "Hello, what is your name and model"
     system_prompt : Optional[str]                  = "Reply in CamelCase"
     model         : str                            = "gpt-oss-120b"
     provider      : Schema__Open_Router__Providers = Schema__Open_Router__Providers.GROQ
+    routing_policy: Optional[str]                  = None                                           # 'fastest', 'cheapest' or 'balanced' (uses provider when there is no data)
+    hedge         : bool                           = False                                          # send a second request to another provider if the first one is slow
 
 class Routes__LLM__Simple(Fast_API__Routes):
     tag            : Safe_Str__Fast_API__Route__Tag = TAG__ROUTES_LLM_SIMPLE
@@ -26,10 +32,12 @@ class Routes__LLM__Simple(Fast_API__Routes):
         return self.service_simple.execute_completion(user_prompt   = user_prompt_simple.user_prompt   ,
                                                       system_prompt = user_prompt_simple.system_prompt ,
                                                       model_key     = user_prompt_simple.model         ,
-                                                      provider_name = user_prompt_simple.provider      )
+                                                      provider_name = user_prompt_simple.provider      ,
+                                                      routing_policy= user_prompt_simple.routing_policy,
+                                                      hedge         = user_prompt_simple.hedge         )
 
-    def models(self) -> Dict[str, Any]:                                                                 # List available models
-        return { "available_models" : HIGH_THROUGHPUT_MODELS }
+    def models(self, request: Request):                                                                 # List available models (fixed, so it is serialised once)
+        return catalogue_response(request, MODELS__PAYLOAD)
 
     def setup_routes(self):
         self.add_route_post(self.complete )
@@ -1,11 +1,20 @@
 import json
 from typing                                                                                          import Dict, Any, Optional
-from fastapi                                                                                         import HTTPException
+from fastapi                                                                                         import HTTPException, Request
 from fastapi.responses                                                                               import StreamingResponse
 from osbot_fast_api.api.routes.Fast_API__Routes                                                      import Fast_API__Routes
 from osbot_fast_api.schemas.Safe_Str__Fast_API__Route__Tag                                           import Safe_Str__Fast_API__Route__Tag
 from mgraph_ai_service_llms.platforms.open_router.service.Service__Open_Router                       import Service__Open_Router
+from mgraph_ai_service_llms.platforms.open_router.service.Open_Router__Services                      import open_router__services
+from mgraph_ai_service_llms.platforms.open_router.limits.Open_Router__Rate_Limiter                   import Open_Router__Rate_Limit__Timeout
+from mgraph_ai_service_llms.platforms.open_router.schemas.limits.Enum__Open_Router__Request_Priority import Enum__Open_Router__Request_Priority
+from mgraph_ai_service_llms.platforms.open_router.schemas.routing.Enum__Open_Router__Routing_Policy  import Enum__Open_Router__Routing_Policy
+from mgraph_ai_service_llms.platforms.open_router.limits.Open_Router__Scheduler                      import Open_Router__Scheduler__Deadline_Exceeded
+from mgraph_ai_service_llms.platforms.open_router.cost.Open_Router__Cost__Ledger                     import Open_Router__Cost__Budget_Exceeded
+from mgraph_ai_service_llms.platforms.open_router.fast_api.routes.Open_Router__Catalogue__Response   import catalogue_response
+from mgraph_ai_service_llms.service.perf.Perf__Span                                                  import perf__trace
 from mgraph_ai_service_llms.service.llms.providers.open_router.Schema__Open_Router__Providers        import Schema__Open_Router__Providers
+from mgraph_ai_service_llms.service.schemas.Schema__Cache__Ids                                       import Schema__Cache__Ids
 from mgraph_ai_service_llms.service.llms.providers.open_router.Schema__Open_Router__Supported_Models import Schema__Open_Router__Supported_Models
 
 
@@ -15,39 +24,74 @@ class Routes__Open_Router(Fast_API__Routes):
 
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
-        self.open_router = Service__Open_Router()
+        self.open_router = open_router__services.shared(Service__Open_Router)                        # (one per process)
 
     def cache_entry__cache_id(self, cache_id: str) -> Dict[str, Any]: # Get cached entry by cache_id"""
         return self.open_router.get_cached_chat_by_id(cache_id)
 
-    def complete(self, prompt       : str                                              ,                # Standard chat completion endpoint
-                       model         : Schema__Open_Router__Supported_Models           ,
-                       system_prompt : Optional[str  ]                          = None ,
-                       temperature   : float                                    = 0.7  ,
-                       max_tokens    : int                                      = 1000 ,
-                       provider      : Optional[Schema__Open_Router__Providers] = None ,
-                       max_cost      : Optional[float]                          = None
+    def cache_entries(self, cache_ids: Schema__Cache__Ids) -> Dict[str, Any]:                           # Get several cached entries in one call (map of cache_id -> entry)
+        return self.open_router.get_cached_chats_by_ids(cache_ids.cache_ids)
+
+    def cache_gc(self, dry_run   : bool          = True ,                                                    # Delete the expired chat cache entries (reports the bytes reclaimed)
+                       ttl_hours : Optional[int] = None
                  ) -> Dict[str, Any]:
         try:
-            provider_str = provider.value if provider else None
+            return self.open_router.chat_cache__gc(dry_run=dry_run, ttl_hours=ttl_hours)
+        except Exception as e:
+            raise HTTPException(status_code = 500                       ,
+                               detail      = f"Internal error: {str(e)}")
 
-            response = self.open_router.chat_completion(
-                prompt        = prompt                ,
-                model         = model.value            ,
-                system_prompt = system_prompt          ,
-                temperature   = temperature            ,
-                max_tokens    = max_tokens             ,
-                provider      = provider_str           ,
-                max_cost      = max_cost
-            )
-
-            return { "status"   : "success"                                            ,
-                     "model"    : model.value                                          ,
-                     "provider" : response.get("provider", provider_str or "auto")     ,
-                     "response" : response.get("choices", [{}])[0].get("message", {}).get("content", ""),
-                     "usage"    : response.get("usage", {})                            ,
-                     "cost"     : response.get("cost_breakdown", {})                   }
+    def complete(self, prompt         : str                                                 ,             # Standard chat completion endpoint
+                       model          : Schema__Open_Router__Supported_Models               ,
+                       system_prompt  : Optional[str  ]                             = None  ,
+                       temperature    : float                                       = 0.7   ,
+                       max_tokens     : int                                         = 1000  ,
+                       provider       : Optional[Schema__Open_Router__Providers]    = None  ,
+                       max_cost       : Optional[float]                             = None  ,
+                       routing_policy : Optional[Enum__Open_Router__Routing_Policy] = None  ,             # 'fastest', 'cheapest' or 'balanced'
+                       hedge          : bool                                        = False ,             # hedge slow requests with a second provider
+                       failover       : Optional[bool ]                             = None  ,             # let other providers answer when this one fails (default: only when no provider is pinned)
+                       priority       : Enum__Open_Router__Request_Priority         = Enum__Open_Router__Request_Priority.interactive ,  # 'interactive', 'batch' or 'background' (scheduler lane)
+                       timings        : bool                                        = False               # add the latency breakdown (ms per stage) to the response
+                 ) -> Dict[str, Any]:
+        try:
+            provider_str = provider.value if provider else None
 
+            with perf__trace() as trace:
+                response = self.open_router.chat_completion(
+                    prompt        = prompt                ,
+                    model         = model.value            ,
+                    system_prompt = system_prompt          ,
+                    temperature   = temperature            ,
+                    max_tokens    = max_tokens             ,
+                    provider      = provider_str           ,
+                    max_cost      = max_cost               ,
+                    routing_policy= routing_policy.value if routing_policy else None,
+                    hedge         = hedge                  ,
+                    failover      = failover               ,
+                    priority      = priority.value
+                )
+
+            result = { "status"   : "success"                                            ,
+                       "model"    : model.value                                          ,
+                       "provider" : response.get("provider", provider_str or "auto")     ,
+                       "response" : response.get("choices", [{}])[0].get("message", {}).get("content", ""),
+                       "usage"    : response.get("usage", {})                            ,
+                       "cost"     : response.get("cost_breakdown", {})                   ,
+                       "hedge"    : response.get("hedge")                                }
+            if timings:
+                result["timings"] = trace.timings()
+            return result
+
+        except Open_Router__Rate_Limit__Timeout as e:
+            raise HTTPException(status_code = 429          ,
+                               detail      = str(e)        )
+        except Open_Router__Scheduler__Deadline_Exceeded as e:
+            raise HTTPException(status_code = 504          ,
+                               detail      = str(e)        )
+        except Open_Router__Cost__Budget_Exceeded as e:
+            raise HTTPException(status_code = 402          ,
+                               detail      = str(e)        )
         except ValueError as e:
             raise HTTPException(status_code = 400          ,
                                detail      = str(e)        )
@@ -89,16 +133,43 @@ class Routes__Open_Router(Fast_API__Routes):
         return StreamingResponse(generate()                    ,
                                 media_type = "text/event-stream")
 
-    def models(self, include_free : bool = True ,                                                       # List available models
-                     include_paid : bool = True
-               ) -> Dict[str, Any]:
+    def models(self, request             : Request                ,                                  # List available models (with an ETag, so that pollers get a 304 when nothing changed)
+                     include_free        : bool            = True ,
+                     include_paid        : bool            = True ,
+                     fields              : Optional[str  ] = None ,                                      # comma separated, e.g. 'id,pricing' (default: id, name, context_length, is_free, pricing)
+                     limit               : Optional[int  ] = None ,
+                     cursor              : Optional[str  ] = None ,                                      # next_cursor of the previous page
+                     modality            : Optional[str  ] = None ,                                      # e.g. 'text+image->text'
+                     tokenizer           : Optional[str  ] = None ,
+                     min_context_length  : int             = 0    ,
+                     supported_parameter : Optional[str  ] = None ,                                      # e.g. 'tools'
+                     max_price           : Optional[float] = None                                        # highest prompt/completion price (catalogue units)
+               ):
         try:
-            return self.open_router.list_models(include_free = include_free ,
-                                               include_paid = include_paid )
+            return catalogue_response(request, self.open_router.list_models__payload(include_free        = include_free        ,
+                                                                                    include_paid        = include_paid        ,
+                                                                                    fields              = fields              ,
+                                                                                    limit               = limit               ,
+                                                                                    cursor              = cursor              ,
+                                                                                    modality            = modality            ,
+                                                                                    tokenizer           = tokenizer           ,
+                                                                                    min_context_length  = min_context_length  ,
+                                                                                    supported_parameter = supported_parameter ,
+                                                                                    max_price           = max_price           ))
+        except ValueError as e:
+            raise HTTPException(status_code = 400          ,
+                               detail      = str(e)        )
         except Exception as e:
             raise HTTPException(status_code = 500                       ,
                                detail      = f"Failed to fetch models: {str(e)}")
 
+    def models_refresh(self) -> Dict[str, Any]:                                                         # Download the models catalogue again (the model lists, summaries and prices are recomputed)
+        try:
+            return self.open_router.models_refresh()
+        except Exception as e:
+            raise HTTPException(status_code = 502                       ,
+                               detail      = f"Failed to refresh models: {str(e)}")
+
     def model_info(self, model_id : str                                                                 # Get detailed model information
                    ) -> Dict[str, Any]:
         model_info = self.open_router.get_model_info(model_id)
@@ -124,6 +195,27 @@ class Routes__Open_Router(Fast_API__Routes):
             raise HTTPException(status_code = 500                                      ,
                                detail      = f"Failed to estimate cost: {str(e)}"    )
 
+    def provider_performance(self, model: Optional[str] = None) -> Dict[str, Any]:                     # Rolling latency/throughput/error/cost per (model, provider)
+        return self.open_router.provider_performance(model)
+
+    def rate_limits(self) -> Dict[str, Any]:                                                            # Client side rate limits (per model and provider) and queue counters
+        return self.open_router.rate_limits()
+
+    def direct_providers(self) -> Dict[str, Any]:                                                       # Providers that skip OpenRouter when pinned (opt in with OPEN_ROUTER__DIRECT_PROVIDERS)
+        return self.open_router.direct_providers()
+
+    def scheduler(self) -> Dict[str, Any]:                                                              # Scheduler lanes (weights, queued requests, waits and dropped requests)
+        return self.open_router.scheduler_status()
+
+    def cost_ledger(self, day: Optional[str] = None) -> Dict[str, Any]:                                  # Budgets (spent, in flight, remaining) and hourly costs by model, provider, route and tenant (day: YYYY-MM-DD)
+        return self.open_router.cost_ledger__status(day)
+
+    def hedge_stats(self) -> Dict[str, Any]:                                                            # How often requests were hedged and how often the hedge won
+        return self.open_router.hedge_stats()
+
+    def request_templates(self) -> Dict[str, Any]:                                                      # Request templates in use (the constant parts of the chat requests, serialised once)
+        return self.open_router.request_templates__status()
+
     def providers(self) -> Dict[str, Any]:                                                              # List available providers
         return { "providers" : [ { "id"          : provider.value                      ,
                                    "name"        : provider.name                        ,
@@ -134,7 +226,17 @@ class Routes__Open_Router(Fast_API__Routes):
         self.add_route_post(self.complete             )
         self.add_route_post(self.complete_stream      )
         self.add_route_get (self.models               )
+        self.add_route_post(self.models_refresh       )
         self.add_route_get (self.model_info           )
         self.add_route_post(self.estimate_cost        )
         self.add_route_get (self.providers            )
-        self.add_route_get (self.cache_entry__cache_id)
\ No newline at end of file
+        self.add_route_get (self.provider_performance )
+        self.add_route_get (self.hedge_stats          )
+        self.add_route_get (self.request_templates    )
+        self.add_route_get (self.rate_limits          )
+        self.add_route_get (self.scheduler            )
+        self.add_route_get (self.cost_ledger          )
+        self.add_route_get (self.direct_providers     )
+        self.add_route_get (self.cache_entry__cache_id)
+        self.add_route_post(self.cache_entries        )
+        self.add_route_post(self.cache_gc             )
\ No newline at end of file
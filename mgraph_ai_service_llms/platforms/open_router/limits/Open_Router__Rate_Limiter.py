@@ -0,0 +1,190 @@
+import json
+import time
+from threading                                                                                   import Condition
+from typing                                                                                      import Dict, Any, List, Optional
+from osbot_utils.type_safe.Type_Safe                                                             import Type_Safe
+from osbot_utils.utils.Env                                                                       import get_env
+from mgraph_ai_service_llms.platforms.open_router.limits.Open_Router__Token_Bucket               import Open_Router__Token_Bucket
+from mgraph_ai_service_llms.platforms.open_router.schemas.limits.Schema__Open_Router__Rate_Limit import Schema__Open_Router__Rate_Limit
+
+ENV_NAME_OPEN_ROUTER__RATE_LIMITS      = "OPEN_ROUTER__RATE_LIMITS"                 # JSON: {"provider:groq": {"requests_per_minute": 30, ...}, "model:openai/gpt-oss-120b": {...}}
+
+REQUEST_PRIORITY__INTERACTIVE          = 'interactive'                              # UI traffic (text analysis, llm-simple)
+REQUEST_PRIORITY__BATCH                = 'batch'
+REQUEST_PRIORITY__BACKGROUND           = 'background'                               # cache warmup, catalogue refresh
+REQUEST_PRIORITIES                     = [REQUEST_PRIORITY__INTERACTIVE, REQUEST_PRIORITY__BATCH, REQUEST_PRIORITY__BACKGROUND]  # highest priority first
+
+RATE_LIMIT__PROVIDER__REQUESTS_PER_MIN = 600                                        # default limits for each provider (models have no default limits)
+RATE_LIMIT__PROVIDER__MAX_CONCURRENCY  = 32
+RATE_LIMIT__MAX_WAIT                   = 30.0                                       # max seconds a request waits in the queue
+RATE_LIMIT__RECHECK_SECONDS            = 1.0                                        # waiters re-check at least this often (in case a notify is missed)
+
+
+class Open_Router__Rate_Limit__Timeout(Exception):                                  # the request waited more than max_wait (nothing was sent upstream)
+    pass
+
+
+class Open_Router__Rate_Limit__Permit(Type_Safe):                                   # Admission to send one request (release it when the request is done)
+    rate_limiter : object          = None
+    keys         : List[str]
+    tokens       : int                                                              # tokens taken (estimate)
+    tokens_used  : Optional[int]   = None                                           # set with the actual usage (the difference is given back)
+    waited       : float
+    released     : bool
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.release()
+        return False
+
+    def release(self) -> None:
+        if not self.released:
+            self.released = True
+            self.rate_limiter.release(self)
+
+
+class Open_Router__Rate_Limiter(Type_Safe):                                         # Requests/min, tokens/min and concurrency limits per model and per provider (requests queue instead of failing)
+    limits                 : dict                                                   # 'model:{id}' or 'provider:{name}' -> Schema__Open_Router__Rate_Limit
+    default_provider_limit : Schema__Open_Router__Rate_Limit
+    max_wait               : float = RATE_LIMIT__MAX_WAIT
+    buckets                : dict                                                   # (key, 'requests' or 'tokens') -> Open_Router__Token_Bucket
+    in_flight              : dict                                                   # key -> requests in flight
+    waiters                : list
+    counters               : dict
+    sequence               : int                                                    # arrival order (FIFO within a priority)
+    condition              : Condition = None
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.condition = Condition()
+        if not self.default_provider_limit.requests_per_minute and not self.default_provider_limit.max_concurrency:
+            self.default_provider_limit = Schema__Open_Router__Rate_Limit(requests_per_minute = RATE_LIMIT__PROVIDER__REQUESTS_PER_MIN,
+                                                                          max_concurrency     = RATE_LIMIT__PROVIDER__MAX_CONCURRENCY )
+        self.load_limits_from_env()
+
+    def load_limits_from_env(self) -> None:
+        try:
+            limits = json.loads(get_env(ENV_NAME_OPEN_ROUTER__RATE_LIMITS) or '{}')
+        except ValueError:
+            return                                                                  # invalid config is ignored (defaults apply)
+        for key, limit in limits.items():
+            self.set_limit(key, **limit)
+
+    def set_limit(self, key                 : str     ,                             # e.g. 'provider:groq' or 'model:openai/gpt-oss-120b'
+                        requests_per_minute : int = 0 ,
+                        tokens_per_minute   : int = 0 ,
+                        max_concurrency     : int = 0
+                  ) -> Schema__Open_Router__Rate_Limit:
+        limit = Schema__Open_Router__Rate_Limit(requests_per_minute = requests_per_minute,
+                                                tokens_per_minute   = tokens_per_minute  ,
+                                                max_concurrency     = max_concurrency    )
+        with self.condition:
+            self.limits[key] = limit
+            for kind in ('requests', 'tokens'):                                     # new rates start with new buckets
+                self.buckets.pop((key, kind), None)
+            self.condition.notify_all()
+        return limit
+
+    def limit(self, key: str) -> Optional[Schema__Open_Router__Rate_Limit]:
+        if key in self.limits:
+            return self.limits[key]
+        if key.startswith('provider:'):
+            return self.default_provider_limit
+        return None
+
+    def keys(self, model: str, provider: Optional[str]) -> List[str]:               # the limits that apply to a request
+        keys = [f'model:{model}', f'provider:{provider or "auto"}']
+        return [key for key in keys if self.limit(key)]
+
+    def bucket(self, key: str, kind: str, rate_per_minute: int) -> Open_Router__Token_Bucket:
+        bucket = self.buckets.get((key, kind))
+        if bucket is None:
+            bucket = self.buckets[(key, kind)] = Open_Router__Token_Bucket(rate_per_minute=rate_per_minute)
+        return bucket
+
+    def buckets_for(self, key: str, tokens: int):                                   # (bucket, amount) pairs for the limits of one key
+        limit = self.limit(key)
+        if limit.requests_per_minute:
+            yield self.bucket(key, 'requests', limit.requests_per_minute), 1
+        if limit.tokens_per_minute and tokens:
+            yield self.bucket(key, 'tokens'  , limit.tokens_per_minute  ), tokens
+
+    def wait_time(self, waiter: dict, now: float) -> float:                         # 0 means the waiter can go now
+        for other in self.waiters:
+            if other is not waiter and other['keys'] & waiter['keys'] and other['rank'] < waiter['rank']:
+                return RATE_LIMIT__RECHECK_SECONDS                                  # a higher priority (or older) request goes first
+        wait_time = 0.0
+        for key in waiter['keys']:
+            max_concurrency = self.limit(key).max_concurrency
+            if max_concurrency and self.in_flight.get(key, 0) >= max_concurrency:
+                wait_time = max(wait_time, RATE_LIMIT__RECHECK_SECONDS)             # woken up by release()
+            for bucket, amount in self.buckets_for(key, waiter['tokens']):
+                wait_time = max(wait_time, bucket.wait_time(amount, now))
+        return wait_time
+
+    def acquire(self, model    : str                                ,               # wait (in priority order) until the request can be sent
+                      provider : Optional[str]                      ,
+                      tokens   : int                = 0             ,
+                      priority : str                = REQUEST_PRIORITY__INTERACTIVE ,
+                      max_wait : Optional[float]    = None
+                ) -> Open_Router__Rate_Limit__Permit:
+        keys          = self.keys(model, provider)
+        start         = time.monotonic()
+        deadline      = start + (self.max_wait if max_wait is None else max_wait)
+        priority_rank = REQUEST_PRIORITIES.index(priority) if priority in REQUEST_PRIORITIES else len(REQUEST_PRIORITIES)
+        with self.condition:
+            self.sequence += 1
+            waiter = dict(keys=set(keys), tokens=tokens, rank=(priority_rank, self.sequence))
+            self.waiters.append(waiter)
+            try:
+                while True:
+                    now       = time.monotonic()
+                    wait_time = self.wait_time(waiter, now)
+                    if wait_time == 0:
+                        break
+                    if now >= deadline:
+                        self.increment('timed_out')
+                        raise Open_Router__Rate_Limit__Timeout(f"Rate limit: request for '{model}' ({provider or 'auto'}) waited more than {round(now - start, 3)}s in the queue")
+                    self.condition.wait(min(wait_time, deadline - now))
+                for key in keys:
+                    self.in_flight[key] = self.in_flight.get(key, 0) + 1
+                    for bucket, amount in self.buckets_for(key, tokens):
+                        bucket.take(amount)
+                waited = time.monotonic() - start
+                self.increment('admitted')
+                if waited > 0.001:
+                    self.increment('queued')
+                self.counters['wait_seconds'] = self.counters.get('wait_seconds', 0.0) + waited
+            finally:
+                self.waiters.remove(waiter)
+                self.condition.notify_all()
+        return Open_Router__Rate_Limit__Permit(rate_limiter=self, keys=keys, tokens=tokens, waited=waited)
+
+    def release(self, permit: Open_Router__Rate_Limit__Permit) -> None:
+        with self.condition:
+            for key in permit.keys:
+                self.in_flight[key] = max(0, self.in_flight.get(key, 0) - 1)
+                tokens_per_minute = self.limit(key).tokens_per_minute
+                if tokens_per_minute and permit.tokens_used is not None and permit.tokens_used < permit.tokens:
+                    self.bucket(key, 'tokens', tokens_per_minute).give_back(permit.tokens - permit.tokens_used)
+            self.condition.notify_all()
+
+    def increment(self, name: str) -> None:
+        self.counters[name] = self.counters.get(name, 0) + 1
+
+    def status(self) -> Dict[str, Any]:
+        with self.condition:
+            now     = time.monotonic()
+            buckets = {}
+            for (key, kind), bucket in sorted(self.buckets.items()):
+                bucket.refill(now)
+                buckets.setdefault(key, {})[kind] = round(bucket.tokens, 3)
+            return dict(limits                 = { key: limit.json() for key, limit in sorted(self.limits.items()) },
+                        default_provider_limit = self.default_provider_limit.json()                                  ,
+                        max_wait               = self.max_wait                                                       ,
+                        buckets                = buckets                                                             ,
+                        in_flight              = { key: count for key, count in sorted(self.in_flight.items()) if count },
+                        waiting                = len(self.waiters)                                                   ,
+                        counters               = dict(self.counters)                                                 )
@@ -0,0 +1,34 @@
+import hashlib
+import time
+from contextvars                                                                                        import ContextVar
+from typing                                                                                             import Dict
+from osbot_fast_api.schemas.consts__Fast_API                                                            import ENV_VAR__FAST_API__AUTH__API_KEY__NAME
+from osbot_utils.utils.Env                                                                              import get_env
+from mgraph_ai_service_llms.platforms.open_router.schemas.limits.Schema__Open_Router__Request_Context  import Schema__Open_Router__Request_Context, REQUEST_CONTEXT__TENANT__ANONYMOUS
+
+HEADER__TENANT_ID       = 'x-tenant-id'                                             # explicit tenant (only used for requests without an API key)
+HEADER__REQUEST_TIMEOUT = 'x-request-timeout'                                       # seconds the caller is prepared to wait
+
+open_router__request_context = ContextVar('open_router__request_context', default=None)    # set per HTTP request by Middleware__Open_Router__Request_Context
+
+
+def request_context() -> Schema__Open_Router__Request_Context:                      # context of the current request (default one outside HTTP requests)
+    return open_router__request_context.get() or Schema__Open_Router__Request_Context()
+
+
+def request_context__from_headers(headers: Dict[str, str], route: str = '') -> Schema__Open_Router__Request_Context:    # headers with lower case names
+    api_key_name = (get_env(ENV_VAR__FAST_API__AUTH__API_KEY__NAME) or '').lower()
+    if api_key_name and headers.get(api_key_name):                                  # the key decides the tenant (so a caller can't pick another tenant to get around its budget or fair share)
+        tenant = 'key-' + hashlib.sha256(headers[api_key_name].encode()).hexdigest()[:12]     # never keep the API key itself
+    else:
+        tenant = headers.get(HEADER__TENANT_ID)
+    deadline = None
+    try:
+        timeout = float(headers.get(HEADER__REQUEST_TIMEOUT) or 0)
+        if timeout > 0:
+            deadline = time.time() + timeout
+    except ValueError:
+        pass                                                                        # invalid timeouts are ignored
+    return Schema__Open_Router__Request_Context(tenant   = tenant[:64] if tenant else REQUEST_CONTEXT__TENANT__ANONYMOUS,
+                                                deadline = deadline                                                    ,
+                                                route    = route[:128]                                                 )
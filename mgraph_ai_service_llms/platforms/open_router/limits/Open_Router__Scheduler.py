@@ -0,0 +1,179 @@
+import time
+from collections                                                                    import deque
+from threading                                                                      import Condition
+from typing                                                                         import Dict, Any, Optional
+from osbot_utils.type_safe.Type_Safe                                                import Type_Safe
+from mgraph_ai_service_llms.platforms.open_router.limits.Open_Router__Rate_Limiter import REQUEST_PRIORITY__INTERACTIVE, REQUEST_PRIORITY__BATCH, REQUEST_PRIORITY__BACKGROUND, REQUEST_PRIORITIES
+
+SCHEDULER__MAX_CONCURRENCY = 16                                                     # chat completions in flight (per process)
+SCHEDULER__LANE_WEIGHTS    = { REQUEST_PRIORITY__INTERACTIVE : 8 ,                  # share of the slots when all lanes are busy (8:2:1)
+                               REQUEST_PRIORITY__BATCH       : 2 ,
+                               REQUEST_PRIORITY__BACKGROUND  : 1 }
+SCHEDULER__LANE_TIMEOUTS   = { REQUEST_PRIORITY__INTERACTIVE : 30.0   ,             # max queue time when the caller didn't send a deadline
+                               REQUEST_PRIORITY__BATCH       : 600.0  ,
+                               REQUEST_PRIORITY__BACKGROUND  : 1800.0 }
+
+
+class Open_Router__Scheduler__Deadline_Exceeded(Exception):                         # the caller's deadline passed while the request was queued (it was dropped, nothing was sent)
+    pass
+
+
+class Open_Router__Scheduler__Slot(Type_Safe):                                      # One admitted request (release it when the request is done)
+    scheduler : object = None
+    lane      : str
+    tenant    : str
+    waited    : float
+    released  : bool
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.release()
+        return False
+
+    def release(self) -> None:
+        if not self.released:
+            self.released = True
+            self.scheduler.release(self)
+
+
+class Open_Router__Scheduler(Type_Safe):                                            # Weighted fair queuing across lanes, fair across tenants inside each lane, deadline aware
+    max_concurrency : int = SCHEDULER__MAX_CONCURRENCY
+    lane_weights    : dict
+    lane_timeouts   : dict
+    in_flight       : int
+    queues          : dict                                                          # lane -> tenant -> deque of entries (FIFO per tenant)
+    lane_pass       : dict                                                          # lane -> virtual start time (advances by 1/weight per admitted request)
+    tenant_pass     : dict                                                          # (lane, tenant) -> virtual time (advances by 1 per admitted request)
+    lane_virtual    : float                                                         # pass of the last admitted lane (idle lanes restart from here, so they can't bank credit)
+    tenant_virtual  : dict                                                          # lane -> pass of the last admitted tenant
+    sequence        : int
+    stats           : dict                                                          # lane -> counters
+    condition       : Condition = None
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.condition = Condition()
+        if not self.lane_weights:
+            self.lane_weights  = dict(SCHEDULER__LANE_WEIGHTS )
+        if not self.lane_timeouts:
+            self.lane_timeouts = dict(SCHEDULER__LANE_TIMEOUTS)
+
+    def lane(self, lane: Optional[str]) -> str:
+        return lane if lane in self.lane_weights else REQUEST_PRIORITY__INTERACTIVE
+
+    def slot(self, lane     : Optional[str]   = None ,                              # wait until the request is admitted (raises if its deadline passes first)
+                   tenant   : Optional[str]   = None ,
+                   deadline : Optional[float] = None                                # epoch seconds
+             ) -> Open_Router__Scheduler__Slot:
+        lane     = self.lane(lane)
+        tenant   = tenant or 'anonymous'
+        now      = time.time()
+        deadline = min(deadline or float('inf'), now + self.lane_timeouts.get(lane, SCHEDULER__LANE_TIMEOUTS[REQUEST_PRIORITY__INTERACTIVE]))
+        with self.condition:
+            self.sequence += 1
+            entry = dict(lane=lane, tenant=tenant, deadline=deadline, sequence=self.sequence, admitted=False, dropped=False)
+            self.enqueue(entry)
+            self.dispatch()
+            while not entry['admitted']:
+                remaining = entry['deadline'] - time.time()
+                if entry['dropped'] or remaining <= 0:
+                    if not entry['dropped']:
+                        self.remove(entry)
+                        self.increment(lane, 'dropped')
+                    raise Open_Router__Scheduler__Deadline_Exceeded(f"Request dropped: the deadline passed after {round(time.time() - now, 3)}s in the '{lane}' queue")
+                self.condition.wait(remaining)
+            waited = time.time() - now
+            self.increment(lane, 'admitted')
+            self.increment(lane, 'wait_seconds', waited)
+            self.stats[lane]['max_wait'] = max(self.stats[lane].get('max_wait', 0.0), waited)
+        return Open_Router__Scheduler__Slot(scheduler=self, lane=lane, tenant=tenant, waited=waited)
+
+    def release(self, slot: Open_Router__Scheduler__Slot) -> None:
+        with self.condition:
+            self.in_flight = max(0, self.in_flight - 1)
+            self.dispatch()
+
+    def enqueue(self, entry: dict) -> None:                                         # (lock held)
+        lane, tenant = entry['lane'], entry['tenant']
+        tenants      = self.queues.setdefault(lane, {})
+        if not tenants:                                                             # lane becomes active
+            self.lane_pass[lane] = max(self.lane_pass.get(lane, 0.0), self.lane_virtual)
+        if tenant not in tenants:                                                   # tenant becomes active in this lane
+            tenants[tenant] = deque()
+            self.tenant_pass[(lane, tenant)] = max(self.tenant_pass.get((lane, tenant), 0.0), self.tenant_virtual.get(lane, 0.0))
+        tenants[tenant].append(entry)
+
+    def remove(self, entry: dict) -> None:                                          # (lock held)
+        tenants = self.queues.get(entry['lane'], {})
+        queue   = tenants.get(entry['tenant'])
+        if queue and entry in queue:
+            queue.remove(entry)
+            if not queue:
+                self.remove_tenant(entry['lane'], entry['tenant'])
+
+    def remove_tenant(self, lane: str, tenant: str) -> None:                        # idle tenants are forgotten (they restart from the lane's virtual time)
+        self.queues[lane].pop(tenant, None)
+        self.tenant_pass.pop((lane, tenant), None)
+
+    def drop_expired(self, now: float) -> None:                                     # requests whose caller has already given up are never sent
+        for lane, tenants in self.queues.items():
+            for tenant, queue in list(tenants.items()):
+                for entry in [entry for entry in queue if entry['deadline'] <= now]:
+                    entry['dropped'] = True
+                    self.remove(entry)
+                    self.increment(lane, 'dropped')
+
+    def lane_finish(self, lane: str) -> float:                                      # virtual finish time of the lane's next request (WFQ picks the smallest)
+        return self.lane_pass.get(lane, 0.0) + 1 / self.lane_weights.get(lane, 1)
+
+    def next_entry(self) -> Optional[dict]:                                         # (lock held) lane with the earliest finish, then its least served tenant, then FIFO
+        self.drop_expired(time.time())
+        active_lanes = [lane for lane, tenants in self.queues.items() if tenants]
+        if not active_lanes:
+            return None
+        lane    = min(active_lanes, key=lambda lane: (self.lane_finish(lane), REQUEST_PRIORITIES.index(lane) if lane in REQUEST_PRIORITIES else len(REQUEST_PRIORITIES)))
+        tenants = self.queues[lane]
+        tenant  = min(tenants, key=lambda tenant: (self.tenant_pass.get((lane, tenant), 0.0), tenants[tenant][0]['sequence']))
+        entry   = tenants[tenant].popleft()
+
+        self.lane_virtual                = self.lane_pass  [lane]
+        self.tenant_virtual[lane]        = self.tenant_pass[(lane, tenant)]
+        self.lane_pass  [lane]          += 1 / self.lane_weights.get(lane, 1)
+        self.tenant_pass[(lane, tenant)] += 1
+        if not tenants[tenant]:
+            self.remove_tenant(lane, tenant)
+        return entry
+
+    def dispatch(self) -> None:                                                     # (lock held) admit requests while there are free slots
+        while self.in_flight < self.max_concurrency:
+            entry = self.next_entry()
+            if entry is None:
+                break
+            entry['admitted'] = True
+            self.in_flight   += 1
+        self.condition.notify_all()
+
+    def increment(self, lane: str, name: str, value: float = 1) -> None:            # (lock held)
+        lane_stats       = self.stats.setdefault(lane, {})
+        lane_stats[name] = lane_stats.get(name, 0) + value
+
+    def status(self) -> Dict[str, Any]:
+        with self.condition:
+            lanes = {}
+            for lane, weight in self.lane_weights.items():
+                lane_stats = self.stats.get(lane, {})
+                admitted   = lane_stats.get('admitted', 0)
+                tenants    = self.queues.get(lane, {})
+                lanes[lane] = dict(weight          = weight                                                            ,
+                                   timeout         = self.lane_timeouts.get(lane)                                      ,
+                                   waiting         = sum(len(queue) for queue in tenants.values())                    ,
+                                   tenants_waiting = len(tenants)                                                      ,
+                                   admitted        = admitted                                                          ,
+                                   dropped         = lane_stats.get('dropped', 0)                                      ,
+                                   avg_wait        = round(lane_stats.get('wait_seconds', 0) / admitted, 4) if admitted else 0.0,
+                                   max_wait        = round(lane_stats.get('max_wait', 0.0), 4)                         )
+            return dict(max_concurrency = self.max_concurrency ,
+                        in_flight       = self.in_flight       ,
+                        lanes           = lanes                )
@@ -0,0 +1,32 @@
+import time
+from typing                                                                         import Optional
+from osbot_utils.type_safe.Type_Safe                                                import Type_Safe
+
+
+class Open_Router__Token_Bucket(Type_Safe):                                         # Token bucket refilled continuously (rate_per_minute / 60 per second), holding up to one minute of budget
+    rate_per_minute : float
+    tokens          : float
+    updated_at      : float
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.tokens     = self.rate_per_minute
+        self.updated_at = time.monotonic()
+
+    def refill(self, now: Optional[float] = None) -> None:
+        now             = time.monotonic() if now is None else now
+        self.tokens     = min(self.rate_per_minute, self.tokens + (now - self.updated_at) * self.rate_per_minute / 60)
+        self.updated_at = now
+
+    def wait_time(self, amount: float, now: Optional[float] = None) -> float:       # seconds until amount can be taken (requests bigger than the bucket only need a full bucket)
+        self.refill(now)
+        needed = min(amount, self.rate_per_minute) - self.tokens
+        if needed <= 0:
+            return 0.0
+        return needed * 60 / self.rate_per_minute
+
+    def take(self, amount: float) -> None:                                          # can go negative (for requests bigger than the bucket)
+        self.tokens -= amount
+
+    def give_back(self, amount: float) -> None:                                     # e.g. when the actual usage was lower than the estimate
+        self.tokens = min(self.rate_per_minute, self.tokens + amount)
@@ -0,0 +1,37 @@
+from typing                                                                         import Any, Dict, List
+from osbot_utils.type_safe.Type_Safe                                                import Type_Safe
+
+PROMPT_CACHE__BREAKPOINT_MODELS = ['anthropic/', 'google/gemini']                   # models that only cache the prefixes marked with cache_control (OpenAI, DeepSeek, Groq, Grok, ... cache repeated prefixes on their own)
+PROMPT_CACHE__MIN_CHARS         = 4096                                              # ~1024 tokens, the smallest prefix these providers cache (shorter ones are not marked)
+PROMPT_CACHE__CACHE_CONTROL     = { 'type': 'ephemeral' }
+
+
+class Open_Router__Prompt_Cache(Type_Safe):                                         # Shapes the upstream body so that providers can reuse the cached prompt prefix: stable messages first, with a cache_control breakpoint after them (where the model needs one)
+    breakpoint_models : list = None
+    min_chars         : int  = PROMPT_CACHE__MIN_CHARS
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        if self.breakpoint_models is None:
+            self.breakpoint_models = list(PROMPT_CACHE__BREAKPOINT_MODELS)
+
+    def needs_breakpoints(self, model: str) -> bool:
+        return str(model).startswith(tuple(self.breakpoint_models))
+
+    def order_messages(self, messages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:     # system messages (the same on every call) before the rest, each group in its original order
+        stable   = [message for message in messages if message.get('role') == 'system']
+        variable = [message for message in messages if message.get('role') != 'system']
+        return stable + variable
+
+    def mark(self, model: str, payload: Dict[str, Any]) -> Dict[str, Any]:           # (payload: a to_api_dict(), changed in place)
+        messages = self.order_messages(payload.get('messages') or [])
+        stable   = [message for message in messages if message.get('role') == 'system']
+        if stable and self.needs_breakpoints(model):
+            last = stable[-1]                                                       # (one breakpoint caches the whole prefix up to it)
+            if isinstance(last.get('content'), str) and sum(len(str(message.get('content'))) for message in stable) >= self.min_chars:
+                position           = messages.index(last)
+                messages[position] = dict(last, content=[dict(type          = 'text'                       ,
+                                                                  text          = last['content']              ,
+                                                                  cache_control = dict(PROMPT_CACHE__CACHE_CONTROL))])
+        payload['messages'] = messages
+        return payload
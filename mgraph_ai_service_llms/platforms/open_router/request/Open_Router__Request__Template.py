@@ -0,0 +1,111 @@
+import copy
+import threading
+from typing                                                                                                 import Any, Dict, Optional
+from osbot_utils.type_safe.Type_Safe                                                                        import Type_Safe
+from mgraph_ai_service_llms.platforms.open_router.request.Open_Router__Prompt_Cache                         import Open_Router__Prompt_Cache
+from mgraph_ai_service_llms.platforms.open_router.schemas.Safe_Str__Open_Router__Model_ID                   import Safe_Str__Open_Router__Model_ID
+from mgraph_ai_service_llms.platforms.open_router.schemas.request.Safe_Str__Message_Content                 import Safe_Str__Message_Content
+from mgraph_ai_service_llms.platforms.open_router.schemas.request.Schema__Open_Router__Chat_Request         import Schema__Open_Router__Chat_Request
+from mgraph_ai_service_llms.platforms.open_router.schemas.request.Schema__Open_Router__Provider_Preferences import Schema__Open_Router__Provider_Preferences
+from mgraph_ai_service_llms.platforms.open_router.service.Open_Router__Services                             import open_router__services
+
+REQUEST_TEMPLATE__PLACEHOLDER   = 'user prompt'                                      # (replaced by the prompt of each request)
+REQUEST_TEMPLATES__MAX_TEMPLATES = 256                                               # system prompts can come from clients, so the templates can't grow without limit
+
+
+class Schema__Open_Router__Chat_Request__From_Template(Schema__Open_Router__Chat_Request):     # A request made from a template: json() and to_api_dict() reuse the template's serialised parts (these requests are not changed after they are made)
+    request_json : dict = None
+    api_dict     : dict = None
+
+    def json(self) -> Dict[str, Any]:
+        return dict(self.request_json)
+
+    def to_api_dict(self) -> Dict[str, Any]:
+        return dict(self.api_dict, messages=list(self.api_dict['messages']))
+
+
+class Open_Router__Request__Template(Type_Safe):                                    # The constant part of a chat request (model, system prompt, temperature, max tokens, provider) validated and serialised once
+    request      : Schema__Open_Router__Chat_Request__From_Template = None          # (with a placeholder user message)
+    request_json : dict                                                             # request.json()        (the chat cache key)
+    api_dict     : dict                                                             # request.to_api_dict() (the upstream body, shaped for the provider's prompt cache)
+    user_json    : dict                                                             # the user message json (the content is replaced)
+    uses         : int
+
+    @classmethod
+    def create(cls, model         : str                              ,
+                    system_prompt : Optional[str]                    ,
+                    temperature   : float                            ,
+                    max_tokens    : int                              ,
+                    provider      : Optional[str]                    ,
+                    prompt_cache  : Open_Router__Prompt_Cache = None
+               ) -> 'Open_Router__Request__Template':
+        kwargs = dict(model         = Safe_Str__Open_Router__Model_ID(model)                          ,
+                      prompt        = Safe_Str__Message_Content(REQUEST_TEMPLATE__PLACEHOLDER)        ,
+                      system_prompt = Safe_Str__Message_Content(system_prompt) if system_prompt else None,
+                      temperature   = temperature                                                     ,
+                      max_tokens    = max_tokens                                                      )
+        if provider:
+            kwargs['provider'] = Schema__Open_Router__Provider_Preferences(order=[provider], allow_fallbacks=False)
+        request  = Schema__Open_Router__Chat_Request.create_simple(**kwargs)
+        template = cls(request = Schema__Open_Router__Chat_Request__From_Template.create_simple(**kwargs))
+        template.request_json = request.json()
+        template.api_dict     = (prompt_cache or open_router__services.shared(Open_Router__Prompt_Cache)).mark(model, request.to_api_dict())     # (the cache key, request_json, is not changed)
+        template.user_json    = template.request_json['messages'][-1]
+        return template
+
+    def render(self, prompt: str) -> Schema__Open_Router__Chat_Request__From_Template:     # the request for one prompt (only the prompt is validated)
+        message         = copy.copy(self.request.messages[-1])
+        message.content = Safe_Str__Message_Content(prompt)
+        messages        = copy.copy(self.request.messages)
+        messages[-1]    = message
+        user_json       = dict(self.user_json, content=str(message.content))
+        request         = copy.copy(self.request)
+        request.messages     = messages
+        request.request_json = dict(self.request_json, messages=[*self.request_json['messages'][:-1], user_json      ])
+        request.api_dict     = dict(self.api_dict    , messages=[*self.api_dict    ['messages'][:-1], dict(user_json)])
+        self.uses += 1
+        return request
+
+
+class Open_Router__Request__Templates(Type_Safe):                                   # The request templates in use (keyed by their constant parts), so hot system prompts are only validated and serialised once
+    templates     : dict
+    max_templates : int                       = REQUEST_TEMPLATES__MAX_TEMPLATES
+    hits          : int
+    misses        : int
+    prompt_cache  : Open_Router__Prompt_Cache = None
+    lock          : object                    = None
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.lock = threading.RLock()
+        if self.prompt_cache is None:
+            self.prompt_cache = open_router__services.shared(Open_Router__Prompt_Cache)
+
+    def template(self, model         : str           ,
+                       system_prompt : Optional[str] ,
+                       temperature   : float         ,
+                       max_tokens    : int           ,
+                       provider      : Optional[str]
+                 ) -> Open_Router__Request__Template:
+        key      = (model, system_prompt, temperature, max_tokens, provider)
+        template = self.templates.get(key)
+        if template is not None:
+            self.hits += 1
+            return template
+        self.misses += 1
+        template = Open_Router__Request__Template.create(model=model, system_prompt=system_prompt, temperature=temperature,
+                                                         max_tokens=max_tokens, provider=provider, prompt_cache=self.prompt_cache)
+        with self.lock:
+            if len(self.templates) >= self.max_templates:
+                self.templates.pop(next(iter(self.templates)))                      # (the oldest one)
+            self.templates[key] = template
+        return template
+
+    def request(self, prompt: str, **kwargs) -> Schema__Open_Router__Chat_Request__From_Template:
+        return self.template(**kwargs).render(prompt)
+
+    def status(self) -> Dict[str, Any]:
+        return dict(templates     = len(self.templates) ,
+                    max_templates = self.max_templates  ,
+                    hits          = self.hits           ,
+                    misses        = self.misses         )
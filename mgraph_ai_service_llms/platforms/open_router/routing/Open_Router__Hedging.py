@@ -0,0 +1,126 @@
+import contextvars
+import threading
+from concurrent.futures                                                                 import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing                                                                             import Callable, Dict, Any, Optional, Tuple
+from osbot_utils.type_safe.Type_Safe                                                    import Type_Safe
+from mgraph_ai_service_llms.platforms.open_router.routing.Open_Router__Provider__Router import Open_Router__Provider__Router, ROUTING_POLICY__FASTEST
+from mgraph_ai_service_llms.platforms.open_router.routing.Open_Router__Provider__Stats  import Open_Router__Provider__Stats
+from mgraph_ai_service_llms.platforms.open_router.service.Open_Router__Services         import open_router__services
+
+HEDGE__DELAY_PERCENTILE = 90.0                                                      # the second request goes out when the first one is slower than this percentile
+HEDGE__DELAY_DEFAULT    = 2.0                                                       # delay (in seconds) used while there are not enough samples for the provider
+HEDGE__DELAY_MIN        = 0.25                                                      # never hedge sooner than this (avoids doubling the fast requests)
+HEDGE__MIN_SAMPLES      = 5
+HEDGE__MAX_EXTRA_COST   = 0.05                                                      # max estimated cost (in USD) of the extra request (None means no cap)
+
+
+class Open_Router__Hedge__Stats(Type_Safe):                                         # How often requests are hedged and which request wins
+    counters   : dict
+    extra_cost : float                                                              # estimated cost of the extra requests sent
+    lock       : object = None
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.lock = threading.RLock()
+
+    def increment(self, name: str, extra_cost: float = 0.0) -> None:
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + 1
+            self.extra_cost    += extra_cost
+
+    def summary(self) -> Dict[str, Any]:
+        with self.lock:
+            counters   = dict(self.counters)
+            extra_cost = self.extra_cost
+        requests   = counters.get('requests'  , 0)
+        hedged     = counters.get('hedged'    , 0)
+        hedge_wins = counters.get('hedge_wins', 0)
+        return dict(requests             = requests                                              ,
+                    hedged               = hedged                                                ,
+                    hedge_wins           = hedge_wins                                            ,
+                    primary_wins         = counters.get('primary_wins'        , 0)               ,
+                    failures             = counters.get('failures'            , 0)               ,
+                    skipped__cost_cap    = counters.get('skipped__cost_cap'   , 0)               ,
+                    skipped__no_provider = counters.get('skipped__no_provider', 0)               ,
+                    hedge_rate           = round(hedged     / requests, 4) if requests else 0.0  ,
+                    hedge_win_rate       = round(hedge_wins / hedged  , 4) if hedged   else 0.0  ,
+                    extra_cost           = round(extra_cost, 6)                                  )
+
+    def clear(self) -> None:
+        with self.lock:
+            self.counters.clear()
+            self.extra_cost = 0.0
+
+
+class Open_Router__Hedging(Type_Safe):                                              # Sends a second request (to another provider) when the first one is slow, first success wins
+    provider_stats   : Open_Router__Provider__Stats  = None
+    provider_router  : Open_Router__Provider__Router = None
+    hedge_stats      : Open_Router__Hedge__Stats     = None
+    delay_percentile : float                         = HEDGE__DELAY_PERCENTILE
+    delay_default    : float                         = HEDGE__DELAY_DEFAULT
+    delay_min        : float                         = HEDGE__DELAY_MIN
+    min_samples      : int                           = HEDGE__MIN_SAMPLES
+    max_extra_cost   : Optional[float]               = HEDGE__MAX_EXTRA_COST
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        if self.provider_stats is None:
+            self.provider_stats = open_router__services.shared(Open_Router__Provider__Stats)
+        if self.provider_router is None:
+            self.provider_router = Open_Router__Provider__Router(provider_stats=self.provider_stats)
+        if self.hedge_stats is None:
+            self.hedge_stats = open_router__services.shared(Open_Router__Hedge__Stats)
+
+    def hedge_delay(self, model: str, provider: Optional[str]) -> float:            # how long to wait for the first provider before hedging
+        successes = [sample for sample in self.provider_stats.recent(model, provider) if not sample['error']]
+        if len(successes) < self.min_samples:
+            return self.delay_default
+        return max(self.delay_min, self.provider_stats.latency(model, provider, self.delay_percentile))
+
+    def hedge_provider(self, model: str, provider: Optional[str]) -> Optional[str]:  # best other provider for the same model
+        for candidate in self.provider_router.preference_order(model=model, policy=ROUTING_POLICY__FASTEST):
+            if candidate != provider:
+                return candidate
+        return None
+
+    def run(self, attempt        : Callable                 ,                       # attempt(provider, cancel_event) -> result (None if it was cancelled)
+                  model          : str                      ,
+                  provider       : Optional[str]            ,
+                  hedge_provider : Optional[str]   = None   ,
+                  estimated_cost : Optional[float] = None                           # estimated cost of one request (used for the cost cap)
+            ) -> Tuple[Any, Dict[str, Any]]:
+        self.hedge_stats.increment('requests')
+        hedge_provider = hedge_provider or self.hedge_provider(model, provider)
+        if hedge_provider is None:
+            self.hedge_stats.increment('skipped__no_provider')
+            return attempt(provider, threading.Event()), dict(hedged=False, provider=provider, skipped='no_provider')
+        if self.max_extra_cost is not None and (estimated_cost is None or estimated_cost > self.max_extra_cost):
+            self.hedge_stats.increment('skipped__cost_cap')
+            return attempt(provider, threading.Event()), dict(hedged=False, provider=provider, skipped='cost_cap')
+
+        delay    = self.hedge_delay(model, provider)
+        cancels  = { provider: threading.Event(), hedge_provider: threading.Event() }
+        executor = ThreadPoolExecutor(max_workers=2)
+        try:
+            primary = executor.submit(contextvars.copy_context().run, attempt, provider, cancels[provider])              # (attempts see the request context, e.g. tenant and route)
+            done, _ = wait([primary], timeout=delay)
+            if done and primary.exception() is None:
+                return primary.result(), dict(hedged=False, provider=provider, delay=delay)
+
+            hedge   = executor.submit(contextvars.copy_context().run, attempt, hedge_provider, cancels[hedge_provider])    # primary is slow (or already failed)
+            futures = { primary: provider, hedge: hedge_provider }
+            self.hedge_stats.increment('hedged', extra_cost=estimated_cost or 0.0)
+            pending = set(futures)
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    if future.exception() is None and future.result() is not None:
+                        winner = futures[future]
+                        for loser in pending:
+                            cancels[futures[loser]].set()                           # the loser stops reading (and closes its connection)
+                        self.hedge_stats.increment('hedge_wins' if winner == hedge_provider else 'primary_wins')
+                        return future.result(), dict(hedged=True, provider=winner, delay=delay, hedge_provider=hedge_provider)
+            self.hedge_stats.increment('failures')
+            raise primary.exception() or hedge.exception()
+        finally:
+            executor.shutdown(wait=False)                                           # don't wait for a cancelled loser
@@ -0,0 +1,86 @@
+import random
+from typing                                                                                     import Dict, Any, List, Optional
+from osbot_utils.type_safe.Type_Safe                                                            import Type_Safe
+from mgraph_ai_service_llms.platforms.open_router.routing.Open_Router__Provider__Stats          import Open_Router__Provider__Stats
+from mgraph_ai_service_llms.platforms.open_router.service.Open_Router__Services                 import open_router__services
+from mgraph_ai_service_llms.service.llms.providers.open_router.Schema__Open_Router__Providers   import Schema__Open_Router__Providers
+
+ROUTING_POLICY__FASTEST  = 'fastest'                                                # lowest p90 latency
+ROUTING_POLICY__CHEAPEST = 'cheapest'                                               # lowest p50 cost per 1k tokens
+ROUTING_POLICY__BALANCED = 'balanced'                                               # latency and cost (relative to the best provider) weighted equally
+ROUTING_POLICIES         = [ROUTING_POLICY__FASTEST, ROUTING_POLICY__CHEAPEST, ROUTING_POLICY__BALANCED]
+
+ROUTING__MIN_SAMPLES     = 5                                                        # providers with fewer (recent) samples are not ranked
+ROUTING__MAX_ERROR_RATE  = 0.5                                                      # providers failing more than this are skipped
+ROUTING__EXPLORE_RATE    = 0.05                                                     # share of requests sent to a provider (known to serve the model) without enough samples
+
+
+class Open_Router__Provider__Router(Type_Safe):                                     # Picks the provider for a request from the observed (rolling) provider performance
+    provider_stats : Open_Router__Provider__Stats = None
+    candidates     : List[str]
+    min_samples    : int   = ROUTING__MIN_SAMPLES
+    max_error_rate : float = ROUTING__MAX_ERROR_RATE
+    explore_rate   : float = ROUTING__EXPLORE_RATE
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        if self.provider_stats is None:
+            self.provider_stats = open_router__services.shared(Open_Router__Provider__Stats)
+        if not self.candidates:
+            self.candidates = [provider.value for provider in Schema__Open_Router__Providers
+                                              if provider != Schema__Open_Router__Providers.AUTO]
+
+    def serving(self, model: str, default: Optional[str] = None) -> List[str]:      # the candidates known to serve the model (and the default), since a pinned request (allow_fallbacks=False) to a provider without the model fails
+        served = self.provider_stats.serving(model)
+        return [provider for provider in self.candidates if provider in served or provider == default]
+
+    def ranked(self, model: str, policy: str) -> List[Dict[str, Any]]:              # healthy providers (with enough samples) best first
+        summaries = [summary for summary in self.provider_stats.summaries(model)
+                             if summary['provider'] in self.candidates          and
+                                summary['samples' ] >= self.min_samples         and
+                                summary['error_rate'] <= self.max_error_rate    and
+                                summary['latency_p90'] is not None                 ]
+        if not summaries:
+            return []
+        best_latency = min(summary['latency_p90'] for summary in summaries) or 1e-9
+        costs        = [summary['cost_per_1k_p50'] for summary in summaries if summary['cost_per_1k_p50']]
+        best_cost    = min(costs) if costs else None
+
+        def cost(summary):
+            return summary['cost_per_1k_p50'] if summary['cost_per_1k_p50'] is not None else float('inf')
+
+        def score(summary):
+            if policy == ROUTING_POLICY__CHEAPEST:
+                return (cost(summary), summary['latency_p90'])
+            if policy == ROUTING_POLICY__BALANCED:
+                relative_latency = summary['latency_p90'] / best_latency
+                relative_cost    = cost(summary) / best_cost if best_cost else 1.0
+                return (relative_latency + relative_cost + summary['error_rate'], summary['latency_p90'])
+            return (summary['latency_p90'], cost(summary))                          # ROUTING_POLICY__FASTEST
+
+        return sorted(summaries, key=score)
+
+    def select(self, model   : str                  ,                               # provider to use for this request (default when there is no data)
+                     policy  : str                  = ROUTING_POLICY__FASTEST ,
+                     default : Optional[str]        = None
+               ) -> Optional[str]:
+        if policy not in ROUTING_POLICIES:
+            raise ValueError(f"Invalid routing policy: {policy}. Valid options: {ROUTING_POLICIES}")
+        unexplored = [provider for provider in self.serving(model, default)
+                               if len(self.provider_stats.recent(model, provider)) < self.min_samples]
+        if unexplored and random.random() < self.explore_rate:                     # keep collecting samples for the providers we don't know yet
+            return random.choice(unexplored)
+        ranked = self.ranked(model, policy)
+        if ranked:
+            return ranked[0]['provider']
+        return default
+
+    def preference_order(self, model   : str                ,                       # the candidates serving the model, best first (unranked ones at the end, default first among those)
+                               policy  : str                = ROUTING_POLICY__FASTEST ,
+                               default : Optional[str]      = None
+                         ) -> List[str]:
+        order = [summary['provider'] for summary in self.ranked(model, policy)]
+        if default and default not in order:
+            order.append(default)
+        order.extend(provider for provider in self.serving(model) if provider not in order)
+        return order
@@ -0,0 +1,101 @@
+import math
+import threading
+import time
+from collections                                                                    import deque
+from typing                                                                         import Dict, Any, List, Optional
+from osbot_utils.type_safe.Type_Safe                                                import Type_Safe
+
+PROVIDER_STATS__WINDOW_SIZE    = 100                                                # samples kept per (model, provider)
+PROVIDER_STATS__WINDOW_SECONDS = 900.0                                              # samples older than this are ignored (15 minutes)
+
+
+def percentile(values: List[float], percent: float) -> Optional[float]:             # nearest-rank percentile (values don't need to be sorted)
+    if not values:
+        return None
+    ordered = sorted(values)
+    index   = max(0, min(len(ordered), math.ceil(percent / 100 * len(ordered))) - 1)
+    return ordered[index]
+
+
+class Open_Router__Provider__Stats(Type_Safe):                                      # Rolling performance samples per (model, provider), recorded from real responses
+    window_size    : int    = PROVIDER_STATS__WINDOW_SIZE
+    window_seconds : float  = PROVIDER_STATS__WINDOW_SECONDS
+    samples        : dict                                                           # (model, provider) -> deque of samples
+    lock           : object = None
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.lock = threading.RLock()
+
+    def record(self, model             : str             ,                          # record one request (success or error)
+                     provider          : str             ,
+                     duration          : float           ,
+                     ttft              : Optional[float] = None ,                   # time to first token (only known when streaming)
+                     completion_tokens : int             = 0    ,
+                     total_tokens      : int             = 0    ,
+                     cost              : float           = 0.0  ,
+                     error             : bool            = False
+                ) -> None:
+        sample = dict(timestamp         = time.time()                                                  ,
+                      duration          = duration                                                     ,
+                      ttft              = ttft if ttft is not None else duration                       ,
+                      tokens_per_second = completion_tokens / duration if duration and completion_tokens else None,
+                      cost_per_1k       = cost / total_tokens * 1000 if total_tokens and cost else None,
+                      error             = error                                                        )
+        key = (str(model), str(provider or 'auto'))
+        with self.lock:
+            if key not in self.samples:
+                self.samples[key] = deque(maxlen=self.window_size)
+            self.samples[key].append(sample)
+
+    def record_error(self, model: str, provider: str, duration: float) -> None:
+        self.record(model=model, provider=provider, duration=duration, error=True)
+
+    def recent(self, model: str, provider: str) -> List[dict]:                      # samples still inside the time window
+        cutoff = time.time() - self.window_seconds
+        with self.lock:
+            return [sample for sample in self.samples.get((str(model), str(provider)), []) if sample['timestamp'] >= cutoff]
+
+    def latency(self, model: str, provider: str, percent: float) -> Optional[float]:   # percentile of the recent successful request durations
+        durations = [sample['duration'] for sample in self.recent(model, provider) if not sample['error']]
+        return percentile(durations, percent)
+
+    def providers(self, model: str) -> List[str]:
+        with self.lock:
+            return sorted(provider for (sample_model, provider) in self.samples if sample_model == str(model))
+
+    def serving(self, model: str) -> List[str]:                                     # providers that returned a successful response for this model (so they are known to serve it)
+        with self.lock:
+            return sorted(provider for (sample_model, provider), samples in self.samples.items()
+                                   if sample_model == str(model) and any(not sample['error'] for sample in samples))
+
+    def summary(self, model: str, provider: str) -> Dict[str, Any]:                 # rolling percentiles for one (model, provider)
+        samples   = self.recent(model, provider)
+        successes = [sample for sample in samples if not sample['error']]
+        def values(name):
+            return [sample[name] for sample in successes if sample[name] is not None]
+        durations         = values('duration'         )
+        ttfts             = values('ttft'             )
+        tokens_per_second = values('tokens_per_second')
+        costs_per_1k      = values('cost_per_1k'      )
+        return dict(model                 = str(model)                                              ,
+                    provider              = str(provider)                                           ,
+                    samples               = len(samples)                                            ,
+                    error_rate            = round(1 - len(successes) / len(samples), 4) if samples else 0.0,
+                    latency_p50           = percentile(durations        , 50)                       ,
+                    latency_p90           = percentile(durations        , 90)                       ,
+                    latency_p99           = percentile(durations        , 99)                       ,
+                    ttft_p50              = percentile(ttfts            , 50)                       ,
+                    ttft_p90              = percentile(ttfts            , 90)                       ,
+                    tokens_per_second_p50 = percentile(tokens_per_second, 50)                       ,
+                    cost_per_1k_p50       = percentile(costs_per_1k     , 50)                       )
+
+    def summaries(self, model: Optional[str] = None) -> List[Dict[str, Any]]:       # all (model, provider) pairs (optionally for one model)
+        with self.lock:
+            keys = sorted(self.samples)
+        return [self.summary(key_model, key_provider) for key_model, key_provider in keys
+                if model is None or key_model == str(model)]
+
+    def clear(self) -> None:
+        with self.lock:
+            self.samples.clear()
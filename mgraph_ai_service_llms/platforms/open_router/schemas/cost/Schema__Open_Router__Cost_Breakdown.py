@@ -10,6 +10,8 @@ class Schema__Open_Router__Cost_Breakdown(Type_Safe):               # Detailed c
     prompt_tokens        : int                                              # Number of prompt tokens
     completion_tokens    : int                                          # Number of completion tokens
     total_tokens         : int                                          # Total tokens used
+    cached_tokens        : int                                          # Prompt tokens read from the provider's prompt cache
+    cache_write_tokens   : int                                          # Prompt tokens written to the provider's prompt cache
     prompt_cost          : Safe_Float                                   # Cost for prompt tokens
     completion_cost      : Safe_Float                                   # Cost for completion tokens
     cache_read_cost      : Safe_Float = None                            # Cost for cache reads (if applicable)
@@ -26,7 +28,7 @@ class Schema__Open_Router__Cost_Breakdown(Type_Safe):               # Detailed c
 
     def to_display_dict(self) -> Dict[str, str]:
         """Convert to human-readable display format"""
-        return {
+        display = {
             "prompt_tokens"     : str(self.prompt_tokens)                          ,
             "completion_tokens" : str(self.completion_tokens)                      ,
             "total_tokens"      : str(self.total_tokens)                           ,
@@ -36,4 +38,11 @@ class Schema__Open_Router__Cost_Breakdown(Type_Safe):               # Detailed c
             "cost_per_1k"       : f"${self.cost_per_1k_tokens:.6f}"                ,
             "model"             : str(self.model_id)                               ,
             "provider"          : str(self.provider) if self.provider else "auto"  ,
-        }
\ No newline at end of file
+        }
+        if self.cached_tokens:                                                  # (only when the provider's prompt cache was used)
+            display["cached_tokens"     ] = str(self.cached_tokens)
+            display["cache_read_cost"   ] = f"${float(self.cache_read_cost or 0):.6f}"
+        if self.cache_write_tokens:
+            display["cache_write_tokens"] = str(self.cache_write_tokens)
+            display["cache_write_cost"  ] = f"${float(self.cache_write_cost or 0):.6f}"
+        return display
\ No newline at end of file
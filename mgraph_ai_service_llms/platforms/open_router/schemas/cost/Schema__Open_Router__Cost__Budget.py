@@ -0,0 +1,5 @@
+from osbot_utils.type_safe.Type_Safe                    import Type_Safe
+
+
+class Schema__Open_Router__Cost__Budget(Type_Safe):                                 # Spend limit for the whole service or for one tenant (0 means no limit)
+    daily_usd : float = 0.0                                                         # per UTC day
@@ -0,0 +1,6 @@
+from enum import Enum
+
+class Enum__Open_Router__Request_Priority(Enum):                                    # scheduler lanes (same values as REQUEST_PRIORITIES)
+    interactive : str = 'interactive'
+    batch       : str = 'batch'
+    background  : str = 'background'
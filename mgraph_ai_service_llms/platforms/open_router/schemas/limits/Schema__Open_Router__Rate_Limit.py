@@ -0,0 +1,7 @@
+from osbot_utils.type_safe.Type_Safe                    import Type_Safe
+
+
+class Schema__Open_Router__Rate_Limit(Type_Safe):                                   # Client side limits for one model or provider (0 means no limit)
+    requests_per_minute : int = 0
+    tokens_per_minute   : int = 0                                                   # prompt (estimated) + max_tokens, corrected with the actual usage
+    max_concurrency     : int = 0                                                   # requests in flight
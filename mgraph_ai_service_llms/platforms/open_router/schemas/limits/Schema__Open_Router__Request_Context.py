@@ -0,0 +1,10 @@
+from typing                                             import Optional
+from osbot_utils.type_safe.Type_Safe                    import Type_Safe
+
+REQUEST_CONTEXT__TENANT__ANONYMOUS = 'anonymous'
+
+
+class Schema__Open_Router__Request_Context(Type_Safe):                              # Who is asking (for per-tenant fairness) and until when they will wait
+    tenant   : str             = REQUEST_CONTEXT__TENANT__ANONYMOUS
+    deadline : Optional[float] = None                                               # epoch seconds (None means: the lane's default timeout)
+    route    : str             = ''                                                 # request path (used to break down the costs)
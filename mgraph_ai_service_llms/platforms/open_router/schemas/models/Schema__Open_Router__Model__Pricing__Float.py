@@ -1,4 +1,5 @@
-from decimal import Decimal
+from decimal   import Decimal
+from functools import lru_cache
 
 from osbot_utils.type_safe.primitives.safe_float.Safe_Float import Safe_Float
 
@@ -10,15 +11,18 @@ class Schema__Open_Router__Model__Pricing__Float(Safe_Float):
     def to_original_string(self) -> str:             # Convert back to original price string format
         if self == 0:
             return "0"
+        return original_price_string(str(self))      # the catalogue only has a few hundred distinct prices, so each one is formatted once
 
 
-        d = Decimal(str(self))                      # Use Decimal to maintain precision
+@lru_cache(maxsize=4096)
+def original_price_string(value: str) -> str:
+    d = Decimal(value)                               # Use Decimal to maintain precision
 
 
-        formatted = format(d, 'f')                  # Format without scientific notation
+    formatted = format(d, 'f')                       # Format without scientific notation
 
-        # Remove trailing zeros after decimal point
-        if '.' in formatted:
-            formatted = formatted.rstrip('0').rstrip('.')
+    # Remove trailing zeros after decimal point
+    if '.' in formatted:
+        formatted = formatted.rstrip('0').rstrip('.')
 
-        return formatted if formatted else "0"
\ No newline at end of file
+    return formatted if formatted else "0"
@@ -0,0 +1,6 @@
+from enum import Enum
+
+class Enum__Open_Router__Routing_Policy(Enum):                                      # how the provider is picked (same values as ROUTING_POLICIES)
+    fastest  : str = 'fastest'
+    cheapest : str = 'cheapest'
+    balanced : str = 'balanced'
@@ -0,0 +1,40 @@
+import threading
+from typing                                                                         import Any, Callable, Dict
+from osbot_utils.type_safe.Type_Safe                                                import Type_Safe
+
+
+class Open_Router__Services(Type_Safe):                                             # Registry of the objects shared by the whole process (services, catalogue, cache backends, limiters, stats, ledger), so that each one is created, loaded and set up once, and all the requests see the same state
+    services : dict                                                                 # key (usually the class) -> shared object
+    lock     : object = None
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.lock = threading.RLock()
+
+    def shared(self, key: Any, factory: Callable[[], Any] = None) -> Any:           # the object registered for key (created with factory, or key(), on first use)
+        service = self.services.get(key)
+        if service is None:
+            with self.lock:                                                         # (re-entrant: a factory can ask for the objects it depends on)
+                service = self.services.get(key)
+                if service is None:
+                    service = factory() if factory else key()
+                    self.services[key] = service
+        return service
+
+    def register(self, key: Any, service: Any) -> Any:                              # replace the shared object (e.g. a pre-configured one)
+        with self.lock:
+            self.services[key] = service
+        return service
+
+    def reset(self, key: Any = None) -> None:                                       # the next shared() call creates a new object (all of them when key is None)
+        with self.lock:
+            if key is None:
+                self.services = {}
+            else:
+                self.services.pop(key, None)
+
+    def status(self) -> Dict[str, Any]:
+        return dict(services = sorted(getattr(key, '__name__', str(key)) for key in list(self.services)))
+
+
+open_router__services = Open_Router__Services()                                     # shared by all the Open Router services in this process
@@ -2,6 +2,8 @@ import time
 from typing                                                                                                  import Dict, Any, Optional
 from osbot_utils.type_safe.Type_Safe                                                                         import Type_Safe
 from mgraph_ai_service_llms.platforms.open_router.service.Service__Open_Router                               import Service__Open_Router
+from mgraph_ai_service_llms.platforms.open_router.service.Open_Router__Services                              import open_router__services
+from mgraph_ai_service_llms.platforms.open_router.limits.Open_Router__Rate_Limiter                           import REQUEST_PRIORITY__INTERACTIVE
 from mgraph_ai_service_llms.service.llms.providers.open_router.Schema__Open_Router__Providers                import Schema__Open_Router__Providers
 
 HIGH_THROUGHPUT_MODELS = { "gpt-oss-120b"  : "openai/gpt-oss-120b"  ,
@@ -16,12 +18,14 @@ class Service__LLM__Simple(Type_Safe):
 
     def __init__(self):
         super().__init__()
-        self.open_router = Service__Open_Router()
+        self.open_router = open_router__services.shared(Service__Open_Router)                        # (one per process)
 
     def execute_completion(self, user_prompt   : str                                             ,      # Execute LLM completion with provider routing
                                  system_prompt : Optional[str]                            = None ,
                                  model_key     : str                                      = "gpt-oss-120b",
-                                 provider_name : Optional[Schema__Open_Router__Providers] = None
+                                 provider_name : Optional[Schema__Open_Router__Providers] = None ,
+                                 routing_policy: Optional[str]                            = None ,      # 'fastest', 'cheapest' or 'balanced' (provider_name becomes the default)
+                                 hedge         : bool                                     = False       # send a second request to another provider if the first one is slow
                            ) -> Dict[str, Any]:
 
         model_id = HIGH_THROUGHPUT_MODELS.get(model_key)
@@ -40,7 +44,10 @@ class Service__LLM__Simple(Type_Safe):
             temperature   = 0              ,
             max_tokens    = 20000          ,
             provider      = provider_value ,
-            max_cost      = 0.5            )
+            max_cost      = 0.5            ,
+            routing_policy= routing_policy ,
+            hedge         = hedge          ,
+            priority      = REQUEST_PRIORITY__INTERACTIVE)
 
         duration = time.perf_counter() - start_time
 
@@ -52,7 +59,8 @@ class Service__LLM__Simple(Type_Safe):
                  "duration_seconds" : round(duration, 3)   ,
                  "model_used"       : model_id             ,
                  "provider_used"    : actual_provider      ,
-                 "response_text"    : response_text        }
+                 "response_text"    : response_text        ,
+                 "hedge"            : response.get("hedge")}
 
     # def execute_completion_with_preferences(self, user_prompt          : str                                             ,      # Execute with full provider preferences
     #                                               system_prompt        : Optional[str]                            = None ,
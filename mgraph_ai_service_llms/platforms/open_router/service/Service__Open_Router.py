@@ -1,33 +1,77 @@
 # mgraph_ai_service_llms/platforms/open_router/service/Service__Open_Router.py
 import json
-import requests
-from typing                                                                                                 import Dict, Any, Optional, Iterator
-from osbot_utils.decorators.methods.cache_on_self                                                           import cache_on_self
+import threading
+import time
+from concurrent.futures                                                                                     import ThreadPoolExecutor
+from typing                                                                                                 import Dict, Any, List, Optional, Iterator, Tuple
 from osbot_utils.type_safe.Type_Safe                                                                        import Type_Safe
 from osbot_utils.utils.Env                                                                                  import get_env
 from mgraph_ai_service_llms.platforms.open_router.cache.Open_Router__Chat__Cache                            import Open_Router__Chat__Cache
+from mgraph_ai_service_llms.platforms.open_router.cache.Open_Router__Cache__GC                              import Open_Router__Cache__GC
+from mgraph_ai_service_llms.platforms.open_router.cache.Open_Router__Catalogue__Views                       import Open_Router__Catalogue__Views, cache_on_catalogue
+from mgraph_ai_service_llms.platforms.open_router.cache.Open_Router__Catalogue__Payload                     import Open_Router__Catalogue__Payload
+from mgraph_ai_service_llms.platforms.open_router.cache.Open_Router__Catalogue__Index                       import CATALOGUE_INDEX__LIST_FIELDS
 from mgraph_ai_service_llms.platforms.open_router.schemas.Safe_Str__Open_Router__Model_ID                   import Safe_Str__Open_Router__Model_ID
 from mgraph_ai_service_llms.platforms.open_router.schemas.request.Schema__Open_Router__Chat_Request         import Schema__Open_Router__Chat_Request
-from mgraph_ai_service_llms.platforms.open_router.schemas.request.Schema__Open_Router__Provider_Preferences import Schema__Open_Router__Provider_Preferences
 from mgraph_ai_service_llms.platforms.open_router.schemas.request.Schema__Open_Router__Request_Headers      import Schema__Open_Router__Request_Headers
 from mgraph_ai_service_llms.platforms.open_router.schemas.request.Safe_Str__Message_Content                 import Safe_Str__Message_Content
 from mgraph_ai_service_llms.platforms.open_router.service.Service__Open_Router__Models                      import Service__Open_Router__Models
+from mgraph_ai_service_llms.platforms.open_router.service.Open_Router__Services                             import open_router__services
 from mgraph_ai_service_llms.platforms.open_router.service.Service__Open_Router__Cost                        import Service__Open_Router__Cost
 from mgraph_ai_service_llms.platforms.open_router.schemas.request.Schema__Open_Router__Message              import Schema__Open_Router__Message
+from mgraph_ai_service_llms.platforms.open_router.routing.Open_Router__Provider__Router                     import Open_Router__Provider__Router, ROUTING_POLICY__FASTEST
+from mgraph_ai_service_llms.platforms.open_router.routing.Open_Router__Provider__Stats                      import Open_Router__Provider__Stats
+from mgraph_ai_service_llms.platforms.open_router.routing.Open_Router__Hedging                              import Open_Router__Hedging
+from mgraph_ai_service_llms.platforms.open_router.limits.Open_Router__Rate_Limiter                          import Open_Router__Rate_Limiter, REQUEST_PRIORITY__INTERACTIVE
+from mgraph_ai_service_llms.platforms.open_router.direct.Open_Router__Direct__Adapter                       import Open_Router__Direct__Adapter
+from mgraph_ai_service_llms.platforms.open_router.direct.Open_Router__Direct__Adapters                      import Open_Router__Direct__Adapters
+from mgraph_ai_service_llms.platforms.open_router.limits.Open_Router__Scheduler                             import Open_Router__Scheduler
+from mgraph_ai_service_llms.platforms.open_router.limits.Open_Router__Request_Context                       import request_context
+from mgraph_ai_service_llms.platforms.open_router.request.Open_Router__Request__Template                    import Open_Router__Request__Templates
+from mgraph_ai_service_llms.platforms.open_router.cost.Open_Router__Cost__Ledger                            import Open_Router__Cost__Ledger
+from mgraph_ai_service_llms.service.llms.transport.LLM__Transport                                           import LLM__Transport, llm__transport
+from mgraph_ai_service_llms.service.perf.Perf__Span                                                         import span
+from mgraph_ai_service_llms.service.metrics.LLM__Metrics                                                    import LLM__Metrics, llm__metrics, METRIC__REQUEST_DURATION, METRIC__UPSTREAM_DURATION, METRIC__UPSTREAM_ERRORS, METRIC__STREAM_TTFT, METRIC__TOKENS, METRIC__COST_USD
+from mgraph_ai_service_llms.service.llms.resilience.LLM__Resilience                                         import LLM__Resilience
+from mgraph_ai_service_llms.service.schemas.Schema__Cache__Ids                                              import CACHE_IDS__MAX_BATCH_SIZE, CACHE_IDS__MAX_WORKERS
 
 ENV_NAME_OPEN_ROUTER__API_KEY = "OPEN_ROUTER__API_KEY"
+FAILOVER__MAX_PROVIDERS       = 3                                                                        # requested provider plus (up to) two others
+HEDGE__READ_CHUNK_SIZE        = 1024                                                                     # small chunks, so that a cancelled (hedged) request notices quickly
 
 
 class Service__Open_Router(Type_Safe):                                                                   # Main service for OpenRouter API interactions
 
-    api_base_url   : str                        = "https://openrouter.ai/api"
-    models_service : Service__Open_Router__Models = None
-    cost_service   : Service__Open_Router__Cost   = None
+    api_base_url      : str                             = "https://openrouter.ai/api"
+    models_service    : Service__Open_Router__Models    = None
+    cost_service      : Service__Open_Router__Cost      = None
+    provider_stats    : Open_Router__Provider__Stats    = None
+    provider_router   : Open_Router__Provider__Router   = None
+    hedging           : Open_Router__Hedging            = None
+    resilience        : LLM__Resilience                 = None
+    rate_limiter      : Open_Router__Rate_Limiter       = None
+    scheduler         : Open_Router__Scheduler          = None
+    direct_adapters   : Open_Router__Direct__Adapters   = None
+    transport         : LLM__Transport                  = None
+    metrics           : LLM__Metrics                    = None
+    cost_ledger       : Open_Router__Cost__Ledger       = None
+    request_templates : Open_Router__Request__Templates = None
 
     def __init__(self):
         super().__init__()
-        self.models_service = Service__Open_Router__Models()
-        self.cost_service   = Service__Open_Router__Cost()
+        self.models_service    = open_router__services.shared(Service__Open_Router__Models)              # shared, so the catalogue is loaded, indexed and costed once per process
+        self.cost_service      = open_router__services.shared(Service__Open_Router__Cost  )              # (uses the same models service, so that a refresh also reprices the responses)
+        self.provider_stats    = open_router__services.shared(Open_Router__Provider__Stats)              # (all the requests of this process contribute to the routing)
+        self.provider_router   = Open_Router__Provider__Router(provider_stats=self.provider_stats)
+        self.hedging           = Open_Router__Hedging         (provider_stats=self.provider_stats, provider_router=self.provider_router)
+        self.resilience        = LLM__Resilience              ()                                         # circuit breakers are shared (per model and provider)
+        self.rate_limiter      = open_router__services.shared(Open_Router__Rate_Limiter)                 # (the limits apply to the whole process)
+        self.scheduler         = open_router__services.shared(Open_Router__Scheduler)                    # (the lanes, and tenants, compete for the same slots)
+        self.direct_adapters   = Open_Router__Direct__Adapters()
+        self.transport         = llm__transport                                                          # shared connection pool (keep-alive connections are reused across requests)
+        self.metrics           = llm__metrics                                                            # shared, scraped at /info/metrics
+        self.cost_ledger       = open_router__services.shared(Open_Router__Cost__Ledger)                 # (the budgets apply to the whole process)
+        self.request_templates = open_router__services.shared(Open_Router__Request__Templates)           # (each hot system prompt is validated and serialised once per process)
 
     def api_key(self) -> str:                                                                            # Get API key from environment
         api_key = get_env(ENV_NAME_OPEN_ROUTER__API_KEY)
@@ -35,9 +79,8 @@ class Service__Open_Router(Type_Safe):
             raise ValueError(f"API key not found in environment variable: {ENV_NAME_OPEN_ROUTER__API_KEY}")
         return api_key
 
-    @cache_on_self
-    def chat_cache(self):
-        return Open_Router__Chat__Cache().setup()
+    def chat_cache(self):                                                                                # (one cache backend per process)
+        return open_router__services.shared(Open_Router__Chat__Cache, lambda: Open_Router__Chat__Cache().setup())
 
     def chat_completion_url(self) -> str:                                                                # Get chat completion endpoint URL
         return f"{self.api_base_url}/v1/chat/completions"
@@ -64,54 +107,253 @@ class Service__Open_Router(Type_Safe):
                               temperature   : float                               = 0.7  ,
                               max_tokens    : int                                = 5000 ,
                               provider      : Optional[str  ]                    = None ,
-                              max_cost      : Optional[float]                    = None
+                              max_cost      : Optional[float]                    = None ,
+                              routing_policy: Optional[str  ]                    = None ,                # 'fastest', 'cheapest' or 'balanced' (picks the provider, using 'provider' as the default)
+                              hedge         : bool                               = False,                # send a second request to another provider if this one is slow (first success wins)
+                              failover      : Optional[bool ]                    = None ,                # on provider failures (after retries) try the next providers (None: only when the caller didn't pin the provider)
+                              priority      : str                                = REQUEST_PRIORITY__INTERACTIVE,         # scheduler lane: 'interactive', 'batch' or 'background' (weighted 8:2:1 when all are busy)
+                              tenant        : Optional[str  ]                    = None                 # fairness key inside the lane (defaults to the tenant of the current HTTP request)
                         ) -> Dict[str, Any]:
-        kwargs = dict(model         = Safe_Str__Open_Router__Model_ID(model)      ,
-                      prompt        = Safe_Str__Message_Content(prompt)           ,
-                      system_prompt = Safe_Str__Message_Content(system_prompt) if system_prompt else None,
-                      temperature   = temperature                                  ,
-                      max_tokens    = max_tokens)
-        if provider:
-            kwargs['provider'] = Schema__Open_Router__Provider_Preferences(order=[provider], allow_fallbacks=False)
-
-        request = Schema__Open_Router__Chat_Request.create_simple(**kwargs)
-
-        request_data = request.json()
-
-        cache_id = self.chat_cache().generate_cache_id(request_data)
-        cached_response = self.chat_cache().get_cached_response(request_data)
+        start_time = time.perf_counter()
+        if failover is None:
+            failover = not provider or bool(routing_policy)                                             # a pinned provider is only replaced when asked for
+        if routing_policy:
+            provider = self.provider_router.select(model=model, policy=routing_policy, default=provider)
+
+        def create_request(request_provider):
+            return self.chat_completion__request(prompt=prompt, model=model, system_prompt=system_prompt, temperature=temperature,
+                                                 max_tokens=max_tokens, provider=request_provider)
+
+        with span('chat.request'):                                                                        # Type_Safe request construction
+            request      = create_request(provider)
+            request_data = request.json()
+
+        with span('chat.cache_lookup'):
+            cache_id        = self.chat_cache().generate_cache_id(request_data)
+            cached_response = self.chat_cache().get_cached_response(request_data)
+        self.metrics.cache_lookup('chat', hit=bool(cached_response))
+        context = request_context()
+        tenant  = tenant or context.tenant
         if cached_response:
             cached_response['from_cache'] = True
             cached_response['cache_id'  ] = str(cache_id)  # Add cache_id here
+            self.cost_ledger.record_cache_hit(model=model, provider=cached_response.get("provider") or provider, route=context.route, tenant=tenant,
+                                              cost_avoided=self.response_cost(cached_response, model))
+            self.metrics.observe(METRIC__REQUEST_DURATION, time.perf_counter() - start_time, model=model, provider=provider or 'default', cache='hit')
             return cached_response
 
+        hedge_info     = None
+        served_by      = dict(provider=provider)                                                        # the provider that actually answered (can differ after a failover or a hedge)
+        estimated_cost = self.hedge_cost_estimate(model=model, prompt_length=len(prompt) + len(system_prompt or ''), max_tokens=max_tokens)
+        with span('chat.budget'):                                                                         # over budget requests are rejected before they queue (or cost anything)
+            reservation = self.cost_ledger.reserve(tenant=tenant, estimated_cost=estimated_cost)
+        with reservation:
+            with span('chat.queue'):                                                                      # cache hits don't need a slot
+                slot = self.scheduler.slot(lane=priority, tenant=tenant, deadline=context.deadline)
+            with slot:
+                if hedge:
+                    def attempt(attempt_provider, cancel):
+                        attempt_request = request if attempt_provider == provider else create_request(attempt_provider)
+                        return self.resilience.call(model     = model                                                                                    ,
+                                                    providers = [attempt_provider]                                                                       ,
+                                                    send      = lambda _: self.chat_completion__send(attempt_request, model=model, provider=attempt_provider,
+                                                                                                     max_cost=max_cost, cancel=cancel, priority=priority, tenant=tenant))
+                    response_data, hedge_info = self.hedging.run(attempt, model=model, provider=provider, estimated_cost=estimated_cost)
+                    served_by['provider']     = hedge_info.get('provider')
+                else:
+                    def send(send_provider):
+                        send_request          = request if send_provider == provider else create_request(send_provider)
+                        send_response         = self.chat_completion__send(send_request, model=model, provider=send_provider, max_cost=max_cost, priority=priority, tenant=tenant)
+                        served_by['provider'] = send_provider
+                        return send_response
+                    providers     = self.failover_providers(model, provider) if failover else [provider]
+                    response_data = self.resilience.call(model=model, providers=providers, send=send)
+
+        with span('chat.cache_write'):
+            if served_by['provider'] != provider:                                                        # cached under the provider that served it (never under the pinned one)
+                request_data = create_request(served_by['provider']).json()
+                cache_id     = self.chat_cache().generate_cache_id(request_data)
+            self.chat_cache().cache_chat_response(request_data, response_data)
+        response_data['cache_id'] = str(cache_id)
+        if hedge_info:
+            response_data['hedge'] = hedge_info
 
+        self.metrics.observe(METRIC__REQUEST_DURATION, time.perf_counter() - start_time, model=model, provider=provider or 'default', cache='miss')
+        return response_data
+
+    def failover_providers(self, model: str, provider: Optional[str]) -> List[Optional[str]]:            # requested provider first, then the best others (when OpenRouter picks, it also does the failover)
+        if not provider:
+            return [provider]
+        others = [candidate for candidate in self.provider_router.preference_order(model=model, policy=ROUTING_POLICY__FASTEST)
+                            if candidate != provider]
+        return [provider] + others[:FAILOVER__MAX_PROVIDERS - 1]
+
+    def chat_completion__request(self, prompt        : str             ,                                 # Create the (simple) chat request for one provider
+                                       model         : str             ,
+                                       system_prompt : Optional[str  ] ,
+                                       temperature   : float           ,
+                                       max_tokens    : int             ,
+                                       provider      : Optional[str  ]
+                                 ) -> Schema__Open_Router__Chat_Request:
+        return self.request_templates.request(prompt        = prompt        ,                             # (only the prompt is validated, the rest comes from the template)
+                                              model         = model         ,
+                                              system_prompt = system_prompt ,
+                                              temperature   = temperature   ,
+                                              max_tokens    = max_tokens    ,
+                                              provider      = provider      )
+
+    def chat_completion__send(self, request  : Schema__Open_Router__Chat_Request ,                      # Send the request once the rate limiter admits it (queued in priority order)
+                                    model    : str                               ,
+                                    provider : Optional[str  ]          = None   ,
+                                    max_cost : Optional[float]          = None   ,
+                                    cancel   : Optional[threading.Event] = None  ,
+                                    priority : str                      = REQUEST_PRIORITY__INTERACTIVE,
+                                    tenant   : Optional[str  ]          = None                           # (for the cost ledger)
+                              ) -> Optional[Dict[str, Any]]:
+        with span('chat.rate_limit'):
+            permit = self.rate_limiter.acquire(model    = model                       ,
+                                               provider = provider                    ,
+                                               tokens   = self.request_tokens(request),
+                                               priority = priority                    )
+        with permit:
+            response_data = self.chat_completion__post(request, model=model, provider=provider, max_cost=max_cost, cancel=cancel, tenant=tenant)
+            if response_data:
+                permit.tokens_used = (response_data.get("usage") or {}).get("total_tokens")              # gives back the unused part of the estimate
+            return response_data
+
+    def chat_completion__target(self, request  : Schema__Open_Router__Chat_Request ,                    # Where (and what) to post: the provider's own endpoint for pinned providers with a direct adapter, otherwise OpenRouter
+                                      model    : str                               ,
+                                      provider : Optional[str  ]          = None   ,
+                                      max_cost : Optional[float]          = None
+                                ) -> Tuple[str, Dict[str, str], Dict[str, Any], Optional[Open_Router__Direct__Adapter]]:
+        adapter = self.direct_adapters.adapter(model, provider)
+        if adapter and max_cost is not None and not self.within_max_cost(request, model=model, max_cost=max_cost):
+            adapter = None                                                                               # (OpenRouter enforces max_cost)
+        if adapter:
+            return adapter.api_url, adapter.headers(), adapter.payload(request), adapter
         headers = self.create_headers(max_cost        = max_cost ,
                                       provider        = provider ,
                                       include_provider = True    )
-
-        response = requests.post(url     = self.chat_completion_url()     ,
-                                 headers = headers.to_headers_dict()       ,
-                                 json    = request.to_api_dict()           )
-        response.raise_for_status()                                                                      # Raise exception for HTTP errors
-        response_data = response.json()
-
+        return self.chat_completion_url(), headers.to_headers_dict(), request.to_api_dict(), None
+
+    def chat_completion__post(self, request  : Schema__Open_Router__Chat_Request ,                      # Post the request (recording the provider stats and adding the cost breakdown)
+                                    model    : str                               ,
+                                    provider : Optional[str  ]          = None   ,
+                                    max_cost : Optional[float]          = None   ,
+                                    cancel   : Optional[threading.Event] = None  ,                       # when set (by a hedge that already won) the response is dropped
+                                    tenant   : Optional[str  ]          = None                           # (for the cost ledger, defaults to the tenant of the current HTTP request)
+                              ) -> Optional[Dict[str, Any]]:
+        url, headers, payload, adapter = self.chat_completion__target(request, model=model, provider=provider, max_cost=max_cost)
+
+        start_time = time.perf_counter()
+        try:
+            with span('chat.upstream'):
+                if cancel is None:
+                    response_data = self.transport.post_json(url, headers=headers, payload=payload)      # raises for HTTP errors
+                else:
+                    response_data = self.chat_completion__post__cancellable(url, headers, payload, cancel)
+            if response_data is None:
+                return None                                                                              # lost the race (not recorded, since it says nothing about the provider's latency)
+            if adapter:
+                response_data = adapter.normalise(response_data, model=model)
+        except Exception:
+            self.provider_stats.record_error(model=model, provider=provider, duration=time.perf_counter() - start_time)
+            self.metrics.inc(METRIC__UPSTREAM_ERRORS, model=model, provider=provider or 'default')
+            raise
+        duration = time.perf_counter() - start_time
+
+        total_cost = 0.0
         if "usage" in response_data:                                                                     # Calculate costs if usage data available
             try:
-                cost_breakdown = self.cost_service.calculate_cost(
-                    model_id = Safe_Str__Open_Router__Model_ID(model),
-                    usage    = response_data["usage"]                 ,
-                    provider = response_data.get("provider")
-                )
-                response_data["cost_breakdown"] = cost_breakdown.to_display_dict()
+                with span('chat.cost'):
+                    cost_breakdown = self.cost_service.calculate_cost(
+                        model_id = Safe_Str__Open_Router__Model_ID(model),
+                        usage    = response_data["usage"]                 ,
+                        provider = response_data.get("provider")
+                    )
+                    response_data["cost_breakdown"] = cost_breakdown.to_display_dict()
+                    total_cost                      = float(cost_breakdown.total_cost)
             except Exception:
                 pass                                                                                      # Ignore cost calculation errors
 
-        self.chat_cache().cache_chat_response(request_data, response_data)
-        response_data['cache_id'] = str(cache_id)
-
+        usage = response_data.get("usage") or {}
+        self.provider_stats.record(model             = model                                               ,
+                                   provider          = response_data.get("provider") or provider           ,  # the provider OpenRouter actually used
+                                   duration          = duration                                            ,
+                                   completion_tokens = usage.get("completion_tokens", 0)                   ,
+                                   total_tokens      = usage.get("total_tokens"     , 0)                   ,
+                                   cost              = total_cost                                          )
+        self.record_metrics(model=model, provider=response_data.get("provider") or provider, duration=duration, usage=usage, cost=total_cost)
+        context = request_context()
+        self.cost_ledger.record(model             = model                                               ,
+                                provider          = response_data.get("provider") or provider           ,
+                                route             = context.route                                       ,
+                                tenant            = tenant or context.tenant                            ,
+                                prompt_tokens     = usage.get("prompt_tokens"    , 0)                   ,
+                                completion_tokens = usage.get("completion_tokens", 0)                   ,
+                                cost              = total_cost                                          )
         return response_data
 
+    def record_metrics(self, model    : str             ,                                                # Upstream latency, tokens and cost (labelled by model and provider)
+                             provider : Optional[str  ] ,
+                             duration : float           ,
+                             usage    : Dict[str, Any]  ,
+                             cost     : float           = 0.0
+                       ) -> None:
+        labels = dict(model=model, provider=provider or 'default')
+        self.metrics.observe(METRIC__UPSTREAM_DURATION, duration, **labels)
+        self.metrics.inc    (METRIC__TOKENS, usage.get("prompt_tokens"    , 0) or 0, direction='in' , **labels)
+        self.metrics.inc    (METRIC__TOKENS, usage.get("completion_tokens", 0) or 0, direction='out', **labels)
+        if cost:
+            self.metrics.inc(METRIC__COST_USD, cost, **labels)
+
+    def chat_completion__post__cancellable(self, url     : str             ,                               # Post and read the body in chunks, so that a cancelled request closes its connection
+                                                 headers : Dict[str, str]  ,
+                                                 payload : Dict[str, Any]  ,
+                                                 cancel  : threading.Event
+                                           ) -> Optional[Dict[str, Any]]:
+        if cancel.is_set():
+            return None
+        with self.transport.post(url, headers=headers, payload=payload, stream=True) as response:
+            response.raise_for_status()
+            chunks = []
+            for chunk in response.iter_content(chunk_size=HEDGE__READ_CHUNK_SIZE):                       # OpenRouter keeps the connection alive (with whitespace) while the model is generating
+                if cancel.is_set():
+                    return None                                                                          # closing the connection also stops the generation upstream
+                chunks.append(chunk)
+        if cancel.is_set():
+            return None
+        return json.loads(b''.join(chunks))
+
+    def response_cost(self, response_data: Dict[str, Any], model: str) -> float:                         # What a (cached) response cost when it was created
+        usage = response_data.get("usage")
+        if not usage:
+            return 0.0
+        try:
+            return float(self.cost_service.calculate_cost(model_id = Safe_Str__Open_Router__Model_ID(model),
+                                                          usage    = usage                                ,
+                                                          provider = response_data.get("provider")        ).total_cost)
+        except Exception:
+            return 0.0                                                                                   # no pricing for this model
+
+    def request_tokens(self, request: Schema__Open_Router__Chat_Request) -> int:                        # Estimated tokens (prompt + max_tokens) used by the tokens/min limits
+        prompt_length = sum(len(str(message.content)) for message in request.messages)
+        return prompt_length // 4 + int(request.max_tokens or 0)                                         # Rough estimate: 1 token ≈ 4 chars
+
+    def within_max_cost(self, request: Schema__Open_Router__Chat_Request, model: str, max_cost: float) -> bool:   # the worst case cost (all of max_tokens used) is under max_cost, so the provider's own endpoint can't go over it
+        prompt_length  = sum(len(str(message.content)) for message in request.messages)
+        estimated_cost = self.hedge_cost_estimate(model=model, prompt_length=prompt_length, max_tokens=int(request.max_tokens or 0))
+        return estimated_cost is not None and estimated_cost <= max_cost
+
+    def hedge_cost_estimate(self, model: str, prompt_length: int, max_tokens: int) -> Optional[float]:    # Upper bound of the cost of one (extra) request
+        try:
+            cost_breakdown = self.cost_service.estimate_cost(model_id      = Safe_Str__Open_Router__Model_ID(model),
+                                                             prompt_tokens = prompt_length // 4                    ,
+                                                             max_tokens    = max_tokens                            )
+            return float(cost_breakdown.total_cost)
+        except Exception:
+            return None                                                                                  # unknown pricing (hedging is skipped when there is a cost cap)
+
     # todo :add cache support
     def chat_completion_stream(self, prompt       : str                         ,                        # Execute streaming chat completion request
                                      model         : str                         ,
@@ -119,7 +361,8 @@ class Service__Open_Router(Type_Safe):
                                      temperature   : float                = 0.7  ,
                                      max_tokens    : int                  = 1000 ,
                                      provider      : Optional[str  ]     = None ,
-                                     max_cost      : Optional[float]     = None
+                                     max_cost      : Optional[float]     = None ,
+                                     priority      : str                 = REQUEST_PRIORITY__INTERACTIVE
                                ) -> Iterator[Dict[str, Any]]:
 
         messages = []
@@ -141,27 +384,71 @@ class Service__Open_Router(Type_Safe):
                                       provider        = provider ,
                                       include_provider = True    )
 
-        response = requests.post(url     = self.chat_completion_url()               ,                    # Use requests for streaming
-                                headers = headers.to_headers_dict()                 ,
-                                json    = request.to_api_dict()                     ,
-                                stream  = True                                       )
-
-        response.raise_for_status()                                                                      # Raise exception for HTTP errors
-
-        for line in response.iter_lines():                                                               # Process Server-Sent Events
-            if line:
-                line_str = line.decode('utf-8')
-                if line_str.startswith('data: '):
-                    data_str = line_str[6:]                                                              # Remove 'data: ' prefix
-
-                    if data_str == '[DONE]':
-                        break
-
+        context     = request_context()
+        reservation = self.cost_ledger.reserve(tenant         = context.tenant                                                                        ,
+                                               estimated_cost = self.hedge_cost_estimate(model=model, prompt_length=len(prompt) + len(system_prompt or ''), max_tokens=max_tokens))
+        with reservation:
+            with span('chat.queue'):
+                slot = self.scheduler.slot(lane=priority, tenant=context.tenant, deadline=context.deadline)
+            with slot, self.rate_limiter.acquire(model    = model                       ,                # the slot and the permit are held until the stream ends
+                                                 provider = provider                    ,
+                                                 tokens   = self.request_tokens(request),
+                                                 priority = priority                    ):
+                def post(_):
                     try:
-                        chunk_data = json.loads(data_str)
-                        yield chunk_data
-                    except json.JSONDecodeError:
-                        continue                                                                          # Skip invalid JSON
+                        response = self.transport.post(url     = self.chat_completion_url()     ,                    # streamed (over the pooled connections)
+                                                       headers = headers.to_headers_dict()       ,
+                                                       payload = self.request_templates.prompt_cache.mark(model, request.to_api_dict()),
+                                                       stream  = True                            )
+
+                        response.raise_for_status()                                                              # Raise exception for HTTP errors
+                        return response
+                    except Exception:
+                        self.provider_stats.record_error(model=model, provider=provider, duration=time.perf_counter() - start_time)
+                        self.metrics.inc(METRIC__UPSTREAM_ERRORS, model=model, provider=provider or 'default')
+                        raise
+
+                start_time = time.perf_counter()
+                response   = self.resilience.call(model=model, providers=[provider], send=post)                  # retries the connection (not the stream, once it started)
+
+                ttft            = None
+                actual_provider = provider
+                usage           = {}
+                for line in response.iter_lines():                                                               # Process Server-Sent Events
+                    if line:
+                        line_str = line.decode('utf-8')
+                        if line_str.startswith('data: '):
+                            data_str = line_str[6:]                                                              # Remove 'data: ' prefix
+
+                            if data_str == '[DONE]':
+                                break
+
+                            try:
+                                chunk_data = json.loads(data_str)
+                                if ttft is None:
+                                    ttft = time.perf_counter() - start_time                                      # time to first token
+                                    self.metrics.observe(METRIC__STREAM_TTFT, ttft, model=model, provider=provider or 'default')
+                                actual_provider = chunk_data.get("provider") or actual_provider
+                                usage           = chunk_data.get("usage"   ) or usage
+                                yield chunk_data
+                            except json.JSONDecodeError:
+                                continue                                                                          # Skip invalid JSON
+
+                self.provider_stats.record(model             = model                               ,
+                                           provider          = actual_provider                     ,
+                                           duration          = time.perf_counter() - start_time    ,
+                                           ttft              = ttft                                ,
+                                           completion_tokens = usage.get("completion_tokens", 0)   ,
+                                           total_tokens      = usage.get("total_tokens"     , 0)   )
+                total_cost = self.response_cost(dict(usage=usage, provider=actual_provider), model)
+                self.record_metrics(model=model, provider=actual_provider, duration=time.perf_counter() - start_time, usage=usage, cost=total_cost)
+                self.cost_ledger.record(model             = model                                   ,
+                                        provider          = actual_provider                         ,
+                                        route             = context.route                           ,
+                                        tenant            = context.tenant                          ,
+                                        prompt_tokens     = usage.get("prompt_tokens"    , 0)       ,
+                                        completion_tokens = usage.get("completion_tokens", 0)       ,
+                                        cost              = total_cost                              )
 
     def get_cached_chat_by_id(self, cache_id: str) -> Dict[str, Any]:       # Retrieve cached chat completion by cache_id
         cache_entry = self.chat_cache().get_cache_entry_by_id(cache_id)
@@ -181,26 +468,89 @@ class Service__Open_Router(Type_Safe):
             'cache_id': cache_id
         }
 
-    def list_models(self, include_free : bool = True ,                                                   # Get list of available models with optional filtering
-                          include_paid : bool = True
+    def get_cached_chats_by_ids(self, cache_ids   : List[str]                    ,                      # Retrieve several cached chat completions (fetched concurrently)
+                                      max_workers : int = CACHE_IDS__MAX_WORKERS
+                                ) -> Dict[str, Any]:
+        cache_ids = list(dict.fromkeys(cache_ids))                                                       # remove duplicates (keeping the order)
+        if len(cache_ids) > CACHE_IDS__MAX_BATCH_SIZE:
+            return { 'status' : 'error',
+                     'message': f'Too many cache ids: {len(cache_ids)} (max is {CACHE_IDS__MAX_BATCH_SIZE})' }
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, CACHE_IDS__MAX_WORKERS))) as executor:
+            entries = dict(zip(cache_ids, executor.map(self.get_cached_chat_by_id, cache_ids)))
+        return { 'status': 'success'                                                                 ,
+                 'count' : len(entries)                                                              ,
+                 'found' : sum(1 for entry in entries.values() if entry.get('status') == 'success') ,
+                 'data'  : entries                                                                   }
+
+    def provider_performance(self, model: Optional[str] = None) -> Dict[str, Any]:                        # Rolling per (model, provider) performance (used for routing)
+        return { "window_seconds" : self.provider_stats.window_seconds      ,
+                 "providers"      : self.provider_stats.summaries(model)    }
+
+    def rate_limits(self) -> Dict[str, Any]:                                                             # Rate limiter configuration, bucket levels, requests in flight and queue counters
+        return self.rate_limiter.status()
+
+    def direct_providers(self) -> Dict[str, Any]:                                                        # Providers that can skip OpenRouter (when pinned), and whether they are enabled
+        return self.direct_adapters.status()
+
+    def scheduler_status(self) -> Dict[str, Any]:                                                        # Scheduler lanes (weights, queued requests, waits and dropped requests)
+        return self.scheduler.status()
+
+    def cost_ledger__status(self, day: Optional[str] = None) -> Dict[str, Any]:                          # Budgets (spent, in flight, remaining) and the hourly cost rollups of one day
+        return dict(status = self.cost_ledger.status()   ,
+                    daily  = self.cost_ledger.daily(day) )
+
+    def circuit_breakers(self) -> Dict[str, Any]:                                                        # Retry policy and circuit breaker state (per model and provider)
+        return self.resilience.status()
+
+    def request_templates__status(self) -> Dict[str, Any]:                                               # How many request templates are in use (and how often they were reused)
+        return self.request_templates.status()
+
+    def hedge_stats(self) -> Dict[str, Any]:                                                              # How often requests were hedged (and how often the hedge won)
+        return self.hedging.hedge_stats.summary()
+
+    def chat_cache__gc(self, dry_run   : bool          = True ,                                          # Delete the expired chat cache entries
+                             ttl_hours : Optional[int] = None
+                       ) -> Dict[str, Any]:
+        chat_cache = self.chat_cache()
+        cache_gc   = Open_Router__Cache__GC(cache     = chat_cache.cache                       ,
+                                            ttl_hours = ttl_hours or chat_cache.cache_ttl_hours)
+        return cache_gc.run(dry_run=dry_run)
+
+    def catalogue_views(self) -> Open_Router__Catalogue__Views:                                          # (the views are shared with the models and cost services)
+        return self.models_service.catalogue_views()
+
+    def models_refresh(self) -> Dict[str, Any]:                                                          # Download the models catalogue again (drops the values derived from the previous one)
+        models = self.models_service.refresh_models()
+        return dict(models    = len(models)                                ,
+                    catalogue = self.models_service.catalogue.status()     ,
+                    views     = self.catalogue_views().status()            )
+
+    @cache_on_catalogue
+    def list_models(self, include_free        : bool            = True ,                                 # Get list of available models with optional filtering
+                          include_paid        : bool            = True ,
+                          fields              : Optional[str  ] = None ,                                 # comma separated (default: id, name, context_length, is_free, pricing)
+                          limit               : Optional[int  ] = None ,
+                          cursor              : Optional[str  ] = None ,                                 # next_cursor of the previous page
+                          modality            : Optional[str  ] = None ,
+                          tokenizer           : Optional[str  ] = None ,
+                          min_context_length  : int             = 0    ,
+                          supported_parameter : Optional[str  ] = None ,
+                          max_price           : Optional[float] = None                                   # highest prompt/completion price (catalogue units)
                     ) -> Dict[str, Any]:
-        models = self.models_service.api__models()
-
-        filtered_models = []
-        for model in models:
-            is_free = (float(model.pricing.prompt) == 0 and float(model.pricing.completion) == 0)
-
-            if (is_free and include_free) or (not is_free and include_paid):
-                filtered_models.append({
-                    "id"             : str(model.id)                       ,
-                    "name"           : str(model.name)                     ,
-                    "context_length" : model.context_length                ,
-                    "is_free"        : is_free                             ,
-                    "pricing"        : model.pricing.json() if model.pricing else None
-                })
-
-        return { "models" : filtered_models        ,
-                 "total"  : len(filtered_models)   }
+        return self.models_service.models_index().query(fields              = fields or CATALOGUE_INDEX__LIST_FIELDS,
+                                                        limit               = limit               ,
+                                                        cursor              = cursor              ,
+                                                        include_free        = include_free        ,
+                                                        include_paid        = include_paid        ,
+                                                        modality            = modality            ,
+                                                        tokenizer           = tokenizer           ,
+                                                        min_context_length  = min_context_length  ,
+                                                        supported_parameter = supported_parameter ,
+                                                        max_price           = max_price           )
+
+    @cache_on_catalogue
+    def list_models__payload(self, **kwargs) -> Open_Router__Catalogue__Payload:                         # list_models serialised once (per catalogue version and arguments)
+        return Open_Router__Catalogue__Payload.from_json(self.list_models(**kwargs))
 
     def estimate_cost(self, model         : str ,                                                        # Estimate cost before making request
                             prompt_length  : int ,
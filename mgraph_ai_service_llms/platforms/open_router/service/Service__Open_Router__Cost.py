@@ -1,11 +1,14 @@
 from typing                                                                                          import Dict, Any, Optional
 from osbot_utils.type_safe.Type_Safe                                                                 import Type_Safe
-from osbot_utils.decorators.methods.cache_on_self                                                    import cache_on_self
 from osbot_utils.type_safe.primitives.safe_float.Safe_Float                                          import Safe_Float
 from mgraph_ai_service_llms.platforms.open_router.schemas.Safe_Str__Open_Router__Model_ID            import Safe_Str__Open_Router__Model_ID
 from mgraph_ai_service_llms.platforms.open_router.service.Service__Open_Router__Models               import Service__Open_Router__Models
 from mgraph_ai_service_llms.platforms.open_router.schemas.cost.Schema__Open_Router__Cost_Breakdown   import Schema__Open_Router__Cost_Breakdown
 from mgraph_ai_service_llms.platforms.open_router.schemas.models.Schema__Open_Router__Model__Pricing import Schema__Open_Router__Model__Pricing
+from mgraph_ai_service_llms.platforms.open_router.cost.Open_Router__Cost__Table                      import Open_Router__Cost__Table
+from mgraph_ai_service_llms.platforms.open_router.cost.Open_Router__Cost__Engine                     import Open_Router__Cost__Engine
+from mgraph_ai_service_llms.platforms.open_router.service.Open_Router__Services                      import open_router__services
+from mgraph_ai_service_llms.platforms.open_router.cache.Open_Router__Catalogue__Views                import Open_Router__Catalogue__Views, cache_on_catalogue
 
 
 
@@ -19,26 +22,65 @@ class Service__Open_Router__Cost(Type_Safe):
     """
 
     models_service : Service__Open_Router__Models = None
-
-    def __init__(self):
-        super().__init__()
-        self.models_service = Service__Open_Router__Models()
+    cost_engine    : Open_Router__Cost__Engine                           # (for pricing objects that are not in the catalogue)
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        if self.models_service is None:
+            self.models_service = open_router__services.shared(Service__Open_Router__Models)    # the process catalogue (loaded and indexed once)
+
+    def catalogue_views(self) -> Open_Router__Catalogue__Views:
+        return self.models_service.catalogue_views()
+
+    @cache_on_catalogue
+    def models_cost_engine(self) -> Open_Router__Cost__Engine:              # catalogue prices as integers (for costing responses)
+        return Open_Router__Cost__Engine().load_models(self.models_service.models_records())
+
+    @cache_on_catalogue
+    def models_cost_table(self) -> Open_Router__Cost__Table:                # catalogue prices as columns (for ranking all models at once)
+        return Open_Router__Cost__Table().load_models(self.models_service.models_records())
+
+    def rank_models(self, prompt_tokens      : int           = 1000 ,       # Cheapest models for a usage profile (all models priced in one pass)
+                          completion_tokens  : int           = 500  ,
+                          cached_tokens      : int           = 0    ,
+                          cache_write_tokens : int           = 0    ,
+                          reasoning_tokens   : int           = 0    ,
+                          capability         : Optional[str] = None ,
+                          include_free       : bool          = True ,
+                          min_context_length : int           = 0    ,
+                          limit              : int           = 10
+                    ) -> Dict[str, Any]:
+        cost_table = self.models_cost_table()
+        ranked     = cost_table.rank(prompt_tokens      = prompt_tokens      ,
+                                     completion_tokens  = completion_tokens  ,
+                                     cached_tokens      = cached_tokens      ,
+                                     cache_write_tokens = cache_write_tokens ,
+                                     reasoning_tokens   = reasoning_tokens   ,
+                                     capability         = capability         ,
+                                     include_free       = include_free       ,
+                                     min_context_length = min_context_length ,
+                                     limit              = limit              )
+        return { "usage"        : dict(prompt_tokens=prompt_tokens, completion_tokens=completion_tokens, cached_tokens=cached_tokens,
+                                       cache_write_tokens=cache_write_tokens, reasoning_tokens=reasoning_tokens),
+                 "capability"   : capability         ,
+                 "models_count" : cost_table.size()  ,
+                 "models"       : ranked             }
 
     def calculate_cost(self, model_id : Safe_Str__Open_Router__Model_ID,
                              usage    : Dict[str, int],
                              provider : Optional[str] = None
                         ) -> Schema__Open_Router__Cost_Breakdown:      # Calculate cost based on usage and model pricing
 
-        # Get model info for pricing
-        model_info = self.models_service.get_model_by_id(model_id)
+        cost_engine = self.models_cost_engine()
+        prices      = cost_engine.model_prices(model_id)                    # (parsed once per catalogue, not per response)
 
-        if not model_info or not model_info.pricing:
+        if prices is None:
             raise ValueError(f"No pricing information available for model: {model_id}")
 
-        return self._calculate_from_pricing(pricing  = model_info.pricing,
-                                            usage    = usage             ,
-                                            model_id = model_id          ,
-                                            provider = provider          )
+        return cost_engine.breakdown(prices   = prices   ,
+                                     usage    = usage    ,
+                                     model_id = model_id ,
+                                     provider = provider )
 
     def _calculate_from_pricing(self, pricing  : Schema__Open_Router__Model__Pricing,
                                       usage    : Dict[str, int],
@@ -46,86 +88,10 @@ class Service__Open_Router__Cost(Type_Safe):
                                       provider : Optional[str] = None
                               ) -> Schema__Open_Router__Cost_Breakdown:
         """Internal method to calculate costs from pricing data"""
-
-        # Extract token counts
-        prompt_tokens     = usage.get("prompt_tokens", 0)
-        completion_tokens = usage.get("completion_tokens", 0)
-        total_tokens      = usage.get("total_tokens", prompt_tokens + completion_tokens)
-
-        # Extract additional usage metrics
-        cached_tokens     = usage.get("prompt_cache_hit_tokens", 0)
-        cache_write_tokens = usage.get("prompt_cache_miss_tokens", 0)
-        images_processed  = usage.get("images", 0)
-        audio_seconds     = usage.get("audio_seconds", 0)
-        web_searches      = usage.get("web_searches", 0)
-        reasoning_tokens  = usage.get("reasoning_tokens", 0)
-
-        # Calculate base costs (convert from per million to actual cost)
-        prompt_cost     = self._calculate_token_cost(prompt_tokens, pricing.prompt)
-        completion_cost = self._calculate_token_cost(completion_tokens, pricing.completion)
-
-        # Calculate additional costs
-        cache_read_cost  = None
-        cache_write_cost = None
-        image_cost       = None
-        audio_cost       = None
-        web_search_cost  = None
-        reasoning_cost   = None
-        request_cost     = None
-
-        if cached_tokens > 0 and pricing.input_cache_read:
-            cache_read_cost = self._calculate_token_cost(cached_tokens, pricing.input_cache_read)
-
-        if cache_write_tokens > 0 and pricing.input_cache_write:
-            cache_write_cost = self._calculate_token_cost(cache_write_tokens, pricing.input_cache_write)
-
-        if images_processed > 0 and pricing.image:
-            image_cost = Safe_Float(str(pricing.image)) * Safe_Float(images_processed)
-
-        if audio_seconds > 0 and pricing.audio:
-            audio_cost = Safe_Float(str(pricing.audio)) * Safe_Float(audio_seconds)
-
-        if web_searches > 0 and pricing.web_search:
-            web_search_cost = Safe_Float(str(pricing.web_search)) * Safe_Float(web_searches)
-
-        if reasoning_tokens > 0 and pricing.internal_reasoning:
-            reasoning_cost = self._calculate_token_cost(reasoning_tokens, pricing.internal_reasoning)
-
-        if pricing.request:
-            request_cost = Safe_Float(str(pricing.request))
-
-        # Calculate total cost
-        total_cost = prompt_cost + completion_cost
-
-        for additional_cost in [cache_read_cost, cache_write_cost, image_cost,
-                               audio_cost, web_search_cost, reasoning_cost, request_cost]:
-            if additional_cost:
-                total_cost += additional_cost
-
-        # Calculate cost per 1k tokens
-        if total_tokens > 0:
-            cost_per_1k = (total_cost / Safe_Float(total_tokens)) * Safe_Float("1000")
-        else:
-            cost_per_1k = Safe_Float("0")
-
-        return Schema__Open_Router__Cost_Breakdown(
-            prompt_tokens      = prompt_tokens                           ,
-            completion_tokens  = completion_tokens                       ,
-            total_tokens       = total_tokens                            ,
-            prompt_cost        = prompt_cost                             ,
-            completion_cost    = completion_cost                         ,
-            cache_read_cost    = cache_read_cost                         ,
-            cache_write_cost   = cache_write_cost                        ,
-            image_cost         = image_cost                              ,
-            audio_cost         = audio_cost                              ,
-            web_search_cost    = web_search_cost                         ,
-            reasoning_cost     = reasoning_cost                          ,
-            request_cost       = request_cost                            ,
-            total_cost         = total_cost                              ,
-            cost_per_1k_tokens = cost_per_1k                             ,
-            model_id           = Safe_Str__Open_Router__Model_ID(model_id)                      ,
-            provider           = provider                                 ,
-        )
+        return self.cost_engine.breakdown(prices   = self.cost_engine.pricing_units(pricing),
+                                          usage    = usage                                  ,
+                                          model_id = model_id                               ,
+                                          provider = provider                               )
 
     def _calculate_token_cost(self, token_count : int,
                                     price_per_million : Any
@@ -170,7 +136,7 @@ class Service__Open_Router__Cost(Type_Safe):
 
         return self.calculate_cost(model_id, usage)
 
-    @cache_on_self
+    @cache_on_catalogue
     def get_cheapest_models(self,
                            capability : Optional[str] = None,
                            limit      : int = 5
@@ -184,7 +150,7 @@ class Service__Open_Router__Cost(Type_Safe):
         Returns:
             List of cheapest models with pricing info
         """
-        models = self.models_service.api__models()
+        models = self.models_service.models_records()                        # (records: no Type_Safe models needed)
 
         # Filter by capability if specified
         if capability:
@@ -205,7 +171,7 @@ class Service__Open_Router__Cost(Type_Safe):
                 # Average cost per 1k tokens
                 avg_cost_per_1k = ((prompt_price + completion_price) / 2) / 1000
 
-                models_with_cost.append({
+                models_with_cost.append((avg_cost_per_1k, {
                     "model_id"          : str(model.id)                    ,
                     "name"              : str(model.name)                  ,
                     "prompt_cost_per_m" : f"${prompt_price:.3f}"           ,
@@ -213,12 +179,12 @@ class Service__Open_Router__Cost(Type_Safe):
                     "avg_cost_per_1k"   : f"${avg_cost_per_1k:.6f}"        ,
                     "context_length"    : model.context_length             ,
                     "is_free"           : prompt_price == 0 and completion_price == 0,
-                })
+                }))
 
         # Sort by average cost
-        models_with_cost.sort(key=lambda x: float(x["avg_cost_per_1k"][1:]))  # Remove $ and convert
+        models_with_cost.sort(key=lambda x: x[0])                           # numeric key (not the formatted "$..." string)
 
-        return models_with_cost[:limit]
+        return [model_with_cost for _, model_with_cost in models_with_cost[:limit]]
 
     def compare_model_costs(self,
                            model_ids      : list[Safe_Str__Open_Router__Model_ID],
@@ -1,21 +1,37 @@
 from typing                                                                                                 import List, Optional, Dict, Any
 from osbot_utils.type_safe.Type_Safe                                                                        import Type_Safe
-from osbot_utils.utils.Http                                                                                 import GET_json
 from osbot_utils.decorators.methods.cache_on_self                                                           import cache_on_self
-from osbot_utils.type_safe.primitives.safe_float.Safe_Float                                                 import Safe_Float
 from mgraph_ai_service_llms.platforms.open_router.cache.Open_Router__Models__Cache                          import Open_Router__Models__Cache
+from mgraph_ai_service_llms.platforms.open_router.cache.Open_Router__Catalogue__Views                       import Open_Router__Catalogue__Views, cache_on_catalogue
+from mgraph_ai_service_llms.platforms.open_router.cache.Open_Router__Catalogue__Payload                     import Open_Router__Catalogue__Payload
+from mgraph_ai_service_llms.platforms.open_router.cache.Open_Router__Catalogue__Index                       import Open_Router__Catalogue__Index
+from mgraph_ai_service_llms.platforms.open_router.cache.Open_Router__Models__Snapshot                       import Open_Router__Models__Snapshot, Open_Router__Model__Record
+from mgraph_ai_service_llms.platforms.open_router.cache.Open_Router__Models__Catalogue                      import Open_Router__Models__Catalogue
 from mgraph_ai_service_llms.platforms.open_router.schemas.Safe_Str__Open_Router__Model_ID                   import Safe_Str__Open_Router__Model_ID
 from mgraph_ai_service_llms.platforms.open_router.schemas.Safe_Str__Open_Router__Modality                   import Safe_Str__Open_Router__Modality
 from mgraph_ai_service_llms.platforms.open_router.schemas.models.Schema__Open_Router__Model                 import Schema__Open_Router__Model
 from mgraph_ai_service_llms.platforms.open_router.schemas.models.Schema__Open_Router__Models__Response      import Schema__Open_Router__Models__Response
 from mgraph_ai_service_llms.platforms.open_router.schemas.consts__Open_Router                               import URL__OPEN_ROUTER__API__V1_MODELS, URL__OPEN_ROUTER__API__V1_PROVIDERS
+from mgraph_ai_service_llms.platforms.open_router.service.Open_Router__Services                             import open_router__services
+from mgraph_ai_service_llms.service.llms.transport.LLM__Transport                                           import LLM__Transport, llm__transport
 
 
 class Service__Open_Router__Models(Type_Safe):
-
-    @cache_on_self
-    def open_router__models_cache(self):
-        return Open_Router__Models__Cache().setup()
+    transport : LLM__Transport                 = None
+    catalogue : Open_Router__Models__Catalogue = None                           # the catalogue shared by the services of this process (used unless models or snapshot are set)
+    models    : list                           = None                           # a catalogue as Type_Safe models, for this service only
+    snapshot  : Open_Router__Models__Snapshot  = None                           # a catalogue as records, for this service only
+    views     : Open_Router__Catalogue__Views                                   # values derived from the catalogue (see @cache_on_catalogue)
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        if self.transport is None:
+            self.transport = llm__transport                                         # same connection pool as the chat requests
+        if self.catalogue is None:
+            self.catalogue = open_router__services.shared(Open_Router__Models__Catalogue)      # one copy of the catalogue per worker (not one per service object)
+
+    def open_router__models_cache(self):                                        # (one cache backend per process)
+        return open_router__services.shared(Open_Router__Models__Cache, lambda: Open_Router__Models__Cache().setup())
 
     def api__url__models(self):
         return URL__OPEN_ROUTER__API__V1_MODELS
@@ -24,20 +40,22 @@ class Service__Open_Router__Models(Type_Safe):
         return URL__OPEN_ROUTER__API__V1_PROVIDERS
 
     def api__providers__download(self):
-        return GET_json(self.api__providers__url())  # Fetch data from OpenRouter API
+        return self.transport.get_json(self.api__providers__url())  # Fetch data from OpenRouter API
 
     def download__api__models(self):                                             # todo: add caching
-        return GET_json(self.api__url__models())                                             # Fetch data from OpenRouter API
+        return self.transport.get_json(self.api__url__models())                                             # Fetch data from OpenRouter API
 
     def download__api__providers(self):                                             # todo: add caching
-        return GET_json(self.api__url__models())                                             # Fetch data from OpenRouter API
+        return self.transport.get_json(self.api__url__models())                                             # Fetch data from OpenRouter API
 
     # rename to just models()
-    def fetch_models(self) -> Schema__Open_Router__Models__Response:                # Fetch current list of available models
+    def fetch_models(self, refresh: bool = False                                # refresh: skip the models cache (and update it)
+                     ) -> Schema__Open_Router__Models__Response:                # Fetch current list of available models
         try:
-            cached_response = self.open_router__models_cache().get_cached_models()
-            if cached_response and cached_response.data:
-                return cached_response
+            if not refresh:
+                cached_response = self.open_router__models_cache().get_cached_models()
+                if cached_response and cached_response.data:
+                    return cached_response
 
             response_data   = self.download__api__models()
             models_response = Schema__Open_Router__Models__Response.from_json(response_data)
@@ -48,55 +66,106 @@ class Service__Open_Router__Models(Type_Safe):
         except Exception as e:
             raise ValueError(f"Failed to fetch models from OpenRouter: {str(e)}")
 
-    @cache_on_self
     def api__models(self) -> List[Schema__Open_Router__Model]:                # Get cached list of models
-        response = self.fetch_models()
-        return response.data
+        if self.models is not None:
+            return self.models
+        return self.models_snapshot().api_models()
+
+    def refresh_models(self) -> List[Schema__Open_Router__Model]:             # Download the catalogue again, for all the services of this process (the derived views are recomputed on their next use)
+        models        = self.fetch_models(refresh=True).data
+        self.models   = None
+        self.snapshot = None
+        self.catalogue.replace(self.models_snapshot__save(Open_Router__Models__Snapshot.from_models(models)))
+        return models
+
+    def models_snapshot(self) -> Open_Router__Models__Snapshot:                 # the one source of the records, lookups and views (so a service with its own models never loads the shared catalogue)
+        if self.models is not None:                                             # a catalogue for this service only
+            if self.snapshot is None or self.snapshot.models is not self.models:
+                self.snapshot = Open_Router__Models__Snapshot.from_models(self.models)
+            return self.snapshot
+        if self.snapshot is not None:
+            return self.snapshot
+        return self.catalogue.get(self.models_snapshot__load)
+
+    def models_snapshot__load(self) -> Open_Router__Models__Snapshot:         # the trusted snapshot (no Type_Safe validation), else the validated catalogue (saved as a snapshot for the next cold start)
+        try:
+            snapshot = Open_Router__Models__Snapshot.from_json(self.open_router__models_cache().get_cached_models_snapshot())
+            if snapshot and snapshot.records:
+                return snapshot
+        except Exception:
+            pass                                                                # (fetch_models reports the cache/API errors)
+        return self.models_snapshot__save(Open_Router__Models__Snapshot.from_models(self.fetch_models().data))
+
+    def models_snapshot__save(self, snapshot: Open_Router__Models__Snapshot) -> Open_Router__Models__Snapshot:
+        try:
+            self.open_router__models_cache().cache_models_snapshot(snapshot.json())
+        except Exception:
+            pass                                                                # a missing snapshot only costs the slow path on the next cold start
+        return snapshot
+
+    def models_records(self) -> list:                                           # the catalogue without building the Type_Safe models (same attributes for the cost table, cost engine and index)
+        return self.models_snapshot().records
+
+    def catalogue_views(self) -> Open_Router__Catalogue__Views:
+        return self.views.for_catalogue(self.models_snapshot())
+
+    @cache_on_catalogue
+    def records_by_id(self) -> Dict[str, Open_Router__Model__Record]:
+        return self.models_snapshot().records_by_id()
 
     @cache_on_self
     def api__providers(self):
         return self.api__providers__download()
 
+    @cache_on_catalogue
+    def api__models__payload(self) -> Open_Router__Catalogue__Payload:         # the catalogue serialised once (per catalogue version)
+        return Open_Router__Catalogue__Payload.from_json([record.json() for record in self.models_records()])
+
+    @cache_on_catalogue
+    def api__models__query__payload(self, **query) -> Open_Router__Catalogue__Payload:    # one page of (projected, filtered) models, see Open_Router__Catalogue__Index.query
+        return Open_Router__Catalogue__Payload.from_json(self.models_index().query(**query))
+
+    @cache_on_catalogue
+    def models_index(self) -> Open_Router__Catalogue__Index:
+        return Open_Router__Catalogue__Index().load_models(self.models_records())
+
+    @cache_on_catalogue
+    def api__providers__payload(self) -> Open_Router__Catalogue__Payload:
+        return Open_Router__Catalogue__Payload.from_json(self.api__providers())
+
     def get_model_by_id(self, model_id : Safe_Str__Open_Router__Model_ID        # Get specific model by ID
                         ) -> Optional[Schema__Open_Router__Model]:
-        models = self.api__models()
-        for model in models:
-            if model.id == model_id:
-                return model
-        return None
+        record = self.records_by_id().get(str(model_id))
+        return record.api_model() if record else None                          # (builds this model only, not the whole catalogue)
 
+    @cache_on_catalogue
     def get_models_by_modality(self, modality : Safe_Str__Open_Router__Modality # Get models supporting specific modality
                                ) -> List[Schema__Open_Router__Model]:
-        models = self.api__models()
-        return [m for m in models if m.architecture.modality == modality]
+        return [record.api_model() for record in self.models_records()          # (only the matching models are built)
+                                   if record.architecture.modality == str(modality)]
 
+    @cache_on_catalogue
     def get_free_models(self                                                    # Get models that are free to use
                         ) -> List[Schema__Open_Router__Model]:
-        models      = self.api__models()
-        free_models = []
-        zero_cost   = Safe_Float(0.0)
+        return [record.api_model() for record in self.free_models_records()]
 
-        for model in models:
-            if float(model.pricing.prompt) == 0 and float(model.pricing.completion) == 0:
-                free_models.append(model)
-        return free_models
+    def free_models_records(self) -> List[Open_Router__Model__Record]:
+        return [record for record in self.models_records()
+                       if record.pricing.prompt == 0 and record.pricing.completion == 0]
 
+    @cache_on_catalogue
     def get_models_summary(self                                                 # Get summary of available models
                            ) -> Dict[str, Any]:
-        models = self.api__models()
+        records = self.models_records()                                         # (no Type_Safe models needed)
 
         modalities = {}                                                         # Group by modality
-        for model in models:
-            modality = str(model.architecture.modality)
-            if modality not in modalities:
-                modalities[modality] = []
-            modalities[modality].append(str(model.id))
+        for record in records:
+            modalities.setdefault(str(record.architecture.modality), []).append(str(record.id))
 
-        free_models = self.get_free_models()                                    # Find free models
+        free_models = self.free_models_records()                                # Find free models
 
-        return { "total_models"      : len(models)                             ,
+        return { "total_models"      : len(records)                            ,
                  "free_models_count"  : len(free_models)                       ,
-                 "free_models"        : [str(m.id) for m in free_models]       ,
+                 "free_models"        : [str(record.id) for record in free_models],
                  "modalities"         : modalities                             ,
-                 "tokenizers"         : list(set(str(m.architecture.tokenizer) for m in models)) }
-
+                 "tokenizers"         : list(set(str(record.architecture.tokenizer) for record in records)) }
@@ -1,8 +1,11 @@
 import json
-from typing                                                                                          import List, Dict, Any
+from typing                                                                                          import List, Dict, Any, Optional
 from osbot_utils.type_safe.Type_Safe                                                                 import Type_Safe
 from mgraph_ai_service_llms.platforms.open_router.service.Service__Open_Router                       import Service__Open_Router
+from mgraph_ai_service_llms.platforms.open_router.service.Open_Router__Services                      import open_router__services
+from mgraph_ai_service_llms.platforms.open_router.limits.Open_Router__Rate_Limiter                   import REQUEST_PRIORITY__INTERACTIVE
 from mgraph_ai_service_llms.service.llms.providers.open_router.Schema__Open_Router__Providers        import Schema__Open_Router__Providers
+from mgraph_ai_service_llms.service.perf.Perf__Span                                                  import span
 
 DEFAULT_MODEL    = "openai/gpt-oss-120b"
 DEFAULT_PROVIDER = Schema__Open_Router__Providers.GROQ
@@ -37,28 +40,39 @@ Example: ["The delay might be due to resource constraints", "This pattern sugges
 class Service__Text_Analysis(Type_Safe):
     open_router     : Service__Open_Router                  = None
     model           : str                                   = DEFAULT_MODEL
-    provider        : Schema__Open_Router__Providers        = DEFAULT_PROVIDER
+    provider        : Schema__Open_Router__Providers        = DEFAULT_PROVIDER                  # used when there is no performance data (or when routing_policy is None)
+    routing_policy  : Optional[str]                         = None                              # 'fastest', 'cheapest' or 'balanced' (opt-in: the provider is part of the chat cache key)
     temperature     : float                                  = 0.3                # Lower temperature for more consistent extraction
     max_tokens      : int                                    = 1000
 
     def __init__(self):
         super().__init__()
-        self.open_router = Service__Open_Router()
+        self.open_router = open_router__services.shared(Service__Open_Router)                        # (one per process)
+
+    def provider_for_request(self) -> str:                                                               # pick the provider from the observed provider performance
+        if self.routing_policy:
+            return self.open_router.provider_router.select(model   = self.model          ,
+                                                           policy  = self.routing_policy ,
+                                                           default = self.provider.value )
+        return self.provider.value
 
     def _extract_json_list(self, text          : str ,
-                             system_prompt : str
+                             system_prompt : str ,
+                             provider      : Optional[str] = None
                       ) -> List[str]:
 
         user_prompt = f"Analyze the following text:\n\n{text}"
 
-        response = self.open_router.chat_completion(
-            prompt        = user_prompt                ,
-            model         = self.model                 ,
-            system_prompt = system_prompt              ,
-            temperature   = self.temperature           ,
-            max_tokens    = self.max_tokens            ,
-            provider      = self.provider.value        ,
-            max_cost      = 0.5                        )
+        with span('text_analysis.completion'):
+            response = self.open_router.chat_completion(
+                prompt        = user_prompt                ,
+                model         = self.model                 ,
+                system_prompt = system_prompt              ,
+                temperature   = self.temperature           ,
+                max_tokens    = self.max_tokens            ,
+                provider      = provider or self.provider_for_request(),
+                max_cost      = 0.5                        ,
+                priority      = REQUEST_PRIORITY__INTERACTIVE)                                           # UI traffic (goes ahead of batch requests)
 
         response_text = response.get("choices", [{}])[0].get("message", {}).get("content", "")
         cache_id      = response.get("cache_id", None)
@@ -77,7 +91,7 @@ class Service__Text_Analysis(Type_Safe):
                 # Filter out empty strings and None values
                 return [str(item) for item in result if item and str(item).strip()], cache_id
             else:
-                return []
+                return [], cache_id
 
         except (json.JSONDecodeError, IndexError):
             # Fallback: try to extract bullet points or numbered items
@@ -102,53 +116,58 @@ class Service__Text_Analysis(Type_Safe):
 
     def extract_facts(self, text: str                                                                    # Extract facts from text
                      ) -> Dict[str, Any]:
-        facts, cache_id = self._extract_json_list(text, SYSTEM_PROMPT_FACTS)
+        provider = self.provider_for_request()
+        facts, cache_id = self._extract_json_list(text, SYSTEM_PROMPT_FACTS, provider)
 
         return { "cache_id"    : cache_id,
                  "text"        : text                    ,
                  "facts"       : facts                   ,
                  "facts_count" : len(facts)              ,
                  "model"       : self.model              ,
-                 "provider"    : self.provider.value     }
+                 "provider"    : provider                }
 
     def extract_data_points(self, text: str                                                              # Extract data points from text
                            ) -> Dict[str, Any]:
-        data_points, cache_id = self._extract_json_list(text, SYSTEM_PROMPT_DATA_POINTS)
+        provider = self.provider_for_request()
+        data_points, cache_id = self._extract_json_list(text, SYSTEM_PROMPT_DATA_POINTS, provider)
 
         return { "cache_id"          : cache_id                  ,
                  "text"              : text                      ,
                  "data_points"       : data_points               ,
                  "data_points_count" : len(data_points)          ,
                  "model"             : self.model                ,
-                 "provider"          : self.provider.value       }
+                 "provider"          : provider                  }
 
     def generate_questions(self, text: str                                                               # Generate follow-up questions
                           ) -> Dict[str, Any]:
-        questions,cache_id = self._extract_json_list(text, SYSTEM_PROMPT_QUESTIONS)
+        provider = self.provider_for_request()
+        questions,cache_id = self._extract_json_list(text, SYSTEM_PROMPT_QUESTIONS, provider)
 
         return { "cache_id"        : cache_id                    ,
                  "text"            : text                        ,
                  "questions"       : questions                   ,
                  "questions_count" : len(questions)              ,
                  "model"           : self.model                  ,
-                 "provider"        : self.provider.value         }
+                 "provider"        : provider                    }
 
     def generate_hypotheses(self, text: str                                                              # Generate hypotheses from text
                            ) -> Dict[str, Any]:
-        hypotheses,cache_id = self._extract_json_list(text, SYSTEM_PROMPT_HYPOTHESES)
+        provider = self.provider_for_request()
+        hypotheses,cache_id = self._extract_json_list(text, SYSTEM_PROMPT_HYPOTHESES, provider)
 
         return { "cache_id"         : cache_id                   ,
                  "text"             : text                       ,
                  "hypotheses"       : hypotheses                 ,
                  "hypotheses_count" : len(hypotheses)            ,
                  "model"            : self.model                 ,
-                 "provider"         : self.provider.value        }
+                 "provider"         : provider                   }
 
     def analyze_all(self, text: str) -> Dict[str, Any]:
-        facts, facts_cache_id             = self._extract_json_list(text, SYSTEM_PROMPT_FACTS)
-        data_points, data_points_cache_id = self._extract_json_list(text, SYSTEM_PROMPT_DATA_POINTS)
-        questions, questions_cache_id     = self._extract_json_list(text, SYSTEM_PROMPT_QUESTIONS)
-        hypotheses, hypotheses_cache_id   = self._extract_json_list(text, SYSTEM_PROMPT_HYPOTHESES)
+        provider                          = self.provider_for_request()                                 # same provider for the 4 requests
+        facts, facts_cache_id             = self._extract_json_list(text, SYSTEM_PROMPT_FACTS      , provider)
+        data_points, data_points_cache_id = self._extract_json_list(text, SYSTEM_PROMPT_DATA_POINTS, provider)
+        questions, questions_cache_id     = self._extract_json_list(text, SYSTEM_PROMPT_QUESTIONS  , provider)
+        hypotheses, hypotheses_cache_id   = self._extract_json_list(text, SYSTEM_PROMPT_HYPOTHESES , provider)
 
         return {
             "text"        : text,
@@ -163,7 +182,7 @@ class Service__Text_Analysis(Type_Safe):
                 "hypotheses_count"  : len(hypotheses)
             },
             "model"       : self.model,
-            "provider"    : self.provider.value,
+            "provider"    : provider,
             "cache_ids"   : {  # Add all cache_ids
                 "facts"       : facts_cache_id,
                 "data_points" : data_points_cache_id,
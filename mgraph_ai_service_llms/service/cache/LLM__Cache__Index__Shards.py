@@ -0,0 +1,241 @@
+import json
+import random
+import time
+from typing                                                                    import Dict, Any, Optional, Callable, Tuple, Union
+from botocore.exceptions                                                       import ClientError
+from osbot_utils.type_safe.Type_Safe                                           import Type_Safe
+from osbot_utils.type_safe.primitives.safe_int.Timestamp_Now                   import Timestamp_Now
+from osbot_utils.type_safe.primitives.safe_str.filesystem.Safe_Str__File__Path import Safe_Str__File__Path
+from mgraph_ai_service_llms.service.cache.LLM__Cache                           import LLM__Cache
+
+FILE_NAME__CACHE_INDEX                 = 'cache_index.json'                         # legacy monolithic index (written by LLM_Request__Cache__File_System)
+FILE_NAME__CACHE_INDEX__MANIFEST       = 'manifest.json'
+FOLDER_NAME__CACHE_INDEX__SHARDS       = 'cache_index'
+SHARD_KIND__HASH                       = 'hash'                                     # request_hash -> cache_id
+SHARD_KIND__ID                         = 'id'                                       # cache_id     -> file_path (or {'file_path', 'cost'} for the entries priced when they were cached)
+CACHE_INDEX__SHARDS__PREFIX_SIZE       = 3                                          # 4096 shards per kind (hex prefixes)
+CACHE_INDEX__SHARDS__REFRESH_SECONDS   = 30.0                                       # how long a loaded shard is trusted before its ETag is checked again
+CACHE_INDEX__SHARDS__PAGE_MAX_SHARDS   = 64                                         # shards one page may read (a filter that matches little returns a short page and a next_cursor)
+CACHE_INDEX__SHARDS__WRITE_ATTEMPTS    = 5                                          # conditional writes of a shard (another worker changed it in between: read it again and retry)
+S3__ERROR_CODES__PRECONDITION          = ('PreconditionFailed', 'ConditionalRequestConflict')
+
+
+class LLM__Cache__Index__Shards(Type_Safe):                                         # Cache index split into hash-prefix shards (each loaded and refreshed individually)
+    llm_cache         : LLM__Cache           = None
+    shards_folder     : Safe_Str__File__Path = Safe_Str__File__Path(FOLDER_NAME__CACHE_INDEX__SHARDS)
+    shard_prefix_size : int                  = CACHE_INDEX__SHARDS__PREFIX_SIZE
+    refresh_seconds   : float                = CACHE_INDEX__SHARDS__REFRESH_SECONDS
+    loaded_shards     : dict                                                        # shard path -> {'etag', 'data', 'checked_at'}
+    listed_shards     : dict                                                        # shard kind -> {'keys', 'checked_at'}
+
+    def setup(self) -> 'LLM__Cache__Index__Shards':                                 # make sure the shards exist (migrating the legacy index on first use)
+        if self.llm_cache is None:
+            self.llm_cache = LLM__Cache().setup()
+        manifest = self.manifest()
+        if manifest:
+            self.shard_prefix_size = manifest.get('shard_prefix_size', self.shard_prefix_size)
+        else:
+            self.import_legacy_index()
+        return self
+
+    def path_manifest(self) -> str:
+        return f'{self.shards_folder}/{FILE_NAME__CACHE_INDEX__MANIFEST}'
+
+    def path_shard(self, kind: str, shard_key: str) -> str:
+        return f'{self.shards_folder}/{kind}/{shard_key}.json'
+
+    def path_shards_folder(self, kind: str) -> str:                                 # full S3 folder (used for listings)
+        return self.llm_cache.get_s3_key(f'{self.shards_folder}/{kind}')
+
+    def shard_key(self, value: str) -> Optional[str]:                                # hashes and ids are hex, so anything else can't be in the index
+        shard_key = str(value)[:self.shard_prefix_size].lower()
+        if shard_key.isalnum():
+            return shard_key
+        return None
+
+    def shard_etag(self, path: str) -> Optional[str]:                               # HEAD request (cheap) used to decide if a shard needs to be re-downloaded
+        try:
+            file_info = self.llm_cache.s3_db.s3_file_info(self.llm_cache.get_s3_key(path))
+            return file_info.get('ETag') if file_info else None
+        except Exception:
+            return None                                                             # shard doesn't exist (yet)
+
+    def shard(self, kind: str, shard_key: str) -> Dict[str, str]:                   # get shard data, re-downloading only if its ETag changed
+        path   = self.path_shard(kind, shard_key)
+        now    = time.monotonic()
+        loaded = self.loaded_shards.get(path)
+        if loaded and now - loaded['checked_at'] < self.refresh_seconds:
+            return loaded['data']
+
+        etag = self.shard_etag(path)
+        if loaded and etag == loaded['etag']:
+            loaded['checked_at'] = now
+            return loaded['data']
+
+        data = (self.llm_cache.json__load(path) or {}) if etag else {}
+        self.loaded_shards[path] = dict(etag=etag, data=data, checked_at=now)
+        return data
+
+    def shard__save(self, kind: str, shard_key: str, data: Dict[str, str]) -> bool:
+        path   = self.path_shard(kind, shard_key)
+        result = self.llm_cache.json__save(path, data)
+        if shard_key not in self.listed_shards.get(kind, {}).get('keys', []):
+            self.listed_shards.pop(kind, None)
+        self.loaded_shards[path] = dict(etag=None, data=data, checked_at=time.monotonic())   # etag unknown, so it will be re-validated after refresh_seconds
+        return result
+
+    def shard__update(self, kind: str, key: str, value: Union[str, Dict[str, Any]]) -> bool:   # read-modify-write of a single shard (conditional on its ETag, so concurrent writers never lose an entry)
+        path = self.path_shard(kind, self.shard_key(key))
+        for attempt in range(CACHE_INDEX__SHARDS__WRITE_ATTEMPTS):
+            data, etag = self.shard__load(path)                                     # (always re-read: the loaded copy can be stale)
+            data[key]  = value
+            new_etag   = self.shard__save__if_match(path, data, etag)
+            if new_etag:
+                if self.shard_key(key) not in self.listed_shards.get(kind, {}).get('keys', []):
+                    self.listed_shards.pop(kind, None)
+                self.loaded_shards[path] = dict(etag=new_etag, data=data, checked_at=time.monotonic())
+                return True
+            time.sleep(random.uniform(0, 0.05 * (attempt + 1)))                     # another worker wrote it first
+        return False
+
+    def shard__load(self, path: str) -> Tuple[Dict[str, Any], Optional[str]]:      # the shard and its ETag, from the same GET (({}, None) when it doesn't exist yet)
+        s3_db = self.llm_cache.s3_db
+        try:
+            result = s3_db.s3().client().get_object(Bucket=s3_db.s3_bucket(), Key=self.llm_cache.get_s3_key(path))
+        except ClientError as error:
+            if error.response.get('Error', {}).get('Code') in ('NoSuchKey', '404'):
+                return {}, None
+            raise
+        return json.loads(result['Body'].read() or b'{}'), result.get('ETag')
+
+    def shard__save__if_match(self, path: str, data: Dict[str, Any], etag: Optional[str]) -> Optional[str]:    # the new ETag, or None when the shard changed since etag (None: it must not exist yet)
+        s3_db  = self.llm_cache.s3_db
+        kwargs = dict(Bucket      = s3_db.s3_bucket()                   ,
+                      Key         = self.llm_cache.get_s3_key(path)     ,
+                      Body        = json.dumps(data).encode()           ,
+                      ContentType = 'application/json'                  )
+        if etag:
+            kwargs['IfMatch'    ] = etag
+        else:
+            kwargs['IfNoneMatch'] = '*'
+        try:
+            return s3_db.s3().client().put_object(**kwargs).get('ETag')
+        except ClientError as error:
+            if error.response.get('Error', {}).get('Code') in S3__ERROR_CODES__PRECONDITION:
+                return None
+            raise
+
+    def shards_keys(self, kind: str):                                               # list the shard keys that exist in storage (listing reused for refresh_seconds)
+        now    = time.monotonic()
+        listed = self.listed_shards.get(kind)
+        if listed and now - listed['checked_at'] < self.refresh_seconds:
+            return listed['keys']
+        file_names = self.llm_cache.s3_db.s3_folder_files(folder=self.path_shards_folder(kind))
+        keys       = sorted(file_name[:-len('.json')] for file_name in file_names if file_name.endswith('.json'))
+        self.listed_shards[kind] = dict(keys=keys, checked_at=now)
+        return keys
+
+    def add_entry(self, request_hash: str, cache_id: str, file_path: str, cost: float = 0.0) -> bool:  # append touches one shard per kind (the id first, so a hash never points to a missing entry)
+        entry = dict(file_path=str(file_path), cost=float(cost)) if cost else str(file_path)
+        added = self.shard__update(SHARD_KIND__ID, str(cache_id), entry)
+        return self.shard__update(SHARD_KIND__HASH, str(request_hash), str(cache_id)) and added
+
+    def entry__file_path(self, entry: Union[str, Dict[str, Any], None]) -> Optional[str]:
+        return entry.get('file_path') if isinstance(entry, dict) else entry
+
+    def entry__cost(self, entry: Union[str, Dict[str, Any], None]) -> float:        # (0.0 when the entry was not priced)
+        return float(entry.get('cost') or 0.0) if isinstance(entry, dict) else 0.0
+
+    def entry__from__cache_id(self, cache_id: str) -> Union[str, Dict[str, Any], None]:
+        shard_key = self.shard_key(cache_id or '')
+        if not shard_key:
+            return None
+        return self.shard(SHARD_KIND__ID, shard_key).get(str(cache_id))
+
+    def cache_id__from__hash(self, request_hash: str) -> Optional[str]:
+        shard_key = self.shard_key(request_hash or '')
+        if not shard_key:
+            return None
+        return self.shard(SHARD_KIND__HASH, shard_key).get(str(request_hash))
+
+    def file_path__from__cache_id(self, cache_id: str) -> Optional[str]:
+        return self.entry__file_path(self.entry__from__cache_id(cache_id))
+
+    def cost__from__cache_id(self, cache_id: str) -> float:                         # (from the id shard the hit already loaded)
+        return self.entry__cost(self.entry__from__cache_id(cache_id))
+
+    def shard__read(self, kind: str, shard_key: str) -> Dict[str, str]:             # for scans: the loaded shard (if still fresh), else read from storage without keeping it in memory
+        path   = self.path_shard(kind, shard_key)
+        loaded = self.loaded_shards.get(path)
+        if loaded and time.monotonic() - loaded['checked_at'] < self.refresh_seconds:
+            return loaded['data']
+        return self.llm_cache.json__load(path) or {}
+
+    def shard__entries(self, shard_key: str, cursor: Optional[str] = None):        # (cache_id, file_path) of one shard, in cache_id order (after cursor)
+        shard = self.shard__read(SHARD_KIND__ID, shard_key)
+        for cache_id in sorted(shard):
+            if cursor and cache_id <= cursor:
+                continue
+            yield cache_id, self.entry__file_path(shard[cache_id])
+
+    def shards_keys__from(self, cursor: Optional[str] = None) -> list:              # the id shards that can have entries after cursor
+        start_shard = self.shard_key(cursor) if cursor else None
+        return [shard_key for shard_key in self.shards_keys(SHARD_KIND__ID) if not (start_shard and shard_key < start_shard)]
+
+    def entries(self, cursor: Optional[str] = None):                                # yield (cache_id, file_path) in cache_id order, one shard in memory at a time
+        for shard_key in self.shards_keys__from(cursor):
+            yield from self.shard__entries(shard_key, cursor)
+
+    def entries__page(self, limit      : int                                        ,   # one page of entries (and the cursor of the next one, None on the last page)
+                            cursor     : Optional[str]                   = None     ,
+                            match      : Optional[Callable[[str], bool]] = None     ,   # match(file_path): only the entries it accepts
+                            max_shards : int                             = CACHE_INDEX__SHARDS__PAGE_MAX_SHARDS
+                      ) -> Tuple[Dict[str, str], Optional[str]]:
+        page = {}
+        for position, shard_key in enumerate(self.shards_keys__from(cursor)):
+            if position == max_shards:
+                return page, shard_key                                              # (every cache_id of this shard sorts after its key, so the next page starts with it)
+            for cache_id, file_path in self.shard__entries(shard_key, cursor):
+                if match and not match(file_path):
+                    continue
+                if len(page) == limit:
+                    return page, max(page)
+                page[cache_id] = file_path
+        return page, None
+
+    def index_data(self) -> Dict[str, Any]:                                         # merged view of all shards (expensive: only for admin/export use)
+        hash_to_id = {}
+        id_to_path = {}
+        for shard_key in self.shards_keys(SHARD_KIND__HASH):
+            hash_to_id.update(self.shard__read(SHARD_KIND__HASH, shard_key))
+        for shard_key in self.shards_keys(SHARD_KIND__ID):
+            for cache_id, entry in self.shard__read(SHARD_KIND__ID, shard_key).items():
+                id_to_path[cache_id] = self.entry__file_path(entry)
+        return { 'cache_id__from__hash__request': hash_to_id ,
+                 'cache_id__to__file_path'      : id_to_path }
+
+    def manifest(self) -> Optional[Dict[str, Any]]:
+        return self.llm_cache.json__load(self.path_manifest())
+
+    def manifest__save(self, entries_imported: int = 0) -> bool:
+        manifest = dict(shard_prefix_size = self.shard_prefix_size ,
+                        entries_imported  = entries_imported       ,
+                        created_at        = Timestamp_Now()        )
+        return self.llm_cache.json__save(self.path_manifest(), manifest)
+
+    def import_legacy_index(self) -> int:                                           # split the legacy cache_index.json into shards (one write per shard)
+        legacy_index = self.llm_cache.json__load(FILE_NAME__CACHE_INDEX) or {}
+        hash_to_id   = legacy_index.get('cache_id__from__hash__request', {})
+        id_to_path   = legacy_index.get('cache_id__to__file_path'      , {})
+
+        for kind, mapping in ((SHARD_KIND__HASH, hash_to_id), (SHARD_KIND__ID, id_to_path)):
+            shards = {}
+            for key, value in mapping.items():
+                shard_key = self.shard_key(key)
+                if shard_key:
+                    shards.setdefault(shard_key, {})[key] = value
+            for shard_key, data in shards.items():
+                self.shard__save(kind, shard_key, data)
+
+        self.manifest__save(entries_imported=len(id_to_path))
+        return len(id_to_path)
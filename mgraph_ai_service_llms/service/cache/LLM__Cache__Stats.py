@@ -0,0 +1,299 @@
+import atexit
+import copy
+import threading
+import time
+import uuid
+from datetime                                                                  import datetime, timedelta, timezone
+from typing                                                                    import Dict, Any, Iterable, Optional, Callable, Tuple, Union
+from osbot_utils.type_safe.Type_Safe                                           import Type_Safe
+from osbot_utils.type_safe.primitives.safe_str.filesystem.Safe_Str__File__Path import Safe_Str__File__Path
+from mgraph_ai_service_llms.service.cache.LLM__Cache                           import LLM__Cache
+
+FOLDER_NAME__CACHE_STATS         = 'cache_stats/daily'
+CACHE_STATS__FLUSH_INTERVAL      = 30.0                                             # seconds between the writes of this worker's rollups (never on the cache read/write path)
+CACHE_STATS__COMPACT_AFTER_DAYS  = 2                                                # the worker files of days this old are merged into the day's rollup (nothing is counted in them any more)
+CACHE_STATS__WORKER_ID           = uuid.uuid4().hex[:8]                             # this process (all its counts go through llm_cache__stats, so it writes one file per day)
+
+
+class LLM__Cache__Stats(Type_Safe):                                                 # Cache statistics kept as per-day rollups (counted in memory, written per worker in the background, added up on read, compacted once the day is closed)
+    llm_cache          : LLM__Cache           = None
+    stats_folder       : Safe_Str__File__Path = Safe_Str__File__Path(FOLDER_NAME__CACHE_STATS)
+    rollups            : dict                                                       # date -> this worker's rollup
+    dirty              : dict                                                       # date -> True (changed since the last flush)
+    worker_id          : str                  = None
+    flush_interval     : float                = CACHE_STATS__FLUSH_INTERVAL
+    next_flush         : float                = 0.0
+    compact_after_days : int                  = CACHE_STATS__COMPACT_AFTER_DAYS
+    compacted_before   : str                  = None                                # the days before this date were compacted (by this worker)
+    lock               : object               = None
+    flush_lock         : object               = None
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.lock       = threading.RLock()
+        self.flush_lock = threading.RLock()
+        self.worker_id  = self.worker_id or CACHE_STATS__WORKER_ID                 # (each worker owns its files, so workers never overwrite each other's counters)
+        self.next_flush = time.monotonic() + self.flush_interval
+
+    def setup(self) -> 'LLM__Cache__Stats':
+        if self.llm_cache is None:
+            self.llm_cache = LLM__Cache().setup()
+        return self
+
+    def path_info(self, file_path: str) -> Dict[str, Optional[str]]:                # parse "{model}[/{provider}]/YYYY/MM/DD/HH/{cache_id}.json"
+        parts = str(file_path).split('/')
+        for index, part in enumerate(parts):
+            if len(part) == 4 and part.isdigit() and len(parts) >= index + 3:
+                return dict(model    = parts[0].replace('_', '/') if index > 0 else None,      # Convert back underscores to slashes
+                            provider = parts[1]                   if index > 1 else None,
+                            date     = '-'.join(parts[index:index + 3])                 )   # YYYY-MM-DD
+        return dict(model=parts[0].replace('_', '/') if len(parts) > 1 else None, provider=None, date=None)
+
+    def path_day(self, date: str) -> str:                                           # the day's rollup (the compacted worker files, and the entries from rebuild_from_index)
+        return f'{self.stats_folder}/{date}.json'
+
+    def path_worker(self, date: str, worker_id: Optional[str] = None) -> str:
+        return f'{self.stats_folder}/{date}/{worker_id or self.worker_id}.json'
+
+    def day(self, date: str, workers: bool = True) -> Dict[str, Any]:              # the day's rollup, plus the worker files not compacted yet, plus this worker's counts (reads never write)
+        stored  = self.llm_cache.json__load(self.path_day(date)) or {}
+        merged  = stored.get('workers', [])                                         # (the workers already added to the day's rollup)
+        offsets = stored.get('offsets', {})
+        with self.lock:
+            own = copy.deepcopy(self.rollups.get(date))
+        rollup = self.rollup__merge(self.day__empty(date), stored)
+        if workers:
+            for worker_id, source in self.day__workers(date).items():
+                if worker_id in merged or (own and worker_id == self.worker_id):   # (this worker's file is older than its counts)
+                    continue
+                self.rollup__merge(rollup, source, offsets.get(worker_id))
+        if own and self.worker_id not in merged:
+            self.rollup__merge(rollup, own, offsets.get(self.worker_id))
+        return rollup
+
+    def day__workers(self, date: str) -> Dict[str, Dict[str, Any]]:                # worker_id -> its rollup of the day (as of its last flush)
+        folder  = self.llm_cache.get_s3_key(f'{self.stats_folder}/{date}')
+        workers = {}
+        for file_name in self.llm_cache.s3_db.s3_folder_files(folder=folder):
+            if file_name.endswith('.json'):
+                worker_id = file_name[:-len('.json')]
+                source    = self.llm_cache.json__load(self.path_worker(date, worker_id))
+                if source:
+                    workers[worker_id] = source
+        return workers
+
+    def day__empty(self, date: str) -> Dict[str, Any]:
+        return dict(date       = date ,
+                    entries    = 0    ,
+                    models     = {}   ,
+                    providers  = {}   ,
+                    bytes      = 0    ,
+                    hits       = 0    ,
+                    misses     = 0    ,
+                    cost_saved = 0.0  )
+
+    def day__today(self) -> str:
+        return datetime.now(timezone.utc).strftime('%Y-%m-%d')
+
+    def day__update(self, date: str, update: Callable[[Dict[str, Any]], None]) -> bool:   # in memory (the rollup is written by the next flush)
+        try:
+            with self.lock:
+                rollup = self.rollups.get(date)
+                if rollup is None:
+                    rollup = self.rollups[date] = self.day__empty(date)
+                update(rollup)
+                self.dirty[date] = True
+            self.flush__if_due()
+            return True
+        except Exception:
+            return False                                                                # stats must never break the cache read/write paths
+
+    def day__cutoff(self) -> str:                                                   # the days before it are closed (nothing is counted in them any more)
+        return (datetime.now(timezone.utc) - timedelta(days=self.compact_after_days - 1)).strftime('%Y-%m-%d')
+
+    def flush__if_due(self) -> None:                                                # writes happen on a background thread
+        if time.monotonic() >= self.next_flush:
+            self.next_flush = time.monotonic() + self.flush_interval
+            threading.Thread(target=self.flush__background, daemon=True).start()
+
+    def flush__background(self) -> None:
+        self.flush()
+        self.compact__if_due()
+
+    def flush(self, wait: bool = False) -> bool:                                    # write this worker's changed rollups (one file per day)
+        if not self.flush_lock.acquire(blocking=wait):                              # another thread is already flushing (wait: for the final flush)
+            return False
+        try:
+            with self.lock:
+                rollups, self.dirty = { date: copy.deepcopy(self.rollups[date]) for date in self.dirty }, {}     # (the whole rollup: each file has this worker's totals for the day)
+            saved = True
+            for date, rollup in rollups.items():
+                try:
+                    saved_day = self.llm_cache.json__save(self.path_worker(date), rollup)
+                except Exception:
+                    saved_day = False
+                if not saved_day:
+                    saved = False
+                    with self.lock:
+                        self.dirty[date] = True                                     # try again on the next flush
+            return saved
+        finally:
+            self.flush_lock.release()
+
+    def compact__if_due(self) -> int:                                               # (once a day) merge the worker files of the closed days, so reads don't grow with every worker ever started
+        cutoff = self.day__cutoff()
+        if self.compacted_before == cutoff:
+            return 0
+        compacted = 0
+        for date, workers in self.days__stored().items():
+            if workers and date < cutoff and self.compact(date):
+                compacted += 1
+        self.compacted_before = cutoff
+        with self.lock:
+            for date in [date for date in self.rollups if date < cutoff and date not in self.dirty]:
+                del self.rollups[date]                                              # (counted in the day's rollup, or in this worker's file)
+        return compacted
+
+    def compact(self, date: str) -> bool:                                           # add the day's worker files to the day's rollup, then delete them
+        try:
+            stored  = self.llm_cache.json__load(self.path_day(date)) or {}
+            merged  = list(stored.get('workers', []))
+            offsets = dict(stored.get('offsets', {}))
+            rollup  = self.rollup__merge(self.day__empty(date), stored)
+            workers = self.day__workers(date)
+            for worker_id, source in workers.items():
+                if worker_id not in merged:                                         # (a worker compacted at the same time by another one is only added once)
+                    self.rollup__merge(rollup, source, offsets.pop(worker_id, None))
+                    merged.append(worker_id)
+            rollup.update(workers=merged, offsets=offsets)
+            if not self.llm_cache.json__save(self.path_day(date), rollup):
+                return False
+            self.llm_cache.s3_db.s3_files_delete([self.llm_cache.get_s3_key(self.path_worker(date, worker_id)) for worker_id in workers])
+            return True
+        except Exception:
+            return False                                                            # (tried again by the next compaction)
+
+    def days__stored(self) -> Dict[str, bool]:                                      # date -> has worker files (one listing of the stats folder)
+        folder = self.llm_cache.get_s3_key(str(self.stats_folder))
+        days   = { file_name[:-len('.json')]: False for file_name in self.llm_cache.s3_db.s3_folder_files(folder=folder) if file_name.endswith('.json') }
+        for date in self.llm_cache.s3_db.s3_folder_list(folder=folder):             # (the per worker folders)
+            days[date] = True
+        return days
+
+    def days(self, stored: Optional[Dict[str, bool]] = None) -> list:              # list the dates that have a rollup (O(days))
+        with self.lock:
+            dates = set(self.rollups)
+        return sorted(dates.union(self.days__stored() if stored is None else stored))
+
+    def days__in_range(self, date_from : Optional[str]             = None,
+                             date_to   : Optional[str]             = None,
+                             stored    : Optional[Dict[str, bool]] = None
+                        ) -> list:
+        return [date for date in self.days(stored) if not ((date_from and date < date_from) or (date_to and date > date_to))]
+
+    def record_entry(self, file_path: str, size_bytes: int = 0) -> bool:            # called when an entry is written to the cache
+        path_info = self.path_info(file_path)
+        if not path_info.get('date'):
+            return False
+        return self.day__update(path_info['date'], lambda rollup: self.rollup__add(rollup, path_info, size_bytes))
+
+    def record_hit(self, cost_saved: float = 0.0) -> bool:                          # called when a request is served from the cache
+        def update(rollup):
+            rollup['hits'      ] += 1
+            rollup['cost_saved'] += float(cost_saved or 0)
+        return self.day__update(self.day__today(), update)
+
+    def record_miss(self) -> bool:                                                  # called when a request was not in the cache
+        def update(rollup):
+            rollup['misses'] += 1
+        return self.day__update(self.day__today(), update)
+
+    def rollup__merge(self, target: Dict[str, Any], source: Dict[str, Any], offset: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:   # offset: what source counted that is already in target
+        offset = offset or {}
+        for key in ('entries', 'bytes', 'hits', 'misses', 'cost_saved'):
+            target[key] += source.get(key, 0) - offset.get(key, 0)
+        for group in ('models', 'providers'):
+            for name, count in source.get(group, {}).items():
+                count = target[group].get(name, 0) + count - offset.get(group, {}).get(name, 0)
+                if count:
+                    target[group][name] = count
+                else:
+                    target[group].pop(name, None)
+        return target
+
+    def rollup__add(self, rollup: Dict[str, Any], path_info: Dict[str, Optional[str]], size_bytes: int = 0) -> None:
+        model    = path_info.get('model'   ) or 'unknown'
+        provider = path_info.get('provider') or 'default'
+        rollup['entries'  ]           = rollup.get('entries', 0) + 1
+        rollup['bytes'    ]           = rollup.get('bytes'  , 0) + (size_bytes or 0)
+        rollup['models'   ][model   ] = rollup['models'   ].get(model   , 0) + 1
+        rollup['providers'][provider] = rollup['providers'].get(provider, 0) + 1
+
+    def rollup__entries(self, rollup: Dict[str, Any]) -> Dict[str, Any]:           # the part of a rollup that the index also has
+        return dict(entries   = rollup.get('entries', 0)         ,
+                    models    = dict(rollup.get('models'   , {})),
+                    providers = dict(rollup.get('providers', {})))
+
+    def rebuild_from_index(self, entries: Union[Dict[str, str], Iterable[Tuple[str, str]]]) -> int:     # one-off full scan (used to create the rollups for pre-existing entries), entries: cache_id -> file_path or (cache_id, file_path) pairs
+        if isinstance(entries, dict):
+            entries = entries.items()
+        rollups = {}
+        for _, file_path in entries:                                                # (streamed: only the per day counts are kept in memory)
+            path_info = self.path_info(file_path)
+            date      = path_info.get('date')
+            if date:
+                if date not in rollups:
+                    rollups[date] = self.day__empty(date)
+                self.rollup__add(rollups[date], path_info)
+        for date, rollup in rollups.items():
+            self.rebuild__day(date, rollup)
+        return len(rollups)
+
+    def rebuild__day(self, date: str, rebuilt: Dict[str, Any]) -> bool:             # the index's entries replace the counted ones (what the workers counted so far becomes their offset, so it is not added again)
+        stored  = self.llm_cache.json__load(self.path_day(date)) or {}
+        merged  = stored.get('workers', [])
+        offsets = { worker_id: self.rollup__entries(source) for worker_id, source in self.day__workers(date).items()
+                                                            if worker_id not in merged }
+        with self.lock:
+            own = self.rollups.get(date)
+            if own and self.worker_id not in merged:
+                offsets[self.worker_id] = self.rollup__entries(own)                 # (its counts, flushed or not)
+        rollup = self.rollup__merge(self.day__empty(date), stored)
+        rollup.update(self.rollup__entries(rebuilt), workers=merged, offsets=offsets)
+        return self.llm_cache.json__save(self.path_day(date), rollup)
+
+    def daily(self, date_from: Optional[str] = None,                                # one rollup per day (for charting stats over time)
+                    date_to  : Optional[str] = None
+               ) -> list:
+        stored = self.days__stored()                                                # (only the days with worker files need their folder listed)
+        return [self.day(date, workers=stored.get(date, False)) for date in self.days__in_range(date_from, date_to, stored)]
+
+    def stats(self, date_from: Optional[str] = None,                               # merge the daily rollups (optionally within a date range)
+                    date_to  : Optional[str] = None
+               ) -> Dict[str, Any]:
+        models_count    = {}
+        providers_count = {}
+        dates_count     = {}
+        totals          = dict(entries=0, bytes=0, hits=0, misses=0, cost_saved=0.0)
+        for rollup in self.daily(date_from, date_to):
+            for key in totals:
+                totals[key] += rollup.get(key, 0)
+            dates_count[rollup['date'].replace('-', '/')] = rollup.get('entries', 0)    # YYYY/MM/DD (same format as before)
+            for model, count in rollup.get('models', {}).items():
+                models_count[model] = models_count.get(model, 0) + count
+            for provider, count in rollup.get('providers', {}).items():
+                providers_count[provider] = providers_count.get(provider, 0) + count
+        lookups = totals['hits'] + totals['misses']
+        return { 'total_entries'         : totals['entries']                                 ,
+                 'total_bytes'           : totals['bytes'  ]                                 ,
+                 'total_hits'            : totals['hits'   ]                                 ,
+                 'total_misses'          : totals['misses' ]                                 ,
+                 'hit_ratio'             : round(totals['hits'] / lookups, 4) if lookups else 0.0,
+                 'cost_saved'            : round(totals['cost_saved'], 8)                    ,
+                 'models_distribution'   : models_count                                      ,
+                 'providers_distribution': providers_count                                   ,
+                 'dates_distribution'    : dates_count                                       }
+
+
+llm_cache__stats = LLM__Cache__Stats()                                              # shared by the cache writers and readers of this process (so the process writes one file per day)
+atexit.register(llm_cache__stats.flush, wait=True)                                  # the counts since the last flush (Lambda also flushes at the end of each invocation, since it is frozen after it)
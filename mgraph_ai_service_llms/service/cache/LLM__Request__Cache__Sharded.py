@@ -0,0 +1,90 @@
+from datetime                                                                        import datetime
+from typing                                                                          import Optional
+from osbot_utils.decorators.methods.cache_on_self                                    import cache_on_self
+from osbot_utils.helpers.Obj_Id                                                      import Obj_Id
+from osbot_utils.helpers.llms.cache.LLM_Request__Cache__File_System                  import LLM_Request__Cache__File_System
+from osbot_utils.helpers.llms.schemas.Schema__LLM_Request                            import Schema__LLM_Request
+from osbot_utils.helpers.llms.schemas.Schema__LLM_Response                           import Schema__LLM_Response
+from osbot_utils.type_safe.primitives.safe_str.cryptography.hashes.Safe_Str__Hash    import Safe_Str__Hash
+from osbot_utils.type_safe.type_safe_core.decorators.type_safe                       import type_safe
+from mgraph_ai_service_llms.service.cache.LLM__Cache__Index__Shards                  import LLM__Cache__Index__Shards
+from mgraph_ai_service_llms.service.cache.LLM__Cache__Stats                          import LLM__Cache__Stats, llm_cache__stats
+from mgraph_ai_service_llms.service.cache.LLM__Request__Cache__Storage               import LLM__Request__Cache__Storage
+from mgraph_ai_service_llms.service.metrics.LLM__Metrics                             import llm__metrics
+
+
+class LLM__Request__Cache__Sharded(LLM_Request__Cache__File_System):               # LLM request cache that persists its index as shards (instead of the monolithic cache_index.json)
+    index_shards  : LLM__Cache__Index__Shards = None
+    cache_stats   : LLM__Cache__Stats         = None
+    cost_function : object                    = None                               # cost_function(response_data) -> USD, used (when the upstream didn't report the cost) to price a response once, when it is cached
+
+    def setup(self) -> 'LLM__Request__Cache__Sharded':                             # note: we don't load the full index, lookups go to the shards
+        if self.index_shards is None:
+            self.index_shards = LLM__Cache__Index__Shards(llm_cache=self.virtual_storage).setup()
+        if self.cache_stats is None:
+            self.cache_stats  = llm_cache__stats.setup()                             # (one writer per process)
+        return self
+
+    @cache_on_self
+    def storage(self) -> LLM__Request__Cache__Storage:
+        return LLM__Request__Cache__Storage(virtual_storage=self.virtual_storage)
+
+    def save(self) -> bool:                                                         # the index is persisted per entry (in add), so there is nothing to save here
+        return True
+
+    @type_safe
+    def add(self, request  : Schema__LLM_Request ,
+                  response : Schema__LLM_Response,
+                  duration : float    = None     ,
+                  payload  : dict     = None     ,
+                  now      : datetime = None
+             ) -> Obj_Id:
+        cache_id     = super().add(request=request, response=response, duration=duration, payload=payload, now=now)
+        request_hash = self.compute_request_hash(request)
+        file_path    = self.cache_index.cache_id__to__file_path.get(cache_id)
+        self.index_shards.add_entry(request_hash=request_hash, cache_id=cache_id, file_path=file_path, cost=self.response_cost(response))
+        self.cache_stats .record_entry(file_path, size_bytes=self.storage().entry_sizes.pop(str(file_path), 0))
+        return cache_id
+
+    def response_cost(self, llm_response: Schema__LLM_Response) -> float:          # what the response cost when it was created (i.e. what a hit saves)
+        try:
+            response_data = llm_response.response_data or {}
+            usage         = response_data.get('usage') or {}
+            if usage.get('cost') is not None:                                       # (reported by OpenRouter)
+                return float(usage['cost'])
+            if usage and self.cost_function:
+                return float(self.cost_function(response_data) or 0.0)
+        except Exception:
+            pass                                                                    # no usage or pricing for this model
+        return 0.0
+
+    def get(self, request: Schema__LLM_Request) -> Optional[Schema__LLM_Response]:
+        request_hash = self.compute_request_hash(request)
+        cache_id     = self.get__cache_id__from__request_hash(request_hash)
+        if cache_id:
+            cache_entry = self.get__cache_entry__from__cache_id(cache_id)
+            if cache_entry:
+                self.cache_stats.record_hit(cost_saved=self.index_shards.cost__from__cache_id(cache_id))     # (priced when it was cached, kept in the id shard that the lookup loaded)
+                llm__metrics.cache_lookup('llm_cache', hit=True)
+                return cache_entry.llm__response
+        self.cache_stats.record_miss()
+        llm__metrics.cache_lookup('llm_cache', hit=False)
+        return None
+
+    def exists(self, request: Schema__LLM_Request) -> bool:
+        request_hash = self.compute_request_hash(request)
+        return self.get__cache_id__from__request_hash(request_hash) is not None
+
+    def get__cache_id__from__request_hash(self, request_hash: Safe_Str__Hash) -> Optional[Obj_Id]:
+        cache_id = self.cache_index.cache_id__from__hash__request.get(request_hash)
+        if cache_id is None:
+            cache_id = self.index_shards.cache_id__from__hash(request_hash)
+            if cache_id is None:
+                return None
+        return Obj_Id(cache_id)
+
+    def cache_id__to__file_path(self, cache_id: Obj_Id) -> Optional[str]:
+        file_path = self.cache_index.cache_id__to__file_path.get(cache_id)
+        if file_path is None:
+            file_path = self.index_shards.file_path__from__cache_id(cache_id)
+        return file_path
@@ -0,0 +1,20 @@
+from osbot_utils.helpers.llms.cache.LLM_Request__Cache__Storage                import LLM_Request__Cache__Storage
+from osbot_utils.helpers.llms.schemas.Schema__LLM_Response__Cache              import Schema__LLM_Response__Cache
+from osbot_utils.type_safe.primitives.safe_str.filesystem.Safe_Str__File__Path import Safe_Str__File__Path
+from osbot_utils.utils.Files                                                   import path_combine_safe
+from osbot_utils.utils.Json                                                    import json_dumps, json_to_gz
+
+
+class LLM__Request__Cache__Storage(LLM_Request__Cache__Storage):                    # Saves the cache entries as bytes, so their size is known without a HEAD request
+    entry_sizes : dict                                                              # file_path -> bytes saved (until LLM__Request__Cache__Sharded.add takes it)
+
+    def save__cache_entry(self, file_path   : Safe_Str__File__Path        ,
+                                cache_entry : Schema__LLM_Response__Cache
+                          ) -> bool:
+        full_file_path = Safe_Str__File__Path(path_combine_safe(self.virtual_storage.path_folder__root_cache(), file_path))
+        s3_db          = self.virtual_storage.s3_db
+        json_data      = cache_entry.json()
+        data           = json_to_gz(json_data) if s3_db.save_as_gz else json_dumps(json_data).encode()     # (same bytes as virtual_storage.json__save)
+        saved          = s3_db.s3_save_bytes(data=data, s3_key=self.virtual_storage.get_s3_key(full_file_path))
+        self.entry_sizes[str(file_path)] = len(data)
+        return saved
@@ -1,60 +1,98 @@
-from typing                                                                    import Dict, Any
+import json
+from concurrent.futures                                                        import ThreadPoolExecutor
+from typing                                                                    import Dict, Any, List, Optional, Callable
 from osbot_utils.type_safe.Type_Safe                                           import Type_Safe
-from osbot_utils.type_safe.primitives.safe_str.filesystem.Safe_Str__File__Name import Safe_Str__File__Name
 from osbot_utils.type_safe.primitives.safe_str.filesystem.Safe_Str__File__Path import Safe_Str__File__Path
-from osbot_utils.utils.Http                                                    import url_join_safe
 from mgraph_ai_service_llms.service.cache.LLM__Cache                           import LLM__Cache
+from mgraph_ai_service_llms.service.cache.LLM__Cache__Index__Shards            import LLM__Cache__Index__Shards
+from mgraph_ai_service_llms.service.cache.LLM__Cache__Stats                    import LLM__Cache__Stats, llm_cache__stats
+from mgraph_ai_service_llms.service.schemas.Schema__Cache__Ids                 import CACHE_IDS__MAX_BATCH_SIZE, CACHE_IDS__MAX_WORKERS
+
+CACHE_INDEX__PAGE_LIMIT__DEFAULT = 100
+CACHE_INDEX__PAGE_LIMIT__MAX     = 1000
 
 
 class Service__Cache(Type_Safe):
-    llm_cache          : LLM__Cache           = None
-    base_folder        : Safe_Str__File__Path = Safe_Str__File__Path('llm-cache/'     )
-    cache_index_path   : Safe_Str__File__Name = Safe_Str__File__Name('cache_index.json')
-    _cached_index      : dict                 = None  # In-memory cache of the index
+    llm_cache          : LLM__Cache                = None
+    index_shards       : LLM__Cache__Index__Shards = None
+    base_folder        : Safe_Str__File__Path      = Safe_Str__File__Path('llm-cache/'     )
+    stats_rollups      : LLM__Cache__Stats         = None
 
     def __init__(self):
         super().__init__()
-        self.llm_cache = LLM__Cache().setup()
-
-    def cache_index(self) -> Dict[str, Any]:                                # Get the complete cache index
-        """Return the complete cache index from cache_index.json"""
+        self.llm_cache     = LLM__Cache().setup()
+        self.index_shards  = LLM__Cache__Index__Shards(llm_cache=self.llm_cache).setup()
+        self.stats_rollups = llm_cache__stats.setup()                                 # (includes the counts of this process that are not written yet)
+
+    def cache_index(self, limit     : int           = CACHE_INDEX__PAGE_LIMIT__DEFAULT,    # Get one page of the cache index
+                          cursor    : Optional[str] = None ,
+                          model     : Optional[str] = None ,
+                          date_from : Optional[str] = None ,
+                          date_to   : Optional[str] = None
+                     ) -> Dict[str, Any]:
+        """Return one page of the cache index (cache_id -> file_path), ordered by cache_id
+
+        Use the returned next_cursor to get the next page (it is None on the last page)
+        """
         try:
-            cache_path = url_join_safe(self.base_folder, self.cache_index_path)
-            index_content = self.llm_cache.json__load(cache_path)
-
-            if index_content:
-                self._cached_index = index_content
-                return { 'status': 'success',
-                         'data': self._cached_index ,
-                         'cache_path': cache_path }
-            else:
-                return { 'status': 'success',
-                         'data'  : { 'cache_id__from__hash__request': {},
-                                     'cache_id__to__file_path'      : {},
-                                     'message'                      : 'Cache index is empty or not initialized' } }
+            limit                   = max(1, min(int(limit), CACHE_INDEX__PAGE_LIMIT__MAX))
+            id_to_path, next_cursor = self.index_shards.entries__page(limit  = limit                                           ,
+                                                                      cursor = cursor                                          ,
+                                                                      match  = self.cache_index__match(model, date_from, date_to))
+
+            data = { 'cache_id__to__file_path': id_to_path  ,
+                     'count'                  : len(id_to_path),
+                     'limit'                  : limit       ,
+                     'cursor'                 : cursor      ,
+                     'next_cursor'            : next_cursor }
+            if not id_to_path and not cursor and not next_cursor:
+                data['message'] = 'Cache index is empty or not initialized'
+            return { 'status'      : 'success'                           ,
+                     'data'        : data                                ,
+                     'cache_path'  : str(self.index_shards.shards_folder) }
         except Exception as e:
             return { 'status' : 'error',
                      'message': f'Failed to read cache index: {str(e)}',
-                     'data'   : {'cache_path': cache_path}
+                     'data'   : {'cache_path': str(self.index_shards.shards_folder)}
             }
 
+    def cache_index__entries(self, cursor    : Optional[str] = None ,                # Stream the (filtered) cache index entries, one shard at a time
+                                   model     : Optional[str] = None ,
+                                   date_from : Optional[str] = None ,
+                                   date_to   : Optional[str] = None
+                              ):
+        match = self.cache_index__match(model, date_from, date_to)
+        for cache_id, file_path in self.index_shards.entries(cursor=cursor):
+            if match is None or match(file_path):
+                yield cache_id, file_path
+
+    def cache_index__match(self, model     : Optional[str] = None ,                  # the filter for the entries' file paths (None when there is nothing to filter)
+                                 date_from : Optional[str] = None ,
+                                 date_to   : Optional[str] = None
+                            ) -> Optional[Callable[[str], bool]]:
+        if not (model or date_from or date_to):
+            return None
+        def match(file_path: str) -> bool:
+            path_info = self.stats_rollups.path_info(file_path)
+            date      = path_info.get('date') or ''
+            if model     and path_info.get('model') != model: return False
+            if date_from and date < date_from               : return False
+            if date_to   and date > date_to                 : return False
+            return True
+        return match
+
+    def cache_index__export(self, model     : Optional[str] = None ,                 # NDJSON lines (one entry per line) for the full (filtered) index
+                                  date_from : Optional[str] = None ,
+                                  date_to   : Optional[str] = None
+                             ):
+        for cache_id, file_path in self.cache_index__entries(model=model, date_from=date_from, date_to=date_to):
+            yield json.dumps({'cache_id': cache_id, 'file_path': file_path}) + '\n'
+
     def get_cache_entry_by_id(self, cache_id: str) -> Dict[str, Any]:       # Get cache entry by cache ID
         """Retrieve a cache entry by its cache ID"""
         try:
-            # Get the file path from the index
-            if not self._cached_index:
-                self.cache_index()  # Load index if not already loaded
-
-            if not self._cached_index:
-                return {
-                    'status': 'error',
-                    'message': 'Could not load cache index',
-                    'cache_id': cache_id,
-                    'data': None
-                }
-
-            # Look up the file path for this cache ID
-            file_path = self._cached_index.get('cache_id__to__file_path', {}).get(cache_id)
+            # Look up the file path for this cache ID (only the shard that holds it is loaded)
+            file_path = self.index_shards.file_path__from__cache_id(cache_id)
 
             if not file_path:
                 return {
@@ -91,28 +129,32 @@ class Service__Cache(Type_Safe):
                 'data': None
             }
 
+    def get_cache_entries_by_ids(self, cache_ids   : List[str]                       ,     # Get several cache entries (fetched concurrently)
+                                       max_workers : int = CACHE_IDS__MAX_WORKERS
+                                  ) -> Dict[str, Any]:
+        """Retrieve several cache entries, returning a map of cache_id -> entry (each with its own status)"""
+        cache_ids = list(dict.fromkeys(cache_ids))                                  # remove duplicates (keeping the order)
+        if len(cache_ids) > CACHE_IDS__MAX_BATCH_SIZE:
+            return { 'status' : 'error',
+                     'message': f'Too many cache ids: {len(cache_ids)} (max is {CACHE_IDS__MAX_BATCH_SIZE})',
+                     'data'   : None }
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, CACHE_IDS__MAX_WORKERS))) as executor:
+            entries = dict(zip(cache_ids, executor.map(self.get_cache_entry_by_id, cache_ids)))
+        return { 'status': 'success'                                                                      ,
+                 'count' : len(entries)                                                                   ,
+                 'found' : sum(1 for entry in entries.values() if entry.get('status') == 'success')      ,
+                 'data'  : entries                                                                        }
+
     def get_cache_entry_by_hash(self, request_hash: str) -> Dict[str, Any]: # Get cache entry by request hash
         """Retrieve a cache entry by its request hash"""
         try:
-            # Load index if not already loaded
-            if not self._cached_index:
-                self.cache_index()
-
-            if not self._cached_index:
-                return {
-                    'status': 'error',
-                    'message': 'Could not load cache index',
-                    'request_hash': request_hash,
-                    'data': None
-                }
-
-            # Get cache ID from the hash
-            cache_id = self._cached_index.get('cache_id__from__hash__request', {}).get(request_hash)
+            # Get cache ID from the hash (only the shard that holds it is loaded)
+            cache_id = self.index_shards.cache_id__from__hash(request_hash)
 
             if not cache_id:
                 # Try with just the first 10 characters if full hash not found
                 short_hash = request_hash[:10] if len(request_hash) >= 10 else request_hash
-                cache_id = self._cached_index.get('cache_id__from__hash__request', {}).get(short_hash)
+                cache_id = self.index_shards.cache_id__from__hash(short_hash)
 
             if not cache_id:
                 return {
@@ -136,46 +178,24 @@ class Service__Cache(Type_Safe):
                 'data': None
             }
 
-    def cache_stats(self) -> Dict[str, Any]:                                # Get cache statistics
-        """Get statistics about the cache"""
+    def cache_stats(self, date_from : Optional[str] = None ,                        # Get cache statistics
+                          date_to   : Optional[str] = None
+                     ) -> Dict[str, Any]:
+        """Get statistics about the cache (merged from the daily rollups, so the index is not scanned)"""
         try:
-            if not self._cached_index:
-                self.cache_index()
-
-            if not self._cached_index:
+            if not self.cache_stats__ready():
                 return {
                     'status': 'error',
-                    'message': 'Could not load cache index',
+                    'message': 'Could not load cache stats',
                     'data': None
                 }
 
-            hash_to_id = self._cached_index.get('cache_id__from__hash__request', {})
-            id_to_path = self._cached_index.get('cache_id__to__file_path', {})
-
-            # Extract model usage from file paths
-            models_count = {}
-            dates_count = {}
-
-            for cache_id, file_path in id_to_path.items():
-                # Parse model from path: "model_name/2025/07/23/15/cache_id.json"
-                parts = file_path.split('/')
-                if len(parts) > 0:
-                    model = parts[0].replace('_', '/')  # Convert back underscores to slashes
-                    models_count[model] = models_count.get(model, 0) + 1
-
-                # Parse date from path
-                if len(parts) >= 4:
-                    date = f"{parts[1]}/{parts[2]}/{parts[3]}"  # YYYY/MM/DD
-                    dates_count[date] = dates_count.get(date, 0) + 1
-
-            stats = {
-                'total_entries': len(id_to_path),
-                'total_request_hashes': len(hash_to_id),
-                'models_distribution': models_count,
-                'dates_distribution': dates_count,
+            stats = self.stats_rollups.stats(date_from=date_from, date_to=date_to)
+            stats.update({
+                'total_request_hashes': stats['total_entries'],                    # one request hash per cache entry
                 'bucket_name': self.llm_cache.s3_db.bucket_name() if self.llm_cache.s3_db else 'unknown',
                 'root_folder': str(self.llm_cache.root_folder)
-            }
+            })
 
             return {
                 'status': 'success',
@@ -187,4 +207,24 @@ class Service__Cache(Type_Safe):
                 'status': 'error',
                 'message': f'Failed to calculate cache stats: {str(e)}',
                 'data': None
-            }
\ No newline at end of file
+            }
+
+    def cache_stats__daily(self, date_from : Optional[str] = None ,                 # Get the per-day rollups (for charting the cache over time)
+                                 date_to   : Optional[str] = None
+                            ) -> Dict[str, Any]:
+        try:
+            self.cache_stats__ready()
+            days = self.stats_rollups.daily(date_from=date_from, date_to=date_to)
+            return { 'status': 'success',
+                     'data'  : { 'days' : days      ,
+                                 'count': len(days) } }
+        except Exception as e:
+            return { 'status' : 'error',
+                     'message': f'Failed to load daily cache stats: {str(e)}',
+                     'data'   : None }
+
+    def cache_stats__ready(self) -> bool:                                   # create the rollups from the index (once) if they don't exist yet
+        if self.stats_rollups.days():
+            return True
+        self.stats_rollups.rebuild_from_index(self.index_shards.entries())       # (one shard in memory at a time)
+        return True
@@ -1,7 +1,11 @@
-from osbot_fast_api.utils.Fast_API__Server_Info                            import fast_api__server_info, Fast_API__Server_Info
-from osbot_utils.type_safe.Type_Safe                                       import Type_Safe
-from mgraph_ai_service_llms.service.info.schemas.Schema__Service__Status   import Schema__Service__Status, Enum__Service_Environment
-from mgraph_ai_service_llms.service.info.schemas.Schema__Server__Versions  import Schema__Server__Versions
+from osbot_fast_api.utils.Fast_API__Server_Info                             import fast_api__server_info, Fast_API__Server_Info
+from osbot_utils.type_safe.Type_Safe                                        import Type_Safe
+from mgraph_ai_service_llms.service.info.schemas.Schema__Service__Status    import Schema__Service__Status, Enum__Service_Environment
+from mgraph_ai_service_llms.service.info.schemas.Schema__Server__Versions   import Schema__Server__Versions
+from mgraph_ai_service_llms.service.llms.resilience.LLM__Resilience         import LLM__Resilience
+from mgraph_ai_service_llms.service.llms.transport.LLM__Transport           import llm__transport
+from mgraph_ai_service_llms.service.perf.Perf__Stats                        import perf__stats
+from mgraph_ai_service_llms.service.metrics.LLM__Metrics                    import llm__metrics
 
 
 class Service_Info(Type_Safe):
@@ -21,3 +25,15 @@ class Service_Info(Type_Safe):
 
     def server_info(self) -> Fast_API__Server_Info:
         return fast_api__server_info
+
+    def circuit_breakers(self):                                                     # Upstream circuit breakers (per model and provider) and the retry policy
+        return LLM__Resilience().status()
+
+    def transport(self):                                                            # Upstream connection pool and per host request counters
+        return llm__transport.stats()
+
+    def perf(self):                                                                 # Span durations (in ms) per request stage, since this process started
+        return perf__stats.summary()
+
+    def metrics(self) -> str:                                                       # Prometheus text format (all the workers, when METRICS__MULTIPROCESS_DIR is set)
+        return llm__metrics.render()
@@ -1,14 +1,16 @@
 from osbot_utils.helpers.llms.actions.LLM_Request__Execute                            import LLM_Request__Execute
 from osbot_utils.helpers.llms.builders.LLM_Request__Builder__Open_AI                  import LLM_Request__Builder__Open_AI
-from osbot_utils.helpers.llms.cache.LLM_Request__Cache__File_System                   import LLM_Request__Cache__File_System
 from osbot_utils.helpers.llms.schemas.Safe_Str__LLM__Model_Name                       import Safe_Str__LLM__Model_Name
 from osbot_utils.type_safe.Type_Safe                                                  import Type_Safe
 from osbot_utils.utils.Env                                                            import load_dotenv
 from mgraph_ai_service_llms.service.cache.LLM__Cache                                  import LLM__Cache
+from mgraph_ai_service_llms.service.cache.LLM__Request__Cache__Sharded                import LLM__Request__Cache__Sharded
 from mgraph_ai_service_llms.service.llms.prompts.LLM__Prompt__Extract_Facts           import LLM__Prompt__Extract_Facts
 from mgraph_ai_service_llms.service.llms.providers.open_router.API__LLM__Open_Router  import API__LLM__Open_Router
 from mgraph_ai_service_llms.service.llms.providers.open_router.Schema__Open_Router__Providers import \
     Schema__Open_Router__Providers
+from mgraph_ai_service_llms.platforms.open_router.service.Open_Router__Services       import open_router__services
+from mgraph_ai_service_llms.platforms.open_router.service.Service__Open_Router__Cost  import Service__Open_Router__Cost
 
 
 class LLM__Execute_Request(Type_Safe):
@@ -20,7 +22,8 @@ class LLM__Execute_Request(Type_Safe):
 
     def setup(self):
         self.virtual_storage   = LLM__Cache().setup()
-        self.llm_cache         = LLM_Request__Cache__File_System(virtual_storage = self.virtual_storage  ).setup()
+        self.llm_cache         = LLM__Request__Cache__Sharded   (virtual_storage = self.virtual_storage  ,
+                                                                 cost_function   = self.response_cost    ).setup()
         self.llm_api           = API__LLM__Open_Router()
         self.request_builder   = LLM_Request__Builder__Open_AI()
         self.llm_execute       = LLM_Request__Execute(llm_cache       = self.llm_cache      ,
@@ -28,6 +31,13 @@ class LLM__Execute_Request(Type_Safe):
                                                       request_builder = self.request_builder)
         return self
 
+    def response_cost(self, response_data: dict) -> float:                          # priced once, when the response is cached (so cache hits never load the models catalogue)
+        cost_service   = open_router__services.shared(Service__Open_Router__Cost)
+        cost_breakdown = cost_service.calculate_cost(model_id = response_data.get('model'   ),
+                                                     usage    = response_data.get('usage'   ),
+                                                     provider = response_data.get('provider'))
+        return float(cost_breakdown.total_cost)
+
     def extract_facts(self, text_content,
                             model_to_use: Safe_Str__LLM__Model_Name,
                             provider    : Schema__Open_Router__Providers  = None):
@@ -1,9 +1,10 @@
 from osbot_utils.helpers.llms.platforms.open_ai.API__LLM__Open_AI import API__LLM__Open_AI
 
 ENV_NAME_GROQ__API_KEY      = "GROQ__API_KEY"
+GROQ__API_URL               = "https://api.groq.com/openai/v1/chat/completions"      # OpenAI compatible endpoint
 #GROQ__LLM_MODEL__MIXTRAL    = 'Mixtral-8x7b-32768'      # decommissioned
 GROQ__LLM_MODEL__LLAMA_3_8B = "llama3-8b-8192"
 
 class API__LLM__Groq(API__LLM__Open_AI):
-    api_url     : str = "https://api.groq.com/openai/v1/chat/completions"
+    api_url     : str = GROQ__API_URL
     api_key_name: str = ENV_NAME_GROQ__API_KEY
\ No newline at end of file
@@ -1,4 +1,7 @@
-from osbot_utils.helpers.llms.platforms.open_ai.API__LLM__Open_AI import API__LLM__Open_AI
+from typing                                                            import Dict, Any
+from requests                                                          import HTTPError
+from osbot_utils.helpers.llms.platforms.open_ai.API__LLM__Open_AI      import API__LLM__Open_AI
+from mgraph_ai_service_llms.service.llms.transport.LLM__Transport      import LLM__Transport, llm__transport
 
 ENV_NAME_OPEN_ROUTER__API_KEY    = "OPEN_ROUTER__API_KEY"
 OPEN_ROUTER__LLM_MODEL__GEMINI_2 = 'google/gemini-2.0-flash-lite-001'
@@ -7,4 +10,19 @@ OPEN_ROUTER__LLM_MODEL__GEMINI_2 = 'google/gemini-2.0-flash-lite-001'
 # todo: refactor with Provider__Open_Router class
 class API__LLM__Open_Router(API__LLM__Open_AI):
     api_url     : str = "https://openrouter.ai/api/v1/chat/completions"
-    api_key_name: str = ENV_NAME_OPEN_ROUTER__API_KEY
\ No newline at end of file
+    api_key_name: str = ENV_NAME_OPEN_ROUTER__API_KEY
+    transport   : LLM__Transport = None
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        if self.transport is None:
+            self.transport = llm__transport                                         # shared connection pool (and metrics) with the platform services
+
+    def execute(self, llm_payload : Dict[str, Any]):                                # same as API__LLM__Open_AI.execute, but through the shared transport
+        headers = { "Authorization": f"Bearer {self.api_key()}",
+                    "Content-Type" : "application/json"       ,
+                    'User-Agent'   : "myfeeds.ai"             }
+        try:
+            return self.transport.post_json(self.api_url, headers=headers, payload=llm_payload)
+        except HTTPError as error:
+            raise ValueError(self.transport.error_message(error))
\ No newline at end of file
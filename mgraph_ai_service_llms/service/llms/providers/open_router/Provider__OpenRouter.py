@@ -1,10 +1,10 @@
 from typing                                                                                     import Dict, Any, Optional
-from urllib.error                                                                               import HTTPError
+from requests                                                                                   import HTTPError
 from osbot_utils.type_safe.Type_Safe                                                            import Type_Safe
-from osbot_utils.utils.Http                                                                     import POST_json
 from osbot_utils.utils.Env                                                                      import get_env
-from osbot_utils.utils.Json                                                                     import str_to_json
 from mgraph_ai_service_llms.service.llms.providers.open_router.Schema__Open_Router__Providers   import Schema__Open_Router__Providers
+from mgraph_ai_service_llms.service.llms.resilience.LLM__Resilience                             import LLM__Resilience
+from mgraph_ai_service_llms.service.llms.transport.LLM__Transport                               import LLM__Transport, llm__transport
 
 ENV_NAME_OPEN_ROUTER__API_KEY = "OPEN_ROUTER__API_KEY"
 
@@ -12,6 +12,13 @@ class Provider__OpenRouter(Type_Safe):
     api_url     : str = "https://openrouter.ai/api/v1/chat/completions"
     api_key_name: str = ENV_NAME_OPEN_ROUTER__API_KEY
     http_referer: str = "https://github.com/the-cyber-boardroom/MGraph-AI__Service__LLMs"
+    resilience  : LLM__Resilience                                                                  # retries transient errors (429, 5xx) with backoff, behind per (model, provider) circuit breakers
+    transport   : LLM__Transport  = None
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        if self.transport is None:
+            self.transport = llm__transport                                                        # shared connection pool (and metrics) with the platform services
 
     def api_key(self) -> str:
         return get_env(self.api_key_name)
@@ -28,12 +35,16 @@ class Provider__OpenRouter(Type_Safe):
                     "X-Include-Provider": "true"                    }                              # default to ask OpenRouter to provide this info
 
 
+        provider_name = None
         if provider and provider != Schema__Open_Router__Providers.AUTO:                           # Add provider-specific routing if specified
             headers["X-Provider"] = provider.value
+            provider_name         = provider.value
 
 
         try:
-            response = POST_json(self.api_url, headers=headers, data=llm_payload)
+            response = self.resilience.call(model     = llm_payload.get('model')                                     ,
+                                            providers = [provider_name]                                              ,
+                                            send      = lambda _: self.transport.post_json(self.api_url, headers=headers, payload=llm_payload))
 
             # # Extract provider info if available
             # if include_provider_info and "provider" in response:
@@ -44,5 +55,4 @@ class Provider__OpenRouter(Type_Safe):
 
             return response
         except HTTPError as error:
-            error_message = str_to_json(error.file.read().decode("utf-8"))
-            raise ValueError(error_message)
\ No newline at end of file
+            raise ValueError(self.transport.error_message(error))
\ No newline at end of file
@@ -0,0 +1,77 @@
+import threading
+import time
+from typing                                                                         import Dict, Any
+from osbot_utils.type_safe.Type_Safe                                                import Type_Safe
+
+CIRCUIT_BREAKER__STATE__CLOSED     = 'closed'                                       # requests flow
+CIRCUIT_BREAKER__STATE__OPEN       = 'open'                                         # requests are rejected (provider is failing)
+CIRCUIT_BREAKER__STATE__HALF_OPEN  = 'half_open'                                    # one probe request is allowed through
+CIRCUIT_BREAKER__FAILURE_THRESHOLD = 5                                              # consecutive failures that open the breaker
+CIRCUIT_BREAKER__OPEN_SECONDS      = 30.0                                           # how long the breaker stays open before a probe
+
+
+class LLM__Circuit_Breaker(Type_Safe):                                              # Circuit breaker for one (model, provider)
+    failure_threshold    : int   = CIRCUIT_BREAKER__FAILURE_THRESHOLD
+    open_seconds         : float = CIRCUIT_BREAKER__OPEN_SECONDS
+    state                : str   = CIRCUIT_BREAKER__STATE__CLOSED
+    consecutive_failures : int
+    total_failures       : int
+    total_successes      : int
+    times_opened         : int
+    opened_at            : float                                                    # time.monotonic() when the breaker opened
+    probe_in_flight      : bool
+    lock                 : object = None
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.lock = threading.RLock()
+
+    def allow(self) -> bool:                                                        # can a request be sent now? (moves open -> half_open after open_seconds)
+        with self.lock:
+            if self.state == CIRCUIT_BREAKER__STATE__OPEN:
+                if time.monotonic() - self.opened_at < self.open_seconds:
+                    return False
+                self.state           = CIRCUIT_BREAKER__STATE__HALF_OPEN
+                self.probe_in_flight = False
+            if self.state == CIRCUIT_BREAKER__STATE__HALF_OPEN:
+                if self.probe_in_flight:
+                    return False
+                self.probe_in_flight = True
+            return True
+
+    def record_success(self) -> None:
+        with self.lock:
+            self.total_successes     += 1
+            self.consecutive_failures = 0
+            self.probe_in_flight      = False
+            self.state                = CIRCUIT_BREAKER__STATE__CLOSED
+
+    def record_failure(self) -> None:                                               # only provider side failures (429, 5xx, timeouts) should be recorded
+        with self.lock:
+            self.total_failures       += 1
+            self.consecutive_failures += 1
+            self.probe_in_flight       = False
+            if self.state == CIRCUIT_BREAKER__STATE__HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+                if self.state != CIRCUIT_BREAKER__STATE__OPEN:
+                    self.times_opened += 1
+                self.state     = CIRCUIT_BREAKER__STATE__OPEN
+                self.opened_at = time.monotonic()
+
+    def release_probe(self) -> None:                                                # the probe ended without telling us anything about the provider (e.g. a local error)
+        with self.lock:
+            self.probe_in_flight = False
+
+    def retry_in(self) -> float:                                                    # seconds until an open breaker allows a probe
+        with self.lock:
+            if self.state != CIRCUIT_BREAKER__STATE__OPEN:
+                return 0.0
+            return max(0.0, round(self.open_seconds - (time.monotonic() - self.opened_at), 3))
+
+    def status(self) -> Dict[str, Any]:
+        with self.lock:
+            return dict(state                = self.state                ,
+                        consecutive_failures = self.consecutive_failures ,
+                        total_failures       = self.total_failures       ,
+                        total_successes      = self.total_successes      ,
+                        times_opened         = self.times_opened         ,
+                        retry_in             = self.retry_in()           )
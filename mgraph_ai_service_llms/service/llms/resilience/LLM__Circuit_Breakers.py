@@ -0,0 +1,46 @@
+import threading
+from typing                                                                         import Dict, Any, List, Optional
+from osbot_utils.type_safe.Type_Safe                                                import Type_Safe
+from mgraph_ai_service_llms.service.llms.resilience.LLM__Circuit_Breaker            import LLM__Circuit_Breaker, CIRCUIT_BREAKER__FAILURE_THRESHOLD, CIRCUIT_BREAKER__OPEN_SECONDS
+
+CIRCUIT_BREAKERS__PROVIDER__AUTO = 'auto'                                           # key used when OpenRouter picks the provider
+
+
+class LLM__Circuit_Breakers(Type_Safe):                                             # Circuit breakers per (model, provider), created on first use
+    failure_threshold : int    = CIRCUIT_BREAKER__FAILURE_THRESHOLD
+    open_seconds      : float  = CIRCUIT_BREAKER__OPEN_SECONDS
+    breakers          : dict                                                        # (model, provider) -> LLM__Circuit_Breaker
+    lock              : object = None
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.lock = threading.RLock()
+
+    def breaker(self, model: str, provider: Optional[str]) -> LLM__Circuit_Breaker:
+        key = (str(model), str(provider or CIRCUIT_BREAKERS__PROVIDER__AUTO))
+        with self.lock:
+            if key not in self.breakers:
+                self.breakers[key] = LLM__Circuit_Breaker(failure_threshold = self.failure_threshold,
+                                                          open_seconds      = self.open_seconds     )
+            return self.breakers[key]
+
+    def allow(self, model: str, provider: Optional[str]) -> bool:
+        return self.breaker(model, provider).allow()
+
+    def record_success(self, model: str, provider: Optional[str]) -> None:
+        self.breaker(model, provider).record_success()
+
+    def record_failure(self, model: str, provider: Optional[str]) -> None:
+        self.breaker(model, provider).record_failure()
+
+    def states(self) -> List[Dict[str, Any]]:                                       # status of all breakers (exposed in /info/circuit-breakers)
+        with self.lock:
+            items = sorted(self.breakers.items())
+        return [dict(model=model, provider=provider, **breaker.status()) for (model, provider), breaker in items]
+
+    def clear(self) -> None:
+        with self.lock:
+            self.breakers.clear()
+
+
+llm__circuit_breakers = LLM__Circuit_Breakers()                                     # shared by all providers/services in this process
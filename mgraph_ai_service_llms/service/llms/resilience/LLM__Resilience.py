@@ -0,0 +1,55 @@
+import time
+from typing                                                                         import Any, Callable, Dict, List, Optional
+from osbot_utils.type_safe.Type_Safe                                                import Type_Safe
+from mgraph_ai_service_llms.service.llms.resilience.LLM__Circuit_Breakers           import LLM__Circuit_Breakers, llm__circuit_breakers
+from mgraph_ai_service_llms.service.llms.resilience.LLM__Retry_Policy               import LLM__Retry_Policy
+
+
+class LLM__Resilience(Type_Safe):                                                   # Sends a request with circuit breakers, retries (with backoff) and failover across providers
+    circuit_breakers : LLM__Circuit_Breakers = None
+    retry_policy     : LLM__Retry_Policy
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        if self.circuit_breakers is None:
+            self.circuit_breakers = llm__circuit_breakers
+
+    def sleep(self, seconds: float) -> None:
+        time.sleep(seconds)
+
+    def call(self, model     : str                          ,                       # send(provider) for each provider (in order) until one succeeds
+                   providers : List[Optional[str]]          ,                       # preference list (None means: let OpenRouter pick)
+                   send      : Callable[[Optional[str]], Any]
+             ) -> Any:
+        last_error = None
+        for provider in providers:
+            if not self.circuit_breakers.allow(model, provider):
+                continue                                                            # provider is failing: skip it without sending anything
+            attempt = 1
+            while True:
+                try:
+                    result = send(provider)
+                except Exception as error:
+                    last_error = error
+                    if not self.retry_policy.is_retryable(error):
+                        if self.retry_policy.status_code(error) is None:
+                            self.circuit_breakers.breaker(model, provider).release_probe()  # local error (e.g. the rate limiter queue timed out)
+                        else:
+                            self.circuit_breakers.record_success(model, provider)   # the provider answered (client errors are not its fault)
+                        raise
+                    self.circuit_breakers.record_failure(model, provider)
+                    delay = self.retry_policy.delay(attempt, error)
+                    if delay is None or not self.circuit_breakers.allow(model, provider):
+                        break                                                       # fail over to the next provider
+                    self.sleep(delay)
+                    attempt += 1
+                    continue
+                self.circuit_breakers.record_success(model, provider)
+                return result
+        if last_error:
+            raise last_error
+        raise ConnectionError(f"No provider available for model '{model}' (circuit open for: {', '.join(str(provider or 'auto') for provider in providers)})")
+
+    def status(self) -> Dict[str, Any]:
+        return dict(retry_policy     = self.retry_policy.json()      ,
+                    circuit_breakers = self.circuit_breakers.states())
@@ -0,0 +1,57 @@
+import random
+from email.utils                                                                    import parsedate_to_datetime
+from datetime                                                                       import datetime, timezone
+from typing                                                                         import Optional
+from osbot_utils.type_safe.Type_Safe                                                import Type_Safe
+
+RETRY_POLICY__MAX_ATTEMPTS     = 3                                                  # per provider (including the first request)
+RETRY_POLICY__BASE_DELAY       = 0.5                                                # seconds (doubled on each attempt)
+RETRY_POLICY__MAX_DELAY        = 8.0
+RETRY_POLICY__MAX_RETRY_AFTER  = 10.0                                               # a longer Retry-After fails over to the next provider instead of waiting
+RETRY_POLICY__RETRYABLE_STATUS = [408, 425, 429, 500, 502, 503, 504]
+
+
+class LLM__Retry_Policy(Type_Safe):                                                 # Which upstream errors are transient, and how long to wait before retrying them
+    max_attempts     : int   = RETRY_POLICY__MAX_ATTEMPTS
+    base_delay       : float = RETRY_POLICY__BASE_DELAY
+    max_delay        : float = RETRY_POLICY__MAX_DELAY
+    max_retry_after  : float = RETRY_POLICY__MAX_RETRY_AFTER
+
+    def status_code(self, error: Exception) -> Optional[int]:                       # works for requests.HTTPError (error.response) and urllib's HTTPError (error.code)
+        response = getattr(error, 'response', None)
+        if response is not None and getattr(response, 'status_code', None):
+            return int(response.status_code)
+        code = getattr(error, 'code', None)
+        return code if isinstance(code, int) else None
+
+    def is_retryable(self, error: Exception) -> bool:                               # provider side failures: throttling, 5xx, timeouts and connection errors
+        status_code = self.status_code(error)
+        if status_code is not None:
+            return status_code in RETRY_POLICY__RETRYABLE_STATUS
+        return isinstance(error, (OSError, TimeoutError))                           # requests.RequestException and urllib's URLError are OSErrors
+
+    def retry_after(self, error: Exception) -> Optional[float]:                     # Retry-After header (in seconds or as an HTTP date)
+        response = getattr(error, 'response', None)
+        headers  = getattr(response, 'headers', None) or getattr(error, 'headers', None) or {}
+        value    = headers.get('Retry-After') if hasattr(headers, 'get') else None
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            return max(0.0, (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds())
+        except (TypeError, ValueError):
+            return None
+
+    def delay(self, attempt: int, error: Optional[Exception] = None) -> Optional[float]:   # wait before the next attempt (None means: don't retry this provider)
+        if attempt >= self.max_attempts:
+            return None
+        if error is not None:
+            if not self.is_retryable(error):
+                return None
+            retry_after = self.retry_after(error)
+            if retry_after is not None:
+                return retry_after if retry_after <= self.max_retry_after else None
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))  # full jitter
@@ -0,0 +1,104 @@
+import asyncio
+import threading
+import time
+import requests
+from typing                                                                         import Dict, Any, Optional, Tuple
+from urllib.parse                                                                   import urlparse
+from requests.adapters                                                              import HTTPAdapter
+from osbot_utils.type_safe.Type_Safe                                                import Type_Safe
+
+TRANSPORT__POOL_CONNECTIONS = 10                                                    # hosts with a pool (OpenRouter, direct providers, ...)
+TRANSPORT__POOL_MAXSIZE     = 32                                                    # keep-alive connections per host (matches the default provider concurrency)
+TRANSPORT__CONNECT_TIMEOUT  = 5.0
+TRANSPORT__READ_TIMEOUT     = 120.0                                                 # long generations keep the connection quiet for a while
+
+
+class LLM__Transport(Type_Safe):                                                    # The one HTTP client for all upstream LLM calls (pooled keep-alive connections, timeouts, per host metrics)
+    pool_connections : int   = TRANSPORT__POOL_CONNECTIONS
+    pool_maxsize     : int   = TRANSPORT__POOL_MAXSIZE
+    connect_timeout  : float = TRANSPORT__CONNECT_TIMEOUT
+    read_timeout     : float = TRANSPORT__READ_TIMEOUT
+    metrics          : dict                                                         # host -> counters
+    session          : requests.Session = None
+    lock             : object           = None
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.lock    = threading.RLock()
+        self.session = self.new_session()
+
+    def new_session(self) -> requests.Session:                                      # retries are not done here (LLM__Resilience owns them)
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=self.pool_connections, pool_maxsize=self.pool_maxsize, max_retries=0)
+        session.mount('https://', adapter)
+        session.mount('http://' , adapter)
+        return session
+
+    def timeout(self) -> Tuple[float, float]:
+        return self.connect_timeout, self.read_timeout
+
+    def request(self, method  : str                          ,                      # send one request (raises for HTTP errors, unless it is streamed)
+                      url     : str                          ,
+                      headers : Optional[Dict[str, str]] = None  ,
+                      payload : Optional[Dict[str, Any]] = None  ,
+                      stream  : bool                     = False
+                ) -> requests.Response:
+        host  = urlparse(url).netloc
+        start = time.perf_counter()
+        self.record(host, 'in_flight', 1)
+        try:
+            response = self.session.request(method, url, headers=headers, json=payload, stream=stream, timeout=self.timeout())
+        except Exception:
+            self.record(host, 'errors', 1, duration=time.perf_counter() - start)
+            raise
+        finally:
+            self.record(host, 'in_flight', -1)
+        self.record(host, f'status_{response.status_code}', 1, duration=time.perf_counter() - start)    # for streams: time to the response headers
+        if not stream:
+            response.raise_for_status()
+        return response
+
+    def post(self, url: str, headers: Dict[str, str], payload: Dict[str, Any], stream: bool = False) -> requests.Response:
+        return self.request('POST', url, headers=headers, payload=payload, stream=stream)
+
+    def post_json(self, url: str, headers: Dict[str, str], payload: Dict[str, Any]) -> Dict[str, Any]:
+        return self.post(url, headers=headers, payload=payload).json()
+
+    def get_json(self, url: str, headers: Optional[Dict[str, str]] = None) -> Any:
+        return self.request('GET', url, headers=headers).json()
+
+    def error_message(self, error: requests.HTTPError) -> Any:                      # upstream error body (json when possible)
+        try:
+            return error.response.json()
+        except ValueError:
+            return error.response.text
+
+    async def post_json__async(self, url: str, headers: Dict[str, str], payload: Dict[str, Any]) -> Dict[str, Any]:   # for async routes (runs on a worker thread, same pool)
+        return await asyncio.to_thread(self.post_json, url, headers, payload)
+
+    def record(self, host: str, name: str, value: int, duration: Optional[float] = None) -> None:
+        with self.lock:
+            host_metrics       = self.metrics.setdefault(host, {})
+            host_metrics[name] = host_metrics.get(name, 0) + value
+            if duration is not None:
+                host_metrics['requests'      ] = host_metrics.get('requests'      , 0  ) + 1
+                host_metrics['duration_total'] = host_metrics.get('duration_total', 0.0) + duration
+                host_metrics['duration_max'  ] = max(host_metrics.get('duration_max', 0.0), duration)
+
+    def stats(self) -> Dict[str, Any]:
+        with self.lock:
+            hosts = {}
+            for host, host_metrics in sorted(self.metrics.items()):
+                requests_count = host_metrics.get('requests', 0)
+                hosts[host]    = dict(host_metrics, duration_avg = round(host_metrics.get('duration_total', 0.0) / requests_count, 4) if requests_count else 0.0)
+            return dict(pool_connections = self.pool_connections                       ,
+                        pool_maxsize     = self.pool_maxsize                           ,
+                        timeout          = dict(connect=self.connect_timeout, read=self.read_timeout),
+                        hosts            = hosts                                       )
+
+    def clear(self) -> None:
+        with self.lock:
+            self.metrics.clear()
+
+
+llm__transport = LLM__Transport()                                                   # shared by every upstream client in this process (one connection pool)
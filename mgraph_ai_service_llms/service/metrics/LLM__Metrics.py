@@ -0,0 +1,215 @@
+import itertools
+import json
+import os
+import threading
+import time
+from bisect                                                                         import bisect_left
+from typing                                                                         import Dict, Any, Optional, Tuple
+from osbot_utils.type_safe.Type_Safe                                                import Type_Safe
+from osbot_utils.utils.Env                                                          import get_env
+
+ENV_NAME__METRICS__MULTIPROCESS_DIR = 'METRICS__MULTIPROCESS_DIR'                   # when set, each worker writes its metrics there and a scrape (of any worker) adds them all up
+METRICS__BUCKETS                    = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)    # seconds (LLM calls are slow, cache/S3 calls are fast)
+METRICS__FLUSH_INTERVAL             = 5.0                                           # seconds between the worker snapshots (in multiprocess mode)
+METRICS__SHARDS                     = 16                                            # fixed number of shards (threads share them round robin, so short lived threads don't add any)
+METRICS__CONTENT_TYPE               = 'text/plain; version=0.0.4; charset=utf-8'    # Prometheus text exposition format
+
+METRIC__REQUEST_DURATION            = 'llm_request_duration_seconds'
+METRIC__UPSTREAM_DURATION           = 'llm_upstream_duration_seconds'
+METRIC__UPSTREAM_ERRORS             = 'llm_upstream_errors_total'
+METRIC__STREAM_TTFT                 = 'llm_stream_ttft_seconds'
+METRIC__SPAN_DURATION               = 'llm_span_duration_seconds'
+METRIC__CACHE_REQUESTS              = 'llm_cache_requests_total'
+METRIC__CACHE_HIT_RATIO             = 'llm_cache_hit_ratio'
+METRIC__TOKENS                      = 'llm_tokens_total'
+METRIC__COST_USD                    = 'llm_cost_usd_total'
+
+METRICS__HELP = { METRIC__REQUEST_DURATION  : 'Chat completion latency (including cache hits)'          ,
+                  METRIC__UPSTREAM_DURATION : 'Latency of the upstream (OpenRouter or direct provider) calls',
+                  METRIC__UPSTREAM_ERRORS   : 'Upstream calls that failed'                              ,
+                  METRIC__STREAM_TTFT       : 'Time to the first token of streamed completions'         ,
+                  METRIC__SPAN_DURATION     : 'Duration of the request stages (cache, S3, queue, upstream, ...)',
+                  METRIC__CACHE_REQUESTS    : 'Cache lookups (per cache and result)'                   ,
+                  METRIC__CACHE_HIT_RATIO   : 'Cache hits / cache lookups (per cache)'                 ,
+                  METRIC__TOKENS            : 'Tokens sent (in) and generated (out)'                   ,
+                  METRIC__COST_USD          : 'Cost of the upstream calls (USD)'                       }
+
+
+class LLM__Metrics(Type_Safe):                                                      # Prometheus style counters and latency histograms (in a fixed set of shards, merged when scraped)
+    flush_interval   : float  = METRICS__FLUSH_INTERVAL
+    multiprocess_dir : str    = None
+    next_flush       : float  = 0.0
+    shard_count      : int    = METRICS__SHARDS
+    shards           : list                                                         # dict(counters, histograms, lock), shared by the threads assigned to it
+    local            : object = None                                                # threading.local with this thread's shard
+    next_shard       : object = None                                                # itertools.count (the round robin assignment)
+    lock             : object = None                                                # (to flush)
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.lock       = threading.RLock()
+        self.local      = threading.local()
+        self.next_shard = itertools.count()
+        self.shards     = [dict(counters={}, histograms={}, lock=threading.Lock()) for _ in range(max(1, self.shard_count))]
+        if self.multiprocess_dir is None:
+            self.multiprocess_dir = get_env(ENV_NAME__METRICS__MULTIPROCESS_DIR) or None
+
+    def shard(self) -> Dict[str, Any]:                                              # this thread's shard (its lock is rarely contended, since threads are spread over the shards)
+        shard = getattr(self.local, 'shard', None)
+        if shard is None:
+            shard = self.local.shard = self.shards[next(self.next_shard) % len(self.shards)]
+        return shard
+
+    def labels_key(self, labels: Dict[str, Any]) -> Tuple[Tuple[str, str], ...]:
+        return tuple(sorted((name, str(value) if value is not None else '') for name, value in labels.items()))
+
+    def inc(self, name: str, value: float = 1.0, **labels) -> None:
+        shard = self.shard()
+        key   = (name, self.labels_key(labels))
+        with shard['lock']:
+            shard['counters'][key] = shard['counters'].get(key, 0.0) + value
+        self.flush__if_due()
+
+    def observe(self, name: str, value: float, **labels) -> None:                   # one histogram sample (in seconds)
+        shard  = self.shard()
+        key    = (name, self.labels_key(labels))
+        bucket = bisect_left(METRICS__BUCKETS, value)
+        with shard['lock']:
+            histogram = shard['histograms'].get(key)
+            if histogram is None:
+                histogram = shard['histograms'][key] = [0] * (len(METRICS__BUCKETS) + 1) + [0.0]    # per bucket counts (the last one is +Inf), then the sum
+            histogram[bucket] += 1
+            histogram[-1]     += value
+        self.flush__if_due()
+
+    def cache_lookup(self, cache: str, hit: bool) -> None:
+        self.inc(METRIC__CACHE_REQUESTS, cache=cache, result='hit' if hit else 'miss')
+
+    def snapshot(self) -> Dict[str, dict]:                                          # this process' metrics (all threads added up)
+        merged = dict(counters={}, histograms={})
+        for shard in self.shards:
+            with shard['lock']:
+                copy = dict(counters   = shard['counters'  ].copy()                                          ,
+                            histograms = { key: list(value) for key, value in shard['histograms'].items() })
+            self.merge(merged, copy)
+        return merged
+
+    def merge(self, target: Dict[str, dict], source: Dict[str, dict]) -> Dict[str, dict]:
+        for key, value in source['counters'].items():
+            target['counters'][key] = target['counters'].get(key, 0.0) + value
+        for key, histogram in source['histograms'].items():
+            current = target['histograms'].get(key)
+            if current is None or len(current) != len(histogram):
+                target['histograms'][key] = list(histogram)
+            else:
+                target['histograms'][key] = [a + b for a, b in zip(current, histogram)]
+        return target
+
+    # multiprocess mode (one snapshot file per worker)
+
+    def path_snapshot(self, pid: Optional[int] = None) -> str:
+        return os.path.join(self.multiprocess_dir, f'metrics-{pid or os.getpid()}.json')
+
+    def flush__if_due(self) -> None:
+        if self.multiprocess_dir and time.monotonic() >= self.next_flush:
+            self.flush()
+
+    def flush(self) -> bool:                                                        # write this worker's snapshot (atomically, so that a scrape never sees half a file)
+        if not self.multiprocess_dir or not self.lock.acquire(blocking=False):      # another thread is already flushing
+            return False
+        try:
+            self.next_flush = time.monotonic() + self.flush_interval
+            snapshot        = self.snapshot()
+            data            = dict(counters   = [[name, labels, value] for (name, labels), value in snapshot['counters'  ].items()],
+                                   histograms = [[name, labels, value] for (name, labels), value in snapshot['histograms'].items()])
+            os.makedirs(self.multiprocess_dir, exist_ok=True)
+            path_temp = f'{self.path_snapshot()}.tmp'
+            with open(path_temp, 'w') as file:
+                json.dump(data, file)
+            os.replace(path_temp, self.path_snapshot())
+            return True
+        except OSError:
+            return False                                                            # metrics must never break the request path
+        finally:
+            self.lock.release()
+
+    def collect(self) -> Dict[str, dict]:                                           # what a scrape reports: this process, or (in multiprocess mode) all the workers
+        if not self.multiprocess_dir:
+            return self.snapshot()
+        self.flush()
+        merged = dict(counters={}, histograms={})
+        for file_name in sorted(os.listdir(self.multiprocess_dir)):
+            if not (file_name.startswith('metrics-') and file_name.endswith('.json')):
+                continue
+            try:
+                with open(os.path.join(self.multiprocess_dir, file_name)) as file:
+                    data = json.load(file)
+            except (OSError, ValueError):
+                continue                                                            # being replaced (or from a crashed worker)
+            self.merge(merged, dict(counters   = { (name, tuple(map(tuple, labels))): value for name, labels, value in data.get('counters'  , []) },
+                                    histograms = { (name, tuple(map(tuple, labels))): value for name, labels, value in data.get('histograms', []) }))
+        return merged
+
+    # Prometheus text format
+
+    def render(self) -> str:
+        metrics = self.collect()
+        lines   = []
+        by_name = {}
+        for (name, labels), value in metrics['counters'].items():
+            by_name.setdefault(name, ('counter', []))[1].append((labels, value))
+        for (name, labels), value in metrics['histograms'].items():
+            by_name.setdefault(name, ('histogram', []))[1].append((labels, value))
+        by_name.update(self.cache_hit_ratios(metrics['counters']))
+        for name, (metric_type, samples) in sorted(by_name.items()):
+            if name in METRICS__HELP:
+                lines.append(f'# HELP {name} {METRICS__HELP[name]}')
+            lines.append(f'# TYPE {name} {metric_type}')
+            for labels, value in sorted(samples):
+                if metric_type == 'histogram':
+                    lines.extend(self.render__histogram(name, labels, value))
+                else:
+                    lines.append(f'{name}{self.render__labels(labels)} {self.render__value(value)}')
+        return '\n'.join(lines) + '\n'
+
+    def render__histogram(self, name: str, labels: tuple, histogram: list) -> list:
+        lines      = []
+        cumulative = 0
+        for bound, count in zip(list(METRICS__BUCKETS) + ['+Inf'], histogram[:-1]):
+            cumulative += count
+            le          = bound if bound == '+Inf' else self.render__value(bound)
+            lines.append(f'{name}_bucket{self.render__labels(labels + (("le", le),))} {cumulative}')
+        lines.append(f'{name}_sum{self.render__labels(labels)} {self.render__value(histogram[-1])}')
+        lines.append(f'{name}_count{self.render__labels(labels)} {cumulative}')
+        return lines
+
+    def render__labels(self, labels: tuple) -> str:
+        if not labels:
+            return ''
+        def escape(value):
+            return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        return '{' + ','.join(f'{name}="{escape(value)}"' for name, value in labels) + '}'
+
+    def render__value(self, value: float) -> str:
+        return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+    def cache_hit_ratios(self, counters: Dict[tuple, float]) -> Dict[str, tuple]:  # derived gauge (so that dashboards don't need to compute it)
+        lookups = {}
+        for (name, labels), value in counters.items():
+            if name == METRIC__CACHE_REQUESTS:
+                labels_dict = dict(labels)
+                hits, total = lookups.get(labels_dict.get('cache'), (0.0, 0.0))
+                lookups[labels_dict.get('cache')] = (hits + (value if labels_dict.get('result') == 'hit' else 0.0), total + value)
+        if not lookups:
+            return {}
+        samples = [((('cache', cache),), round(hits / total, 4) if total else 0.0) for cache, (hits, total) in lookups.items()]
+        return { METRIC__CACHE_HIT_RATIO: ('gauge', samples) }
+
+    def clear(self) -> None:                                                        # (only this process)
+        for shard in self.shards:
+            with shard['lock']:
+                shard['counters'  ].clear()
+                shard['histograms'].clear()
+
+
+llm__metrics = LLM__Metrics()                                                       # shared by every request path in this process
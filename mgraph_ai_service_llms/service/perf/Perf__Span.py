@@ -0,0 +1,33 @@
+import time
+from contextlib                                                                     import contextmanager
+from contextvars                                                                    import ContextVar
+from typing                                                                         import Iterator
+from mgraph_ai_service_llms.service.perf.Perf__Stats                               import perf__stats
+from mgraph_ai_service_llms.service.perf.Perf__Trace                               import Perf__Trace
+from mgraph_ai_service_llms.service.metrics.LLM__Metrics                           import llm__metrics, METRIC__SPAN_DURATION
+
+perf__current_trace = ContextVar('perf__current_trace', default=None)              # trace of the current request (copied into the thread pool that runs the sync routes)
+
+
+@contextmanager
+def span(name: str) -> Iterator[None]:                                              # time one stage of the request path (always aggregated, added to the current trace if there is one)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        duration = time.perf_counter() - start
+        perf__stats.record(name, duration)
+        llm__metrics.observe(METRIC__SPAN_DURATION, duration, span=name)            # (histogram for /info/metrics)
+        trace = perf__current_trace.get()
+        if trace is not None:
+            trace.add(name, duration)
+
+
+@contextmanager
+def perf__trace() -> Iterator[Perf__Trace]:                                         # collect the spans of a block (they are also added to the outer trace)
+    trace = Perf__Trace(parent=perf__current_trace.get())
+    token = perf__current_trace.set(trace)
+    try:
+        yield trace
+    finally:
+        perf__current_trace.reset(token)
@@ -0,0 +1,48 @@
+import threading
+from collections                                                                        import deque
+from typing                                                                             import Dict, Any
+from osbot_utils.type_safe.Type_Safe                                                    import Type_Safe
+from mgraph_ai_service_llms.platforms.open_router.routing.Open_Router__Provider__Stats import percentile
+
+PERF__WINDOW_SIZE = 500                                                             # recent durations kept per span (for the percentiles)
+
+
+class Perf__Stats(Type_Safe):                                                       # In memory aggregate of the span durations (per span name, for this process)
+    window_size : int    = PERF__WINDOW_SIZE
+    spans       : dict                                                              # name -> dict(count, total, max, recent)
+    lock        : object = None
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.lock = threading.RLock()
+
+    def record(self, name: str, duration: float) -> None:
+        with self.lock:
+            stats = self.spans.get(name)
+            if stats is None:
+                stats = self.spans[name] = dict(count=0, total=0.0, max=0.0, recent=deque(maxlen=self.window_size))
+            stats['count'] += 1
+            stats['total'] += duration
+            stats['max'  ]  = max(stats['max'], duration)
+            stats['recent'].append(duration)
+
+    def summary(self) -> Dict[str, Any]:                                            # milliseconds
+        with self.lock:
+            spans = { name: dict(stats, recent=list(stats['recent'])) for name, stats in self.spans.items() }
+        def ms(seconds):
+            return round(seconds * 1000, 3) if seconds is not None else None
+        return { name: dict(count  = stats['count']                              ,
+                            total  = ms(stats['total'])                          ,
+                            avg    = ms(stats['total'] / stats['count'])         ,
+                            max    = ms(stats['max'])                            ,
+                            p50    = ms(percentile(stats['recent'], 50))         ,
+                            p95    = ms(percentile(stats['recent'], 95))         ,
+                            p99    = ms(percentile(stats['recent'], 99))         )
+                 for name, stats in sorted(spans.items()) }
+
+    def clear(self) -> None:
+        with self.lock:
+            self.spans.clear()
+
+
+perf__stats = Perf__Stats()                                                         # shared by all the spans in this process
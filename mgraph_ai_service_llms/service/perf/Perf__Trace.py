@@ -0,0 +1,21 @@
+from typing                                                                         import Dict
+from osbot_utils.type_safe.Type_Safe                                                import Type_Safe
+
+
+class Perf__Trace(Type_Safe):                                                       # The spans of one request (in the order they finished)
+    spans  : list                                                                   # (name, duration in seconds)
+    parent : object = None                                                          # outer trace (e.g. the one started by the Server-Timing middleware)
+
+    def add(self, name: str, duration: float) -> None:
+        self.spans.append((name, duration))                                         # list.append is atomic (spans can finish on other threads)
+        if self.parent is not None:
+            self.parent.add(name, duration)
+
+    def timings(self) -> Dict[str, float]:                                          # milliseconds per span name (repeated spans are added up)
+        timings = {}
+        for name, duration in list(self.spans):
+            timings[name] = timings.get(name, 0.0) + duration
+        return { name: round(duration * 1000, 3) for name, duration in timings.items() }
+
+    def server_timing(self) -> str:                                                 # value for the Server-Timing header
+        return ', '.join(f'{name};dur={duration}' for name, duration in self.timings().items())
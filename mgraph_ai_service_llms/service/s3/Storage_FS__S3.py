@@ -4,6 +4,7 @@ from osbot_utils.type_safe.type_safe_core.decorators.type_safe
 from osbot_utils.utils.Json                                                     import bytes_to_json, json_to_bytes
 from osbot_aws.aws.s3.S3                                                        import S3
 from memory_fs.storage_fs.Storage_FS                                            import Storage_FS
+from mgraph_ai_service_llms.service.perf.Perf__Span                             import span
 
 
 class Storage_FS__S3(Storage_FS):
@@ -46,7 +47,8 @@ class Storage_FS__S3(Storage_FS):
                     ) -> Optional[bytes]:
         s3_key = self._get_s3_key(path)
         if self.file__exists(path):
-            return self.s3.file_bytes(bucket=self.s3_bucket, key=s3_key)
+            with span('s3.get'):
+                return self.s3.file_bytes(bucket=self.s3_bucket, key=s3_key)
         return None
     
     @type_safe
@@ -54,14 +56,16 @@ class Storage_FS__S3(Storage_FS):
                      ) -> bool:
         s3_key = self._get_s3_key(path)
         if self.file__exists(path) is True:
-            return self.s3.file_delete(bucket=self.s3_bucket, key=s3_key)
+            with span('s3.delete'):
+                return self.s3.file_delete(bucket=self.s3_bucket, key=s3_key)
         return False
     
     @type_safe
     def file__exists(self, path: Safe_Str__File__Path                                  # Check if file exists in S3
                      ) -> bool:
         s3_key = self._get_s3_key(path)
-        return self.s3.file_exists(bucket=self.s3_bucket, key=s3_key)
+        with span('s3.exists'):
+            return self.s3.file_exists(bucket=self.s3_bucket, key=s3_key)
     
     @type_safe
     def file__json(self, path: Safe_Str__File__Path                                    # Read file content as JSON from S3
@@ -76,18 +80,20 @@ class Storage_FS__S3(Storage_FS):
                          data: bytes
                    ) -> bool:
         s3_key = self._get_s3_key(path)
-        return self.s3.file_create_from_bytes(
-            file_bytes=data,
-            bucket=self.s3_bucket,
-            key=s3_key
-        )
+        with span('s3.put'):
+            return self.s3.file_create_from_bytes(
+                file_bytes=data,
+                bucket=self.s3_bucket,
+                key=s3_key
+            )
     
     @type_safe
     def file__str(self, path: Safe_Str__File__Path                                     # Read file content as string from S3
                   ) -> Optional[str]:
         s3_key = self._get_s3_key(path)
         if self.file__exists(path):
-            return self.s3.file_contents(bucket=self.s3_bucket, key=s3_key)
+            with span('s3.get'):
+                return self.s3.file_contents(bucket=self.s3_bucket, key=s3_key)
         return None
     
     def files__paths(self) -> List[Safe_Str__File__Path]:                              # List all file paths in S3 bucket
@@ -0,0 +1,9 @@
+from typing                          import List
+from osbot_utils.type_safe.Type_Safe import Type_Safe
+
+CACHE_IDS__MAX_BATCH_SIZE  = 100                                                    # max cache ids per batch request
+CACHE_IDS__MAX_WORKERS     = 8                                                      # max concurrent storage reads per batch request
+
+
+class Schema__Cache__Ids(Type_Safe):                                                # body of the batch cache fetch endpoints
+    cache_ids : List[str]
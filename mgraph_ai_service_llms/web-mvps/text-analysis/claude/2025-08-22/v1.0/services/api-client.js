@@ -139,6 +139,20 @@ export class APIClient {
         return await response.json();
     }
 
+    async getCacheEntries(cacheIds) {                       // fetches several entries in one call (returns map of cache_id -> entry)
+        const response = await fetch('/platform/open-router/chat/cache-entries', {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({ cache_ids: cacheIds })
+        });
+
+        if (!response.ok) {
+            throw new Error(`Cache retrieval error: ${response.status}`);
+        }
+
+        return await response.json();
+    }
+
     async getCacheStats() {
         const response = await fetch('/cache/stats');
 
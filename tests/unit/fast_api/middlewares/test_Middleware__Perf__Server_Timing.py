@@ -0,0 +1,28 @@
+import asyncio
+from unittest                                                                       import TestCase
+from mgraph_ai_service_llms.fast_api.middlewares.Middleware__Perf__Server_Timing    import Middleware__Perf__Server_Timing, HEADER__SERVER_TIMING
+from mgraph_ai_service_llms.service.perf.Perf__Span                                 import span
+
+
+class test_Middleware__Perf__Server_Timing(TestCase):
+
+    def test__call__(self):
+        async def app(scope, receive, send):                                        # ASGI app with two spans
+            with span('stage.a'):
+                pass
+            with span('stage.b'):
+                pass
+            await send({'type': 'http.response.start', 'status': 200, 'headers': [(b'content-type', b'application/json')]})
+            await send({'type': 'http.response.body' , 'body'  : b'{}'})
+
+        messages = []
+        async def send(message):
+            messages.append(message)
+
+        asyncio.run(Middleware__Perf__Server_Timing(app)({'type': 'http'}, None, send))
+        headers       = dict(messages[0]['headers'])
+        server_timing = headers[HEADER__SERVER_TIMING].decode()
+        assert headers[b'content-type']  == b'application/json'
+        assert server_timing.startswith('stage.a;dur=')
+        assert ', stage.b;dur='          in server_timing
+        assert messages[1]['body']       == b'{}'
@@ -28,3 +28,28 @@ class test_Routes__Info(TestCase):
                                     'osbot_fast_api_serverless',
                                     'osbot_utils'              ]
             assert _.mgraph_ai_service_llms == version__mgraph_ai_service_llms
+
+    def test_circuit_breakers(self):
+        circuit_breakers = self.routes_info.circuit_breakers()
+        assert list_set(circuit_breakers)                           == ['circuit_breakers', 'retry_policy']
+        assert type(circuit_breakers.get('circuit_breakers'))       is list
+        assert circuit_breakers.get('retry_policy').get('max_attempts') == 3
+
+    def test_transport(self):
+        transport = self.routes_info.transport()
+        assert list_set(transport)              == ['hosts', 'pool_connections', 'pool_maxsize', 'timeout']
+        assert transport.get('pool_maxsize')    == 32
+
+    def test_perf(self):
+        from mgraph_ai_service_llms.service.perf.Perf__Span import span
+        with span('test.routes_info'):
+            pass
+        perf = self.routes_info.perf()
+        assert perf['test.routes_info']['count'] >= 1
+
+    def test_metrics(self):
+        from mgraph_ai_service_llms.service.metrics.LLM__Metrics import llm__metrics
+        llm__metrics.cache_lookup('chat', hit=True)
+        response = self.routes_info.metrics()
+        assert response.media_type.startswith('text/plain; version=0.0.4')
+        assert b'llm_cache_requests_total{cache="chat",result="hit"}' in response.body
@@ -0,0 +1,11 @@
+from mgraph_ai_service_llms.platforms.open_router.schemas.models.Schema__Open_Router__Model                 import Schema__Open_Router__Model
+from mgraph_ai_service_llms.platforms.open_router.schemas.models.Schema__Open_Router__Model__Pricing        import Schema__Open_Router__Model__Pricing
+from mgraph_ai_service_llms.platforms.open_router.schemas.models.Schema__Open_Router__Model__Pricing__Float import Schema__Open_Router__Model__Pricing__Float
+
+
+def create_model(model_id, prompt, completion, supported_parameters=(), context_length=8192, **prices):     # a catalogue model (prices per million tokens, e.g. input_cache_read=0.5)
+    pricing = Schema__Open_Router__Model__Pricing(prompt     = Schema__Open_Router__Model__Pricing__Float(prompt    ),
+                                                  completion = Schema__Open_Router__Model__Pricing__Float(completion),
+                                                  **{ name: Schema__Open_Router__Model__Pricing__Float(value) for name, value in prices.items() })
+    return Schema__Open_Router__Model(id=model_id, name=f'Model {model_id}', context_length=context_length,
+                                      pricing=pricing, supported_parameters=list(supported_parameters))
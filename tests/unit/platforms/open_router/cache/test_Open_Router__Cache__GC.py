@@ -0,0 +1,69 @@
+from datetime                                                                       import datetime, timedelta
+from unittest                                                                       import TestCase
+from osbot_aws.utils.AWS_Sanitization                                               import str_to_valid_s3_bucket_name
+from osbot_utils.type_safe.Type_Safe                                                import Type_Safe
+from osbot_utils.type_safe.primitives.safe_str.identifiers.Safe_Id                  import Safe_Id
+from osbot_utils.utils.Misc                                                         import random_string_short
+from osbot_utils.utils.Objects                                                      import base_classes
+from mgraph_ai_service_llms.platforms.open_router.cache.Open_Router__Cache          import Open_Router__Cache
+from mgraph_ai_service_llms.platforms.open_router.cache.Open_Router__Cache__GC      import Open_Router__Cache__GC, CACHE_GC__BATCH_SIZE
+from mgraph_ai_service_llms.platforms.open_router.cache.Open_Router__Chat__Cache    import Open_Router__Chat__Cache
+from tests.unit.Service__Fast_API__Test_Objs                                        import setup__service_fast_api_test_objs
+
+
+class test_Open_Router__Cache__GC(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        setup__service_fast_api_test_objs()
+        cls.test_bucket = str_to_valid_s3_bucket_name(random_string_short("test-chat-cache-gc-"))
+        cls.chat_cache  = Open_Router__Chat__Cache(cache=Open_Router__Cache(s3__bucket = cls.test_bucket,
+                                                                            s3__prefix = "chat"         ).setup())
+        cls.cache_gc    = Open_Router__Cache__GC(cache=cls.chat_cache.cache, ttl_hours=cls.chat_cache.cache_ttl_hours)
+        cls.request     = {'model': 'openai/gpt-4o-mini', 'messages': [{'role': 'user', 'content': 'Hello, world!'}]}
+        cls.response    = {'choices': [{'message': {'content': 'Hello!'}}]}
+
+    @classmethod
+    def tearDownClass(cls):
+        with cls.chat_cache.cache.s3__storage.s3 as _:
+            if _.bucket_exists(cls.test_bucket):
+                _.bucket_delete_all_files(cls.test_bucket)
+                _.bucket_delete          (cls.test_bucket)
+
+    def tearDown(self):
+        self.chat_cache.cache.clear_all()
+
+    def test__init__(self):
+        with Open_Router__Cache__GC() as _:
+            assert type(_)         is Open_Router__Cache__GC
+            assert base_classes(_) == [Type_Safe, object]
+            assert _.cache         is None
+            assert _.batch_size    == CACHE_GC__BATCH_SIZE
+
+    def test_run__nothing_expired(self):
+        self.chat_cache.cache_chat_response(self.request, self.response)
+        report = self.cache_gc.run()
+        assert report['files_deleted'  ] == 0
+        assert report['bytes_reclaimed'] == 0
+        assert self.chat_cache.get_cached_response(self.request) == self.response
+
+    def test_run__expired(self):
+        self.chat_cache.cache_chat_response(self.request, self.response)
+        file_id = Safe_Id(self.chat_cache.generate_cache_id(self.request))
+        later   = datetime.now() + timedelta(hours=self.cache_gc.ttl_hours + 2)
+
+        dry_run = self.cache_gc.run(dry_run=True, now=later)
+        assert dry_run['dry_run'        ] is True
+        assert dry_run['days_scanned'   ] >= 1
+        assert dry_run['latest_deleted' ] == 1
+        assert dry_run['files_deleted'  ] > 0
+        assert dry_run['bytes_reclaimed'] > 0
+        with self.chat_cache.cache.fs__latest_temporal.file__json(file_id) as _:
+            assert _.exists() is True                                               # dry run doesn't delete
+
+        report = self.cache_gc.run(now=later)
+        assert report['files_deleted'  ] == dry_run['files_deleted'  ]
+        assert report['bytes_reclaimed'] == dry_run['bytes_reclaimed']
+        assert self.chat_cache.cache.s3__storage.files__paths() == []
+        with self.chat_cache.cache.fs__latest_temporal.file__json(file_id) as _:
+            assert _.exists() is False                                              # latest copy removed together with the temporal ones
@@ -0,0 +1,75 @@
+import pytest
+from unittest                                                                                    import TestCase
+from osbot_utils.type_safe.Type_Safe                                                             import Type_Safe
+from osbot_utils.utils.Objects                                                                   import base_classes
+from mgraph_ai_service_llms.platforms.open_router.cache.Open_Router__Catalogue__Index            import Open_Router__Catalogue__Index, CATALOGUE_INDEX__LIST_FIELDS
+from mgraph_ai_service_llms.platforms.open_router.service.Service__Open_Router__Models           import Service__Open_Router__Models
+from tests.unit.platforms.open_router.Open_Router__Test_Models                                   import create_model
+
+
+def create_indexed_model(model_id, prompt, completion, modality='text->text', tokenizer='GPT', **kwargs):
+    model = create_model(model_id, prompt, completion, **kwargs)
+    model.architecture.modality  = modality
+    model.architecture.tokenizer = tokenizer
+    return model
+
+
+class test_Open_Router__Catalogue__Index(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.models = [ create_indexed_model('expensive/model', 10.0, 20.0, supported_parameters=['tools'], context_length=200_000),
+                       create_indexed_model('cheap/model'    , 0.1 , 0.2 , supported_parameters=['tools', 'response_format'], modality='text+image->text'),
+                       create_indexed_model('free/model'     , 0.0 , 0.0 , tokenizer='Llama3', context_length=4096),
+                       create_indexed_model('mid/model'      , 1.0 , 2.0 , tokenizer='Llama3'),
+                       create_indexed_model('openrouter/auto', -1  , -1                                           )]
+        cls.index  = Open_Router__Catalogue__Index().load_models(cls.models)
+
+    def test_load_models(self):
+        with self.index as _:
+            assert type(_)                          is Open_Router__Catalogue__Index
+            assert base_classes(_)                  == [Type_Safe, object]
+            assert _.size()                         == 5
+            assert _.positions['mid/model']         == 3
+            assert _.by_tokenizer['Llama3']         == {2, 3}
+            assert _.by_parameter['tools']          == {0, 1}
+            assert _.max_prices                     == [20.0, 0.2, 0.0, 2.0, None]
+            assert 'description'                    in _.field_names
+            assert _.records[2]['is_free']          is True
+
+    def test_query__filters(self):
+        def ids(**kwargs):
+            return [model['id'] for model in self.index.query(fields='id', **kwargs)['models']]
+        assert ids()                                            == ['expensive/model', 'cheap/model', 'free/model', 'mid/model', 'openrouter/auto']
+        assert ids(tokenizer='Llama3'                          ) == ['free/model', 'mid/model']
+        assert ids(supported_parameter='tools'                 ) == ['expensive/model', 'cheap/model']
+        assert ids(supported_parameter='tools', modality='text->text') == ['expensive/model']
+        assert ids(min_context_length=100_000                  ) == ['expensive/model']
+        assert ids(max_price=1.0                               ) == ['cheap/model', 'free/model']       # (not the 'auto' model)
+        assert ids(include_free=False, tokenizer='Llama3'      ) == ['mid/model']
+        assert ids(supported_parameter='unknown'               ) == []
+
+    def test_query__projection_and_pages(self):
+        with self.index as _:
+            page_1 = _.query(fields=['id', 'pricing'], limit=2)
+            assert page_1                           == dict(models      = [dict(id='expensive/model', pricing={'prompt': '10', 'completion': '20' }),
+                                                                           dict(id='cheap/model'    , pricing={'prompt': '0.1', 'completion': '0.2'})],
+                                                            total       = 5                 ,
+                                                            next_cursor = 'cheap/model'     )
+            page_2 = _.query(fields='id', limit=2, cursor=page_1['next_cursor'], include_paid=True)
+            assert [model['id'] for model in page_2['models']] == ['free/model', 'mid/model']
+            page_3 = _.query(fields='id', limit=2, cursor=page_2['next_cursor'])
+            assert page_3['models']                 == [dict(id='openrouter/auto')]
+            assert page_3['next_cursor']            is None
+            assert list(_.query(fields=CATALOGUE_INDEX__LIST_FIELDS, limit=1)['models'][0]) == CATALOGUE_INDEX__LIST_FIELDS
+
+            with pytest.raises(ValueError, match="Unknown fields: \\['colour'\\]"):
+                _.query(fields='id,colour')
+            with pytest.raises(ValueError, match="Unknown cursor"):
+                _.query(cursor='removed/model')
+
+    def test__models_service(self):
+        models_service = Service__Open_Router__Models(models=self.models)
+        payload        = models_service.api__models__query__payload(fields='id', limit=1, tokenizer='Llama3')
+        assert payload.body                                                 == b'{"models":[{"id":"free/model"}],"total":2,"next_cursor":"free/model"}'
+        assert models_service.models_index()                                is models_service.models_index()
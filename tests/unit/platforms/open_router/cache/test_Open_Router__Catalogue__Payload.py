@@ -0,0 +1,40 @@
+import json
+from unittest                                                                                    import TestCase
+from osbot_utils.type_safe.Type_Safe                                                             import Type_Safe
+from osbot_utils.utils.Objects                                                                   import base_classes
+from mgraph_ai_service_llms.platforms.open_router.cache.Open_Router__Catalogue__Payload          import Open_Router__Catalogue__Payload, CATALOGUE__CACHE_CONTROL, CATALOGUE__CACHE_CONTROL__FIXED
+from mgraph_ai_service_llms.platforms.open_router.service.Service__Open_Router__Models           import Service__Open_Router__Models
+from tests.unit.platforms.open_router.Open_Router__Test_Models                                   import create_model
+
+
+class test_Open_Router__Catalogue__Payload(TestCase):
+
+    def test_from_json(self):
+        with Open_Router__Catalogue__Payload.from_json({'models': ['a', 'b']}) as _:
+            assert type(_)                  is Open_Router__Catalogue__Payload
+            assert base_classes(_)          == [Type_Safe, object]
+            assert _.body                   == b'{"models":["a","b"]}'
+            assert len(_.etag)              == 34
+            assert _.etag                   == Open_Router__Catalogue__Payload.from_json({'models': ['a', 'b']}).etag    # same bytes, same ETag (in every worker)
+            assert _.etag                   != Open_Router__Catalogue__Payload.from_json({'models': ['a'     ]}).etag
+            assert _.headers()              == {'ETag': _.etag, 'Cache-Control': CATALOGUE__CACHE_CONTROL}
+        assert Open_Router__Catalogue__Payload.from_json([], cache_control=CATALOGUE__CACHE_CONTROL__FIXED).cache_control == 'public, max-age=3600'
+
+    def test_not_modified(self):
+        with Open_Router__Catalogue__Payload.from_json([1, 2, 3]) as _:
+            assert _.not_modified(None                      ) is False
+            assert _.not_modified(''                        ) is False
+            assert _.not_modified('"abc"'                   ) is False
+            assert _.not_modified(_.etag                    ) is True
+            assert _.not_modified(f'W/{_.etag}'             ) is True
+            assert _.not_modified(f'"abc", {_.etag}'        ) is True
+            assert _.not_modified('*'                       ) is True
+
+    def test__models_payload(self):                                                     # serialised once per catalogue version
+        models_service = Service__Open_Router__Models(models=[create_model('a/model', 1.0, 2.0)])
+        payload        = models_service.api__models__payload()
+        assert models_service.api__models__payload()        is payload
+        assert json.loads(payload.body)[0]['pricing']       == {'prompt': '1', 'completion': '2'}
+
+        models_service.models = [create_model('a/model', 1.0, 3.0)]
+        assert models_service.api__models__payload().etag   != payload.etag
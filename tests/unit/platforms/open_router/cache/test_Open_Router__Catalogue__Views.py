@@ -0,0 +1,63 @@
+from unittest                                                                                    import TestCase
+from osbot_utils.type_safe.Type_Safe                                                             import Type_Safe
+from osbot_utils.utils.Objects                                                                   import base_classes
+from mgraph_ai_service_llms.platforms.open_router.cache.Open_Router__Catalogue__Views            import Open_Router__Catalogue__Views, cache_on_catalogue
+from mgraph_ai_service_llms.platforms.open_router.service.Service__Open_Router__Cost             import Service__Open_Router__Cost
+from mgraph_ai_service_llms.platforms.open_router.service.Service__Open_Router__Models           import Service__Open_Router__Models
+from tests.unit.platforms.open_router.Open_Router__Test_Models                                   import create_model
+
+
+class An_Service(Type_Safe):
+    models : list
+    calls  : int
+    views  : Open_Router__Catalogue__Views
+
+    def catalogue_views(self):
+        return self.views.for_catalogue(self.models)
+
+    @cache_on_catalogue
+    def names(self, prefix=''):
+        self.calls += 1
+        return [name for name in self.models if name.startswith(prefix)]
+
+
+class test_Open_Router__Catalogue__Views(TestCase):
+
+    def test__init__(self):
+        with Open_Router__Catalogue__Views() as _:
+            assert type(_)          is Open_Router__Catalogue__Views
+            assert base_classes(_)  == [Type_Safe, object]
+            assert _.status()       == dict(version=0, models=0, views=0, hits=0, misses=0)
+
+    def test_cache_on_catalogue(self):
+        service = An_Service(models=['a-1', 'a-2', 'b-1'])
+        assert service.names('a')           == ['a-1', 'a-2']
+        assert service.names('a')           == ['a-1', 'a-2']
+        assert service.names(prefix='b')    == ['b-1']
+        assert service.calls                == 2                                        # once per arguments
+        assert service.views.status()       == dict(version=1, models=3, views=2, hits=1, misses=2)
+
+        service.models = ['a-3']                                                        # new catalogue: all the views are dropped
+        assert service.names('a')           == ['a-3']
+        assert service.calls                == 3
+        assert service.views.version        == 2
+
+    def test__models_service(self):                                                     # the derived views follow the catalogue (no network: the catalogue is set directly)
+        models_service              = Service__Open_Router__Models(models=[create_model('paid/model', 1.0, 2.0), create_model('cheap/model', 0.5, 0.5), create_model('free/model', 0.0, 0.0)])
+        cost_service                = Service__Open_Router__Cost()
+        cost_service.models_service = models_service
+
+        free_models = models_service.get_free_models()
+        assert [str(model.id) for model in free_models]            == ['free/model']
+        assert models_service.get_free_models()                    is free_models
+        assert models_service.get_model_by_id('paid/model').name   == 'Model paid/model'
+        assert cost_service.models_cost_table().size()             == 3
+        assert cost_service.calculate_cost('paid/model', dict(prompt_tokens=1_000_000)).prompt_cost == 1.0
+        assert cost_service.get_cheapest_models(limit=1)[0]['model_id'] == 'cheap/model'
+
+        models_service.models = [create_model('paid/model', 3.0, 4.0)]                  # (what refresh_models does)
+        assert models_service.get_free_models()                    == []
+        assert models_service.get_models_summary()['total_models'] == 1
+        assert cost_service.calculate_cost('paid/model', dict(prompt_tokens=1_000_000)).prompt_cost == 3.0
+        assert cost_service.get_cheapest_models(limit=1)[0]['model_id'] == 'paid/model'
+        assert models_service.views.version                        == 2
@@ -0,0 +1,94 @@
+import tracemalloc
+from unittest                                                                                          import TestCase
+from osbot_utils.type_safe.Type_Safe                                                                   import Type_Safe
+from osbot_utils.utils.Objects                                                                         import base_classes
+from mgraph_ai_service_llms.platforms.open_router.cache.Open_Router__Models__Catalogue                 import Open_Router__Models__Catalogue
+from mgraph_ai_service_llms.platforms.open_router.cache.Open_Router__Models__Snapshot                  import Open_Router__Models__Snapshot
+from mgraph_ai_service_llms.platforms.open_router.schemas.models.Schema__Open_Router__Models__Response import Schema__Open_Router__Models__Response
+from mgraph_ai_service_llms.platforms.open_router.service.Service__Open_Router__Models                 import Service__Open_Router__Models
+from mgraph_ai_service_llms.platforms.open_router.service.Open_Router__Services                        import open_router__services
+from tests.unit.platforms.open_router.Open_Router__Test_Models                                         import create_model
+
+
+class test_Open_Router__Models__Catalogue(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.models   = [create_model(f'provider/model-{i}', 0.000001 * (i % 5), 0.000002 * (i % 5), ['tools', 'temperature']) for i in range(20)]
+        cls.snapshot = Open_Router__Models__Snapshot.from_models(cls.models)
+
+    def setUp(self):
+        self.catalogue = Open_Router__Models__Catalogue()
+
+    def test__init__(self):
+        with self.catalogue as _:
+            assert type(_)                                  is Open_Router__Models__Catalogue
+            assert base_classes(_)                          == [Type_Safe, object]
+            assert _.status()                               == dict(loaded=False, models=0, built=0, loads=0)
+        assert Service__Open_Router__Models().catalogue     is open_router__services.shared(Open_Router__Models__Catalogue)     # (the default)
+
+    def test_get(self):
+        calls  = []
+        def loader():
+            calls.append(1)
+            return self.snapshot
+        assert self.catalogue.get(loader)                   is self.snapshot
+        assert self.catalogue.get(loader)                   is self.snapshot
+        assert calls                                        == [1]                               # only the first service loads it
+        assert self.catalogue.status()                      == dict(loaded=True, models=20, built=20, loads=1)
+
+    def test__shared_by_the_services(self):
+        snapshot  = Open_Router__Models__Snapshot.from_json(self.snapshot.json())
+        self.catalogue.replace(snapshot)
+        service_1 = Service__Open_Router__Models(catalogue=self.catalogue)
+        service_2 = Service__Open_Router__Models(catalogue=self.catalogue)
+        assert service_1.models_records()                   is service_2.models_records()
+        assert service_1.get_model_by_id('provider/model-3') is service_2.get_model_by_id('provider/model-3')
+        assert snapshot.models                              is None                              # (one model built, not the catalogue)
+
+    def test__refresh(self):                                                                     # a refresh by one service is seen by all of them
+        service_1 = Service__Open_Router__Models(catalogue=self.catalogue)
+        service_2 = Service__Open_Router__Models(catalogue=self.catalogue)
+        self.catalogue.replace(self.snapshot)
+        assert service_2.models_index().size()              == 20
+        service_1.fetch_models          = lambda refresh: Schema__Open_Router__Models__Response(data=self.models[:5])
+        service_1.models_snapshot__save = lambda snapshot: snapshot
+        assert len(service_1.refresh_models())              == 5
+        assert service_2.models_index().size()              == 5
+        assert self.catalogue.loads                         == 2
+
+    def test__memory(self):                                                                      # records built from the json use less memory than the Type_Safe models
+        json_data = self.snapshot.json()
+        def allocated(build):
+            tracemalloc.start()
+            value = build()
+            size  = tracemalloc.get_traced_memory()[0]
+            tracemalloc.stop()
+            assert value
+            return size
+        models_size  = allocated(lambda: Schema__Open_Router__Models__Response.from_json(dict(data=json_data['data'])))
+        records_size = allocated(lambda: Open_Router__Models__Snapshot.from_json(json_data).records)
+        assert records_size * 2                             < models_size
+
+    def test__views_are_lazy(self):                                                              # the views read the records, only the models they return are built
+        snapshot = Open_Router__Models__Snapshot.from_json(self.snapshot.json())
+        self.catalogue.replace(snapshot)
+        service  = Service__Open_Router__Models(catalogue=self.catalogue)
+        summary  = service.get_models_summary()
+        assert summary['total_models']                      == 20
+        assert summary['free_models_count']                 == 4
+        assert [str(model.id) for model in service.get_free_models()] == summary['free_models']
+        assert snapshot.models                              is None
+        assert sum(record.model is not None for record in snapshot.records) == 4
+
+    def test__own_models(self):                                                                  # a service with its own models never loads the shared catalogue
+        def catalogue_get(loader):
+            raise ValueError('the shared catalogue was loaded')
+        self.catalogue.get  = catalogue_get
+        service             = Service__Open_Router__Models(catalogue=self.catalogue, models=[])
+        assert service.get_model_by_id('provider/model-1')  is None
+        assert service.get_free_models()                    == []
+        assert service.get_models_summary()['total_models'] == 0
+        service             = Service__Open_Router__Models(catalogue=self.catalogue, models=self.models)
+        assert str(service.get_model_by_id('provider/model-1').id) == 'provider/model-1'
+        assert service.get_models_summary()['total_models'] == 20
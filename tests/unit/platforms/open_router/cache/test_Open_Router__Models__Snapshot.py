@@ -0,0 +1,77 @@
+import copy
+from unittest                                                                                    import TestCase
+from osbot_utils.type_safe.Type_Safe                                                             import Type_Safe
+from osbot_utils.utils.Objects                                                                   import base_classes
+from mgraph_ai_service_llms.platforms.open_router.cache.Open_Router__Models__Snapshot            import Open_Router__Models__Snapshot, Open_Router__Model__Record, models_snapshot__schema_checksum
+from mgraph_ai_service_llms.platforms.open_router.cost.Open_Router__Cost__Engine                 import Open_Router__Cost__Engine
+from mgraph_ai_service_llms.platforms.open_router.schemas.models.Schema__Open_Router__Model      import Schema__Open_Router__Model
+from mgraph_ai_service_llms.platforms.open_router.service.Service__Open_Router__Models           import Service__Open_Router__Models
+from tests.unit.platforms.open_router.Open_Router__Test_Models                                   import create_model
+
+
+class test_Open_Router__Models__Snapshot(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.models   = [ create_model('paid/model', 0.00000015, 0.0000006, ['tools'], input_cache_read=0.00000001875),
+                         create_model('free/model', 0.0       , 0.0                                                  )]
+        cls.snapshot = Open_Router__Models__Snapshot.from_models(cls.models)
+
+    def test_from_models(self):
+        with self.snapshot as _:
+            assert type(_)                      is Open_Router__Models__Snapshot
+            assert base_classes(_)              == [Type_Safe, object]
+            assert _.schema                     == models_snapshot__schema_checksum()
+            assert _.models                     is self.models
+            assert type(_.records[0])           is Open_Router__Model__Record
+            record = _.records[0]
+            assert record.id                    == 'paid/model'
+            assert record.pricing.prompt        == 1.5e-07
+            assert record.pricing.image         is None
+            assert record.supported_parameters  == ['tools']
+            assert record.json()                == self.models[0].json()
+
+    def test_from_json(self):                                                           # trusted load: records only, the Type_Safe models are built on first use
+        snapshot = Open_Router__Models__Snapshot.from_json(self.snapshot.json())
+        assert [record.id for record in snapshot.records]       == ['paid/model', 'free/model']
+        assert snapshot.models                                  is None
+        models = snapshot.api_models()
+        assert type(models[0])                                  is Schema__Open_Router__Model
+        assert [model.json() for model in models]               == [model.json() for model in self.models]
+        assert snapshot.api_models()                            is models
+
+    def test_from_json__other_schema(self):                                             # snapshots written by another version of the schema are not trusted
+        assert Open_Router__Models__Snapshot.from_json(dict(self.snapshot.json(), schema='0000000000000000')) is None
+        assert Open_Router__Models__Snapshot.from_json(None) is None
+
+    def test_from_json__shared_values(self):                                           # the strings and the identical pricing / architecture records are stored once
+        snapshot_1 = Open_Router__Models__Snapshot.from_json(self.snapshot.json())
+        snapshot_2 = Open_Router__Models__Snapshot.from_json(copy.deepcopy(self.snapshot.json()))
+        paid, free = snapshot_1.records
+        assert free.architecture                                is paid.architecture
+        assert free.pricing                                     is not paid.pricing
+        assert snapshot_2.records[0].id                         is paid.id
+        assert snapshot_2.records[0].data['pricing']['prompt']  is paid.data['pricing']['prompt']
+        assert len(snapshot_1)                                  == 2
+
+    def test_schema_checksum(self):
+        class An_Model(Type_Safe):
+            id : str
+        assert models_snapshot__schema_checksum()              == models_snapshot__schema_checksum(Schema__Open_Router__Model)
+        assert models_snapshot__schema_checksum(An_Model)      != models_snapshot__schema_checksum()
+
+    def test__records_have_the_same_prices(self):                                       # the cost engine, cost table and index read records like models
+        from_models  = Open_Router__Cost__Engine().load_models(self.models          )
+        from_records = Open_Router__Cost__Engine().load_models(self.snapshot.records)
+        assert from_records.prices                              == from_models.prices
+
+    def test__models_service(self):
+        models_service = Service__Open_Router__Models(snapshot=Open_Router__Models__Snapshot.from_json(self.snapshot.json()))
+        assert models_service.models_records()[1].id            == 'free/model'
+        assert models_service.api__models__payload().body.startswith(b'[{')
+        assert models_service.snapshot.models                   is None                 # (not needed for the payload)
+        model = models_service.get_model_by_id('paid/model')
+        assert model.json()                                     == self.models[0].json()
+        assert models_service.snapshot.models                   is None                 # (only that model was built)
+        assert models_service.api__models()[0]                  is model
+
@@ -0,0 +1,106 @@
+from unittest                                                                                                import TestCase
+from osbot_utils.type_safe.Type_Safe                                                                         import Type_Safe
+from osbot_utils.type_safe.primitives.safe_float.Safe_Float                                                  import Safe_Float
+from osbot_utils.utils.Objects                                                                               import base_classes
+from mgraph_ai_service_llms.platforms.open_router.cost.Open_Router__Cost__Engine                            import Open_Router__Cost__Engine, COST_ENGINE__PRICE_SCALE
+from mgraph_ai_service_llms.platforms.open_router.schemas.models.Schema__Open_Router__Model__Pricing__Float import Schema__Open_Router__Model__Pricing__Float
+from tests.unit.platforms.open_router.Open_Router__Test_Models                                              import create_model
+
+
+class test_Open_Router__Cost__Engine(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.models      = [ create_model('openai/gpt-4o-mini', 0.15      , 0.60      , image=0.01, input_cache_read=0.075, input_cache_write=0.15),
+                            create_model('catalogue/model'   , 0.00000015, 0.0000006 , request=0.0005, internal_reasoning=0.0000006, input_cache_read=0.00000001875),
+                            create_model('free/model'        , 0.0       , 0.0                                    ),
+                            create_model('openrouter/auto'   , -1        , -1                                     )]
+        cls.cost_engine = Open_Router__Cost__Engine().load_models(cls.models)
+
+    def test_load_models(self):
+        with self.cost_engine as _:
+            assert type(_)                                  is Open_Router__Cost__Engine
+            assert base_classes(_)                          == [Type_Safe, object]
+            assert list(_.prices)                           == ['openai/gpt-4o-mini', 'catalogue/model', 'free/model', 'openrouter/auto']
+            assert _.model_prices('catalogue/model')['prompt'          ] == 150_000                        # pico-dollars
+            assert _.model_prices('catalogue/model')['input_cache_read'] == 18_750                         # (would not fit in nano-dollars)
+            assert _.model_prices('openrouter/auto')['prompt'          ] == -COST_ENGINE__PRICE_SCALE
+            assert _.model_prices('unknown/model')                       is None
+
+    def test_price_units(self):
+        with self.cost_engine as _:
+            assert _.price_units(None                                               ) == 0
+            assert _.price_units(Schema__Open_Router__Model__Pricing__Float(0.0    )) == 0
+            assert _.price_units(Schema__Open_Router__Model__Pricing__Float(1.5e-07)) == 150_000
+            assert _.price_units('0.000003'                                         ) == 3_000_000
+            assert type(_.price_units(0.1))                                           is int
+
+    def test_cost_units(self):
+        with self.cost_engine as _:
+            prices = _.model_prices('openai/gpt-4o-mini')
+            assert _.cost_units(prices, dict(prompt_tokens=1000, completion_tokens=500)) == dict(prompt_cost     = 150_000_000_000_000 ,    # 1e-18 USD
+                                                                                                  completion_cost = 300_000_000_000_000 )
+            assert list(_.cost_units(prices, dict(prompt_tokens=1000, prompt_cache_hit_tokens=100, images=2))) == ['prompt_cost', 'completion_cost', 'cache_read_cost', 'image_cost']
+
+    def test_breakdown(self):                                                                                   # same values as Service__Open_Router__Cost's previous Safe_Float maths
+        with self.cost_engine as _:
+            breakdown = _.breakdown(prices=_.model_prices('openai/gpt-4o-mini'), usage=dict(prompt_tokens=1000, completion_tokens=500, total_tokens=1500),
+                                    model_id='openai/gpt-4o-mini', provider='openai')
+            assert breakdown.prompt_cost        == Safe_Float("0.00015" )
+            assert breakdown.completion_cost    == Safe_Float("0.0003"  )
+            assert breakdown.total_cost         == Safe_Float("0.00045" )
+            assert breakdown.cost_per_1k_tokens == Safe_Float("0.0003"  )
+            assert breakdown.cache_read_cost    is None
+            assert breakdown.request_cost       is None
+            assert breakdown.provider           == 'openai'
+
+            usage     = dict(prompt_tokens=2000, completion_tokens=1000, reasoning_tokens=300, prompt_cache_hit_tokens=1000)
+            breakdown = _.breakdown(prices=_.model_prices('catalogue/model'), usage=usage, model_id='catalogue/model')
+            assert breakdown.total_tokens       == 3000
+            assert breakdown.request_cost       == Safe_Float("0.0005"   )
+            assert breakdown.reasoning_cost     == Safe_Float(1.8e-10    )
+            assert float(breakdown.total_cost)  == (2000 * 150_000 + 1000 * 600_000 + 300 * 600_000 + 1000 * 18_750 + 500_000_000 * 1_000_000) / 10 ** 18     # exact until the last step
+
+            breakdown = _.breakdown(prices=_.model_prices('free/model'), usage=dict(), model_id='free/model')
+            assert breakdown.total_cost         == 0
+            assert breakdown.cost_per_1k_tokens == 0
+
+    def test_cost_usage(self):                                                                                  # OpenRouter reports the cached tokens inside prompt_tokens
+        with self.cost_engine as _:
+            usage = dict(prompt_tokens=1000, completion_tokens=10, prompt_tokens_details=dict(cached_tokens=800))
+            assert _.cost_usage(usage)                      == dict(usage, prompt_tokens=200, prompt_cache_hit_tokens=800, prompt_cache_write_tokens=0)
+            assert _.cost_usage(dict(prompt_tokens=1000))   == dict(prompt_tokens=1000)
+            estimate = dict(prompt_tokens=700, prompt_cache_hit_tokens=300)                                     # (already split, like estimate_cost does)
+            assert _.cost_usage(estimate)                   is estimate
+
+    def test_breakdown__cached_tokens(self):
+        with self.cost_engine as _:
+            usage     = dict(prompt_tokens=2000, completion_tokens=100, total_tokens=2100, prompt_tokens_details=dict(cached_tokens=1500))
+            breakdown = _.breakdown(prices=_.model_prices('catalogue/model'), usage=usage, model_id='catalogue/model')
+            assert breakdown.prompt_tokens                  == 500
+            assert breakdown.cached_tokens                  == 1500
+            assert breakdown.total_tokens                   == 2100
+            assert float(breakdown.cache_read_cost)         == 1500 * 18_750 / 10 ** 18
+            assert breakdown.to_display_dict()['cached_tokens'] == '1500'
+
+            breakdown = _.breakdown(prices=_.model_prices('free/model'), usage=usage, model_id='free/model')
+            assert breakdown.cached_tokens                  == 1500
+            assert breakdown.total_cost                     == 0
+
+    def test_breakdown__cache_write_tokens(self):                                                               # cache writes are priced at input_cache_write (not as prompt tokens, nor as cache misses)
+        with self.cost_engine as _:
+            prices    = dict(_.model_prices('openai/gpt-4o-mini'), input_cache_write=_.price_units(0.375))      # (more than the prompt price)
+            usage     = dict(prompt_tokens=2000, completion_tokens=100, prompt_tokens_details=dict(cached_tokens=500, cache_write_tokens=1000))
+            breakdown = _.breakdown(prices=prices, usage=usage, model_id='openai/gpt-4o-mini')
+            assert breakdown.prompt_tokens                  == 500
+            assert breakdown.cache_write_tokens             == 1000
+            assert breakdown.cache_write_cost               == Safe_Float(0.000375)                             # 1000 * 0.375/1M
+            assert breakdown.prompt_cost                    == Safe_Float(0.000075)                             # 500  * 0.15/1M
+            assert _.cost_usage(dict(prompt_tokens=800, prompt_cache_miss_tokens=200))['prompt_cache_write_tokens'] == 200     # (the previous usage key)
+
+    def test_cost_units__cache_not_priced(self):                                                                # cached tokens of models without a cache price are charged as prompt tokens
+        with self.cost_engine as _:
+            prices = dict(_.model_prices('catalogue/model'), input_cache_read=0)
+            costs  = _.cost_units(prices, dict(prompt_tokens=500, prompt_cache_hit_tokens=1500))
+            assert costs['prompt_cost']                     == 2000 * 150_000
+            assert 'cache_read_cost'                        not in costs
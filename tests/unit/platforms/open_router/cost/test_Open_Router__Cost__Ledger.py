@@ -0,0 +1,103 @@
+import pytest
+from unittest                                                                                   import TestCase
+from osbot_utils.type_safe.Type_Safe                                                            import Type_Safe
+from osbot_utils.utils.Env                                                                      import set_env, del_env
+from osbot_utils.utils.Misc                                                                     import random_string_short
+from osbot_utils.utils.Objects                                                                  import base_classes
+from mgraph_ai_service_llms.platforms.open_router.cost.Open_Router__Cost__Ledger                import Open_Router__Cost__Ledger, Open_Router__Cost__Budget_Exceeded, ENV_NAME_OPEN_ROUTER__COST_BUDGETS, COST_LEDGER__FIELDS
+from mgraph_ai_service_llms.platforms.open_router.service.Open_Router__Services                 import open_router__services
+
+NOW = 1735732800.0                                                                                  # 2025-01-01 12:00 UTC
+
+
+class test_Open_Router__Cost__Ledger(TestCase):
+
+    def setUp(self):
+        self.ledger = Open_Router__Cost__Ledger(persist=False)
+
+    def test__init__(self):
+        with self.ledger as _:
+            assert type(_)                          is Open_Router__Cost__Ledger
+            assert base_classes(_)                  == [Type_Safe, object]
+            assert _.budgets                        == {}
+            assert type(open_router__services.shared(Open_Router__Cost__Ledger)) is Open_Router__Cost__Ledger
+
+    def test_load_budgets_from_env(self):
+        set_env(ENV_NAME_OPEN_ROUTER__COST_BUDGETS, '{"global": {"daily_usd": 50}, "tenant:*": {"daily_usd": 5}}')
+        try:
+            ledger = Open_Router__Cost__Ledger(persist=False)
+            assert ledger.budgets['global'  ].daily_usd == 50.0
+            assert ledger.budgets['tenant:*'].daily_usd == 5.0
+        finally:
+            del_env(ENV_NAME_OPEN_ROUTER__COST_BUDGETS)
+
+    def test_record(self):
+        with self.ledger as _:
+            row = _.record(model='openai/gpt-oss-20b', provider='groq', route='/chat/complete', tenant='tenant-a',
+                           prompt_tokens=100, completion_tokens=50, cost=0.002, now=NOW)
+            _.record          (model='openai/gpt-oss-20b', provider='groq', route='/chat/complete', tenant='tenant-b', cost=0.001 , now=NOW + 60  )
+            _.record_cache_hit(model='openai/gpt-oss-20b', provider='groq', route='/chat/complete', tenant='tenant-a', cost_avoided=0.002, now=NOW + 3600)
+            assert dict(zip(COST_LEDGER__FIELDS, row)) == dict(timestamp=NOW, model='openai/gpt-oss-20b', provider='groq', route='/chat/complete', tenant='tenant-a',
+                                                               prompt_tokens=100, completion_tokens=50, cost=0.002, cache_hit=0, cost_avoided=0.0)
+            assert sorted(_.hourly)                 == ['2025-01-01-12', '2025-01-01-13']
+
+            daily  = _.daily('2025-01-01')
+            totals = daily['totals']
+            assert [hour['hour'] for hour in daily['hours']] == ['2025-01-01-12', '2025-01-01-13']
+            assert totals['requests'    ]           == 2
+            assert totals['cache_hits'  ]           == 1
+            assert round(totals['cost'], 6)         == 0.003
+            assert totals['cost_avoided']           == 0.002
+            assert totals['prompt_tokens']          == 100
+            assert totals['tenants']['tenant-a']    == dict(requests=1, cache_hits=1, cost=0.002, cost_avoided=0.002)
+            assert list(totals['routes'])           == ['/chat/complete']
+            assert _.spent('2025-01-01'            ) == 0.003
+            assert _.spent('2025-01-01', 'tenant-b') == 0.001
+            assert len(_.rows(limit=2)['rows'])     == 2
+            assert _.pending                        == []                                   # not persisted
+
+    def test_reserve(self):
+        with self.ledger as _:
+            _.set_budget('global'  , daily_usd=1.0)
+            _.set_budget('tenant:*', daily_usd=0.5)
+            with _.reserve('tenant-a', estimated_cost=0.3, now=NOW) as reservation:
+                assert _.reserved == {'*': 0.3, 'tenant-a': 0.3}
+                with pytest.raises(Open_Router__Cost__Budget_Exceeded, match="'tenant:tenant-a'"):
+                    _.reserve('tenant-a', estimated_cost=0.3, now=NOW)                      # in flight requests count against the budget
+                _.record(model='model-a', tenant='tenant-a', cost=0.25, now=NOW)
+            assert reservation.released             is True
+            assert _.reserved                       == {'*': 0.0, 'tenant-a': 0.0}
+
+            _.reserve('tenant-b', estimated_cost=0.5, now=NOW).release()                    # each tenant has its own (default) budget
+            _.record(model='model-a', tenant='tenant-b', cost=0.5 , now=NOW)
+            _.record(model='model-a', tenant='tenant-c', cost=0.2 , now=NOW)
+            with pytest.raises(Open_Router__Cost__Budget_Exceeded, match="'global'"):
+                _.reserve('tenant-d', estimated_cost=0.1, now=NOW)                          # 0.95 spent
+            _.reserve('tenant-d', estimated_cost=None, now=NOW).release()                   # unknown cost: only the spend is checked
+            assert _.counters['rejected']           == 2
+
+            status = _.status()
+            assert list(status['budgets'])          == ['global', 'tenant:*']
+
+    def test_flush(self):                                                                   # rows and rollups are written to S3 (per worker)
+        from mgraph_ai_service_llms.service.cache.LLM__Cache        import LLM__Cache
+        from tests.unit.Service__Fast_API__Test_Objs                import setup__service_fast_api_test_objs
+        setup__service_fast_api_test_objs()
+        llm_cache = LLM__Cache().setup()
+        worker_1  = Open_Router__Cost__Ledger(llm_cache=llm_cache, worker_id=random_string_short('test-'))
+        worker_2  = Open_Router__Cost__Ledger(llm_cache=llm_cache, worker_id=random_string_short('test-'))
+        day       = '2025-01-01'
+        try:
+            worker_1.record(model='model-a', tenant='tenant-a', cost=0.25, now=NOW)
+            worker_2.record(model='model-a', tenant='tenant-a', cost=0.50, now=NOW)
+            assert worker_1.flush() is True
+            assert worker_2.flush() is True
+            stored = worker_1.hourly__stored(day)
+            assert list(stored)                     == ['2025-01-01-12']
+            assert stored['2025-01-01-12']['cost']  == 0.75                                 # both workers
+            assert worker_1.pending                 == []
+            assert worker_1.hourly__stored(day, exclude_worker=worker_1.worker_id)['2025-01-01-12']['cost'] == 0.5
+        finally:
+            for worker in (worker_1, worker_2):
+                s3_keys = [llm_cache.get_s3_key(path) for path in (worker.path_hourly('2025-01-01-12'), worker.path_rows('2025-01-01-12', 1))]
+                llm_cache.s3_db.s3_files_delete(s3_keys)
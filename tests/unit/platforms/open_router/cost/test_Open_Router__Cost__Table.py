@@ -0,0 +1,52 @@
+from unittest                                                                                                import TestCase
+from osbot_utils.type_safe.Type_Safe                                                                         import Type_Safe
+from osbot_utils.utils.Objects                                                                               import base_classes
+from mgraph_ai_service_llms.platforms.open_router.cost.Open_Router__Cost__Table                              import Open_Router__Cost__Table
+from mgraph_ai_service_llms.platforms.open_router.service.Service__Open_Router__Cost                         import Service__Open_Router__Cost
+from tests.unit.platforms.open_router.Open_Router__Test_Models                                               import create_model
+
+
+class test_Open_Router__Cost__Table(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.models     = [ create_model('expensive/model', 10.0, 20.0, ['tools']                        ),
+                           create_model('cheap/model'    , 0.1 , 0.2 , ['tools', 'response_format'], request=0.001),
+                           create_model('free/model'     , 0.0 , 0.0 , context_length=4096           ),
+                           create_model('mid/model'      , 1.0 , 2.0 , input_cache_read=0.5          ),
+                           create_model('openrouter/auto', -1  , -1                                  )]   # auto routing (not priced)
+        cls.cost_table = Open_Router__Cost__Table().load_models(cls.models)
+
+    def test_load_models(self):
+        with self.cost_table as _:
+            assert type(_)                      is Open_Router__Cost__Table
+            assert base_classes(_)              == [Type_Safe, object]
+            assert _.model_ids                  == ['expensive/model', 'cheap/model', 'free/model', 'mid/model']
+            assert list(_.columns['prompt'    ]) == [10.0, 0.1, 0.0, 1.0]
+            assert list(_.columns['request'   ]) == [0.0 , 0.001, 0.0, 0.0]
+            assert _.size()                     == 4
+
+    def test_totals(self):                                                                      # same values as Service__Open_Router__Cost._calculate_from_pricing
+        totals       = self.cost_table.totals(prompt_tokens=1000, completion_tokens=500)
+        cost_service = Service__Open_Router__Cost()
+        usage        = dict(prompt_tokens=1000, completion_tokens=500, total_tokens=1500)
+        for model, total in zip(self.models, totals):
+            breakdown = cost_service._calculate_from_pricing(pricing=model.pricing, usage=usage, model_id=model.id)
+            assert round(total, 12) == round(float(breakdown.total_cost), 12)
+        assert self.cost_table.totals(cached_tokens=1_000_000)[3] == 0.5
+
+    def test_rank(self):
+        with self.cost_table as _:
+            assert [item['model_id'] for item in _.rank(limit=3)]                       == ['free/model', 'cheap/model', 'mid/model']
+            assert [item['model_id'] for item in _.rank(include_free=False, limit=2)]   == ['cheap/model', 'mid/model']
+            assert [item['model_id'] for item in _.rank(capability='tools')]            == ['cheap/model', 'expensive/model']
+            assert [item['model_id'] for item in _.rank(min_context_length=8000)][0]    == 'cheap/model'
+            assert [item['model_id'] for item in _.rank(prompt_tokens=10, completion_tokens=0, limit=2)] == ['free/model', 'mid/model']    # the request price matters for small prompts
+            assert _.rank(limit=1)[0] == dict(model_id='free/model', name='Model free/model', total_cost=0.0, prompt_price=0.0,
+                                              completion_price=0.0, context_length=4096, is_free=True)
+            assert _.by_capability              == {'tools': [0, 1]}
+
+    def test_compare(self):
+        comparison = self.cost_table.compare(['cheap/model', 'unknown/model'], prompt_tokens=1000, completion_tokens=500)
+        assert list(comparison)                 == ['cheap/model']
+        assert round(comparison['cheap/model'], 9) == 0.0012
@@ -0,0 +1,119 @@
+import json
+from http.server                                                                              import BaseHTTPRequestHandler
+from unittest                                                                                 import TestCase
+from osbot_utils.testing.Temp_Env_Vars                                                        import Temp_Env_Vars
+from osbot_utils.testing.Temp_Web_Server                                                      import Temp_Web_Server
+from mgraph_ai_service_llms.platforms.open_router.direct.Open_Router__Direct__Adapter         import Open_Router__Direct__Adapter
+from mgraph_ai_service_llms.platforms.open_router.direct.Open_Router__Direct__Adapter__Groq   import Open_Router__Direct__Adapter__Groq, GROQ__MODEL_IDS
+from mgraph_ai_service_llms.platforms.open_router.direct.Open_Router__Direct__Adapters        import ENV_NAME_OPEN_ROUTER__DIRECT_PROVIDERS
+from mgraph_ai_service_llms.platforms.open_router.service.Service__Open_Router                import Service__Open_Router, ENV_NAME_OPEN_ROUTER__API_KEY
+from mgraph_ai_service_llms.service.llms.providers.groq.API__LLM__Groq                        import ENV_NAME_GROQ__API_KEY, GROQ__API_URL
+from memory_fs.helpers.Memory_FS__Latest_Temporal                                             import Memory_FS__Latest_Temporal
+from memory_fs.storage_fs.providers.Storage_FS__Memory                                        import Storage_FS__Memory
+from mgraph_ai_service_llms.platforms.open_router.cache.Open_Router__Cache                    import Open_Router__Cache
+from mgraph_ai_service_llms.platforms.open_router.cache.Open_Router__Chat__Cache              import Open_Router__Chat__Cache
+from mgraph_ai_service_llms.platforms.open_router.service.Open_Router__Services               import open_router__services
+from mgraph_ai_service_llms.platforms.open_router.service.Service__Open_Router__Cost          import Service__Open_Router__Cost
+from mgraph_ai_service_llms.platforms.open_router.service.Service__Open_Router__Models        import Service__Open_Router__Models
+from mgraph_ai_service_llms.platforms.open_router.service.Service__Text_Analysis              import Service__Text_Analysis
+from tests.unit.platforms.open_router.Open_Router__Test_Models                                import create_model
+
+STUB__GROQ__RESPONSE = { "id"      : "chatcmpl-stub"                                                            ,
+                         "object"  : "chat.completion"                                                          ,
+                         "model"   : "openai/gpt-oss-120b"                                                      ,
+                         "choices" : [{ "index": 0, "message": { "role": "assistant", "content": "42" }, "finish_reason": "stop" }],
+                         "usage"   : { "prompt_tokens": 10, "completion_tokens": 2, "total_tokens": 12, "prompt_time": 0.001 },
+                         "x_groq"  : { "id": "req_stub" }                                                       }
+
+
+class Stub__Groq__Handler(BaseHTTPRequestHandler):                                  # OpenAI compatible chat endpoint (records the requests it gets)
+    requests = []
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers['Content-Length']))
+        Stub__Groq__Handler.requests.append(dict(path          = self.path                         ,
+                                                 authorization = self.headers.get('Authorization') ,
+                                                 payload       = json.loads(body)                  ))
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.end_headers()
+        self.wfile.write(json.dumps(STUB__GROQ__RESPONSE).encode())
+
+    def log_message(self, *args):
+        pass
+
+
+class test_Open_Router__Direct__Adapter__Groq(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.web_server = Temp_Web_Server(http_handler=Stub__Groq__Handler).start()
+        cls.env_vars   = Temp_Env_Vars(env_vars={ ENV_NAME_GROQ__API_KEY                 : 'groq-test-key'        ,
+                                                  ENV_NAME_OPEN_ROUTER__API_KEY          : 'open-router-test-key' ,
+                                                  ENV_NAME_OPEN_ROUTER__DIRECT_PROVIDERS : 'groq'                 }).set_vars()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.env_vars  .restore_vars()
+        cls.web_server.stop()
+
+    def setUp(self):
+        Stub__Groq__Handler.requests.clear()
+        self.service = Service__Open_Router()
+        self.adapter = self.service.direct_adapters.adapters['groq']
+        self.service.cost_service = Service__Open_Router__Cost(models_service=Service__Open_Router__Models(models=[create_model('openai/gpt-oss-120b', 0.15, 0.60)]))
+        self.adapter.api_url = self.web_server.url('/openai/v1/chat/completions')
+
+    def test__init__(self):
+        with Open_Router__Direct__Adapter__Groq() as _:
+            assert isinstance(_, Open_Router__Direct__Adapter)
+            assert _.api_url       == GROQ__API_URL
+            assert _.model_ids     == GROQ__MODEL_IDS
+            assert _.supports('openai/gpt-oss-120b'     ) is True
+            assert _.supports('openai/gpt-oss-120b:free') is False
+
+    def test_payload(self):
+        request = self.service.chat_completion__request(prompt='the answer?', model='moonshotai/kimi-k2', system_prompt=None,
+                                                        temperature=0.5, max_tokens=100, provider='groq')
+        payload = self.adapter.payload(request)
+        assert payload['model'     ] == 'moonshotai/kimi-k2-instruct'
+        assert payload['max_tokens'] == 100
+        assert 'provider' not in payload                                            # OpenRouter only
+
+    def test_chat_completion__target(self):
+        request = self.service.chat_completion__request(prompt='the answer?', model='openai/gpt-oss-120b', system_prompt=None,
+                                                        temperature=0.5, max_tokens=100, provider='groq')
+        assert self.service.chat_completion__target(request, model='openai/gpt-oss-120b', provider='groq'               )[3] is self.adapter
+        assert self.service.chat_completion__target(request, model='openai/gpt-oss-120b', provider='groq', max_cost=0.1     )[3] is self.adapter   # the worst case cost is under max_cost
+        assert self.service.chat_completion__target(request, model='openai/gpt-oss-120b', provider='groq', max_cost=0.000001)[3] is None           # it could go over, so OpenRouter enforces max_cost
+        assert self.service.chat_completion__target(request, model='moonshotai/kimi-k2' , provider='groq', max_cost=0.1     )[3] is None           # (no pricing, no estimate)
+        assert self.service.direct_adapters.adapter(model='openai/gpt-oss-120b', provider='cerebras') is None
+        with Temp_Env_Vars(env_vars={ENV_NAME_OPEN_ROUTER__DIRECT_PROVIDERS: ''}):
+            assert self.service.direct_adapters.adapter(model='openai/gpt-oss-120b', provider='groq') is None      # not opted in
+
+    def test_chat_completion__post(self):
+        request       = self.service.chat_completion__request(prompt='the answer?', model='openai/gpt-oss-120b', system_prompt='be brief',
+                                                              temperature=0.5, max_tokens=100, provider='groq')
+        response_data = self.service.chat_completion__post(request, model='openai/gpt-oss-120b', provider='groq')
+        assert Stub__Groq__Handler.requests == [dict(path          = '/openai/v1/chat/completions'                    ,
+                                                     authorization = 'Bearer groq-test-key'                           ,
+                                                     payload       = self.adapter.payload(request)                    )]
+        assert response_data['provider'] == 'Groq'                                  # same shape as an OpenRouter response
+        assert response_data['direct'  ] is True
+        assert response_data['usage'   ] == { 'prompt_tokens': 10, 'completion_tokens': 2, 'total_tokens': 12 }
+        assert response_data['choices' ][0]['message']['content'] == '42'
+
+    def test_chat_completion__text_analysis(self):                                  # the text analysis requests (which always set max_cost) take the fast path
+        chat_cache = Open_Router__Chat__Cache(cache=Open_Router__Cache(fs__latest_temporal=Memory_FS__Latest_Temporal(storage_fs=Storage_FS__Memory())))
+        open_router__services.register(Service__Open_Router    , self.service)
+        open_router__services.register(Open_Router__Chat__Cache, chat_cache  )
+        try:
+            result = Service__Text_Analysis().extract_facts('The meeting is at 3pm')
+        finally:
+            open_router__services.reset(Service__Open_Router    )
+            open_router__services.reset(Open_Router__Chat__Cache)
+        assert len(Stub__Groq__Handler.requests)                   == 1
+        assert Stub__Groq__Handler.requests[0]['authorization']     == 'Bearer groq-test-key'
+        assert Stub__Groq__Handler.requests[0]['payload']['model'] == 'openai/gpt-oss-120b'
+        assert result['provider']                                  == 'groq'
+        assert result['cache_id']                                  is not None
@@ -0,0 +1,79 @@
+import threading
+import time
+import pytest
+from unittest                                                                               import TestCase
+from osbot_utils.type_safe.Type_Safe                                                        import Type_Safe
+from osbot_utils.utils.Objects                                                              import base_classes
+from mgraph_ai_service_llms.platforms.open_router.limits.Open_Router__Token_Bucket          import Open_Router__Token_Bucket
+from mgraph_ai_service_llms.platforms.open_router.limits.Open_Router__Rate_Limiter          import Open_Router__Rate_Limiter, Open_Router__Rate_Limit__Timeout, REQUEST_PRIORITY__BATCH, REQUEST_PRIORITY__INTERACTIVE, RATE_LIMIT__PROVIDER__MAX_CONCURRENCY
+from mgraph_ai_service_llms.platforms.open_router.service.Open_Router__Services             import open_router__services
+
+
+class test_Open_Router__Rate_Limiter(TestCase):
+
+    def setUp(self):
+        self.rate_limiter = Open_Router__Rate_Limiter(max_wait=1.0)
+
+    def test__init__(self):
+        with self.rate_limiter as _:
+            assert type(_)                                  is Open_Router__Rate_Limiter
+            assert base_classes(_)                          == [Type_Safe, object]
+            assert _.default_provider_limit.max_concurrency == RATE_LIMIT__PROVIDER__MAX_CONCURRENCY
+            assert type(open_router__services.shared(Open_Router__Rate_Limiter)) is Open_Router__Rate_Limiter
+
+    def test_token_bucket(self):
+        with Open_Router__Token_Bucket(rate_per_minute=60) as _:
+            now = _.updated_at
+            assert _.wait_time(60 , now) == 0.0
+            _.take(60)
+            assert _.wait_time(1  , now) == 1.0                                     # 1 token per second
+            assert _.wait_time(120, now) == 60.0                                    # bigger than the bucket: waits for a full bucket
+            _.give_back(1000)
+            assert _.tokens              == 60
+
+    def test_keys(self):
+        with self.rate_limiter as _:
+            assert _.keys('an-model', 'groq') == ['provider:groq']                  # models have no default limits
+            _.set_limit('model:an-model', requests_per_minute=10)
+            assert _.keys('an-model', None  ) == ['model:an-model', 'provider:auto']
+
+    def test_acquire__concurrency(self):
+        with self.rate_limiter as _:
+            _.set_limit('provider:groq', max_concurrency=1)
+            with _.acquire('an-model', 'groq') as permit:
+                assert _.in_flight == {'provider:groq': 1}
+                with pytest.raises(Open_Router__Rate_Limit__Timeout):
+                    _.acquire('an-model', 'groq', max_wait=0.05)
+                assert _.acquire('an-model', 'cerebras').waited < 0.05               # other providers are not affected
+            assert permit.released                     is True
+            assert _.in_flight['provider:groq']        == 0
+            assert _.counters['timed_out']             == 1
+
+    def test_acquire__tokens(self):
+        with self.rate_limiter as _:
+            _.set_limit('model:an-model', tokens_per_minute=1000)
+            with _.acquire('an-model', 'groq', tokens=900) as permit:
+                permit.tokens_used = 100                                            # the estimate was too high
+            assert round(_.buckets[('model:an-model', 'tokens')].tokens) == 900
+            with pytest.raises(Open_Router__Rate_Limit__Timeout):
+                _.acquire('an-model', 'groq', tokens=1000, max_wait=0.05)           # would need ~6 seconds of refill
+
+    def test_acquire__priority(self):
+        with self.rate_limiter as _:
+            _.set_limit('provider:groq', max_concurrency=1)
+            order  = []
+            permit = _.acquire('an-model', 'groq')
+            def request(priority):
+                with _.acquire('an-model', 'groq', priority=priority):
+                    order.append(priority)
+            threads = [threading.Thread(target=request, args=(REQUEST_PRIORITY__BATCH,))]
+            threads[0].start()
+            time.sleep(0.05)                                                        # batch request is queued first
+            threads.append(threading.Thread(target=request, args=(REQUEST_PRIORITY__INTERACTIVE,)))
+            threads[1].start()
+            time.sleep(0.05)
+            permit.release()
+            for thread in threads:
+                thread.join()
+            assert order == [REQUEST_PRIORITY__INTERACTIVE, REQUEST_PRIORITY__BATCH]
+            assert _.status()['waiting'] == 0
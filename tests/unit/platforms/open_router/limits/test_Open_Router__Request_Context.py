@@ -0,0 +1,40 @@
+import time
+from unittest                                                                                           import TestCase
+from osbot_fast_api.schemas.consts__Fast_API                                                            import ENV_VAR__FAST_API__AUTH__API_KEY__NAME
+from osbot_utils.utils.Env                                                                              import set_env, del_env
+from mgraph_ai_service_llms.platforms.open_router.limits.Open_Router__Request_Context                   import request_context, request_context__from_headers, open_router__request_context, HEADER__TENANT_ID, HEADER__REQUEST_TIMEOUT
+from mgraph_ai_service_llms.platforms.open_router.schemas.limits.Schema__Open_Router__Request_Context   import REQUEST_CONTEXT__TENANT__ANONYMOUS
+
+
+class test_Open_Router__Request_Context(TestCase):
+
+    def test_request_context(self):
+        assert request_context().tenant   == REQUEST_CONTEXT__TENANT__ANONYMOUS
+        assert request_context().deadline is None
+        token = open_router__request_context.set(request_context__from_headers({HEADER__TENANT_ID: 'tenant-a'}))
+        try:
+            assert request_context().tenant == 'tenant-a'
+        finally:
+            open_router__request_context.reset(token)
+
+    def test_request_context__from_headers(self):
+        context = request_context__from_headers({HEADER__TENANT_ID: 'tenant-a', HEADER__REQUEST_TIMEOUT: '5'})
+        assert context.tenant == 'tenant-a'
+        assert time.time() + 4 < context.deadline <= time.time() + 5
+
+        assert request_context__from_headers({HEADER__REQUEST_TIMEOUT: 'abc'}).deadline is None
+
+        set_env(ENV_VAR__FAST_API__AUTH__API_KEY__NAME, 'X-API-Key')
+        try:
+            tenant = request_context__from_headers({'x-api-key': 'the-secret-key'}).tenant
+            assert tenant.startswith('key-')
+            assert 'the-secret-key' not in tenant
+            assert tenant == request_context__from_headers({'x-api-key': 'the-secret-key'}).tenant
+            assert tenant == request_context__from_headers({'x-api-key': 'the-secret-key', HEADER__TENANT_ID: 'tenant-b'}).tenant   # (the header can't change the key's tenant)
+            assert request_context__from_headers({HEADER__TENANT_ID: 'tenant-b'}).tenant == 'tenant-b'                                 # (no key)
+        finally:
+            del_env(ENV_VAR__FAST_API__AUTH__API_KEY__NAME)
+
+    def test_request_context__route(self):
+        assert request_context__from_headers({}                          ).route == ''
+        assert request_context__from_headers({}, route='/chat/complete'  ).route == '/chat/complete'
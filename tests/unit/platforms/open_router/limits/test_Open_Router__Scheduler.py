@@ -0,0 +1,73 @@
+import threading
+import time
+import pytest
+from unittest                                                                       import TestCase
+from osbot_utils.type_safe.Type_Safe                                                import Type_Safe
+from osbot_utils.utils.Objects                                                      import base_classes
+from mgraph_ai_service_llms.platforms.open_router.limits.Open_Router__Rate_Limiter  import REQUEST_PRIORITY__INTERACTIVE, REQUEST_PRIORITY__BATCH, REQUEST_PRIORITY__BACKGROUND
+from mgraph_ai_service_llms.platforms.open_router.limits.Open_Router__Scheduler     import Open_Router__Scheduler, Open_Router__Scheduler__Deadline_Exceeded, SCHEDULER__LANE_WEIGHTS
+from mgraph_ai_service_llms.platforms.open_router.service.Open_Router__Services     import open_router__services
+
+
+class test_Open_Router__Scheduler(TestCase):
+
+    def setUp(self):
+        self.scheduler = Open_Router__Scheduler(max_concurrency=1)
+
+    def admission_order(self, requests):                                            # queue all requests behind a busy slot, then release it and record the order they get in
+        order = []
+        busy  = self.scheduler.slot()
+        def run(lane, tenant):
+            with self.scheduler.slot(lane=lane, tenant=tenant):
+                order.append((lane, tenant))
+        threads = []
+        for lane, tenant in requests:
+            thread = threading.Thread(target=run, args=(lane, tenant))
+            thread.start()
+            threads.append(thread)
+            time.sleep(0.01)                                                        # keep the arrival order
+        busy.release()
+        for thread in threads:
+            thread.join()
+        return order
+
+    def test__init__(self):
+        with Open_Router__Scheduler() as _:
+            assert type(_)                       is Open_Router__Scheduler
+            assert base_classes(_)               == [Type_Safe, object]
+            assert _.lane_weights                == SCHEDULER__LANE_WEIGHTS
+            assert type(open_router__services.shared(Open_Router__Scheduler)) is Open_Router__Scheduler
+
+    def test_slot(self):
+        with self.scheduler as _:
+            with _.slot(lane=REQUEST_PRIORITY__BATCH, tenant='tenant-a') as slot:
+                assert _.in_flight == 1
+                assert slot.lane   == REQUEST_PRIORITY__BATCH
+            assert _.in_flight == 0
+            assert _.slot(lane='an-unknown-lane').lane == REQUEST_PRIORITY__INTERACTIVE
+
+    def test__weighted_fair_queuing(self):
+        order = self.admission_order([(REQUEST_PRIORITY__BATCH      , 'a')] * 3 +
+                                     [(REQUEST_PRIORITY__BACKGROUND , 'a')]     +
+                                     [(REQUEST_PRIORITY__INTERACTIVE, 'a')] * 3 )
+        lanes = [lane for lane, _ in order]
+        assert lanes[:3]  == [REQUEST_PRIORITY__INTERACTIVE] * 3                   # interactive goes first (even though it arrived last)
+        assert lanes[3:]  == [REQUEST_PRIORITY__BATCH     , REQUEST_PRIORITY__BATCH ,   # then batch gets two slots for each background one (2:1)
+                              REQUEST_PRIORITY__BACKGROUND, REQUEST_PRIORITY__BATCH ]
+
+    def test__tenant_fairness(self):
+        order   = self.admission_order([(REQUEST_PRIORITY__BATCH, 'tenant-a')] * 3 +
+                                       [(REQUEST_PRIORITY__BATCH, 'tenant-b')] * 2 )
+        tenants = [tenant for _, tenant in order]
+        assert tenants == ['tenant-a', 'tenant-b', 'tenant-a', 'tenant-b', 'tenant-a']   # round robin, not FIFO
+
+    def test__deadline(self):
+        with self.scheduler as _:
+            busy = _.slot()
+            with pytest.raises(Open_Router__Scheduler__Deadline_Exceeded):
+                _.slot(lane=REQUEST_PRIORITY__BATCH, deadline=time.time() + 0.05)
+            busy.release()
+            status = _.status()
+            assert status['in_flight'                                  ] == 0
+            assert status['lanes'][REQUEST_PRIORITY__BATCH]['dropped'  ] == 1
+            assert status['lanes'][REQUEST_PRIORITY__BATCH]['waiting'  ] == 0
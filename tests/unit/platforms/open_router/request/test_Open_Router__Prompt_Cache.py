@@ -0,0 +1,49 @@
+from unittest                                                                                       import TestCase
+from osbot_utils.type_safe.Type_Safe                                                                import Type_Safe
+from osbot_utils.utils.Objects                                                                      import base_classes
+from mgraph_ai_service_llms.platforms.open_router.request.Open_Router__Prompt_Cache                 import Open_Router__Prompt_Cache, PROMPT_CACHE__MIN_CHARS
+from mgraph_ai_service_llms.platforms.open_router.request.Open_Router__Request__Template            import Open_Router__Request__Template
+
+LONG_SYSTEM_PROMPT = 'You are an analyst. ' * (PROMPT_CACHE__MIN_CHARS // 20 + 1)
+
+
+def create_payload(system_prompt=LONG_SYSTEM_PROMPT):
+    return dict(model    = 'anthropic/claude-sonnet-4'                      ,
+                messages = [dict(role='user'  , content='the question'   ),
+                            dict(role='system', content=system_prompt    )])
+
+
+class test_Open_Router__Prompt_Cache(TestCase):
+
+    def setUp(self):
+        self.prompt_cache = Open_Router__Prompt_Cache()
+
+    def test__init__(self):
+        with self.prompt_cache as _:
+            assert type(_)                                  is Open_Router__Prompt_Cache
+            assert base_classes(_)                          == [Type_Safe, object]
+            assert _.needs_breakpoints('anthropic/claude-sonnet-4'  ) is True
+            assert _.needs_breakpoints('google/gemini-2.5-flash'    ) is True
+            assert _.needs_breakpoints('openai/gpt-oss-120b'        ) is False            # (cached automatically)
+
+    def test_mark(self):                                                                # stable prefix first, with a breakpoint after it
+        payload  = self.prompt_cache.mark('anthropic/claude-sonnet-4', create_payload())
+        messages = payload['messages']
+        assert [message['role'] for message in messages]    == ['system', 'user']
+        assert messages[0]['content']                       == [dict(type='text', text=LONG_SYSTEM_PROMPT, cache_control=dict(type='ephemeral'))]
+        assert messages[1]['content']                       == 'the question'
+
+    def test_mark__no_breakpoint(self):
+        payload = self.prompt_cache.mark('openai/gpt-oss-120b', create_payload())
+        assert payload['messages'][0]                       == dict(role='system', content=LONG_SYSTEM_PROMPT)       # (ordered, not marked)
+        payload = self.prompt_cache.mark('anthropic/claude-sonnet-4', create_payload('be brief'))
+        assert payload['messages'][0]                       == dict(role='system', content='be brief')               # (too short to be cached)
+
+    def test__request_template(self):                                                   # marked once per template, the cache key doesn't change
+        kwargs   = dict(system_prompt=LONG_SYSTEM_PROMPT, temperature=0.3, max_tokens=100, provider=None)
+        marked   = Open_Router__Request__Template.create(model='anthropic/claude-sonnet-4', **kwargs).render('some text')
+        unmarked = Open_Router__Request__Template.create(model='openai/gpt-oss-120b'      , **kwargs).render('some text')
+        assert marked.to_api_dict()['messages'][0]['content'][0]['cache_control'] == dict(type='ephemeral')
+        assert marked.to_api_dict()['messages'][1]['content'] == 'some text'
+        assert marked.json()['messages']                    == unmarked.json()['messages']
+        assert unmarked.to_api_dict()['messages'][0]['content'] == LONG_SYSTEM_PROMPT
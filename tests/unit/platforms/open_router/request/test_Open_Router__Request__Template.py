@@ -0,0 +1,76 @@
+from unittest                                                                                               import TestCase
+from osbot_utils.type_safe.Type_Safe                                                                        import Type_Safe
+from osbot_utils.utils.Objects                                                                              import base_classes
+from mgraph_ai_service_llms.platforms.open_router.request.Open_Router__Request__Template                    import Open_Router__Request__Template, Open_Router__Request__Templates, Schema__Open_Router__Chat_Request__From_Template
+from mgraph_ai_service_llms.platforms.open_router.schemas.Safe_Str__Open_Router__Model_ID                   import Safe_Str__Open_Router__Model_ID
+from mgraph_ai_service_llms.platforms.open_router.schemas.request.Safe_Str__Message_Content                 import Safe_Str__Message_Content
+from mgraph_ai_service_llms.platforms.open_router.schemas.request.Schema__Open_Router__Chat_Request         import Schema__Open_Router__Chat_Request
+from mgraph_ai_service_llms.platforms.open_router.schemas.request.Schema__Open_Router__Provider_Preferences import Schema__Open_Router__Provider_Preferences
+from mgraph_ai_service_llms.platforms.open_router.service.Service__Text_Analysis                            import SYSTEM_PROMPT_FACTS
+
+
+def create_request(prompt, model, system_prompt, temperature, max_tokens, provider):                   # (what Service__Open_Router built before the templates)
+    kwargs = dict(model         = Safe_Str__Open_Router__Model_ID(model)                        ,
+                  prompt        = Safe_Str__Message_Content(prompt)                             ,
+                  system_prompt = Safe_Str__Message_Content(system_prompt) if system_prompt else None,
+                  temperature   = temperature                                                   ,
+                  max_tokens    = max_tokens                                                    )
+    if provider:
+        kwargs['provider'] = Schema__Open_Router__Provider_Preferences(order=[provider], allow_fallbacks=False)
+    return Schema__Open_Router__Chat_Request.create_simple(**kwargs)
+
+
+class test_Open_Router__Request__Template(TestCase):
+
+    def setUp(self):
+        self.kwargs    = dict(model='openai/gpt-oss-120b', system_prompt=SYSTEM_PROMPT_FACTS, temperature=0.3, max_tokens=1000, provider='groq')
+        self.templates = Open_Router__Request__Templates()
+
+    def test_create(self):
+        with Open_Router__Request__Template.create(**self.kwargs) as _:
+            assert type(_)                                  is Open_Router__Request__Template
+            assert base_classes(_)                          == [Type_Safe, object]
+            assert _.request_json['messages'][0]['content'] == SYSTEM_PROMPT_FACTS
+            assert _.api_dict['provider']['order']          == ['groq']
+
+    def test_render(self):                                                              # same request (and so the same cache key) as the one built field by field
+        for kwargs in [self.kwargs, dict(self.kwargs, system_prompt=None, provider=None)]:
+            template = Open_Router__Request__Template.create(**kwargs)
+            for prompt in ['Analyze the following text:\n\nQ3 revenue was $5.2M', 'with \x01 control chars', '']:
+                request  = template.render(prompt)
+                expected = create_request(prompt, **kwargs)
+                assert isinstance(request, Schema__Open_Router__Chat_Request)
+                assert request.json()                       == expected.json()
+                assert request.to_api_dict()                == expected.to_api_dict()
+                assert str(request.messages[-1].content)    == str(expected.messages[-1].content)
+                assert len(request.messages)                == len(expected.messages)
+
+    def test_render__requests_are_independent(self):
+        template  = Open_Router__Request__Template.create(**self.kwargs)
+        request_1 = template.render('first')
+        request_2 = template.render('second')
+        payload   = request_1.to_api_dict()
+        payload.pop('provider')
+        payload['messages'].append('extra')
+        assert request_1.to_api_dict()['provider']['order'] == ['groq']
+        assert len(request_1.to_api_dict()['messages'])     == 2
+        assert request_2.json()['messages'][1]['content']   == 'second'
+        assert str(template.request.messages[-1].content)   == 'user prompt'
+        assert template.uses                                == 2
+
+    def test_templates(self):
+        with self.templates as _:
+            request = _.request('some text', **self.kwargs)
+            assert type(request)                            is Schema__Open_Router__Chat_Request__From_Template
+            assert _.template(**self.kwargs)                is _.template(**self.kwargs)
+            assert _.template(**dict(self.kwargs, temperature=0.5)) is not _.template(**self.kwargs)
+            assert _.status()                               == dict(templates=2, max_templates=256, hits=3, misses=2)
+
+    def test_templates__max_templates(self):
+        with self.templates as _:
+            _.max_templates = 2
+            first = _.template(**self.kwargs)
+            for max_tokens in [10, 20]:
+                _.template(**dict(self.kwargs, max_tokens=max_tokens))
+            assert len(_.templates)                         == 2
+            assert _.template(**self.kwargs)                is not first                # (the oldest template was dropped)
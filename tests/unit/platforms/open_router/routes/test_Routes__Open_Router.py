@@ -1,7 +1,7 @@
 import pytest
 import json
 from unittest                                                                                        import TestCase
-from fastapi                                                                                         import HTTPException
+from fastapi                                                                                         import HTTPException, Request
 from fastapi.responses                                                                               import StreamingResponse
 from osbot_utils.type_safe.Type_Safe                                                                 import Type_Safe
 from osbot_utils.utils.Env                                                                           import get_env, load_dotenv, in_github_action
@@ -14,6 +14,10 @@ from mgraph_ai_service_llms.service.llms.providers.open_router.Schema__Open_Rout
 from tests.unit.Service__Fast_API__Test_Objs                                                         import setup__service_fast_api_test_objs
 
 
+def create_request(**headers):
+    return Request(dict(type='http', headers=[(name.replace('_', '-').encode(), value.encode()) for name, value in headers.items()]))
+
+
 class test_Routes__Open_Router(TestCase):
 
     @classmethod
@@ -191,8 +195,11 @@ class test_Routes__Open_Router(TestCase):
             pytest.skip('This test requires OPEN_ROUTER__API_KEY to be set')
 
         # Test getting all models
-        result = self.routes.models()
+        response = self.routes.models(create_request())
+        result   = json.loads(response.body)
 
+        assert response.status_code            == 200
+        assert response.headers['cache-control'].startswith('public, max-age=')
         assert type(result) is dict
         assert 'models' in result
         assert 'total'  in result
@@ -209,22 +216,35 @@ class test_Routes__Open_Router(TestCase):
             assert 'is_free'        in model
             assert 'pricing'        in model
 
+    def test_models__etag(self):                                                     # pollers that already have the catalogue get a 304 (without the body)
+        if get_env(ENV_NAME_OPEN_ROUTER__API_KEY) is None:
+            pytest.skip('This test requires OPEN_ROUTER__API_KEY to be set')
+
+        etag          = self.routes.models(create_request()).headers['etag']
+        not_modified  = self.routes.models(create_request(if_none_match=etag))
+        other_filters = self.routes.models(create_request(if_none_match=etag), include_free=False)
+
+        assert not_modified.status_code     == 304
+        assert not_modified.body            == b''
+        assert not_modified.headers['etag'] == etag
+        assert other_filters.status_code    == 200
+
     def test_models__filtered(self):
         if get_env(ENV_NAME_OPEN_ROUTER__API_KEY) is None:
             pytest.skip('This test requires OPEN_ROUTER__API_KEY to be set')
 
         # Test free models only
-        free_result = self.routes.models(include_free = True, include_paid = False)
+        free_result = json.loads(self.routes.models(create_request(), include_free = True, include_paid = False).body)
         for model in free_result['models']:
             assert model['is_free'] is True
 
         # Test paid models only
-        paid_result = self.routes.models(include_free = False, include_paid = True)
+        paid_result = json.loads(self.routes.models(create_request(), include_free = False, include_paid = True).body)
         for model in paid_result['models']:
             assert model['is_free'] is False
 
         # Test no models (exclude both)
-        no_result = self.routes.models(include_free = False, include_paid = False)
+        no_result = json.loads(self.routes.models(create_request(), include_free = False, include_paid = False).body)
         assert no_result['total']  == 0
         assert no_result['models'] == []
 
@@ -0,0 +1,93 @@
+import time
+import pytest
+from unittest                                                                           import TestCase
+from osbot_utils.type_safe.Type_Safe                                                    import Type_Safe
+from osbot_utils.utils.Objects                                                          import base_classes
+from mgraph_ai_service_llms.platforms.open_router.routing.Open_Router__Provider__Stats  import Open_Router__Provider__Stats
+from mgraph_ai_service_llms.platforms.open_router.routing.Open_Router__Hedging          import Open_Router__Hedging, Open_Router__Hedge__Stats, HEDGE__DELAY_DEFAULT
+from mgraph_ai_service_llms.platforms.open_router.service.Open_Router__Services         import open_router__services
+
+
+class test_Open_Router__Hedging(TestCase):
+
+    def setUp(self):
+        self.provider_stats = Open_Router__Provider__Stats()
+        self.hedging        = Open_Router__Hedging(provider_stats = self.provider_stats         ,
+                                                   hedge_stats    = Open_Router__Hedge__Stats() ,
+                                                   delay_default  = 0.05                        ,
+                                                   delay_min      = 0.01                        )
+        self.cancelled      = []
+
+    def attempt(self, durations):                                                   # fake request: sleeps for the provider's duration (None means it fails)
+        def attempt(provider, cancel):
+            duration = durations[provider]
+            if duration is None:
+                raise ValueError(f'{provider} failed')
+            if cancel.wait(duration):
+                self.cancelled.append(provider)
+                return None
+            return f'response from {provider}'
+        return attempt
+
+    def test__init__(self):
+        with Open_Router__Hedging() as _:
+            assert type(_)                 is Open_Router__Hedging
+            assert base_classes(_)         == [Type_Safe, object]
+            assert _.hedge_stats           is open_router__services.shared(Open_Router__Hedge__Stats)
+            assert _.delay_default         == HEDGE__DELAY_DEFAULT
+
+    def test_hedge_delay(self):
+        with self.hedging as _:
+            assert _.hedge_delay('an-model', 'groq') == 0.05                                   # no samples
+            for duration in [0.1, 0.2, 0.3, 0.4, 1.0]:
+                self.provider_stats.record(model='an-model', provider='groq', duration=duration)
+            assert _.hedge_delay('an-model', 'groq') == 1.0                                    # p90
+            _.delay_min = 2.0
+            assert _.hedge_delay('an-model', 'groq') == 2.0
+
+    def test_hedge_provider(self):
+        with self.hedging as _:
+            assert _.hedge_provider('an-model', 'groq'    ) != 'groq'
+            for _i in range(5):
+                self.provider_stats.record(model='an-model', provider='cerebras', duration=0.1)
+            assert _.hedge_provider('an-model', 'groq'    ) == 'cerebras'
+            assert _.hedge_provider('an-model', 'cerebras') != 'cerebras'
+
+    def test_run__primary_fast(self):
+        with self.hedging as _:
+            result, info = _.run(self.attempt({'groq': 0, 'cerebras': 0}), model='an-model', provider='groq', hedge_provider='cerebras', estimated_cost=0.001)
+            assert result == 'response from groq'
+            assert info   == dict(hedged=False, provider='groq', delay=0.05)
+            assert _.hedge_stats.summary()['hedged'] == 0
+
+    def test_run__hedge_wins(self):
+        with self.hedging as _:
+            result, info = _.run(self.attempt({'groq': 2, 'cerebras': 0}), model='an-model', provider='groq', hedge_provider='cerebras', estimated_cost=0.001)
+            assert result         == 'response from cerebras'
+            assert info['hedged'] is True
+            assert info['provider'] == 'cerebras'
+            time.sleep(0.05)
+            assert self.cancelled == ['groq']                                          # the loser was cancelled
+            summary = _.hedge_stats.summary()
+            assert summary['requests'      ] == 1
+            assert summary['hedged'        ] == 1
+            assert summary['hedge_wins'    ] == 1
+            assert summary['hedge_win_rate'] == 1.0
+            assert summary['extra_cost'    ] == 0.001
+
+    def test_run__primary_fails(self):
+        with self.hedging as _:
+            result, info = _.run(self.attempt({'groq': None, 'cerebras': 0.1}), model='an-model', provider='groq', hedge_provider='cerebras', estimated_cost=0.001)
+            assert result == 'response from cerebras'
+            with pytest.raises(ValueError, match='groq failed'):
+                _.run(self.attempt({'groq': None, 'cerebras': None}), model='an-model', provider='groq', hedge_provider='cerebras', estimated_cost=0.001)
+            assert _.hedge_stats.summary()['failures'] == 1
+
+    def test_run__cost_cap(self):
+        with self.hedging as _:
+            _.max_extra_cost = 0.01
+            for estimated_cost in [0.1, None]:                                         # too expensive, or unknown cost
+                result, info = _.run(self.attempt({'groq': 0.1, 'cerebras': 0}), model='an-model', provider='groq', hedge_provider='cerebras', estimated_cost=estimated_cost)
+                assert result == 'response from groq'
+                assert info   == dict(hedged=False, provider='groq', skipped='cost_cap')
+            assert _.hedge_stats.summary()['skipped__cost_cap'] == 2
@@ -0,0 +1,54 @@
+import pytest
+from unittest                                                                           import TestCase
+from osbot_utils.type_safe.Type_Safe                                                    import Type_Safe
+from osbot_utils.utils.Objects                                                          import base_classes
+from mgraph_ai_service_llms.platforms.open_router.routing.Open_Router__Provider__Stats  import Open_Router__Provider__Stats
+from mgraph_ai_service_llms.platforms.open_router.routing.Open_Router__Provider__Router import Open_Router__Provider__Router, ROUTING_POLICY__FASTEST, ROUTING_POLICY__CHEAPEST, ROUTING_POLICY__BALANCED
+
+
+class test_Open_Router__Provider__Router(TestCase):
+
+    def setUp(self):
+        self.provider_stats  = Open_Router__Provider__Stats()
+        self.provider_router = Open_Router__Provider__Router(provider_stats=self.provider_stats, explore_rate=0)
+        for _ in range(5):
+            self.provider_stats.record(model='an-model', provider='groq'    , duration=1.0, total_tokens=1000, cost=0.004)
+            self.provider_stats.record(model='an-model', provider='cerebras', duration=0.5, total_tokens=1000, cost=0.010)
+            self.provider_stats.record(model='an-model', provider='together', duration=3.0, total_tokens=1000, cost=0.001)
+
+    def test__init__(self):
+        with Open_Router__Provider__Router() as _:
+            assert type(_)         is Open_Router__Provider__Router
+            assert base_classes(_) == [Type_Safe, object]
+            assert 'groq'          in _.candidates
+            assert 'auto'      not in _.candidates
+
+    def test_select(self):
+        with self.provider_router as _:
+            assert _.select('an-model', ROUTING_POLICY__FASTEST ) == 'cerebras'
+            assert _.select('an-model', ROUTING_POLICY__CHEAPEST) == 'together'
+            assert _.select('an-model', ROUTING_POLICY__BALANCED) == 'groq'
+            assert _.select('other-model', default='groq'       ) == 'groq'            # no data
+            with pytest.raises(ValueError, match='Invalid routing policy'):
+                _.select('an-model', 'an-policy')
+
+    def test_select__skips_failing_providers(self):
+        for _ in range(10):
+            self.provider_stats.record_error(model='an-model', provider='cerebras', duration=0.1)
+        assert self.provider_router.select('an-model', ROUTING_POLICY__FASTEST) == 'groq'
+
+    def test_preference_order(self):
+        order = self.provider_router.preference_order('an-model', ROUTING_POLICY__FASTEST)
+        assert order == ['cerebras', 'groq', 'together']                                # (only the providers serving the model)
+        assert self.provider_router.preference_order('an-model', default='deepinfra')[-1] == 'deepinfra'
+
+    def test_select__explores_providers_serving_the_model(self):                        # never a provider that doesn't have the model (a pinned request to it would fail)
+        self.provider_router.explore_rate = 1
+        self.provider_stats.record_error(model='an-model' , provider='deepinfra', duration=0.1)
+        self.provider_stats.record      (model='new-model', provider='deepinfra', duration=1.0)
+        for _ in range(20):
+            assert self.provider_router.select('an-model'   , ROUTING_POLICY__FASTEST                  ) == 'cerebras'
+            assert self.provider_router.select('new-model'  , ROUTING_POLICY__FASTEST, default='groq') in ['deepinfra', 'groq']
+            assert self.provider_router.select('other-model', ROUTING_POLICY__FASTEST, default='groq') == 'groq'
+        assert self.provider_router.serving('an-model' )    == ['cerebras', 'groq', 'together']
+        assert self.provider_router.serving('new-model')    == ['deepinfra']
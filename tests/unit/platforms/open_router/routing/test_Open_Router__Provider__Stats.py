@@ -0,0 +1,52 @@
+from unittest                                                                          import TestCase
+from osbot_utils.type_safe.Type_Safe                                                   import Type_Safe
+from osbot_utils.utils.Objects                                                         import base_classes
+from mgraph_ai_service_llms.platforms.open_router.routing.Open_Router__Provider__Stats import Open_Router__Provider__Stats, percentile, PROVIDER_STATS__WINDOW_SIZE
+from mgraph_ai_service_llms.platforms.open_router.service.Open_Router__Services        import open_router__services
+
+
+class test_Open_Router__Provider__Stats(TestCase):
+
+    def setUp(self):
+        self.provider_stats = Open_Router__Provider__Stats()
+
+    def test__init__(self):
+        with self.provider_stats as _:
+            assert type(_)                     is Open_Router__Provider__Stats
+            assert base_classes(_)             == [Type_Safe, object]
+            assert _.window_size               == PROVIDER_STATS__WINDOW_SIZE
+            assert _.samples                   == {}
+            assert type(open_router__services.shared(Open_Router__Provider__Stats)) is Open_Router__Provider__Stats
+
+    def test_percentile(self):
+        assert percentile([]                  , 50) is None
+        assert percentile([3, 1, 2]           , 50) == 2
+        assert percentile(list(range(1, 101)) , 90) == 90
+        assert percentile(list(range(1, 101)) , 99) == 99
+        assert percentile([5]                 , 99) == 5
+
+    def test_record__summary(self):
+        with self.provider_stats as _:
+            for duration in [1.0, 2.0, 3.0, 4.0]:
+                _.record(model='an-model', provider='groq', duration=duration, completion_tokens=100, total_tokens=200, cost=0.002)
+            _.record_error(model='an-model', provider='groq', duration=0.5)
+            summary = _.summary('an-model', 'groq')
+            assert summary['samples'              ] == 5
+            assert summary['error_rate'           ] == 0.2
+            assert summary['latency_p50'          ] == 2.0
+            assert summary['latency_p90'          ] == 4.0
+            assert summary['ttft_p50'             ] == 2.0                          # same as duration when not streaming
+            assert summary['tokens_per_second_p50'] == 100 / 3                     # 100 tokens in 3 seconds
+            assert summary['cost_per_1k_p50'      ] == 0.01
+            assert _.providers('an-model')           == ['groq']
+            assert len(_.summaries())                == 1
+            assert _.summaries('another-model')      == []
+
+    def test_window(self):
+        with Open_Router__Provider__Stats(window_size=3) as _:
+            for duration in [10.0, 1.0, 1.0, 1.0]:
+                _.record(model='an-model', provider='groq', duration=duration)
+            assert _.summary('an-model', 'groq')['latency_p99'] == 1.0             # oldest sample was dropped
+        with Open_Router__Provider__Stats(window_seconds=-1.0) as _:
+            _.record(model='an-model', provider='groq', duration=1.0)
+            assert _.summary('an-model', 'groq')['samples'] == 0                   # sample is outside the time window
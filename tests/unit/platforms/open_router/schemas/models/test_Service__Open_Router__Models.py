@@ -277,10 +277,7 @@ class test_Service__Open_Router__Models(TestCase):
 
     def test_empty_models_handling(self):
         # Test methods with empty model list
-        service = Service__Open_Router__Models()
-
-        # Mock empty cache
-        service.api__models = lambda: []
+        service = Service__Open_Router__Models(models=[])                    # (an empty catalogue)
 
         # Test each method handles empty list gracefully
         assert service.get_model_by_id(Safe_Str__Open_Router__Model_ID("test")) is None
@@ -0,0 +1,55 @@
+import threading
+from unittest                                                                            import TestCase
+from osbot_utils.type_safe.Type_Safe                                                     import Type_Safe
+from osbot_utils.utils.Objects                                                           import base_classes
+from mgraph_ai_service_llms.platforms.open_router.service.Open_Router__Services          import Open_Router__Services, open_router__services
+from mgraph_ai_service_llms.platforms.open_router.service.Service__Open_Router__Cost     import Service__Open_Router__Cost
+from mgraph_ai_service_llms.platforms.open_router.service.Service__Open_Router__Models   import Service__Open_Router__Models
+
+
+class An_Service(Type_Safe):
+    created = []
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        An_Service.created.append(self)
+
+
+class test_Open_Router__Services(TestCase):
+
+    def setUp(self):
+        self.services      = Open_Router__Services()
+        An_Service.created = []
+
+    def test__init__(self):
+        with self.services as _:
+            assert type(_)                                          is Open_Router__Services
+            assert base_classes(_)                                  == [Type_Safe, object]
+            assert _.status()                                       == dict(services=[])
+
+    def test_shared(self):
+        with self.services as _:
+            service = _.shared(An_Service)
+            assert _.shared(An_Service)                             is service
+            assert _.shared('an-key', lambda: 42)                   == 42
+            assert An_Service.created                               == [service]
+            assert _.status()                                       == dict(services=['An_Service', 'an-key'])
+            _.reset(An_Service)
+            assert _.shared(An_Service)                             is not service
+            _.reset()
+            assert _.services                                       == {}
+
+    def test_shared__threads(self):                                                     # concurrent first uses create a single object
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(self.services.shared(An_Service))) for _ in range(8)]
+        for thread in threads: thread.start()
+        for thread in threads: thread.join()
+        assert len(An_Service.created)                              == 1
+        assert all(result is An_Service.created[0] for result in results)
+
+    def test__cost_service(self):                                                       # services built by default use the shared catalogue
+        cost_service = Service__Open_Router__Cost()
+        assert cost_service.models_service                          is open_router__services.shared(Service__Open_Router__Models)
+        assert Service__Open_Router__Cost().models_service          is cost_service.models_service
+        models_service = Service__Open_Router__Models()
+        assert Service__Open_Router__Cost(models_service=models_service).models_service is models_service
@@ -144,6 +144,15 @@ class test_Service__Open_Router(TestCase):
         assert len(full_content) > 0
 
     @pytest.mark.skip(reason="needs cache support")
+    def test_get_cached_chats_by_ids(self):
+        result = self.service.get_cached_chats_by_ids(['aaaaaaaaaa', 'bbbbbbbbbb'])
+        assert result['status'] == 'success'
+        assert result['count' ] == 2
+        assert result['found' ] == 0
+        assert result['data'  ]['aaaaaaaaaa'] == { 'status'  : 'error'                                  ,
+                                                   'message' : 'Cache entry not found for id: aaaaaaaaaa' ,
+                                                   'cache_id': 'aaaaaaaaaa'                              }
+
     def test_list_models(self):
 
         # Test listing all models
@@ -7,6 +7,8 @@ from mgraph_ai_service_llms.platforms.open_router.schemas.cost.Schema__Open_Rout
 from mgraph_ai_service_llms.platforms.open_router.schemas.models.Schema__Open_Router__Model__Pricing         import Schema__Open_Router__Model__Pricing
 from mgraph_ai_service_llms.platforms.open_router.schemas.models.Schema__Open_Router__Model__Pricing__Float  import Schema__Open_Router__Model__Pricing__Float
 from mgraph_ai_service_llms.platforms.open_router.service.Service__Open_Router__Cost                         import Service__Open_Router__Cost
+from mgraph_ai_service_llms.platforms.open_router.service.Service__Open_Router__Models                       import Service__Open_Router__Models
+from tests.unit.platforms.open_router.Open_Router__Test_Models                                                import create_model
 
 class test_Service__Open_Router__Cost(TestCase):
 
@@ -255,6 +257,17 @@ class test_Service__Open_Router__Cost(TestCase):
         assert cheapest[1]["model_id"] == "cheap/model"
         assert cheapest[2]["model_id"] == "mid/model"
 
+    def test_rank_models(self):                         # cache writes are priced (a model with cheap prompts but expensive cache writes drops in the ranking)
+        models_service = Service__Open_Router__Models(models=[create_model('cheap/writes', 1.0, 1.0, input_cache_write=1.0 ),
+                                                              create_model('cheap/prompt', 0.5, 1.0, input_cache_write=10.0)])
+        cost_service   = Service__Open_Router__Cost(models_service=models_service)
+        ranked         = cost_service.rank_models(prompt_tokens=1000, completion_tokens=0)
+        assert [model['model_id'] for model in ranked['models']] == ['cheap/prompt', 'cheap/writes']
+        ranked         = cost_service.rank_models(prompt_tokens=1000, completion_tokens=0, cache_write_tokens=1000)
+        assert [model['model_id'] for model in ranked['models']] == ['cheap/writes', 'cheap/prompt']
+        assert ranked['usage']['cache_write_tokens']             == 1000
+        assert ranked['models'][0]['total_cost']                 == 0.002                                    # 1000 * 1.0/1M (prompt) + 1000 * 1.0/1M (cache write)
+
     @pytest.mark.skip("add cache and check results")
     def test__compare_model_costs(self):
         """Test comparing costs across models"""
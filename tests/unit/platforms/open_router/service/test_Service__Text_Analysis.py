@@ -48,6 +48,7 @@ class test_Service__Text_Analysis(TestCase):
         assert type(service.open_router) is Service__Open_Router
         assert service.model             == DEFAULT_MODEL
         assert service.provider          == DEFAULT_PROVIDER
+        assert service.routing_policy    is None                                                          # (routing is opt-in)
         assert service.temperature       == 0.3
         assert service.max_tokens        == 1000
 
@@ -0,0 +1,143 @@
+from unittest                                                       import TestCase
+from osbot_utils.type_safe.Type_Safe                                import Type_Safe
+from osbot_utils.utils.Misc                                         import random_string_short
+from osbot_utils.utils.Objects                                      import base_classes
+from mgraph_ai_service_llms.service.cache.LLM__Cache                import LLM__Cache
+from mgraph_ai_service_llms.service.cache.LLM__Cache__Index__Shards import LLM__Cache__Index__Shards, SHARD_KIND__HASH, SHARD_KIND__ID, CACHE_INDEX__SHARDS__PREFIX_SIZE
+from tests.unit.Service__Fast_API__Test_Objs                        import setup__service_fast_api_test_objs
+
+
+class test_LLM__Cache__Index__Shards(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        setup__service_fast_api_test_objs()
+        cls.llm_cache     = LLM__Cache().setup()
+        cls.shards_folder = random_string_short('test-cache-index-')                   # isolate from the real index
+        cls.index_shards  = LLM__Cache__Index__Shards(llm_cache     = cls.llm_cache    ,
+                                                      shards_folder = cls.shards_folder).setup()
+
+    @classmethod
+    def tearDownClass(cls):
+        s3_keys = cls.llm_cache.s3_db.s3_folder_files__all(folder=cls.llm_cache.get_s3_key(cls.shards_folder))
+        cls.llm_cache.s3_db.s3_files_delete(s3_keys)
+
+    def test__init__(self):
+        with self.index_shards as _:
+            assert type(_)             is LLM__Cache__Index__Shards
+            assert base_classes(_)     == [Type_Safe, object]
+            assert _.shard_prefix_size == CACHE_INDEX__SHARDS__PREFIX_SIZE
+            assert _.manifest()        is not None                                     # created by setup()
+
+    def test_shard_key(self):
+        with self.index_shards as _:
+            assert _.shard_key('ABCDEF1234'      ) == 'abc'
+            assert _.shard_key('12'              ) == '12'
+            assert _.shard_key('../../etc/passwd') is None
+            assert _.shard_key(''                ) is None
+
+    def test_add_entry(self):
+        with self.index_shards as _:
+            assert _.add_entry(request_hash='a1b2c3d4e5', cache_id='f00dcafe', file_path='an-model/2025/08/21/10/f00dcafe.json') is True
+            assert _.cache_id__from__hash     ('a1b2c3d4e5') == 'f00dcafe'
+            assert _.file_path__from__cache_id('f00dcafe'  ) == 'an-model/2025/08/21/10/f00dcafe.json'
+            assert _.shard(SHARD_KIND__HASH, 'a1b')          == {'a1b2c3d4e5': 'f00dcafe'}
+            assert _.shard(SHARD_KIND__ID  , 'f00')          == {'f00dcafe'  : 'an-model/2025/08/21/10/f00dcafe.json'}
+            assert 'a1b' in _.shards_keys(SHARD_KIND__HASH)
+
+    def test_add_entry__cost(self):                                                    # priced when cached, so a hit doesn't need the models catalogue
+        with self.index_shards as _:
+            _.add_entry(request_hash='c1c2c3c4c5', cache_id='c0570001', file_path='m/c0570001.json', cost=0.00125)
+            _.add_entry(request_hash='c1c2c3c4c6', cache_id='c0570002', file_path='m/c0570002.json')
+            assert _.cost__from__cache_id('c0570001') == 0.00125
+            assert _.cost__from__cache_id('c0570002') == 0.0
+            assert _.file_path__from__cache_id('c0570001') == 'm/c0570001.json'
+            assert _.shard(SHARD_KIND__ID, 'c05')     == {'c0570001': {'file_path': 'm/c0570001.json', 'cost': 0.00125},     # (in the id shard, so a hit reads one shard)
+                                                          'c0570002': 'm/c0570002.json'                                   }
+            assert dict(_.entries(cursor='c0570000'))['c0570001'] == 'm/c0570001.json'
+
+    def test_shard__update__conditional(self):                                         # a shard changed by another worker since it was read is read again (no lost entries)
+        other_worker = LLM__Cache__Index__Shards(llm_cache=self.llm_cache, shards_folder=self.shards_folder).setup()
+        with self.index_shards as _:
+            _.add_entry(request_hash='5a00000001', cache_id='5b000001', file_path='m/5b000001.json')
+            path       = _.path_shard(SHARD_KIND__ID, '5b0')
+            data, etag = _.shard__load(path)
+            assert other_worker.add_entry(request_hash='5a00000002', cache_id='5b000002', file_path='m/5b000002.json') is True
+            assert _.shard__save__if_match(path, dict(data, lost='entry'), etag) is None                # (stale ETag)
+            assert _.shard__save__if_match(_.path_shard(SHARD_KIND__ID, '5b1'), {}, None) is not None      # (a new shard)
+            assert _.shard__save__if_match(_.path_shard(SHARD_KIND__ID, '5b1'), {}, None) is None          # (that exists now)
+            _.add_entry(request_hash='5a00000003', cache_id='5b000003', file_path='m/5b000003.json')
+            assert sorted(_.shard(SHARD_KIND__ID, '5b0')) == ['5b000001', '5b000002', '5b000003']
+
+    def test_add_entry__only_touches_one_shard(self):
+        with self.index_shards as _:
+            _.add_entry(request_hash='b000000001', cache_id='c0000001', file_path='m/c0000001.json')
+            _.add_entry(request_hash='b000000002', cache_id='c0000002', file_path='m/c0000002.json')
+            _.add_entry(request_hash='e000000003', cache_id='d0000003', file_path='m/d0000003.json')
+            assert _.shard(SHARD_KIND__HASH, 'b00') == {'b000000001': 'c0000001', 'b000000002': 'c0000002'}
+            assert _.shard(SHARD_KIND__HASH, 'e00') == {'e000000003': 'd0000003'}
+
+    def test_shard__refreshed_by_etag(self):
+        other_worker = LLM__Cache__Index__Shards(llm_cache       = self.llm_cache    ,
+                                                 shards_folder   = self.shards_folder,
+                                                 refresh_seconds = 0                 ).setup()
+        with self.index_shards as _:
+            _.add_entry(request_hash='9a00000001', cache_id='9b000001', file_path='m/9b000001.json')
+            assert other_worker.cache_id__from__hash('9a00000001') == '9b000001'
+            _.add_entry(request_hash='9a00000002', cache_id='9b000002', file_path='m/9b000002.json')
+            assert other_worker.cache_id__from__hash('9a00000002') == '9b000002'        # picked up since the shard's ETag changed
+
+    def test_entries__not_kept_in_memory(self):                                        # scans (export, index pages) read the shards without caching them
+        other_worker = LLM__Cache__Index__Shards(llm_cache=self.llm_cache, shards_folder=self.shards_folder).setup()
+        self.index_shards.add_entry(request_hash='7a00000001', cache_id='7b000001', file_path='m/7b000001.json')
+        entries = dict(other_worker.entries())
+        assert entries['7b000001']        == 'm/7b000001.json'
+        assert other_worker.loaded_shards == {}
+
+    def test_entries__page(self):
+        page_folder = random_string_short('test-cache-index-page-')
+        with LLM__Cache__Index__Shards(llm_cache=self.llm_cache, shards_folder=page_folder).setup() as _:
+            try:
+                for cache_id in ['a1000001', 'a1000002', 'b2000001', 'c3000001', 'd4000001']:
+                    _.add_entry(request_hash=f'f{cache_id}', cache_id=cache_id, file_path=f'm/{cache_id[0]}/{cache_id}.json')
+                assert _.entries__page(limit=2)                      == ({'a1000001': 'm/a/a1000001.json', 'a1000002': 'm/a/a1000002.json'}, 'a1000002')
+                assert _.entries__page(limit=1)                      == ({'a1000001': 'm/a/a1000001.json'}                                 , 'a1000001')
+                assert _.entries__page(limit=9, max_shards=2)        == ({'a1000001': 'm/a/a1000001.json', 'a1000002': 'm/a/a1000002.json',
+                                                                          'b2000001': 'm/b/b2000001.json'}                                 , 'c30'     )
+                assert _.entries__page(limit=9, cursor='c30')        == ({'c3000001': 'm/c/c3000001.json', 'd4000001': 'm/d/d4000001.json'}, None     )
+
+                only_d = lambda file_path: file_path.startswith('m/d/')                 # a filter that matches little: short pages (scanning at most max_shards each), until the last one
+                assert _.entries__page(limit=9, match=only_d, max_shards=1               ) == ({}                                      , 'b20')
+                assert _.entries__page(limit=9, match=only_d, max_shards=1, cursor='b20') == ({}                                      , 'c30')
+                assert _.entries__page(limit=9, match=only_d, max_shards=2, cursor='c30') == ({'d4000001': 'm/d/d4000001.json'}      , None )
+            finally:
+                s3_keys = self.llm_cache.s3_db.s3_folder_files__all(folder=self.llm_cache.get_s3_key(page_folder))
+                self.llm_cache.s3_db.s3_files_delete(s3_keys)
+
+    def test_cache_id__from__hash__not_found(self):
+        with self.index_shards as _:
+            assert _.cache_id__from__hash     ('0000000000') is None
+            assert _.file_path__from__cache_id('00000000'  ) is None
+            assert _.cache_id__from__hash     (None        ) is None
+
+    def test_import_legacy_index(self):
+        legacy_folder = random_string_short('test-cache-index-legacy-')
+        legacy_index  = { 'cache_id__from__hash__request': { 'cb93fe94c1': '9299d6d6', '6017b1e8ae': '44c415d9'},
+                          'cache_id__to__file_path'      : { '9299d6d6'  : 'gpt-4o-mini/2025/07/23/15/9299d6d6.json',
+                                                             '44c415d9'  : 'openai_gpt-4_1-mini/2025/07/23/15/44c415d9.json'}}
+        with LLM__Cache__Index__Shards(llm_cache=self.llm_cache, shards_folder=legacy_folder) as _:
+            original_legacy = self.llm_cache.json__load('cache_index.json')
+            try:
+                self.llm_cache.json__save('cache_index.json', legacy_index)
+                assert _.import_legacy_index() == 2
+                assert _.cache_id__from__hash     ('cb93fe94c1') == '9299d6d6'
+                assert _.file_path__from__cache_id('44c415d9'  ) == 'openai_gpt-4_1-mini/2025/07/23/15/44c415d9.json'
+                assert _.index_data() == legacy_index
+                assert _.manifest().get('entries_imported') == 2
+            finally:
+                if original_legacy:
+                    self.llm_cache.json__save('cache_index.json', original_legacy)
+                else:
+                    self.llm_cache.file__delete('cache_index.json')
+                s3_keys = self.llm_cache.s3_db.s3_folder_files__all(folder=self.llm_cache.get_s3_key(legacy_folder))
+                self.llm_cache.s3_db.s3_files_delete(s3_keys)
@@ -0,0 +1,144 @@
+import threading
+import time
+from unittest                                               import TestCase
+from osbot_utils.type_safe.Type_Safe                        import Type_Safe
+from osbot_utils.utils.Misc                                 import random_string_short
+from osbot_utils.utils.Objects                              import base_classes
+from mgraph_ai_service_llms.service.cache.LLM__Cache        import LLM__Cache
+from mgraph_ai_service_llms.service.cache.LLM__Cache__Stats import LLM__Cache__Stats
+from tests.unit.Service__Fast_API__Test_Objs                import setup__service_fast_api_test_objs
+
+
+class test_LLM__Cache__Stats(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        setup__service_fast_api_test_objs()
+        cls.llm_cache    = LLM__Cache().setup()
+        cls.stats_folder = random_string_short('test-cache-stats-')                     # isolate from the real rollups
+        cls.cache_stats  = LLM__Cache__Stats(llm_cache=cls.llm_cache, stats_folder=cls.stats_folder).setup()
+
+    @classmethod
+    def tearDownClass(cls):
+        s3_keys = cls.llm_cache.s3_db.s3_folder_files__all(folder=cls.llm_cache.get_s3_key(cls.stats_folder))
+        cls.llm_cache.s3_db.s3_files_delete(s3_keys)
+
+    def test__init__(self):
+        with self.cache_stats as _:
+            assert type(_)         is LLM__Cache__Stats
+            assert base_classes(_) == [Type_Safe, object]
+            assert _.llm_cache     is self.llm_cache
+
+    def test_path_info(self):
+        with self.cache_stats as _:
+            assert _.path_info('gpt-4o-mini/2025/07/23/15/9299d6d6.json'     ) == dict(model='gpt-4o-mini'        , provider=None  , date='2025-07-23')
+            assert _.path_info('openai_gpt-oss-20b/groq/2025/08/01/10/a.json') == dict(model='openai/gpt-oss-20b' , provider='groq', date='2025-08-01')
+            assert _.path_info('an-file.json'                                ) == dict(model=None                 , provider=None  , date=None        )
+
+    def test_record_entry(self):
+        with self.cache_stats as _:
+            assert _.record_entry('model-a/2024/01/02/10/00000001.json'     , size_bytes=100) is True
+            assert _.record_entry('model-a/groq/2024/01/02/11/00000002.json', size_bytes=50 ) is True
+            assert _.record_entry('model-b/2024/01/03/11/00000003.json'                     ) is True
+            assert _.record_entry('no-date.json'                                            ) is False
+            assert _.day('2024-01-02') == dict(date       = '2024-01-02'                   ,
+                                               entries    = 2                              ,
+                                               models     = {'model-a': 2}                 ,
+                                               providers  = {'default': 1, 'groq': 1}      ,
+                                               bytes      = 150                            ,
+                                               hits       = 0                              ,
+                                               misses     = 0                              ,
+                                               cost_saved = 0.0                            )
+            assert '2024-01-03' in _.days()
+
+            stats = _.stats(date_from='2024-01-02', date_to='2024-01-03')
+            assert stats == { 'total_entries'         : 3                                  ,
+                              'total_bytes'           : 150                                ,
+                              'total_hits'            : 0                                  ,
+                              'total_misses'          : 0                                  ,
+                              'hit_ratio'             : 0.0                                ,
+                              'cost_saved'            : 0.0                                ,
+                              'models_distribution'   : {'model-a': 2, 'model-b': 1}       ,
+                              'providers_distribution': {'default': 2, 'groq': 1}          ,
+                              'dates_distribution'    : {'2024/01/02': 2, '2024/01/03': 1} }
+
+    def test_record_hit__record_miss(self):
+        with self.cache_stats as _:
+            today = _.day__today()
+            assert _.record_hit (cost_saved=0.0015) is True
+            assert _.record_hit (cost_saved=0.0005) is True
+            assert _.record_miss(               ) is True
+            stats = _.stats(date_from=today, date_to=today)
+            assert stats['total_hits'  ] == 2
+            assert stats['total_misses'] == 1
+            assert stats['hit_ratio'   ] == 0.6667
+            assert stats['cost_saved'  ] == 0.002
+            assert [day['date'] for day in _.daily(date_from=today)] == [today]
+
+    def test_record_hit__workers(self):                                                 # counted in memory, each worker writes its own file (so no increment is lost)
+        worker_1 = LLM__Cache__Stats(llm_cache=self.llm_cache, stats_folder=self.stats_folder, worker_id='worker-1').setup()
+        worker_2 = LLM__Cache__Stats(llm_cache=self.llm_cache, stats_folder=self.stats_folder, worker_id='worker-2').setup()
+        today    = worker_1.day__today()
+        before   = worker_1.day(today)
+        for _ in range(10):
+            worker_1.record_hit(cost_saved=0.001)
+            worker_2.record_miss()
+        assert worker_1.rollups[today]['hits'  ] == 10                                  # (not written yet)
+        assert worker_2.flush()                  is True
+        day = worker_1.day(today)                                                       # (worker_1's counts come from memory, reads never write)
+        assert day['hits'  ] - before['hits'  ] == 10
+        assert day['misses'] - before['misses'] == 10
+        assert worker_1.path_worker(today) != worker_2.path_worker(today)
+        assert self.llm_cache.file__exists(worker_1.path_worker(today)) is False
+
+    def test_flush__wait(self):                                                         # the final flush waits for a running flush (instead of skipping the last counts)
+        worker   = LLM__Cache__Stats(llm_cache=self.llm_cache, stats_folder=self.stats_folder, worker_id='worker-3').setup()
+        flushing = threading.Event()
+        def background_flush():
+            with worker.flush_lock:
+                flushing.set()
+                time.sleep(0.1)
+        thread = threading.Thread(target=background_flush)
+        thread.start()
+        flushing.wait()
+        worker.record_miss()
+        assert worker.flush()          is False
+        assert worker.flush(wait=True) is True
+        assert worker.dirty            == {}
+        thread.join()
+
+    def test_compact(self):                                                             # the closed days' worker files are merged into the day's rollup (once)
+        worker_1 = LLM__Cache__Stats(llm_cache=self.llm_cache, stats_folder=self.stats_folder, worker_id='worker-1').setup()
+        worker_2 = LLM__Cache__Stats(llm_cache=self.llm_cache, stats_folder=self.stats_folder, worker_id='worker-2').setup()
+        worker_1.record_entry('model-a/2024/02/01/10/00000001.json', size_bytes=10)
+        worker_2.record_entry('model-b/2024/02/01/10/00000002.json', size_bytes=20)
+        assert worker_1.flush() is True
+        assert worker_2.flush() is True
+        expected = LLM__Cache__Stats(llm_cache=self.llm_cache, stats_folder=self.stats_folder).day('2024-02-01')
+        assert expected['entries'] == 2
+        assert worker_1.compact__if_due()      >= 1
+        assert worker_1.rollups                == {}                                   # (the closed days are dropped from memory)
+        assert worker_1.days__stored()['2024-02-01'] is False                           # no worker files left for that day
+        assert worker_2.compact('2024-02-01')  is True                                  # (nothing new to add)
+        assert worker_2.day('2024-02-01')      == expected
+
+    def test_rebuild_from_index__workers(self):                                         # the entries the workers already counted are in the index (so they are not added twice)
+        stats_folder = random_string_short('test-cache-stats-rebuild-')
+        worker_1     = LLM__Cache__Stats(llm_cache=self.llm_cache, stats_folder=stats_folder, worker_id='worker-1').setup()
+        worker_2     = LLM__Cache__Stats(llm_cache=self.llm_cache, stats_folder=stats_folder, worker_id='worker-2').setup()
+        try:
+            worker_1.record_entry('model-a/2024/03/01/10/00000001.json')
+            worker_2.record_entry('model-a/2024/03/01/10/00000002.json')
+            assert worker_1.flush() is True                                             # (worker_2's entry is only in memory)
+            assert worker_2.rebuild_from_index(iter([('00000001', 'model-a/2024/03/01/10/00000001.json'),       # (streamed, as from index_shards.entries())
+                                                     ('00000002', 'model-a/2024/03/01/10/00000002.json'),
+                                                     ('00000003', 'model-a/2024/03/01/10/00000003.json')])) == 1
+            assert worker_2.day('2024-03-01')['entries'] == 3
+            worker_1.record_entry('model-a/2024/03/01/11/00000004.json')
+            worker_2.record_entry('model-a/2024/03/01/11/00000005.json')
+            assert worker_1.flush() is True
+            assert worker_2.flush() is True
+            assert LLM__Cache__Stats(llm_cache=self.llm_cache, stats_folder=stats_folder).day('2024-03-01')['models'] == {'model-a': 5}
+        finally:
+            s3_keys = self.llm_cache.s3_db.s3_folder_files__all(folder=self.llm_cache.get_s3_key(stats_folder))
+            self.llm_cache.s3_db.s3_files_delete(s3_keys)
@@ -1,7 +1,11 @@
-from unittest                                                import TestCase
-from mgraph_ai_service_llms.service.cache.Service__Cache     import Service__Cache
-from mgraph_ai_service_llms.service.cache.LLM__Cache         import LLM__Cache
-from tests.unit.Service__Fast_API__Test_Objs                 import setup__service_fast_api_test_objs
+import json
+from unittest                                                       import TestCase
+from osbot_utils.utils.Misc                                         import random_string_short
+from mgraph_ai_service_llms.service.cache.Service__Cache            import Service__Cache
+from mgraph_ai_service_llms.service.cache.LLM__Cache                import LLM__Cache
+from mgraph_ai_service_llms.service.cache.LLM__Cache__Index__Shards import LLM__Cache__Index__Shards
+from mgraph_ai_service_llms.service.cache.LLM__Cache__Stats         import LLM__Cache__Stats
+from tests.unit.Service__Fast_API__Test_Objs                        import setup__service_fast_api_test_objs
 
 
 class test_Service__Cache(TestCase):
@@ -13,10 +17,11 @@ class test_Service__Cache(TestCase):
 
     def test__init__(self):
         with self.service_cache as _:
-            assert type(_)            is Service__Cache
-            assert type(_.llm_cache)  is LLM__Cache
-            assert _.cache_index_path == 'cache_index.json'
-            assert _._cached_index    is None
+            assert type(_)                  is Service__Cache
+            assert type(_.llm_cache)        is LLM__Cache
+            assert type(_.index_shards)     is LLM__Cache__Index__Shards
+            assert _.index_shards.llm_cache is _.llm_cache
+            assert type(_.stats_rollups)    is LLM__Cache__Stats
 
     def test_cache_index(self):
         result = self.service_cache.cache_index()
@@ -31,14 +36,14 @@ class test_Service__Cache(TestCase):
             # Check for expected structure or empty message
             if 'message' in data:
                 assert data['message'] == 'Cache index is empty or not initialized'
-                assert data.get('cache_id__from__hash__request') == {}
-                assert data.get('cache_id__to__file_path')       == {}
+                assert data.get('cache_id__to__file_path') == {}
+                assert data.get('next_cursor')             is None
             else:
                 # If cache exists, check structure
-                assert 'cache_id__from__hash__request' in data
                 assert 'cache_id__to__file_path'       in data
-                assert type(data['cache_id__from__hash__request']) is dict
-                assert type(data['cache_id__to__file_path'])       is dict
+                assert type(data['cache_id__to__file_path']) is dict
+                assert data['count'] == len(data['cache_id__to__file_path'])
+                assert data['count'] <= data['limit']
 
     def test_get_cache_entry_by_id(self):
         # First get the cache index to find a valid cache ID
@@ -155,60 +160,89 @@ class test_Service__Cache(TestCase):
             # Check root folder value
             assert stats['root_folder'] == 'llm-cache/'
 
-    def test_cache_index__caching_behavior(self):
-        # Test that the index is cached in memory after first load
-        self.service_cache._cached_index = {}  # Clear any cached index
-
-        # First call should load from S3
-        result1 = self.service_cache.cache_index()
-
-        if result1['status'] == 'success' and result1['data']:
-            # Check that index is now cached
-            assert self.service_cache._cached_index is not None
-
-            # Store the cached version
-            cached_data = self.service_cache._cached_index
-
-            # Second call should use cached version
-            result2 = self.service_cache.cache_index()
-
-            # Should return the same data
-            assert result2['data'] == result1['data']
-            # Should still be the same object in memory
-            assert self.service_cache._cached_index == cached_data
+    def test_cache_index__pagination(self):
+        with Service__Cache() as _:
+            _.index_shards = LLM__Cache__Index__Shards(llm_cache=_.llm_cache, shards_folder=random_string_short('test-cache-index-')).setup()
+            _.index_shards.add_entry(request_hash='a000000001', cache_id='1a000001', file_path='gpt-4o-mini/2025/07/23/15/1a000001.json'        )
+            _.index_shards.add_entry(request_hash='a000000002', cache_id='2a000002', file_path='openai_gpt-4_1-mini/2025/07/23/15/2a000002.json')
+            _.index_shards.add_entry(request_hash='a000000003', cache_id='3a000003', file_path='gpt-4o-mini/2025/07/24/15/3a000003.json'        )
+            try:
+                page_1 = _.cache_index(limit=2).get('data')
+                page_2 = _.cache_index(limit=2, cursor=page_1.get('next_cursor')).get('data')
+                assert list(page_1['cache_id__to__file_path']) == ['1a000001', '2a000002']
+                assert page_1['next_cursor']                   == '2a000002'
+                assert list(page_2['cache_id__to__file_path']) == ['3a000003']
+                assert page_2['next_cursor']                   is None
+
+                assert list(_.cache_index(model='gpt-4o-mini'   ).get('data').get('cache_id__to__file_path')) == ['1a000001', '3a000003']
+                assert list(_.cache_index(date_from='2025-07-24').get('data').get('cache_id__to__file_path')) == ['3a000003']
+                assert list(_.cache_index(date_to  ='2025-07-23').get('data').get('cache_id__to__file_path')) == ['1a000001', '2a000002']
+
+                lines = list(_.cache_index__export(model='openai/gpt-4/1-mini'))
+                assert [json.loads(line) for line in lines] == [{'cache_id': '2a000002', 'file_path': 'openai_gpt-4_1-mini/2025/07/23/15/2a000002.json'}]
+            finally:
+                s3_keys = _.llm_cache.s3_db.s3_folder_files__all(folder=_.llm_cache.get_s3_key(_.index_shards.shards_folder))
+                _.llm_cache.s3_db.s3_files_delete(s3_keys)
+
+    def test_get_cache_entries_by_ids(self):
+        with Service__Cache() as _:
+            _.index_shards = LLM__Cache__Index__Shards(llm_cache=_.llm_cache, shards_folder=random_string_short('test-cache-index-')).setup()
+            file_path      = random_string_short('test-cache-entries-') + '/2025/07/23/15/4b000001.json'
+            _.index_shards.add_entry(request_hash='b000000001', cache_id='4b000001', file_path=file_path)
+            _.llm_cache.json__save(file_path, {'an': 'entry'})
+            try:
+                result = _.get_cache_entries_by_ids(['4b000001', 'ffffffff', '4b000001'])
+                assert result['status'] == 'success'
+                assert result['count' ] == 2                                        # duplicates are only fetched once
+                assert result['found' ] == 1
+                assert result['data'  ]['4b000001'] == { 'status'   : 'success'       ,
+                                                         'cache_id' : '4b000001'      ,
+                                                         'file_path': file_path       ,
+                                                         'data'     : {'an': 'entry'} }
+                assert result['data'  ]['ffffffff']['status'] == 'error'
+                assert _.get_cache_entries_by_ids([str(index) for index in range(101)])['status'] == 'error'
+            finally:
+                _.llm_cache.file__delete(file_path)
+                s3_keys = _.llm_cache.s3_db.s3_folder_files__all(folder=_.llm_cache.get_s3_key(_.index_shards.shards_folder))
+                _.llm_cache.s3_db.s3_files_delete(s3_keys)
 
     def test_cache_stats__with_sample_data(self):
-        # Test stats calculation with known index structure
-        self.service_cache._cached_index = {
-            'cache_id__from__hash__request': {
-                'cb93fe94c1': '9299d6d6',
-                '6017b1e8ae': '44c415d9',
-            },
-            'cache_id__to__file_path': {
-                '9299d6d6': 'gpt-4o-mini/2025/07/23/15/9299d6d6.json',
-                '44c415d9': 'openai_gpt-4_1-mini/2025/07/23/15/44c415d9.json',
-                'f71571ad': 'google_gemini-2_5-flash-lite/2025/07/24/15/f71571ad.json',
-            }
-        }
-
-        result = self.service_cache.cache_stats()
-
-        assert result['status'] == 'success'
-        stats = result['data']
-
-        assert stats['total_entries']        == 3
-        assert stats['total_request_hashes'] == 2
-
-        # Check model distribution
-        assert 'gpt-4o-mini'                    in stats['models_distribution']
-        assert 'openai/gpt-4/1-mini'            in stats['models_distribution']
-        assert 'google/gemini-2/5-flash-lite'   in stats['models_distribution']
-
-        # Check dates distribution
-        assert '2025/07/23' in stats['dates_distribution']
-        assert '2025/07/24' in stats['dates_distribution']
-        assert stats['dates_distribution']['2025/07/23'] == 2
-        assert stats['dates_distribution']['2025/07/24'] == 1
+        # Test stats calculation with known rollups (created from a known index)
+        with Service__Cache() as _:
+            _.stats_rollups = LLM__Cache__Stats(llm_cache=_.llm_cache, stats_folder=random_string_short('test-cache-stats-')).setup()
+            _.stats_rollups.rebuild_from_index({ '9299d6d6': 'gpt-4o-mini/2025/07/23/15/9299d6d6.json'                 ,
+                                                 '44c415d9': 'openai_gpt-4_1-mini/2025/07/23/15/44c415d9.json'         ,
+                                                 'f71571ad': 'google_gemini-2_5-flash-lite/2025/07/24/15/f71571ad.json'})
+            try:
+                result = _.cache_stats()
+
+                assert result['status'] == 'success'
+                stats = result['data']
+
+                assert stats['total_entries']        == 3
+                assert stats['total_request_hashes'] == 3
+
+                # Check model distribution
+                assert 'gpt-4o-mini'                    in stats['models_distribution']
+                assert 'openai/gpt-4/1-mini'            in stats['models_distribution']
+                assert 'google/gemini-2/5-flash-lite'   in stats['models_distribution']
+
+                # Check dates distribution
+                assert '2025/07/23' in stats['dates_distribution']
+                assert '2025/07/24' in stats['dates_distribution']
+                assert stats['dates_distribution']['2025/07/23'] == 2
+                assert stats['dates_distribution']['2025/07/24'] == 1
+
+                # Check date range
+                assert _.cache_stats(date_from='2025-07-24').get('data').get('total_entries') == 1
+
+                # Check daily rollups
+                days = _.cache_stats__daily().get('data').get('days')
+                assert [day['date']    for day in days] == ['2025-07-23', '2025-07-24']
+                assert [day['entries'] for day in days] == [2, 1]
+            finally:
+                s3_keys = _.llm_cache.s3_db.s3_folder_files__all(folder=_.llm_cache.get_s3_key(_.stats_rollups.stats_folder))
+                _.llm_cache.s3_db.s3_files_delete(s3_keys)
 
     def test_get_cache_entry_by_id__error_cases(self):
         # Test various error scenarios
@@ -0,0 +1,53 @@
+from unittest                                                                   import TestCase
+from osbot_utils.type_safe.Type_Safe                                            import Type_Safe
+from osbot_utils.utils.Objects                                                  import base_classes
+from mgraph_ai_service_llms.service.llms.resilience.LLM__Circuit_Breaker        import LLM__Circuit_Breaker, CIRCUIT_BREAKER__STATE__CLOSED, CIRCUIT_BREAKER__STATE__OPEN, CIRCUIT_BREAKER__STATE__HALF_OPEN
+from mgraph_ai_service_llms.service.llms.resilience.LLM__Circuit_Breakers       import LLM__Circuit_Breakers, llm__circuit_breakers
+
+
+class test_LLM__Circuit_Breaker(TestCase):
+
+    def test__init__(self):
+        with LLM__Circuit_Breaker() as _:
+            assert type(_)         is LLM__Circuit_Breaker
+            assert base_classes(_) == [Type_Safe, object]
+            assert _.state         == CIRCUIT_BREAKER__STATE__CLOSED
+            assert _.allow()       is True
+
+    def test_open__half_open__closed(self):
+        with LLM__Circuit_Breaker(failure_threshold=2, open_seconds=0.0) as _:
+            _.record_failure()
+            assert _.state   == CIRCUIT_BREAKER__STATE__CLOSED
+            _.record_failure()
+            assert _.state   == CIRCUIT_BREAKER__STATE__OPEN
+            assert _.allow() is True                                                # open_seconds elapsed: one probe
+            assert _.state   == CIRCUIT_BREAKER__STATE__HALF_OPEN
+            assert _.allow() is False                                               # only one probe at a time
+            _.record_failure()                                                      # failed probe re-opens the breaker
+            assert _.state   == CIRCUIT_BREAKER__STATE__OPEN
+            assert _.allow() is True
+            _.record_success()
+            assert _.status() == dict(state                = CIRCUIT_BREAKER__STATE__CLOSED,
+                                      consecutive_failures = 0                             ,
+                                      total_failures       = 3                             ,
+                                      total_successes      = 1                             ,
+                                      times_opened         = 2                             ,
+                                      retry_in             = 0.0                           )
+
+    def test_open__rejects(self):
+        with LLM__Circuit_Breaker(failure_threshold=1, open_seconds=60.0) as _:
+            _.record_failure()
+            assert _.allow()    is False
+            assert _.retry_in() >  59
+
+    def test_circuit_breakers(self):
+        with LLM__Circuit_Breakers(failure_threshold=1) as _:
+            assert type(llm__circuit_breakers) is LLM__Circuit_Breakers
+            assert _.breaker('an-model', 'groq') is _.breaker('an-model', 'groq')
+            _.record_failure('an-model', 'groq')
+            _.record_success('an-model', None  )
+            assert _.allow  ('an-model', 'groq'    ) is False
+            assert _.allow  ('an-model', 'cerebras') is True
+            assert [(state['provider'], state['state']) for state in _.states()] == [('auto'    , CIRCUIT_BREAKER__STATE__CLOSED),
+                                                                                     ('cerebras', CIRCUIT_BREAKER__STATE__CLOSED),
+                                                                                     ('groq'    , CIRCUIT_BREAKER__STATE__OPEN  )]
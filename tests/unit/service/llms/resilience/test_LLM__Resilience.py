@@ -0,0 +1,74 @@
+import pytest
+from unittest                                                                   import TestCase
+from requests                                                                   import Response, HTTPError
+from osbot_utils.type_safe.Type_Safe                                            import Type_Safe
+from osbot_utils.utils.Objects                                                  import base_classes
+from mgraph_ai_service_llms.service.llms.resilience.LLM__Circuit_Breakers       import LLM__Circuit_Breakers, llm__circuit_breakers
+from mgraph_ai_service_llms.service.llms.resilience.LLM__Resilience             import LLM__Resilience
+
+
+def http_error(status_code):
+    response             = Response()
+    response.status_code = status_code
+    return HTTPError(f'{status_code} error', response=response)
+
+
+class test_LLM__Resilience(TestCase):
+
+    def setUp(self):
+        self.resilience       = LLM__Resilience(circuit_breakers=LLM__Circuit_Breakers(failure_threshold=3))
+        self.resilience.sleep = lambda seconds: self.sleeps.append(seconds)
+        self.sleeps           = []
+        self.calls            = []
+
+    def send(self, errors):                                                         # fake request: raises the next error for the provider (until there are none left)
+        def send(provider):
+            self.calls.append(provider)
+            provider_errors = errors.get(provider, [])
+            if provider_errors:
+                raise provider_errors.pop(0)
+            return f'response from {provider}'
+        return send
+
+    def test__init__(self):
+        with LLM__Resilience() as _:
+            assert type(_)             is LLM__Resilience
+            assert base_classes(_)     == [Type_Safe, object]
+            assert _.circuit_breakers  is llm__circuit_breakers
+
+    def test_call__retry(self):
+        result = self.resilience.call('an-model', ['groq'], self.send({'groq': [http_error(503), http_error(429)]}))
+        assert result      == 'response from groq'
+        assert self.calls  == ['groq', 'groq', 'groq']
+        assert len(self.sleeps) == 2
+
+    def test_call__failover(self):
+        result = self.resilience.call('an-model', ['groq', 'cerebras'], self.send({'groq': [http_error(503)] * 3}))
+        assert result     == 'response from cerebras'
+        assert self.calls == ['groq', 'groq', 'groq', 'cerebras']
+        assert self.resilience.circuit_breakers.breaker('an-model', 'groq').state == 'open'
+
+        self.calls.clear()
+        self.resilience.call('an-model', ['groq', 'cerebras'], self.send({}))          # open breaker: groq is skipped
+        assert self.calls == ['cerebras']
+
+    def test_call__client_error(self):
+        with pytest.raises(HTTPError, match='400 error'):
+            self.resilience.call('an-model', ['groq', 'cerebras'], self.send({'groq': [http_error(400)]}))
+        assert self.calls == ['groq']                                                  # no retry and no failover
+        assert self.resilience.circuit_breakers.breaker('an-model', 'groq').consecutive_failures == 0
+
+    def test_call__all_open(self):
+        self.resilience.circuit_breakers.breaker('an-model', 'groq').record_failure()
+        self.resilience.circuit_breakers.failure_threshold = 1
+        for _ in range(3):
+            self.resilience.circuit_breakers.record_failure('an-model', 'groq')
+        with pytest.raises(ConnectionError, match="No provider available for model 'an-model'"):
+            self.resilience.call('an-model', ['groq'], self.send({}))
+        assert self.calls == []
+
+    def test_call__local_error(self):
+        with pytest.raises(ValueError, match='local error'):
+            self.resilience.call('an-model', ['groq', 'cerebras'], self.send({'groq': [ValueError('local error')]}))
+        assert self.calls == ['groq']
+        assert self.resilience.circuit_breakers.breaker('an-model', 'groq').total_successes == 0
@@ -0,0 +1,46 @@
+from unittest                                                                   import TestCase
+from urllib.error                                                               import HTTPError
+from requests                                                                   import Response, HTTPError as Requests__HTTPError, ConnectionError as Requests__ConnectionError
+from mgraph_ai_service_llms.service.llms.resilience.LLM__Retry_Policy           import LLM__Retry_Policy, RETRY_POLICY__MAX_ATTEMPTS
+
+
+def requests_error(status_code, headers=None):
+    response             = Response()
+    response.status_code = status_code
+    response.headers.update(headers or {})
+    return Requests__HTTPError(response=response)
+
+
+class test_LLM__Retry_Policy(TestCase):
+
+    def setUp(self):
+        self.retry_policy = LLM__Retry_Policy()
+
+    def test__init__(self):
+        assert self.retry_policy.max_attempts == RETRY_POLICY__MAX_ATTEMPTS
+
+    def test_is_retryable(self):
+        with self.retry_policy as _:
+            assert _.is_retryable(requests_error(429))                               is True
+            assert _.is_retryable(requests_error(503))                               is True
+            assert _.is_retryable(requests_error(400))                               is False
+            assert _.is_retryable(HTTPError('url', 502, 'Bad Gateway', {}, None))    is True      # urllib (used by Provider__OpenRouter)
+            assert _.is_retryable(HTTPError('url', 401, 'Unauthorized', {}, None))   is False
+            assert _.is_retryable(Requests__ConnectionError())                      is True
+            assert _.is_retryable(ValueError('bad payload'))                         is False
+
+    def test_retry_after(self):
+        with self.retry_policy as _:
+            assert _.retry_after(requests_error(429, {'Retry-After': '3'}))                              == 3.0
+            assert _.retry_after(requests_error(429, {'Retry-After': 'Wed, 21 Oct 2015 07:28:00 GMT'}))  == 0.0      # date in the past
+            assert _.retry_after(requests_error(429))                                                    is None
+            assert _.retry_after(HTTPError('url', 429, 'Too Many', {'Retry-After': '2'}, None))          == 2.0
+
+    def test_delay(self):
+        with self.retry_policy as _:
+            assert 0 <= _.delay(1) <= _.base_delay                                                       # full jitter
+            assert 0 <= _.delay(2) <= _.base_delay * 2
+            assert _.delay(RETRY_POLICY__MAX_ATTEMPTS)                                   is None
+            assert _.delay(1, requests_error(429, {'Retry-After': '3' }))                == 3.0
+            assert _.delay(1, requests_error(429, {'Retry-After': '60'}))                is None         # too long: fail over instead
+            assert _.delay(1, requests_error(400))                                       is None
@@ -0,0 +1,71 @@
+import asyncio
+import json
+import pytest
+from http.server                                                    import BaseHTTPRequestHandler
+from unittest                                                       import TestCase
+from requests                                                       import HTTPError
+from osbot_utils.testing.Temp_Web_Server                            import Temp_Web_Server
+from osbot_utils.type_safe.Type_Safe                                import Type_Safe
+from osbot_utils.utils.Objects                                      import base_classes
+from mgraph_ai_service_llms.service.llms.transport.LLM__Transport   import LLM__Transport, llm__transport, TRANSPORT__POOL_MAXSIZE
+
+
+class Stub__LLM__Handler(BaseHTTPRequestHandler):                                   # echoes the posted json (and fails on /error), over keep-alive connections
+    protocol_version = 'HTTP/1.1'
+    connections      = set()
+
+    def do_POST(self):
+        Stub__LLM__Handler.connections.add(self.client_address)
+        body   = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        status = 429 if self.path == '/error' else 200
+        data   = json.dumps({ 'error': 'rate limited' } if status == 429 else { 'echo': body }).encode()
+        self.send_response(status)
+        self.send_header('Content-Type'  , 'application/json')
+        self.send_header('Content-Length', str(len(data))    )
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+class test_LLM__Transport(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.web_server = Temp_Web_Server(http_handler=Stub__LLM__Handler).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.web_server.stop()
+
+    def setUp(self):
+        Stub__LLM__Handler.connections.clear()
+        self.transport = LLM__Transport()
+
+    def test__init__(self):
+        with self.transport as _:
+            assert type(_)                  is LLM__Transport
+            assert base_classes(_)          == [Type_Safe, object]
+            assert _.pool_maxsize           == TRANSPORT__POOL_MAXSIZE
+            assert type(llm__transport)     is LLM__Transport
+
+    def test_post_json(self):
+        url = self.web_server.url('/chat')
+        for index in range(3):
+            assert self.transport.post_json(url, headers={}, payload={'index': index}) == {'echo': {'index': index}}
+        assert len(Stub__LLM__Handler.connections) == 1                              # the connection was reused
+        host = self.transport.stats()['hosts'][f'127.0.0.1:{self.web_server.port}']
+        assert host['requests'  ] == 3
+        assert host['status_200'] == 3
+        assert host['in_flight' ] == 0
+
+    def test_post_json__error(self):
+        with pytest.raises(HTTPError) as error:
+            self.transport.post_json(self.web_server.url('/error'), headers={}, payload={})
+        assert error.value.response.status_code            == 429                  # LLM__Retry_Policy reads the status from here
+        assert self.transport.error_message(error.value)   == {'error': 'rate limited'}
+
+    def test_post_json__async(self):
+        result = asyncio.run(self.transport.post_json__async(self.web_server.url('/chat'), headers={}, payload={'a': 1}))
+        assert result == {'echo': {'a': 1}}
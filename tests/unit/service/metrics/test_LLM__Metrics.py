@@ -0,0 +1,82 @@
+import os
+import threading
+from unittest                                               import TestCase
+from osbot_utils.utils.Files                                import temp_folder, folder_delete_all, files_names, files_list
+from mgraph_ai_service_llms.service.metrics.LLM__Metrics    import LLM__Metrics, llm__metrics, METRIC__REQUEST_DURATION, METRIC__TOKENS, METRIC__CACHE_REQUESTS, METRIC__SPAN_DURATION
+from mgraph_ai_service_llms.service.perf.Perf__Span         import span
+
+
+class test_LLM__Metrics(TestCase):
+
+    def setUp(self):
+        self.metrics = LLM__Metrics(multiprocess_dir='')                                    # (not from the env)
+
+    def test_inc__observe(self):
+        with self.metrics as _:
+            _.inc    (METRIC__TOKENS, 10, model='a/b', provider='groq', direction='in')
+            _.inc    (METRIC__TOKENS,  5, model='a/b', provider='groq', direction='in')
+            _.observe(METRIC__REQUEST_DURATION, 0.003, model='a/b', provider='groq', cache='miss')
+            _.observe(METRIC__REQUEST_DURATION, 0.300, model='a/b', provider='groq', cache='miss')
+            snapshot  = _.snapshot()
+            labels    = (('cache', 'miss'), ('model', 'a/b'), ('provider', 'groq'))
+            histogram = snapshot['histograms'][(METRIC__REQUEST_DURATION, labels)]
+            assert snapshot['counters'][(METRIC__TOKENS, (('direction', 'in'), ('model', 'a/b'), ('provider', 'groq')))] == 15
+            assert histogram[0]                 == 1                                        # <= 5ms
+            assert histogram[6]                 == 1                                        # <= 500ms
+            assert sum(histogram[:-1])          == 2
+            assert round(histogram[-1], 3)      == 0.303
+
+    def test_shards__threads(self):
+        def record():
+            for _ in range(100):
+                self.metrics.cache_lookup('chat', hit=True)
+        threads = [threading.Thread(target=record) for _ in range(4)]
+        for thread in threads: thread.start()
+        for thread in threads: thread.join()
+        assert len(self.metrics.shards)     == 16
+        assert self.metrics.snapshot()['counters'] == { (METRIC__CACHE_REQUESTS, (('cache', 'chat'), ('result', 'hit'))): 400 }
+
+    def test_shards__short_lived_threads(self):                                             # (like the executors of the hedged requests and batch fetches)
+        for _ in range(200):
+            threads = [threading.Thread(target=self.metrics.cache_lookup, args=('chat', True)) for _ in range(2)]
+            for thread in threads: thread.start()
+            for thread in threads: thread.join()
+        assert len(self.metrics.shards)     == 16
+        assert self.metrics.snapshot()['counters'] == { (METRIC__CACHE_REQUESTS, (('cache', 'chat'), ('result', 'hit'))): 400 }
+
+    def test_render(self):
+        with self.metrics as _:
+            _.cache_lookup('chat', hit=True )
+            _.cache_lookup('chat', hit=True )
+            _.cache_lookup('chat', hit=False)
+            _.observe(METRIC__REQUEST_DURATION, 0.2, model='a/"b"', provider='groq', cache='hit')
+            text = _.render()
+        assert '# TYPE llm_cache_requests_total counter'                                  in text
+        assert 'llm_cache_requests_total{cache="chat",result="hit"} 2'                    in text
+        assert 'llm_cache_hit_ratio{cache="chat"} 0.6667'                                 in text
+        assert '# TYPE llm_request_duration_seconds histogram'                            in text
+        assert 'llm_request_duration_seconds_bucket{cache="hit",model="a/\\"b\\"",provider="groq",le="0.1"} 0'    in text
+        assert 'llm_request_duration_seconds_bucket{cache="hit",model="a/\\"b\\"",provider="groq",le="+Inf"} 1'   in text
+        assert 'llm_request_duration_seconds_count{cache="hit",model="a/\\"b\\"",provider="groq"} 1'             in text
+
+    def test_collect__multiprocess(self):                                                   # two workers writing to the same folder
+        folder   = temp_folder()
+        worker_1 = LLM__Metrics(multiprocess_dir=folder)
+        worker_2 = LLM__Metrics(multiprocess_dir=folder)
+        try:
+            worker_1.inc(METRIC__TOKENS, 3, direction='out')
+            worker_2.inc(METRIC__TOKENS, 4, direction='out')
+            worker_2.path_snapshot = lambda pid=None: f'{folder}/metrics-worker-2.json'     # (same pid here)
+            assert worker_1.flush() is True
+            assert worker_2.flush() is True
+            assert sorted(files_names(files_list(folder))) == sorted([f'metrics-{os.getpid()}.json', 'metrics-worker-2.json'])
+            assert 'llm_tokens_total{direction="out"} 7' in worker_1.render()
+        finally:
+            folder_delete_all(folder)
+
+    def test_span__observes_histogram(self):
+        llm__metrics.clear()
+        with span('test.metrics'):
+            pass
+        assert 'llm_span_duration_seconds_count{span="test.metrics"} 1' in llm__metrics.render()
+        assert (METRIC__SPAN_DURATION, (('span', 'test.metrics'),)) in llm__metrics.snapshot()['histograms']
@@ -0,0 +1,57 @@
+import contextvars
+import threading
+from unittest                                               import TestCase
+from mgraph_ai_service_llms.service.perf.Perf__Span         import span, perf__trace, perf__current_trace
+from mgraph_ai_service_llms.service.perf.Perf__Stats        import Perf__Stats, perf__stats
+from mgraph_ai_service_llms.service.perf.Perf__Trace        import Perf__Trace
+
+
+class test_Perf__Span(TestCase):
+
+    def setUp(self):
+        perf__stats.clear()
+
+    def test_span(self):
+        with span('test.stage'):
+            pass
+        summary = perf__stats.summary()
+        assert list(summary)                    == ['test.stage']
+        assert summary['test.stage']['count']   == 1
+        assert list(summary['test.stage'])      == ['count', 'total', 'avg', 'max', 'p50', 'p95', 'p99']
+        assert perf__current_trace.get()        is None                             # no trace outside a request
+
+    def test_perf__trace(self):
+        with perf__trace() as outer:
+            with span('stage.a'):
+                pass
+            with perf__trace() as inner:
+                with span('stage.b'):
+                    pass
+                with span('stage.b'):
+                    pass
+        assert type(outer)                      is Perf__Trace
+        assert [name for name, _ in inner.spans] == ['stage.b', 'stage.b']
+        assert [name for name, _ in outer.spans] == ['stage.a', 'stage.b', 'stage.b']   # inner spans also reach the outer trace
+        assert list(outer.timings())            == ['stage.a', 'stage.b']              # repeated spans are added up
+        assert outer.server_timing().startswith('stage.a;dur=')
+        assert perf__current_trace.get()        is None
+
+    def test_perf__trace__threads(self):                                                    # trace is shared (by reference) with threads started from the request context
+        with perf__trace() as trace:
+            context = contextvars.copy_context()
+            def run():
+                with span('in.thread'):
+                    pass
+            thread = threading.Thread(target=context.run, args=(run,))
+            thread.start()
+            thread.join()
+        assert trace.timings().keys() == {'in.thread'}
+
+    def test_Perf__Stats(self):
+        stats = Perf__Stats(window_size=2)
+        for duration in (0.001, 0.002, 0.003):
+            stats.record('stage', duration)
+        summary = stats.summary()['stage']
+        assert summary['count'] == 3
+        assert summary['max'  ] == 3.0
+        assert summary['p50'  ] == 2.0                                                      # only the last 2 are kept for the percentiles